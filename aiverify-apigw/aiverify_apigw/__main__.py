@@ -9,14 +9,16 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from .lib.logging import logger
-from .routers import project_template_router, test_result_router, plugin_router, project_router, input_block_data_router, test_model_router, test_dataset_router, storage_router, test_run_router
+from .routers import project_template_router, test_result_router, plugin_router, project_router, input_block_data_router, test_model_router, test_dataset_router, storage_router, test_run_router, metrics_router
 from .lib.database import engine
-from .models import BaseORMModel
+from .lib.migrations import migrate_database
 from .lib.plugin_store import PluginStore
+from .lib.validation_jobs import fail_interrupted_validations
 
 
 # init db
-BaseORMModel.metadata.create_all(bind=engine)
+migrate_database(engine)
+fail_interrupted_validations()
 
 app = FastAPI()
 
@@ -30,6 +32,7 @@ app.include_router(test_model_router.router)
 app.include_router(test_dataset_router.router)
 app.include_router(storage_router.router)
 app.include_router(test_run_router.router)
+app.include_router(metrics_router.router)
 # modify the openai schema
 
 
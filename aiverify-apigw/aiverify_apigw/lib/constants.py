@@ -31,6 +31,7 @@ class TestDatasetFileType(StrEnum):
 
 
 class TestDatasetStatus(StrEnum):
+    Pending = auto()
     Valid = auto()
     Invalid = auto()
 
@@ -48,3 +49,9 @@ class TestRunStatus(StrEnum):
     Success = auto()
     Error = auto()
     Cancelled = auto() 
+
+
+class TaskPriority(StrEnum):
+    High = auto()
+    Normal = auto()
+    Low = auto()
@@ -1,23 +1,116 @@
-from venv import logger
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, Engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from typing import Any, Dict
+import os
+import threading
 
+from .logging import logger
 
-def init_db():
-    import os
 
+# SQLite: seconds to wait for the write lock before failing with "database is locked"
+sqlite_busy_timeout = float(os.getenv("APIGW_DB_BUSY_TIMEOUT", "30"))
+# other databases: number of connections kept in the pool and the extra connections opened under load
+pool_size = int(os.getenv("APIGW_DB_POOL_SIZE", "10"))
+max_overflow = int(os.getenv("APIGW_DB_MAX_OVERFLOW", "20"))
+pool_timeout = float(os.getenv("APIGW_DB_POOL_TIMEOUT", "30"))
+pool_recycle = int(os.getenv("APIGW_DB_POOL_RECYCLE", "1800"))
+
+SQLITE_PRAGMAS = {
+    # readers do not block the writer and the writer does not block readers
+    "journal_mode": "WAL",
+    # safe with WAL, commits do not wait for fsync of the database file
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    # 64 MiB page cache per connection
+    "cache_size": "-65536",
+}
+
+
+def get_db_uri() -> str:
     if "APIGW_DB_URI" in os.environ:
-        db_uri = os.environ["APIGW_DB_URI"]
-    else:
-        from .filestore import base_data_dir
+        return os.environ["APIGW_DB_URI"]
+    from .filestore import base_data_dir
+
+    return f"sqlite:///{base_data_dir}/database.db"
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
 
-        db_uri = f"sqlite:///{base_data_dir}/database.db"
-    logger.debug(f"db_uri: {db_uri}")
-    engine = create_engine(db_uri, echo=False, connect_args={"check_same_thread": False})
+def create_db_engine(db_uri: str) -> Engine:
+    """
+    Create the database engine for the database URI.
+
+    SQLite is meant for single node deployments. The database file is opened in WAL mode with a busy timeout, so that
+    concurrent writes wait for the write lock instead of failing. Other databases, e.g. PostgreSQL for deployments with
+    multiple apigw replicas, use a connection pool sized by APIGW_DB_POOL_SIZE and APIGW_DB_MAX_OVERFLOW.
+    """
+    url = make_url(db_uri)
+    logger.debug(f"db_uri: {url.render_as_string(hide_password=True)}")
+    if url.get_backend_name() == "sqlite":
+        engine = create_engine(
+            url, echo=False, connect_args={"check_same_thread": False, "timeout": sqlite_busy_timeout}
+        )
+        if url.database and url.database != ":memory:":
+            event.listen(engine, "connect", _set_sqlite_pragmas)
+    else:
+        engine = create_engine(
+            url,
+            echo=False,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=True,
+        )
+    _track_pool_metrics(engine)
     return engine
 
 
-engine = init_db()
+_metrics_lock = threading.Lock()
+_pool_metrics: Dict[Engine, Dict[str, int]] = {}
+
+
+def _track_pool_metrics(engine: Engine):
+    metrics = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0}
+    _pool_metrics[engine] = metrics
+
+    def _count(name: str):
+        def listener(*args):
+            with _metrics_lock:
+                metrics[name] += 1
+        return listener
+
+    event.listen(engine, "connect", _count("connects"))
+    event.listen(engine, "checkout", _count("checkouts"))
+    event.listen(engine, "checkin", _count("checkins"))
+    event.listen(engine, "invalidate", _count("invalidations"))
+
+
+def get_pool_metrics(db_engine: Engine | None = None) -> Dict[str, Any]:
+    """Return the connection pool status and the counts of the pool events since the engine was created"""
+    db_engine = db_engine or engine
+    pool = db_engine.pool
+    with _metrics_lock:
+        metrics: Dict[str, Any] = dict(_pool_metrics.get(db_engine, {}))
+    metrics["pool"] = type(pool).__name__
+    if isinstance(pool, QueuePool):
+        metrics["size"] = pool.size()
+        metrics["checked_in"] = pool.checkedin()
+        metrics["checked_out"] = pool.checkedout()
+        metrics["overflow"] = pool.overflow()
+    return metrics
+
+
+engine = create_db_engine(get_db_uri())
 
 SessionLocal = sessionmaker(engine)
 
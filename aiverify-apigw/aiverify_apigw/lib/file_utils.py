@@ -1,7 +1,13 @@
 from pathlib import PurePath, Path
+from typing import BinaryIO
 import io
 import re
 import hashlib
+import shutil
+
+
+# size of the chunks of the files copied, so that large files are not read into memory
+COPY_CHUNK_SIZE = 1024 * 1024
 
 
 class InvalidFilename(Exception):
@@ -60,6 +66,48 @@ def compute_file_hash(file_path: Path) -> str:
     """
     hasher = hashlib.sha256()
     with open(file_path, "rb") as f:
-        while chunk := f.read(8192):
+        while chunk := f.read(COPY_CHUNK_SIZE):
             hasher.update(chunk)
     return hasher.hexdigest()
+
+
+class HashingWriter:
+    """
+    File object wrapper that computes the SHA-256 hash of the data written to the file object.
+
+    The wrapper is not seekable, so that all the data is written in order. ZipFile writes to an unseekable
+    file object in a single pass, with the sizes and CRC of each file in a data descriptor after the file data.
+    """
+
+    def __init__(self, fp: BinaryIO):
+        self.fp = fp
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.hasher.update(data)
+        self.size += len(data)
+        return self.fp.write(data)
+
+    def flush(self):
+        self.fp.flush()
+
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+
+def copy_file_with_hash(fsrc: BinaryIO, target_path: Path) -> tuple[int, str]:
+    """
+    Copy a file object to the target path in chunks, computing the SHA-256 hash of the file while copying.
+
+    Args:
+        fsrc (BinaryIO): The file object to copy
+        target_path (Path): The path of the file to write
+
+    Returns:
+        tuple[int, str]: The size and SHA-256 hash of the file
+    """
+    with open(target_path, "wb") as fp:
+        writer = HashingWriter(fp)
+        shutil.copyfileobj(fsrc, writer, COPY_CHUNK_SIZE)
+    return (writer.size, writer.hexdigest())
@@ -1,16 +1,16 @@
-from .file_utils import compute_file_hash, check_valid_filename
+from .file_utils import compute_file_hash, check_valid_filename, copy_file_with_hash, HashingWriter
 from .validators import validate_gid_cid
 from .logging import logger
 from .s3 import MyS3
-from typing import Any
+from typing import Any, BinaryIO
 import json
 import io
 from urllib.parse import urljoin
 import os
 import shutil
+import tempfile
 from pathlib import Path
 import urllib.parse
-import hashlib
 from zipfile import ZipFile
 
 urllib.parse.uses_relative.append("s3")
@@ -161,12 +161,15 @@ plugin_ignore_patten = shutil.ignore_patterns(
 )
 
 
-def zip_folder(folder: Path) -> tuple[io.BytesIO, str]:
+def zip_folder(folder: Path, target: BinaryIO) -> str:
     """
-    Generate a zip file for the path specifified.
+    Write a zip file of the path specifified to the target file object.
+
+    The zip file is written and hashed in a single pass, without keeping the zip file in memory.
 
     Args:
         folder (Path): The path of the folder to zip
+        target (BinaryIO): The file object to write the zip file to
 
     Returns:
         str: Filehash of zip file
@@ -176,36 +179,43 @@ def zip_folder(folder: Path) -> tuple[io.BytesIO, str]:
         raise FileStoreError(f"Invalid filename {folder.name}")
     logger.debug(f"ziping folder {folder}")
 
-    zip_content = io.BytesIO()
     if not folder.exists() or not folder.is_dir():
         raise FileStoreError(f"Invalid directory for {folder}")
 
-    with ZipFile(zip_content, "w") as zipf:
+    writer = HashingWriter(target)
+    with ZipFile(writer, "w") as zipf:  # type: ignore
         for file_path in folder.rglob("**/*"):
             if file_path.is_file():
                 zipf.write(file_path, file_path.relative_to(folder))
             elif file_path.is_dir():
                 zipf.mkdir(file_path.relative_to(folder).as_posix())
 
-    # Compute file hash using zip_content
-    zip_content.seek(0)  # Ensure we're at the start of the BytesIO stream
-    hasher = hashlib.sha256()
-    while chunk := zip_content.read(8192):
-        hasher.update(chunk)
-    file_hash = hasher.hexdigest()
+    file_hash = writer.hexdigest()
     logger.debug(f"Computed file hash: {file_hash}")
+    return file_hash
 
-    zip_content.seek(0)
-    return (zip_content, file_hash)
+
+def _save_zip(source: Path, target: Path | str) -> str:
+    """Zip the folder to the target zip file or S3 object key, and return the hash of the zip file"""
+    if isinstance(target, Path):
+        with open(target, "wb") as fp:
+            return zip_folder(source, fp)
+    elif s3 is not None:
+        # zip to a temporary file, which is uploaded to S3 in multiple parts
+        with tempfile.TemporaryFile() as fp:
+            filehash = zip_folder(source, fp)
+            fp.seek(0)
+            s3.upload_fileobj(fp, target)
+        return filehash
+    else:
+        raise FileStoreError("Invalid data path configuration")
 
 
 def _save_plugin(source: Path, target: Path | str, zip_filename: str, hash_filename: str) -> str:
-    (zip_content, filehash) = zip_folder(source)
     if isinstance(target, Path):
         target.mkdir(parents=True, exist_ok=True)
         # shutil.copytree(source_dir, folder, dirs_exist_ok=True, ignore=plugin_ignore_patten)
-        with open(target.joinpath(zip_filename), "wb") as fp:
-            fp.write(zip_content.read())
+        filehash = _save_zip(source, target.joinpath(zip_filename))
         with open(target.joinpath(hash_filename), "w") as fp:
             fp.write(filehash)
     elif s3 is not None:
@@ -213,8 +223,10 @@ def _save_plugin(source: Path, target: Path | str, zip_filename: str, hash_filen
         if s3.check_s3_prefix_exists(target):
             s3.delete_objects_under_prefix(target)  # if prefix exists, delete
         # s3.upload_directory_to_s3(source_dir, folder)
-        s3.put_object(urljoin(target, zip_filename), zip_content)
+        filehash = _save_zip(source, urljoin(target, zip_filename))
         s3.put_object(urljoin(target, hash_filename), filehash)
+    else:
+        raise FileStoreError("Invalid data path configuration")
     return filehash
 
 
@@ -424,7 +436,8 @@ def get_artifacts_folder(test_result_id: str):
         return urljoin(base_artifacts_dir, f"{test_result_id}/")
 
 
-def save_artifact(test_result_id: str, filename: str, data: bytes):
+def save_artifact(test_result_id: str, filename: str, data: bytes | BinaryIO):
+    """Save the test result artifact. data can be a binary file object, which is streamed to the file store"""
     # validate input
     if not test_result_id.isalnum():
         raise FileStoreError(f"Invalid test result id {test_result_id}")
@@ -440,11 +453,17 @@ def save_artifact(test_result_id: str, filename: str, data: bytes):
         if not filepath.parent.exists():
             filepath.parent.mkdir(parents=True, exist_ok=True)
         with open(filepath, "wb") as fp:
-            fp.write(data)
+            if isinstance(data, bytes):
+                fp.write(data)
+            else:
+                shutil.copyfileobj(data, fp, 1024 * 1024)
         return filepath
     elif s3 is not None:
         key = urljoin(folder, filename)
-        s3.put_object(key, data)
+        if isinstance(data, bytes):
+            s3.put_object(key, data)
+        else:
+            s3.upload_fileobj(data, key)
         return key
 
 
@@ -490,59 +509,94 @@ def save_test_model(source_path: Path) -> str:
 
     if source_path.is_dir():
         # for folders, zip the content as well
-        (zip_content, filehash) = zip_folder(source_path)
         zip_filename = f"{source_path.name}.zip"
         hash_filename = f"{source_path.name}.hash"
         if isinstance(target_path, Path):
             shutil.copytree(source_path, target_path, dirs_exist_ok=True)
-            with open(target_path.parent.joinpath(zip_filename), "wb") as fp:
-                fp.write(zip_content.read())
+            filehash = _save_zip(source_path, target_path.parent.joinpath(zip_filename))
             with open(target_path.parent.joinpath(hash_filename), "w") as fp:
                 fp.write(filehash)
         elif s3 is not None:
             s3.upload_directory_to_s3(source_path, target_path)
-            s3.put_object(zip_filename, zip_content)
-            s3.put_object(hash_filename, filehash)
+            filehash = _save_zip(source_path, f"{target_path}.zip")
+            s3.put_object(f"{target_path}.hash", filehash)
+        else:
+            raise FileStoreError("Invalid data path configuration")
         return filehash
     else:
-        filehash = compute_file_hash(source_path)
         if isinstance(target_path, Path):
-            shutil.copy(source_path, target_path)
+            # copy and hash the file in a single pass
+            with open(source_path, "rb") as fp:
+                (_, filehash) = copy_file_with_hash(fp, target_path)
         elif s3 is not None:
+            filehash = compute_file_hash(source_path)
             s3.upload_file(source_path.as_posix(), target_path)
+        else:
+            raise FileStoreError("Invalid data path configuration")
         return filehash
 
 
-def get_test_model(filename: str):
+def _get_download_path(stored_path: Path | str, filename: str) -> Path | str:
+    """Return the local path or S3 object key of the stored file, or of the zip file if stored_path is a folder"""
+    if isinstance(stored_path, Path):
+        if not stored_path.exists():
+            raise FileNotFoundError(f"File {filename} is not found")
+        if stored_path.is_file():
+            return stored_path
+        # check for zip
+        zip_path = stored_path.parent.joinpath(f"{stored_path.name}.zip")
+        if zip_path.exists():
+            return zip_path
+        raise FileNotFoundError(f"File {filename} is not found")
+    elif s3 is not None:
+        if s3.check_s3_object_exists(stored_path):
+            return stored_path
+        elif s3.check_s3_prefix_exists(stored_path):
+            return f"{stored_path}.zip"
+        else:
+            raise FileNotFoundError(f"File {filename} is not found")
+    else:
+        raise FileStoreError("Invalid data path configuration")
+
+
+def _read_download_path(download_path: Path | str) -> bytes:
+    if isinstance(download_path, Path):
+        with open(download_path, "rb") as fp:
+            return fp.read()
+    elif s3 is not None:
+        return s3.get_object(download_path)
+    else:
+        raise FileStoreError("Invalid data path configuration")
+
+
+def open_s3_object(key: str, byte_range: str | None = None) -> dict:
+    """
+    Open an S3 object to stream its content, without reading the content into memory.
+
+    Args:
+        key (str): Key of the S3 object
+        byte_range (str | None): HTTP Range header value to read part of the object
+
+    Returns:
+        dict: S3 GetObject response, with the object content in the Body stream
+    """
+    if s3 is None:
+        raise FileStoreError("Invalid data path configuration")
+    return s3.get_object_stream(key, byte_range)
+
+
+def get_test_model_download_path(filename: str) -> Path | str:
+    """Return the local path or S3 object key of the test model file, or of the zip file of a test model folder"""
     # validate filename
     if not check_valid_filename(filename):
         raise FileStoreError(f"Invalid filename {filename}")
     if not check_relative_to_base(base_models_dir, filename):
         raise FileStoreError(f"Invalid filename {filename}")
-    model_path = get_model_path(filename)
-    if isinstance(model_path, Path):
-        if not model_path.exists():
-            raise FileNotFoundError(f"File {filename} is not found")
-        if model_path.is_file():
-            with open(model_path, "rb") as fp:
-                data = fp.read()
-            return data
-        else:
-            # check for zip
-            zip_path = model_path.parent.joinpath(f"{model_path.name}.zip")
-            if zip_path.exists():
-                with open(zip_path, "rb") as fp:
-                    data = fp.read()
-                return data
-            else:
-                raise FileNotFoundError(f"File {filename} is not found")
-    elif s3 is not None:
-        if s3.check_s3_object_exists(model_path):
-            return s3.get_object(model_path)
-        elif s3.check_s3_prefix_exists(model_path):
-            return s3.get_object(f"{model_path}.zip")
-        else:
-            raise FileNotFoundError(f"File {filename} is not found")
+    return _get_download_path(get_model_path(filename), filename)
+
+
+def get_test_model(filename: str):
+    return _read_download_path(get_test_model_download_path(filename))
 
 
 def delete_test_model(filename: str):
@@ -591,59 +645,45 @@ def save_test_dataset(source_path: Path) -> str:
 
     if source_path.is_dir():
         # for folders, zip the content as well
-        (zip_content, filehash) = zip_folder(source_path)
         zip_filename = f"{source_path.name}.zip"
         hash_filename = f"{source_path.name}.hash"
         if isinstance(target_path, Path):
             shutil.copytree(source_path, target_path, dirs_exist_ok=True)
-            with open(target_path.parent.joinpath(zip_filename), "wb") as fp:
-                fp.write(zip_content.read())
+            filehash = _save_zip(source_path, target_path.parent.joinpath(zip_filename))
             with open(target_path.parent.joinpath(hash_filename), "w") as fp:
                 fp.write(filehash)
         elif s3 is not None:
             s3.upload_directory_to_s3(source_path, target_path)
-            s3.put_object(zip_filename, zip_content)
-            s3.put_object(hash_filename, filehash)
+            filehash = _save_zip(source_path, f"{target_path}.zip")
+            s3.put_object(f"{target_path}.hash", filehash)
+        else:
+            raise FileStoreError("Invalid data path configuration")
         return filehash
     else:
-        filehash = compute_file_hash(source_path)
         if isinstance(target_path, Path):
-            shutil.copy(source_path, target_path)
+            # copy and hash the file in a single pass
+            with open(source_path, "rb") as fp:
+                (_, filehash) = copy_file_with_hash(fp, target_path)
         elif s3 is not None:
+            filehash = compute_file_hash(source_path)
             s3.upload_file(source_path.as_posix(), target_path)
+        else:
+            raise FileStoreError("Invalid data path configuration")
         return filehash
 
 
-def get_test_dataset(filename: str):
+def get_test_dataset_download_path(filename: str) -> Path | str:
+    """Return the local path or S3 object key of the test dataset file, or of the zip file of a test dataset folder"""
     # validate file name
     if not check_valid_filename(filename):
         raise FileStoreError(f"Invalid filename {filename}")
     if not check_relative_to_base(base_dataset_dir, filename):
         raise FileStoreError(f"Invalid filename {filename}")
-    dataset_path = get_dataset_path(filename)
-    if isinstance(dataset_path, Path):
-        if not dataset_path.exists():
-            raise FileNotFoundError(f"File {filename} is not found")
-        if dataset_path.is_file():
-            with open(dataset_path, "rb") as fp:
-                data = fp.read()
-            return data
-        else:
-            # check for zip
-            zip_path = dataset_path.parent.joinpath(f"{dataset_path.name}.zip")
-            if zip_path.exists():
-                with open(zip_path, "rb") as fp:
-                    data = fp.read()
-                return data
-            else:
-                raise FileNotFoundError(f"File {filename} is not found")
-    elif s3 is not None:
-        if s3.check_s3_object_exists(dataset_path):
-            return s3.get_object(dataset_path)
-        elif s3.check_s3_prefix_exists(dataset_path):
-            return s3.get_object(f"{dataset_path}.zip")
-        else:
-            raise FileNotFoundError(f"File {filename} is not found")
+    return _get_download_path(get_dataset_path(filename), filename)
+
+
+def get_test_dataset(filename: str):
+    return _read_download_path(get_test_dataset_download_path(filename))
 
 
 def delete_test_dataset(filename: str):
@@ -0,0 +1,83 @@
+"""Versioned migrations of the database schema.
+
+The version of the schema is kept in the schema_version table. A new database is created from the ORM models and set
+to the latest version. An existing database is upgraded by running the migrations after its version in order, in a
+single transaction. To change the schema, update the ORM models and append a migration that applies the change to
+existing databases.
+"""
+from sqlalchemy import Column, Connection, Engine, Integer, MetaData, Table, inspect, select, text
+from typing import Callable, List, Tuple
+
+from .logging import logger
+from ..models import BaseORMModel
+
+
+_version_metadata = MetaData()
+schema_version_table = Table("schema_version", _version_metadata, Column("version", Integer, nullable=False))
+
+# key of the PostgreSQL advisory lock held while migrating, so that replicas starting together migrate only once
+MIGRATION_LOCK_KEY = 0x61697665
+
+
+def _create_missing_tables(connection: Connection):
+    """Baseline: create the tables added since the database was created"""
+    BaseORMModel.metadata.create_all(bind=connection)
+
+
+def _create_filter_indexes(connection: Connection):
+    """Index the model and dataset of the test results and test runs, used to filter the lists"""
+    for table_name in ("test_result", "test_run"):
+        table = BaseORMModel.metadata.tables[table_name]
+        for index in table.indexes:
+            if index.name in (f"ix_{table_name}_model_id", f"ix_{table_name}_test_dataset_id"):
+                index.create(bind=connection, checkfirst=True)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "create missing tables", _create_missing_tables),
+    (2, "index test results and test runs by model and dataset", _create_filter_indexes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _get_version(connection: Connection) -> int | None:
+    """Return the schema version of the database, 0 if the database was created before versioning or None if empty"""
+    table_names = inspect(connection).get_table_names()
+    if schema_version_table.name in table_names:
+        return connection.execute(select(schema_version_table.c.version)).scalar() or 0
+    if any(name in table_names for name in BaseORMModel.metadata.tables):
+        return 0
+    return None
+
+
+def _set_version(connection: Connection, version: int):
+    connection.execute(schema_version_table.delete())
+    connection.execute(schema_version_table.insert().values(version=version))
+
+
+def migrate_database(engine: Engine) -> int:
+    """Create or upgrade the database schema to the latest version.
+
+    Returns:
+        int: the schema version of the database
+    """
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        version = _get_version(connection)
+        _version_metadata.create_all(bind=connection)
+        if version is None:
+            logger.info(f"Creating database schema version {LATEST_VERSION}")
+            BaseORMModel.metadata.create_all(bind=connection)
+            _set_version(connection, LATEST_VERSION)
+            return LATEST_VERSION
+        if version > LATEST_VERSION:
+            raise RuntimeError(f"Database schema version {version} is newer than the latest version {LATEST_VERSION}")
+        for migration_version, description, migration in MIGRATIONS:
+            if migration_version > version:
+                logger.info(f"Migrating database schema to version {migration_version}: {description}")
+                migration(connection)
+        if version < LATEST_VERSION:
+            _set_version(connection, LATEST_VERSION)
+        return LATEST_VERSION
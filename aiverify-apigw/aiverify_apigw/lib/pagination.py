@@ -0,0 +1,55 @@
+"""Cursor pagination of the list endpoints.
+
+The rows are listed in the order of their primary key. The cursor of the next page is the primary key of the last row
+of the current page, and is returned in the X-Next-Cursor response header. Each page is read with an indexed range
+query, so the time to read a page does not grow with the number of rows stored, unlike offset pagination.
+"""
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def paginate(
+    session: Session, stmt: Select, id_column: Any, limit: Optional[int] = None, cursor: Optional[str] = None
+) -> Tuple[Sequence[Any], Optional[str]]:
+    """Return a page of the rows selected by the statement, in the order of the primary key column.
+
+    Args:
+        session (Session): Database session
+        stmt (Select): Select statement of the rows, with the filters applied
+        id_column: Primary key column of the rows
+        limit (Optional[int]): Maximum number of rows in the page. All the rows after the cursor are returned if None.
+        cursor (Optional[str]): Cursor returned with the previous page, or None for the first page
+
+    Returns:
+        Tuple[Sequence[Any], Optional[str]]: the rows of the page and the cursor of the next page, or None if this
+            is the last page
+
+    Raises:
+        InvalidCursorError: if the cursor is not a valid primary key
+    """
+    if cursor:
+        try:
+            last_id = id_column.type.python_type(cursor)
+        except (TypeError, ValueError):
+            raise InvalidCursorError(f"Invalid cursor: {cursor}")
+        stmt = stmt.where(id_column > last_id)
+    stmt = stmt.order_by(id_column)
+    if limit is None:
+        return session.scalars(stmt).all(), None
+
+    # read one more row to find out if there is a next page
+    rows = session.scalars(stmt.limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, str(getattr(rows[-1], id_column.key))
@@ -3,7 +3,7 @@ import boto3
 import os
 import io
 from urllib.parse import urlparse
-from typing import List
+from typing import BinaryIO, List
 from .logging import logger
 
 # Get credentials
@@ -80,6 +80,16 @@ class MyS3:
         self.client.upload_file(Filename=filepath, Bucket=self.bucket_name, Key=key)
         logger.debug(f"Uploading file {filepath} to key {key}")
 
+    def upload_fileobj(self, fileobj: BinaryIO, key: str):
+        """Upload a binary file object to an S3 object, in multiple parts for large files.
+
+        Args:
+            fileobj (BinaryIO): the file object to upload
+            key (str): the name of the key to upload to
+        """
+        self.client.upload_fileobj(Fileobj=fileobj, Bucket=self.bucket_name, Key=key)
+        logger.debug(f"Uploading file object to key {key}")
+
     def download_file(self, filepath: str, key: str):
         """Download an S3 object to a file.
 
@@ -111,6 +121,20 @@ class MyS3:
         resp = self.client.get_object(Bucket=self.bucket_name, Key=key)
         return resp["Body"].read()
 
+    def get_object_stream(self, key: str, byte_range: str | None = None) -> dict:
+        """Retrieves an object from S3 without reading the object data.
+
+        Args:
+            key (str): Key of the object to get
+            byte_range (str | None): HTTP Range header value to get part of the object. Defaults to None (whole object)
+
+        Returns:
+            dict: GetObject response, with the object data in the Body stream
+        """
+        if byte_range:
+            return self.client.get_object(Bucket=self.bucket_name, Key=key, Range=byte_range)
+        return self.client.get_object(Bucket=self.bucket_name, Key=key)
+
     def copy_object(self, sourceKey: str, targetKey: str):
         """Copy object from source to target
 
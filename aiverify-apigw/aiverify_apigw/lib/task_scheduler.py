@@ -0,0 +1,94 @@
+"""Scheduling of the test run tasks on the task streams read by the test engine workers.
+
+Tasks are queued in priority lanes. The workers read the lanes in priority order, so a task in a higher lane is
+started before the tasks queued in the lower lanes. The lane of a task is selected from its estimated cost, the
+number of rows in the test dataset multiplied by the cost weight of the algorithm, so that short test runs are
+not queued behind long ones.
+
+Each lane has one stream per tenant (the project of the test run) and the workers read one message from each
+stream of a lane in turn, so the tenants share the workers fairly instead of in the order the tasks were queued.
+The streams are registered in the TASK_STREAMS_KEY hash, mapping each stream name to its lane.
+"""
+from typing import Optional
+import json
+import os
+
+from .constants import TaskPriority
+from .logging import logger
+from ..models import AlgorithmModel, TestDatasetModel
+
+
+TASK_STREAM_NAME = "aiverify:worker:task_queue"
+TASK_GROUP_NAME = "aiverify_workers"
+TASK_STREAMS_KEY = "aiverify:worker:task_streams"
+DEFAULT_TENANT = "default"
+
+
+# cost weight of the algorithms that take much longer than others on the same dataset, by algorithm CID
+DEFAULT_ALGORITHM_COST_WEIGHTS: dict[str, float] = {
+    "aiverify_robustness_toolbox": 20,
+    "aiverify_blur_corruptions": 20,
+    "aiverify_digital_corruptions": 20,
+    "aiverify_environment_corruptions": 20,
+    "aiverify_general_corruptions": 20,
+    "aiverify_shap_toolbox": 10,
+    "aiverify_accumulated_local_effect": 2,
+    "aiverify_partial_dependence_plot": 2,
+}
+# number of rows assumed when the number of rows of the test dataset is not known
+DEFAULT_DATASET_ROWS = 10000
+
+
+def _get_algorithm_cost_weights() -> dict[str, float]:
+    weights = dict(DEFAULT_ALGORITHM_COST_WEIGHTS)
+    if "APIGW_TASK_COST_WEIGHTS" in os.environ:
+        try:
+            weights.update(json.loads(os.environ["APIGW_TASK_COST_WEIGHTS"]))
+        except ValueError as e:
+            logger.warning(f"Invalid APIGW_TASK_COST_WEIGHTS: {e}")
+    return weights
+
+
+algorithm_cost_weights = _get_algorithm_cost_weights()
+# tasks with estimated cost up to high_priority_max_cost are queued in the high lane, above low_priority_min_cost in the low lane
+high_priority_max_cost = int(os.getenv("APIGW_TASK_HIGH_PRIORITY_MAX_COST", "100000"))
+low_priority_min_cost = int(os.getenv("APIGW_TASK_LOW_PRIORITY_MIN_COST", "10000000"))
+
+
+def estimate_task_cost(algorithm: AlgorithmModel, test_dataset: TestDatasetModel) -> int:
+    """Estimate the relative cost of running the algorithm on the test dataset"""
+    num_rows = test_dataset.num_rows or DEFAULT_DATASET_ROWS
+    weight = algorithm_cost_weights.get(algorithm.cid, 1)
+    return int(num_rows * weight)
+
+
+def get_task_priority(cost: int, priority: Optional[TaskPriority] = None) -> TaskPriority:
+    """Return the requested priority, or the priority of a task with the estimated cost"""
+    if priority is not None:
+        return priority
+    if cost <= high_priority_max_cost:
+        return TaskPriority.High
+    if cost > low_priority_min_cost:
+        return TaskPriority.Low
+    return TaskPriority.Normal
+
+
+def get_task_stream(priority: TaskPriority, tenant: str = DEFAULT_TENANT) -> str:
+    """Return the name of the stream of the tenant in the priority lane"""
+    if priority == TaskPriority.Normal and tenant == DEFAULT_TENANT:
+        # tasks queued before the lanes were introduced, and algorithm builds
+        return TASK_STREAM_NAME
+    return f"{TASK_STREAM_NAME}:{priority}:{tenant}"
+
+
+def make_job_id(stream: str, message_id: bytes) -> bytes:
+    """Return the job id of a task, which is the message id qualified by the stream name"""
+    if stream == TASK_STREAM_NAME:
+        return message_id
+    return message_id + b"@" + stream.encode("utf-8")
+
+
+def parse_job_id(job_id: bytes) -> tuple[str, bytes]:
+    """Return the stream name and message id of a job id"""
+    message_id, _, stream = job_id.partition(b"@")
+    return (stream.decode("utf-8") if stream else TASK_STREAM_NAME), message_id
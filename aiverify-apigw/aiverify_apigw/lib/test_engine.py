@@ -5,6 +5,10 @@ from typing import Any, List
 from .logging import logger
 
 
+# number of rows read to detect the column datatypes of datasets that are read in batches
+DATASET_SAMPLE_ROWS = 10000
+
+
 class TestEngineValidatorException(BaseException):
     pass
 
@@ -91,6 +95,9 @@ class TestEngineValidator:
     def validate_dataset(cls, model_path: Path) -> tuple[str, str, int, int, List[dict]]:
         """Validate test dataset
 
+        Datasets that can be read in batches (e.g. CSV, Parquet) are not loaded into memory. The number of rows is
+        counted from the file and the column datatypes are read from the first DATASET_SAMPLE_ROWS rows.
+
         Args:
             model_path (Path): Path to the test dataset file or folder
 
@@ -98,42 +105,76 @@ class TestEngineValidator:
             TestEngineValidatorException
 
         Returns:
-            tuple[DataPluginType, SerializerPluginType]: (model_format, serializer_type)
+            tuple[DataPluginType, SerializerPluginType, int, int, List[dict]]: (data_format, serializer_type, num_rows, num_cols, data_columns)
         """
         from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+        from aiverify_test_engine.plugins.enums.data_plugin_type import DataPluginType
         plugins_manager = cls.init_engine()
         PluginManager = plugins_manager.PluginManager
 
         try:
             (data_instance, data_serializer, errmsg) = PluginManager.get_instance(
-                PluginType.DATA, **{"filename": model_path.absolute().as_posix()}
+                PluginType.DATA, **{"filename": model_path.absolute().as_posix(), "convert_to_pandas": False}
             )
             logger.debug(f"validate dataset. data_instance:{data_instance}, data_serializer: {data_serializer}, errmsg: {errmsg}")
             if not isinstance(data_instance, plugins_manager.IData):
                 raise TestEngineValidatorException(f"Invalid dataset instance returned: {type(data_instance)}")
+            if data_instance.get_data_plugin_type() is not DataPluginType.PANDAS and not data_instance.is_batch_supported():
+                # the data can only be read by converting to pandas
+                (data_instance, data_serializer, errmsg) = PluginManager.get_instance(
+                    PluginType.DATA, **{"filename": model_path.absolute().as_posix()}
+                )
+                if not isinstance(data_instance, plugins_manager.IData):
+                    raise TestEngineValidatorException(f"Invalid dataset instance returned: {type(data_instance)}")
         except:
             raise TestEngineValidatorException(f"Invalid dataset format")
         if data_instance and data_serializer:
             (is_success, error_messages) = data_instance.setup() 
             if not is_success:
                 raise TestEngineValidatorException(f"Failed to perform dataset instance setup: {error_messages}")
-            # get dataset labels
-            (is_data_valid, validation_error_message) = data_instance.validate()
-            if not is_data_valid:
-                raise TestEngineValidatorException(f"Dataset could not be validated: {validation_error_message}")
-            labels = data_instance.read_labels()
+            if data_instance.get_data_plugin_type() is not DataPluginType.PANDAS:
+                (data_format, num_rows, num_cols, labels) = cls._read_dataset_metadata(data_instance)
+            else:
+                # get dataset labels
+                (is_data_valid, validation_error_message) = data_instance.validate()
+                if not is_data_valid:
+                    raise TestEngineValidatorException(f"Dataset could not be validated: {validation_error_message}")
+                labels = data_instance.read_labels()
+                data_format = data_instance.get_data_plugin_type().name.lower()
+                (num_rows, num_cols) = data_instance.get_shape()
             if not labels:
                 raise TestEngineValidatorException("Dataset has no headers")
             data_columns = []
             for key, value in labels.items():
                 data_columns.append({"name": key, "datatype": value, "label": key})
-            (num_rows, num_cols) = data_instance.get_shape()
-            result = (data_instance.get_data_plugin_type().name.lower(), data_serializer.get_serializer_plugin_type().name.lower(), num_rows, num_cols, data_columns)
+            result = (data_format, data_serializer.get_serializer_plugin_type().name.lower(), num_rows, num_cols, data_columns)
             logger.debug(f"dataset validation result: {result}")
             return result
         else:
             raise TestEngineValidatorException(errmsg)
 
+    @classmethod
+    def _read_dataset_metadata(cls, data_instance: Any) -> tuple[str, int, int, dict]:
+        """Read the data format, shape and column datatypes of a dataset that is read in batches, without loading the
+        whole dataset into memory.
+
+        Returns:
+            tuple[str, int, int, dict]: (data_format, num_rows, num_cols, labels)
+        """
+        import pandas as pd
+        try:
+            sample = next(data_instance.iter_batches(DATASET_SAMPLE_ROWS), None)
+            num_rows = data_instance.get_num_rows()
+        except Exception as e:
+            raise TestEngineValidatorException(f"Dataset could not be read: {e}")
+        if not isinstance(sample, pd.DataFrame) or sample.empty:
+            raise TestEngineValidatorException("Dataset could not be validated: The inputs do not meet the validation rules.")
+        if any(pd.isnull(column) or column == "" for column in sample.columns):
+            raise TestEngineValidatorException("Dataset could not be validated: The data has missing column labels.")
+        labels = {column: sample.dtypes[column].name for column in sample.columns}
+        # the test engine converts the batched data formats to pandas when the whole dataset is loaded
+        return ("pandas", num_rows, len(labels), labels)
+
 
 # # initialize the test engine
 # TestEngineValidator.init_engine()
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""Background validation of the uploaded test datasets and models.
+
+Validating a dataset or model loads it with the test engine, which can take minutes and most of the memory of the
+process for large files. The upload endpoints save the uploaded files to a staging folder, create the record with
+status Pending and submit a validation job. The job validates the files in a separate process of the validation
+process pool, saves the valid files to the file store and updates the record to Valid or Invalid. Clients poll the
+record for the result of the validation.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+
+from .logging import logger
+from .constants import TestDatasetStatus, TestModelStatus
+from .database import SessionLocal
+from .filestore import save_test_dataset as fs_save_test_dataset, save_test_model as fs_save_test_model
+from .test_engine import TestEngineValidator, TestEngineValidatorException
+from ..models import TestDatasetModel, TestModelModel
+
+
+MAX_ERROR_MESSAGE_LENGTH = 2048
+
+# number of processes validating the uploaded files
+validation_workers = int(os.getenv("APIGW_VALIDATION_WORKERS", "2"))
+
+_lock = threading.Lock()
+_process_pool: Optional[ProcessPoolExecutor] = None
+# the jobs wait for the validation processes and update the database in these threads
+_job_pool = ThreadPoolExecutor(max_workers=validation_workers, thread_name_prefix="validation-job")
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _lock:
+        if _process_pool is None:
+            # spawn the processes so that they do not inherit the threads and database connections of the server
+            _process_pool = ProcessPoolExecutor(
+                max_workers=validation_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def _run_validation(fn, *args):
+    """Run the validation function in the process pool, restarting the pool if a validation process died"""
+    global _process_pool
+    pool = _get_process_pool()
+    try:
+        return pool.submit(fn, *args).result()
+    except TestEngineValidatorException:
+        raise
+    except Exception as e:
+        # e.g. BrokenProcessPool if the validation process ran out of memory
+        logger.error(f"Validation process error: {e}")
+        with _lock:
+            if _process_pool is pool and getattr(pool, "_broken", False):
+                pool.shutdown(wait=False)
+                _process_pool = None
+        raise TestEngineValidatorException(f"Validation error: {e}")
+
+
+def validate_dataset_job(dataset_id: int, validate_path: Path, save_path: Path, staging_dir: Path):
+    """Validate the staged dataset, save it to the file store and update the status of the test dataset"""
+    status = TestDatasetStatus.Invalid
+    error_message = None
+    try:
+        (data_format, serializer, num_rows, num_cols, data_columns) = _run_validation(
+            TestEngineValidator.validate_dataset, validate_path
+        )
+        zip_hash = fs_save_test_dataset(save_path)
+        status = TestDatasetStatus.Valid
+    except TestEngineValidatorException as e:
+        logger.debug(f"Dataset validation error: {e}")
+        error_message = str(e)
+    except Exception as e:
+        logger.error(f"Error saving dataset: {e}")
+        error_message = f"Error saving test dataset: {e}"
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    with SessionLocal() as session:
+        test_dataset = session.query(TestDatasetModel).filter(TestDatasetModel.id == dataset_id).first()
+        if test_dataset is None:
+            logger.warning(f"Test dataset {dataset_id} deleted before validation completed")
+            return
+        test_dataset.status = status
+        test_dataset.error_message = error_message[:MAX_ERROR_MESSAGE_LENGTH] if error_message else None
+        if status == TestDatasetStatus.Valid:
+            test_dataset.data_format = data_format
+            test_dataset.serializer = serializer
+            test_dataset.num_rows = num_rows
+            test_dataset.num_cols = num_cols
+            test_dataset.data_columns = json.dumps(data_columns).encode("utf-8")
+            test_dataset.zip_hash = zip_hash
+        test_dataset.updated_at = datetime.now(timezone.utc)
+        session.commit()
+    logger.info(f"Test dataset {dataset_id} validated with status {status}")
+
+
+def validate_model_job(model_id: int, validate_path: Path, save_path: Path, staging_dir: Path, is_pipeline: bool = False):
+    """Validate the staged model, save it to the file store and update the status of the test model"""
+    status = TestModelStatus.Invalid
+    error_message = None
+    try:
+        (model_format, serializer) = _run_validation(TestEngineValidator.validate_model, validate_path, is_pipeline)
+        zip_hash = fs_save_test_model(save_path)
+        status = TestModelStatus.Valid
+    except TestEngineValidatorException as e:
+        logger.debug(f"Model validation error: {e}")
+        error_message = str(e)
+    except Exception as e:
+        logger.error(f"Error saving model: {e}")
+        error_message = f"Error saving test model: {e}"
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    with SessionLocal() as session:
+        test_model = session.query(TestModelModel).filter(TestModelModel.id == model_id).first()
+        if test_model is None:
+            logger.warning(f"Test model {model_id} deleted before validation completed")
+            return
+        test_model.status = status
+        test_model.error_message = error_message[:MAX_ERROR_MESSAGE_LENGTH] if error_message else None
+        if status == TestModelStatus.Valid:
+            test_model.model_format = model_format
+            test_model.serializer = serializer
+            test_model.zip_hash = zip_hash
+        test_model.updated_at = datetime.now(timezone.utc)
+        session.commit()
+    logger.info(f"Test model {model_id} validated with status {status}")
+
+
+def fail_interrupted_validations():
+    """Set the datasets and models still pending validation to Invalid, as their jobs ended with the previous server"""
+    now = datetime.now(timezone.utc)
+    error_message = "Validation interrupted by server restart, please upload again"
+    with SessionLocal() as session:
+        session.query(TestDatasetModel).filter(TestDatasetModel.status == TestDatasetStatus.Pending).update(
+            {"status": TestDatasetStatus.Invalid, "error_message": error_message, "updated_at": now}
+        )
+        session.query(TestModelModel).filter(TestModelModel.status == TestModelStatus.Pending).update(
+            {"status": TestModelStatus.Invalid, "error_message": error_message, "updated_at": now}
+        )
+        session.commit()
+
+
+def _log_job_error(future: Future):
+    if future.exception() is not None:
+        logger.error(f"Validation job error: {future.exception()}")
+
+
+def submit_dataset_validation(dataset_id: int, validate_path: Path, save_path: Path, staging_dir: Path) -> Future:
+    """Submit the validation of a dataset uploaded to the staging folder. The staging folder is removed when done.
+
+    Args:
+        dataset_id (int): ID of the test dataset with status Pending
+        validate_path (Path): Path of the dataset file or folder to validate
+        save_path (Path): Path of the dataset file or folder to save to the file store
+        staging_dir (Path): Staging folder of the upload
+    """
+    future = _job_pool.submit(validate_dataset_job, dataset_id, validate_path, save_path, staging_dir)
+    future.add_done_callback(_log_job_error)
+    return future
+
+
+def submit_model_validation(
+    model_id: int, validate_path: Path, save_path: Path, staging_dir: Path, is_pipeline: bool = False
+) -> Future:
+    """Submit the validation of a model uploaded to the staging folder. The staging folder is removed when done.
+
+    Args:
+        model_id (int): ID of the test model with status Pending
+        validate_path (Path): Path of the model file or folder to validate
+        save_path (Path): Path of the model file or folder to save to the file store
+        staging_dir (Path): Staging folder of the upload
+        is_pipeline (bool): Whether the model is a pipeline
+    """
+    future = _job_pool.submit(validate_model_job, model_id, validate_path, save_path, staging_dir, is_pipeline)
+    future.add_done_callback(_log_job_error)
+    return future
@@ -25,9 +25,9 @@ class TestResultModel(BaseORMModel):
     version: Mapped[Optional[str]] = mapped_column(String(256))
     user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id"))
     user: Mapped[Optional["UserModel"]] = relationship()
-    model_id: Mapped[int] = mapped_column(ForeignKey("test_model.id"))
+    model_id: Mapped[int] = mapped_column(ForeignKey("test_model.id"), index=True)
     model: Mapped["TestModelModel"] = relationship()
-    test_dataset_id: Mapped[int] = mapped_column(ForeignKey("test_dataset.id"))
+    test_dataset_id: Mapped[int] = mapped_column(ForeignKey("test_dataset.id"), index=True)
     test_dataset: Mapped["TestDatasetModel"] = relationship(foreign_keys=[test_dataset_id])
     ground_truth_dataset_id: Mapped[int] = mapped_column(ForeignKey("test_dataset.id"))
     ground_truth_dataset: Mapped["TestDatasetModel"] = relationship(foreign_keys=[ground_truth_dataset_id])
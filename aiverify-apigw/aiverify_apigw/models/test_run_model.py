@@ -25,9 +25,9 @@ class TestRunModel(BaseORMModel):
     algorithm_id: Mapped[int] = mapped_column(ForeignKey("algorithm.id"))
     algorithm: Mapped["AlgorithmModel"] = relationship()
     algo_arguments: Mapped[bytes]  # serialized json, arguments pass as input to algo
-    model_id: Mapped[int] = mapped_column(ForeignKey("test_model.id"), nullable=False)
+    model_id: Mapped[int] = mapped_column(ForeignKey("test_model.id"), nullable=False, index=True)
     model: Mapped["TestModelModel"] = relationship()
-    test_dataset_id: Mapped[int] = mapped_column(ForeignKey("test_dataset.id"))
+    test_dataset_id: Mapped[int] = mapped_column(ForeignKey("test_dataset.id"), index=True)
     test_dataset: Mapped["TestDatasetModel"] = relationship(foreign_keys=[test_dataset_id])
     ground_truth_dataset_id: Mapped[Optional[int]] = mapped_column(ForeignKey("test_dataset.id"))
     ground_truth_dataset: Mapped["TestDatasetModel"] = relationship(foreign_keys=[ground_truth_dataset_id])
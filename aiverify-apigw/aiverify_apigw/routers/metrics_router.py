@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from typing import Any, Dict
+
+from ..lib.database import get_pool_metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/database")
+def read_database_metrics() -> Dict[str, Any]:
+    """
+    Endpoint to retrieve the status of the database connection pool and the counts of the pool events.
+    """
+    return get_pool_metrics()
@@ -10,6 +10,7 @@ from ..lib.database import get_db_session
 from ..lib.filestore import get_plugin_zip, get_plugin_algorithm_zip, backup_plugin, get_plugin_widgets_zip, get_plugin_inputs_zip, get_plugin_mdx_bundle
 from ..lib.plugin_store import PluginStore, PluginStoreException
 from ..lib.file_utils import sanitize_filename
+from .test_run_router import queue_algorithm_builds
 from ..schemas import PluginOutput
 from ..models import PluginModel, AlgorithmModel, WidgetModel, InputBlockModel
 
@@ -92,14 +93,12 @@ async def upload_plugin(file: UploadFile = File(), session: Session = Depends(ge
     """
     from pathlib import Path
     from zipfile import ZipFile
-    import io
     import tempfile
 
     if not file.filename or not file.filename.endswith(".zip"):
         raise HTTPException(status_code=400, detail="Invalid file format. Only .zip files are allowed.")
 
     try:
-        zip_contents = await file.read()
         # Save the uploaded file to a temporary location
         with tempfile.TemporaryDirectory() as temp_dirname:
             temp_root_dir = Path(temp_dirname)
@@ -107,7 +106,8 @@ async def upload_plugin(file: UploadFile = File(), session: Session = Depends(ge
 
             # unzip to temp dir
             # plugin_dir = temp_dir.joinpath(file.filename[:-4])
-            with ZipFile(io.BytesIO(zip_contents)) as zip_ref:
+            # the uploaded file is spooled to disk, so the zip is read from the file without loading it into memory
+            with ZipFile(file.file) as zip_ref:
                 zip_ref.extractall(temp_dir)  # Extract to a folder named after the zip file without extension
 
             if temp_dir.joinpath("plugin.meta.json").exists():
@@ -140,6 +140,7 @@ async def upload_plugin(file: UploadFile = File(), session: Session = Depends(ge
 
                 plugin = PluginStore.scan_algorithm_directory(algo_dir)
                 session.add(plugin)
+                queue_algorithm_builds(plugin.algorithms)
                 return PluginOutput.from_model(plugin)
             else:
                 # validate and read plugin
@@ -174,6 +175,7 @@ async def upload_plugin(file: UploadFile = File(), session: Session = Depends(ge
                     logger.debug(f"New plugin meta: {meta}")
                     # plugin = session.scalar(stmt)
                     session.add(plugin)
+                    queue_algorithm_builds(plugin.algorithms)
                     return PluginOutput.from_model(plugin)
                 except PluginStoreException as e:
                     logger.error(f"Error scanning plugin directory {plugin_dir}: {e}")
@@ -1,28 +1,96 @@
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, HTTPException, Request, Response, Depends
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from pathlib import Path
+from botocore.exceptions import ClientError
 
 from ..lib.logging import logger
-from ..lib.file_utils import check_valid_filename
-from ..lib.filestore import get_test_model as fs_get_test_model, get_test_dataset as fs_get_test_dataset
+from ..lib.database import get_db_session
+from ..lib.file_utils import check_valid_filename, COPY_CHUNK_SIZE
+from ..lib.filestore import (
+    get_test_model_download_path as fs_get_test_model_download_path,
+    get_test_dataset_download_path as fs_get_test_dataset_download_path,
+    open_s3_object as fs_open_s3_object,
+)
+from ..models import TestModelModel, TestDatasetModel
 
 router = APIRouter(prefix="/storage", tags=["storage"])
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check whether the If-None-Match header matches the ETag, using weak comparison"""
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def _download_response(request: Request, download_path: Path | str, filename: str, file_hash: str | None) -> Response:
+    """
+    Return the response to download the stored file, without reading the file into memory.
+
+    Local files are sent with FileResponse. S3 objects are streamed from the S3 response body. The ETag is the
+    stored hash of the file, so that clients can revalidate their cached copy with If-None-Match, and ranges are
+    supported so that interrupted downloads can be resumed.
+    """
+    if not filename.lower().endswith('.zip'):
+        media_type = "application/octet-stream"
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    else:
+        media_type = "application/zip"
+        headers = {"Content-Disposition": f'attachment; filename="{filename}.zip"'}
+
+    etag = f'"{file_hash}"' if file_hash else None
+    if etag:
+        headers["ETag"] = etag
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+    if isinstance(download_path, Path):
+        # handles Range and If-Range requests, and uses sendfile when supported by the server
+        return FileResponse(download_path, media_type=media_type, headers=headers)
+
+    byte_range = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if byte_range and if_range is not None and if_range != etag:
+        # the client copy has changed, send the whole file
+        byte_range = None
+    try:
+        s3_object = fs_open_s3_object(download_path, byte_range)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "InvalidRange":
+            raise HTTPException(status_code=416, detail="Requested range not satisfiable")
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            raise FileNotFoundError(f"File {filename} is not found")
+        raise
+    headers["Accept-Ranges"] = "bytes"
+    headers["Content-Length"] = str(s3_object["ContentLength"])
+    status_code = 200
+    if byte_range and "ContentRange" in s3_object:
+        headers["Content-Range"] = s3_object["ContentRange"]
+        status_code = 206
+    return StreamingResponse(
+        s3_object["Body"].iter_chunks(COPY_CHUNK_SIZE), status_code=status_code, media_type=media_type, headers=headers
+    )
+
+
 @router.get("/models/{filename}", response_class=Response)
-def download_test_model(filename: str):
+def download_test_model(filename: str, request: Request, session: Session = Depends(get_db_session)):
     """
     Endpoint to download a specific test model file by filename.
     """
     if not check_valid_filename(filename):
         raise HTTPException(status_code=400, detail="Invalid filename")
     try:
-        model_content = fs_get_test_model(filename)
-
-        if not filename.lower().endswith('.zip'):
-            headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-            return Response(content=model_content, media_type="application/octet-stream", headers=headers)
-        else:
-            headers = {"Content-Disposition": f'attachment; filename="{filename}.zip"'}
-            return Response(content=model_content, media_type="application/zip", headers=headers)
+        download_path = fs_get_test_model_download_path(filename)
+        file_hash = session.query(TestModelModel.zip_hash).filter(TestModelModel.filename == filename).limit(1).scalar()
+        return _download_response(request, download_path, filename, file_hash)
     except HTTPException:
         raise
     except FileNotFoundError:
@@ -30,28 +98,23 @@ def download_test_model(filename: str):
     except Exception as e:
         logger.error(f"Error downloading test model with filename {filename}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    
+
 
 @router.get("/datasets/{filename}", response_class=Response)
-def download_test_dataset(filename: str):
+def download_test_dataset(filename: str, request: Request, session: Session = Depends(get_db_session)):
     """
     Endpoint to download a specific test model file by filename.
     """
     if not check_valid_filename(filename):
         raise HTTPException(status_code=400, detail="Invalid filename")
     try:
-        model_content = fs_get_test_dataset(filename)
-
-        if not filename.lower().endswith('.zip'):
-            headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-            return Response(content=model_content, media_type="application/octet-stream", headers=headers)
-        else:
-            headers = {"Content-Disposition": f'attachment; filename="{filename}.zip"'}
-            return Response(content=model_content, media_type="application/zip", headers=headers)
+        download_path = fs_get_test_dataset_download_path(filename)
+        file_hash = session.query(TestDatasetModel.zip_hash).filter(TestDatasetModel.filename == filename).limit(1).scalar()
+        return _download_response(request, download_path, filename, file_hash)
     except HTTPException:
         raise
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Dataset file not found")
     except Exception as e:
         logger.error(f"Error downloading test dataset with filename {filename}: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
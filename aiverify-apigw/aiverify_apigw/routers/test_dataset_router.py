@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, UploadFile, Form, Depends, Response
-from typing import List, Annotated, Any
+from fastapi import APIRouter, HTTPException, UploadFile, Form, Depends, Response, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Annotated, Any, Optional
 from datetime import datetime, timezone
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 import tempfile
 import shutil
@@ -9,12 +11,14 @@ from pathlib import Path, PurePath
 
 from ..lib.logging import logger
 from ..lib.constants import TestDatasetFileType, TestDatasetStatus
-from ..lib.file_utils import check_valid_filename, check_file_size
+from ..lib.file_utils import check_valid_filename, check_file_size, COPY_CHUNK_SIZE
 from ..lib.filestore import save_test_dataset as fs_save_test_dataset, get_test_dataset as fs_get_test_dataset, delete_test_dataset as fs_delete_test_dataset
 from ..lib.database import get_db_session
+from ..lib.pagination import paginate, InvalidCursorError, NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
 from ..schemas.test_dataset import TestDataset, TestDatasetUpdate
 from ..models import TestDatasetModel, TestResultModel
 from ..lib.test_engine import TestEngineValidator, TestEngineValidatorException
+from ..lib.validation_jobs import submit_dataset_validation
 
 router = APIRouter(prefix="/test_datasets", tags=["test_datasets"])
 
@@ -32,77 +36,61 @@ async def upload_dataset_files(
     if len(files) == 0:
         raise HTTPException(status_code=400, detail="No file upload")
 
-    # validate all the models first
+    # write the files to staging folders, the datasets are validated in background jobs
+    staging_dirs: List[Path] = []
     try:
         model_list: List[TestDatasetModel] = []
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            with session.begin():
-                tmpdir = Path(tmpdirname)
-                for index, file in enumerate(files):
-                    if not file.filename or not file.size:
-                        raise HTTPException(status_code=400, detail=f"Invalid File")
-                    if not check_valid_filename(file.filename):
-                        raise HTTPException(status_code=400, detail=f"Invalid filename {file.filename}")
-                    if not check_file_size(file.size):
-                        raise HTTPException(status_code=400, detail=f"File {file.filename} exceeds maximum upload size")
-
-                    # check for duplicate filenames
-                    filename = file.filename
-                    filepath = PurePath(filename)
-                    file_counter = 1
-                    while session.query(TestDatasetModel).filter(TestDatasetModel.filename == filename).count() > 0:
-                        filename = f"{filepath.stem}_{file_counter}{filepath.suffix}"
-                        file_counter = file_counter + 1
-
-                    dataset_path = tmpdir.joinpath(filename)
-                    now = datetime.now(timezone.utc)
-                    with open(dataset_path, "wb") as fp:
-                        fp.write(file.file.read())
-                    test_dataset = TestDatasetModel(
-                        name=filename,
-                        description=None,
-                        file_type=TestDatasetFileType.File,
-                        filename=filename,
-                        size=file.size,
-                        created_at=now,
-                        updated_at=now
-                    )
-                    try:
-                        (data_format, serializer, num_rows, num_cols,
-                         dataColumns) = TestEngineValidator.validate_dataset(dataset_path)
-                        test_dataset.status = TestDatasetStatus.Valid
-                        test_dataset.data_format = data_format
-                        test_dataset.serializer = serializer
-                        test_dataset.num_rows = num_rows
-                        test_dataset.num_cols = num_cols
-                        test_dataset.data_columns = json.dumps(dataColumns).encode("utf-8")
-                    except TestEngineValidatorException as e:
-                        logger.debug(f"Dataset validation error: {e}")
-                        test_dataset.status = TestDatasetStatus.Invalid
-                        test_dataset.error_message = str(e)
-                        raise HTTPException(status_code=400, detail=f"Unsupported Dataset")
-
-                    if test_dataset.status == TestDatasetStatus.Valid:
-                        try:
-                            filehash = fs_save_test_dataset(dataset_path)
-                        except Exception as e:
-                            # if save error, set dataset to invalid
-                            logger.error(f"Error saving dataset file: {e}")
-                            test_dataset.status = TestDatasetStatus.Invalid
-                            test_dataset.error_message = f"Error saving test dataset to file: {e}"
-                            raise HTTPException(status_code=400, detail=f"Error saving test dataset files")
-                        else:
-                            logger.debug(f"filehash: {filehash}")
-                            test_dataset.zip_hash = filehash
-
-                        model_list.append(test_dataset)
-                        session.add(test_dataset)
+        dataset_paths: List[Path] = []
+        with session.begin():
+            for index, file in enumerate(files):
+                if not file.filename or not file.size:
+                    raise HTTPException(status_code=400, detail=f"Invalid File")
+                if not check_valid_filename(file.filename):
+                    raise HTTPException(status_code=400, detail=f"Invalid filename {file.filename}")
+                if not check_file_size(file.size):
+                    raise HTTPException(status_code=400, detail=f"File {file.filename} exceeds maximum upload size")
+
+                # check for duplicate filenames
+                filename = file.filename
+                filepath = PurePath(filename)
+                file_counter = 1
+                while session.query(TestDatasetModel).filter(TestDatasetModel.filename == filename).count() > 0:
+                    filename = f"{filepath.stem}_{file_counter}{filepath.suffix}"
+                    file_counter = file_counter + 1
+
+                # the staging folder is removed when the validation is done
+                staging_dir = Path(tempfile.mkdtemp(prefix="aiverify-dataset-"))
+                staging_dirs.append(staging_dir)
+                dataset_path = staging_dir.joinpath(filename)
+                now = datetime.now(timezone.utc)
+                with open(dataset_path, "wb") as fp:
+                    await run_in_threadpool(shutil.copyfileobj, file.file, fp, COPY_CHUNK_SIZE)
+                test_dataset = TestDatasetModel(
+                    name=filename,
+                    description=None,
+                    file_type=TestDatasetFileType.File,
+                    filename=filename,
+                    size=file.size,
+                    status=TestDatasetStatus.Pending,
+                    created_at=now,
+                    updated_at=now
+                )
+                model_list.append(test_dataset)
+                dataset_paths.append(dataset_path)
+                session.add(test_dataset)
+
+        for test_dataset, dataset_path in zip(model_list, dataset_paths):
+            submit_dataset_validation(test_dataset.id, dataset_path, dataset_path, dataset_path.parent)
 
         return [TestDataset.from_model(dataset) for dataset in model_list]
 
     except HTTPException:
+        for staging_dir in staging_dirs:
+            shutil.rmtree(staging_dir, ignore_errors=True)
         raise
     except Exception as e:
+        for staging_dir in staging_dirs:
+            shutil.rmtree(staging_dir, ignore_errors=True)
         logger.error(f"Error uploading dataset files: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -180,7 +168,7 @@ def upload_dataset_folder(
                 except ValueError:
                     raise HTTPException(status_code=400, detail=f"Invalid filename {file.filename}")
                 with open(dataset_path, "wb") as fp:
-                    fp.write(file.file.read())
+                    shutil.copyfileobj(file.file, fp, COPY_CHUNK_SIZE)
                 total_size += file.size
 
             now = datetime.now(timezone.utc)
@@ -241,13 +229,29 @@ def upload_dataset_folder(
 
 
 @router.get("/", response_model=List[TestDataset])
-def list_datasets(session: Session = Depends(get_db_session)):
+def list_datasets(
+    response: Response,
+    status: Optional[TestDatasetStatus] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_db_session),
+):
     """
-    Endpoint to return a list of TestDataset.
+    Endpoint to return a list of TestDataset, optionally filtered by status.
+
+    If limit is set, at most limit datasets are returned and the cursor of the next page is returned in the
+    X-Next-Cursor header.
     """
     try:
-        datasets = session.query(TestDatasetModel).all()
+        stmt = select(TestDatasetModel)
+        if status is not None:
+            stmt = stmt.where(TestDatasetModel.status == status)
+        datasets, next_cursor = paginate(session, stmt, TestDatasetModel.id, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return [TestDataset.from_model(dataset) for dataset in datasets]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving dataset list: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, UploadFile, Form, Depends, Response
-from typing import List, Annotated, Any, Literal
+from fastapi import APIRouter, HTTPException, UploadFile, Form, Depends, Response, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Annotated, Any, Optional, Literal
 from datetime import datetime, timezone
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 import tempfile
 import shutil
@@ -8,12 +10,14 @@ from pathlib import Path, PurePath
 
 from ..lib.logging import logger
 from ..lib.constants import ModelType, TestModelMode, TestModelFileType, TestModelStatus
-from ..lib.file_utils import check_valid_filename, check_file_size
+from ..lib.file_utils import check_valid_filename, check_file_size, COPY_CHUNK_SIZE
 from ..lib.filestore import save_test_model as fs_save_test_model, delete_test_model as fs_delete_test_model, get_test_model as fs_get_test_model
 from ..lib.database import get_db_session
+from ..lib.pagination import paginate, InvalidCursorError, NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
 from ..schemas import TestModel, TestModelUpdate, load_examples
 from ..models import TestModelModel, TestResultModel
 from ..lib.test_engine import TestEngineValidator, TestEngineValidatorException
+from ..lib.validation_jobs import submit_model_validation
 
 router = APIRouter(prefix="/test_models", tags=["test_models"])
 
@@ -52,78 +56,64 @@ async def upload_model_files(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error validating form data: {e}")
 
-    # validate all the models first
+    # write the files to staging folders, the models are validated in background jobs
+    staging_dirs: List[Path] = []
     try:
         model_list: List[TestModelModel] = []
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            with session.begin():
-                tmpdir = Path(tmpdirname)
-                for index, file in enumerate(files):
-                    if not file.filename or not file.size:
-                        raise HTTPException(status_code=400, detail=f"Invalid File")
-                    if not check_valid_filename(file.filename):
-                        raise HTTPException(status_code=400, detail=f"Invalid filename {file.filename}")
-                    if not check_file_size(file.size):
-                        raise HTTPException(status_code=400, detail=f"File {file.filename} exceeds maximum upload size")
-
-                    # check for duplicate filenames
-                    filename = file.filename
-                    filepath = PurePath(filename)
-                    file_counter = 1
-                    while session.query(TestModelModel).filter(TestModelModel.filename == filename).count() > 0:
-                        filename = f"{filepath.stem}_{file_counter}{filepath.suffix}"
-                        file_counter = file_counter + 1
-
-                    model_path = tmpdir.joinpath(filename)
-                    now = datetime.now(timezone.utc)
-                    with open(model_path, "wb") as fp:
-                        fp.write(file.file.read())
-                    test_model = TestModelModel(
-                        name=filename,
-                        description=None,
-                        mode=TestModelMode.Upload,
-                        model_type=model_types_list[index],
-                        file_type=TestModelFileType.File,
-                        filename=filename,
-                        size=file.size,
-                        # status=TestModelStatus.Pending,
-                        # errorMessages=None,
-                        created_at=now,
-                        updated_at=now
-                    )
-                    try:
-                        (model_format, serializer) = TestEngineValidator.validate_model(model_path)
-                        test_model.status = TestModelStatus.Valid
-                        test_model.model_format = model_format
-                        test_model.serializer = serializer
-                    except TestEngineValidatorException as e:
-                        logger.debug(f"Model validation error: {e}")
-                        test_model.status = TestModelStatus.Invalid
-                        test_model.error_message = str(e)
-                        raise HTTPException(status_code=400, detail=f"Unsupported Model Files")
-
-                    if test_model.status == TestModelStatus.Valid:
-                        try:
-                            filehash = fs_save_test_model(model_path)
-                        except Exception as e:
-                            # if save error, set model to invalid
-                            logger.error(f"Error saving model file: {e}")
-                            test_model.status = TestModelStatus.Invalid
-                            test_model.error_message = f"Error saving test model to file: {e}"
-                            raise HTTPException(status_code=400, detail=f"Error saving model files")
-                        else:
-                            logger.debug(f"filehash: {filehash}")
-                            test_model.zip_hash = filehash
-
-                        model_list.append(test_model)
-                        session.add(test_model)
+        model_paths: List[Path] = []
+        with session.begin():
+            for index, file in enumerate(files):
+                if not file.filename or not file.size:
+                    raise HTTPException(status_code=400, detail=f"Invalid File")
+                if not check_valid_filename(file.filename):
+                    raise HTTPException(status_code=400, detail=f"Invalid filename {file.filename}")
+                if not check_file_size(file.size):
+                    raise HTTPException(status_code=400, detail=f"File {file.filename} exceeds maximum upload size")
+
+                # check for duplicate filenames
+                filename = file.filename
+                filepath = PurePath(filename)
+                file_counter = 1
+                while session.query(TestModelModel).filter(TestModelModel.filename == filename).count() > 0:
+                    filename = f"{filepath.stem}_{file_counter}{filepath.suffix}"
+                    file_counter = file_counter + 1
+
+                # the staging folder is removed when the validation is done
+                staging_dir = Path(tempfile.mkdtemp(prefix="aiverify-model-"))
+                staging_dirs.append(staging_dir)
+                model_path = staging_dir.joinpath(filename)
+                now = datetime.now(timezone.utc)
+                with open(model_path, "wb") as fp:
+                    await run_in_threadpool(shutil.copyfileobj, file.file, fp, COPY_CHUNK_SIZE)
+                test_model = TestModelModel(
+                    name=filename,
+                    description=None,
+                    mode=TestModelMode.Upload,
+                    model_type=model_types_list[index],
+                    file_type=TestModelFileType.File,
+                    filename=filename,
+                    size=file.size,
+                    status=TestModelStatus.Pending,
+                    created_at=now,
+                    updated_at=now
+                )
+                model_list.append(test_model)
+                model_paths.append(model_path)
+                session.add(test_model)
+
+        for test_model, model_path in zip(model_list, model_paths):
+            submit_model_validation(test_model.id, model_path, model_path, model_path.parent)
 
         return [TestModel.from_model(model) for model in model_list]
 
     except HTTPException:
+        for staging_dir in staging_dirs:
+            shutil.rmtree(staging_dir, ignore_errors=True)
         raise
 
     except Exception as e:
+        for staging_dir in staging_dirs:
+            shutil.rmtree(staging_dir, ignore_errors=True)
         logger.error(f"Error uploading model files: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -203,7 +193,7 @@ def upload_folder(
                 except ValueError:
                     raise HTTPException(status_code=400, detail=f"Invalid filename {file.filename}")
                 with open(model_path, "wb") as fp:
-                    fp.write(file.file.read())
+                    shutil.copyfileobj(file.file, fp, COPY_CHUNK_SIZE)
                 total_size += file.size
 
             now = datetime.now(timezone.utc)
@@ -264,13 +254,29 @@ def upload_folder(
 
 
 @router.get("/", response_model=List[TestModel])
-def list_test_models(session: Session = Depends(get_db_session)):
+def list_test_models(
+    response: Response,
+    status: Optional[TestModelStatus] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_db_session),
+):
     """
-    Endpoint to list all test models.
+    Endpoint to list all test models, optionally filtered by status.
+
+    If limit is set, at most limit test models are returned and the cursor of the next page is returned in the
+    X-Next-Cursor header.
     """
     try:
-        test_models = session.query(TestModelModel).all()
+        stmt = select(TestModelModel)
+        if status is not None:
+            stmt = stmt.where(TestModelModel.status == status)
+        test_models, next_cursor = paginate(session, stmt, TestModelModel.id, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return [TestModel.from_model(model) for model in test_models]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving test models: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,13 +1,12 @@
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, UploadFile, Form, Depends, Response, Request, File
-from typing import List, Annotated, Any
+from fastapi import APIRouter, HTTPException, UploadFile, Form, Depends, Response, Request, File, Query
+from typing import List, Annotated, Any, Iterator, Mapping, Optional
 import json
 import zipfile
-import io
 import os
 from starlette.formparsers import MultiPartParser
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer, selectinload
 from pathlib import PurePath
 from jsonschema import validate
 from uuid import UUID
@@ -18,7 +17,8 @@ from ..lib.constants import TestDatasetFileType, TestDatasetStatus, TestModelMod
 from ..lib.filestore import save_artifact, get_artifact
 from ..lib.utils import guess_mimetype_from_filename
 from ..lib.file_utils import get_suffix, check_valid_filename
-from ..schemas import TestResult, TestResultOutput, TestResultUpdate
+from ..lib.pagination import paginate, InvalidCursorError, NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
+from ..schemas import TestResult, TestResultOutput, TestResultSummary, TestResultUpdate
 from ..models import AlgorithmModel, TestModelModel, TestResultModel, TestDatasetModel, TestArtifactModel, TestRunModel
 
 router = APIRouter(prefix="/test_results", tags=["test_result"])
@@ -32,7 +32,7 @@ test_result_examples = load_examples("test_result_examples.json")
 #     return {"message": "List of test results"}
 
 
-async def _save_test_result(session: Session, test_result: TestResult, artifact_set: dict[str, UploadFile], test_run_id: str | None = None):
+async def _save_test_result(session: Session, test_result: TestResult, artifact_set: Mapping[str, UploadFile], test_run_id: str | None = None):
     # find algorithm
     stmt = (
         select(AlgorithmModel).where(AlgorithmModel.gid == test_result.gid).where(AlgorithmModel.cid == test_result.cid)
@@ -170,8 +170,7 @@ async def _save_test_result(session: Session, test_result: TestResult, artifact_
                 logger.warn(f"Invalid artifact filename {filename}, skipping")
                 raise HTTPException(status_code=400, detail=f"Invalid artifact filename in result output: {filename}")
             artifact_file = artifact_set[filename]
-            data = artifact_file.file.read()
-            save_artifact(test_result_id, filename, data)
+            save_artifact(test_result_id, filename, artifact_file.file)
             artifact = TestArtifactModel(
                 filename=filename,
                 suffix=get_suffix(filename),
@@ -254,6 +253,34 @@ async def upload_test_result(
     return all_urls
 
 
+class ZipArtifactSet(Mapping[str, UploadFile]):
+    """Artifacts in a folder of a zip file, keyed by the filename relative to the folder.
+
+    Each artifact is opened from the zip file when it is looked up, so that it is streamed to the
+    file store without extracting the other artifacts.
+    """
+
+    def __init__(self, zip_ref: zipfile.ZipFile, foldername: str, exclude: str):
+        self.zip_ref = zip_ref
+        self.zip_infos = {
+            zip_info.filename[len(foldername):]: zip_info  # remove foldername
+            for zip_info in zip_ref.infolist()
+            if zip_info.filename.startswith(foldername) and zip_info.filename != exclude and not zip_info.is_dir()
+        }
+
+    def __getitem__(self, filename: str) -> UploadFile:
+        return UploadFile(filename=filename, file=self.zip_ref.open(self.zip_infos[filename]))  # type: ignore
+
+    def __contains__(self, filename: object) -> bool:
+        return filename in self.zip_infos
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.zip_infos)
+
+    def __len__(self) -> int:
+        return len(self.zip_infos)
+
+
 @router.post("/upload_zip")
 async def upload_zip_file(file: UploadFile, session: Session = Depends(get_db_session)) -> List[str]:
     """Endpoint to upload a zip file containing test results and artifacts"""
@@ -262,9 +289,8 @@ async def upload_zip_file(file: UploadFile, session: Session = Depends(get_db_se
 
     RESULT_FILENAME = "results.json"
     try:
-        # Read the zip file
-        zip_bytes = await file.read()
-        with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as zip_ref:
+        # Read the zip file from the spooled upload file, large uploads are spooled to disk and not read into memory
+        with zipfile.ZipFile(file.file, "r") as zip_ref:
             # Check if results.json exists in the zip
             if RESULT_FILENAME in zip_ref.namelist():
                 result_filenames = [RESULT_FILENAME]
@@ -286,32 +312,18 @@ async def upload_zip_file(file: UploadFile, session: Session = Depends(get_db_se
             all_urls = []
             for result_filename in result_filenames:
                 p = PurePath(result_filename)
-                if len(p.parts) == 1:
-                    foldername = ""
-                    zip_infos = zip_ref.infolist()
-                else:
-                    foldername = f"{p.parts[0]}/"
-                    zip_infos = list(filter(lambda x: x.filename.startswith(foldername), zip_ref.infolist()))
+                foldername = "" if len(p.parts) == 1 else f"{p.parts[0]}/"
 
-                artifact_set = {}
-                for zip_info in zip_infos:
-                    # Read results.json
-                    try:
-                        with zip_ref.open(result_filename) as results_file:
-                            results_data = json.load(results_file)
-                    except:
-                        raise HTTPException(status_code=400, detail=f"Unable to load {result_filename}")
-
-                    # Extract artifacts
-                    for zip_info in zip_infos:
-                        if zip_info.filename != result_filename and zip_info.filename != foldername:
-                            with zip_ref.open(zip_info) as artifact_file:
-                                filename = zip_info.filename[len(foldername):]  # remove foldername
-                                artifact_set[filename] = UploadFile(
-                                    filename=filename, file=io.BytesIO(artifact_file.read())
-                                )
-
-                logger.debug(f"artifact_set: {artifact_set}")
+                # Read results.json
+                try:
+                    with zip_ref.open(result_filename) as results_file:
+                        results_data = json.load(results_file)
+                except:
+                    raise HTTPException(status_code=400, detail=f"Unable to load {result_filename}")
+
+                # the artifacts are extracted when saved, so that each artifact is read once
+                artifact_set = ZipArtifactSet(zip_ref, foldername, exclude=result_filename)
+                logger.debug(f"artifact_set: {len(artifact_set)} artifacts")
 
                 if isinstance(results_data, dict):
                     result_dicts = [results_data]
@@ -385,14 +397,49 @@ async def get_test_result_artifact(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+def _select_test_results(
+    gid: Optional[str], cid: Optional[str], model_id: Optional[int], test_dataset_id: Optional[int]
+):
+    """Select the test results matching the filters, loading the related rows in bulk"""
+    stmt = select(TestResultModel).options(
+        selectinload(TestResultModel.model),
+        selectinload(TestResultModel.test_dataset),
+        selectinload(TestResultModel.ground_truth_dataset),
+        selectinload(TestResultModel.artifacts),
+    )
+    if gid is not None:
+        stmt = stmt.where(TestResultModel.gid == gid)
+    if cid is not None:
+        stmt = stmt.where(TestResultModel.cid == cid)
+    if model_id is not None:
+        stmt = stmt.where(TestResultModel.model_id == model_id)
+    if test_dataset_id is not None:
+        stmt = stmt.where(TestResultModel.test_dataset_id == test_dataset_id)
+    return stmt
+
+
 @router.get("/", response_model=List[TestResultOutput])
-async def read_test_results(session: Session = Depends(get_db_session)) -> List[TestResultOutput]:
+async def read_test_results(
+    response: Response,
+    gid: Optional[str] = None,
+    cid: Optional[str] = None,
+    model_id: Optional[int] = None,
+    test_dataset_id: Optional[int] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_db_session),
+) -> List[TestResultOutput]:
     """
-    Endpoint to retrieve all test results.
+    Endpoint to retrieve the test results, optionally filtered by algorithm, model and test dataset.
+
+    If limit is set, at most limit results are returned and the cursor of the next page is returned in the
+    X-Next-Cursor header.
     """
     try:
-        stmt = select(TestResultModel)
-        test_results = session.scalars(stmt).all()
+        stmt = _select_test_results(gid, cid, model_id, test_dataset_id)
+        test_results, next_cursor = paginate(session, stmt, TestResultModel.id, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         ar = []
         for result in test_results:
             obj = TestResultOutput.from_model(result)
@@ -400,11 +447,43 @@ async def read_test_results(session: Session = Depends(get_db_session)) -> List[
         return ar
     except HTTPException as e:
         raise e
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving test results: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/summary", response_model=List[TestResultSummary])
+async def read_test_result_summaries(
+    response: Response,
+    gid: Optional[str] = None,
+    cid: Optional[str] = None,
+    model_id: Optional[int] = None,
+    test_dataset_id: Optional[int] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_db_session),
+) -> List[TestResultSummary]:
+    """
+    Endpoint to retrieve the summaries of the test results, without the algorithm arguments and output.
+    Filters and pagination are the same as for the list of test results.
+    """
+    try:
+        stmt = _select_test_results(gid, cid, model_id, test_dataset_id).options(
+            defer(TestResultModel.algo_arguments), defer(TestResultModel.output)
+        )
+        test_results, next_cursor = paginate(session, stmt, TestResultModel.id, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return [TestResultSummary.from_model(result) for result in test_results]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error retrieving test result summaries: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/{test_result_id}", response_model=TestResultOutput)
 async def read_test_result(test_result_id: int, session: Session = Depends(get_db_session)) -> TestResultOutput:
     """
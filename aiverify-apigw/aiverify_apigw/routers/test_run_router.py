@@ -1,25 +1,29 @@
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 import os
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 import valkey
 import json
 from uuid import UUID
-from typing import List
+from typing import List, Annotated, Optional
 
 from ..lib.logging import logger
 from ..lib.database import get_db_session
-from ..lib.constants import TestModelMode, TestRunStatus
+from ..lib.constants import TestModelMode, TestModelStatus, TestDatasetStatus, TestRunStatus
 from ..lib.utils import validate_json_schema
+from ..lib.pagination import paginate, InvalidCursorError, NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
+from ..lib.task_scheduler import (
+    TASK_STREAM_NAME, TASK_GROUP_NAME, TASK_STREAMS_KEY, DEFAULT_TENANT,
+    estimate_task_cost, get_task_priority, get_task_stream, make_job_id, parse_job_id
+)
 from ..schemas import TestRunInput, TestRunOutput, TestRunStatusUpdate
-from ..models import TestRunModel, TestModelModel, AlgorithmModel, TestDatasetModel
+from ..models import TestRunModel, TestModelModel, AlgorithmModel, TestDatasetModel, ProjectModel, TestResultModel
 
 router = APIRouter(prefix="/test_runs", tags=["test_run"])
 
 
 # create valkey client
-TASK_STREAM_NAME = "aiverify:worker:task_queue"
-TASK_GROUP_NAME = "aiverify_workers"
 host = os.getenv("VALKEY_HOST_ADDRESS", "127.0.0.1")
 try:
     port = int(os.getenv("VALKEY_PORT", "6379"))
@@ -29,6 +33,7 @@ client = valkey.Valkey(host=host, port=port, db=0)
 # client.ping()
 
 _group_init_flag: bool = True
+_task_streams: set[str] = set()  # task streams created by this process
 
 
 def _check_server_active():
@@ -62,6 +67,37 @@ def init_group():
         pass
 
 
+def init_task_stream(stream: str, lane: str):
+    """Create the consumer group of the task stream and register the stream for the workers to read"""
+    from valkey.exceptions import ResponseError
+    if stream in _task_streams:
+        return
+    try:
+        # the group is created from the start of the stream, so that tasks queued before the group exists are read
+        client.xgroup_create(name=stream, groupname=TASK_GROUP_NAME, id="0", mkstream=True)
+        logger.info(f"Created STREAM {stream}")
+    except ResponseError:
+        pass
+    client.hset(TASK_STREAMS_KEY, stream, lane)
+    _task_streams.add(stream)
+
+
+def queue_algorithm_builds(algorithms: List[AlgorithmModel]):
+    """Queue build tasks so that the workers build the algorithm environments before the first test run."""
+    if len(algorithms) == 0 or not _check_server_active():
+        return
+    for algo in algorithms:
+        build = {
+            "algorithmGID": algo.gid,
+            "algorithmCID": algo.cid,
+            "algorithmHash": algo.zip_hash,
+        }
+        try:
+            client.xadd(TASK_STREAM_NAME, fields={"build": json.dumps(build)})  # type: ignore
+        except Exception as e:
+            logger.warning(f"Unable to queue build for algorithm {algo.gid}:{algo.cid}: {e}")
+
+
 @router.post("/server_active")
 async def server_active() -> bool:
     return _check_server_active()
@@ -95,6 +131,8 @@ async def run_test(input_data: TestRunInput, session: Session = Depends(get_db_s
             raise HTTPException(status_code=400, detail="Currently only support Upload model models")
         if model.size is None or model.size == 0:
             raise HTTPException(status_code=400, detail="Model file not uploaded")
+        if model.status != TestModelStatus.Valid:
+            raise HTTPException(status_code=400, detail=f"Model status is {model.status}")
         
     test_dataset = session.query(TestDatasetModel).filter(TestDatasetModel.filename == input_data.testDatasetFilename).first()
     if test_dataset is None:
@@ -103,6 +141,8 @@ async def run_test(input_data: TestRunInput, session: Session = Depends(get_db_s
         # check if test dataset has uploaded file
         if test_dataset.size is None or test_dataset.size == 0:
             raise HTTPException(status_code=400, detail="Test Dataset file not uploaded")
+        if test_dataset.status != TestDatasetStatus.Valid:
+            raise HTTPException(status_code=400, detail=f"Test dataset status is {test_dataset.status}")
     
     ground_truth_dataset = None
     if input_data.groundTruthDatasetFilename:
@@ -113,6 +153,16 @@ async def run_test(input_data: TestRunInput, session: Session = Depends(get_db_s
             # check if test dataset has uploaded file
             if ground_truth_dataset.size is None or ground_truth_dataset.size == 0:
                 raise HTTPException(status_code=400, detail="Ground truth dataset file not uploaded")
+            if ground_truth_dataset.status != TestDatasetStatus.Valid:
+                raise HTTPException(status_code=400, detail=f"Ground truth dataset status is {ground_truth_dataset.status}")
+
+    # test runs of each project share the workers fairly with the other projects
+    tenant = DEFAULT_TENANT
+    if input_data.projectId is not None:
+        project = session.query(ProjectModel).filter(ProjectModel.id == input_data.projectId).first()
+        if project is None:
+            raise HTTPException(status_code=404, detail="Project not found with the provided projectId")
+        tenant = f"project-{project.id}"
             
     # create new TestRunModel and save to DB
     now = datetime.now(timezone.utc)
@@ -143,18 +193,24 @@ async def run_test(input_data: TestRunInput, session: Session = Depends(get_db_s
         "modelType": model.model_type.value.lower(),
         "testDataset": test_dataset.filename,
         "testDatasetHash": test_dataset.zip_hash,
-
     }
     if ground_truth_dataset:
         task["groundTruthDataset"] = ground_truth_dataset.filename
         task["groundTruthDatasetHash"] = ground_truth_dataset.zip_hash
         task["groundTruth"] = input_data.groundTruth
 
+    cost = estimate_task_cost(algo, test_dataset)
+    priority = get_task_priority(cost, input_data.priority)
+    task["estimatedCost"] = cost
+    task["priority"] = priority.value
+
     task_str = json.dumps(task)
     logger.debug(f"Add new Task: {task_str}")
 
-    resp = client.xadd(TASK_STREAM_NAME, fields={"task": task_str}) # type: ignore
-    test_run.job_id = resp # type: ignore
+    stream = get_task_stream(priority, tenant)
+    init_task_stream(stream, priority.value)
+    resp = client.xadd(stream, fields={"task": task_str}) # type: ignore
+    test_run.job_id = make_job_id(stream, resp) # type: ignore
     logger.debug(f"XADD response {test_run.job_id}")
 
     session.commit()
@@ -163,8 +219,53 @@ async def run_test(input_data: TestRunInput, session: Session = Depends(get_db_s
 
 
 @router.get("/", response_model=List[TestRunOutput])
-def list_test_runs(session: Session = Depends(get_db_session)) -> List[TestRunOutput]:
-    test_runs = session.query(TestRunModel).all()
+def list_test_runs(
+    response: Response,
+    status: Optional[TestRunStatus] = None,
+    gid: Optional[str] = None,
+    cid: Optional[str] = None,
+    model_id: Optional[int] = None,
+    test_dataset_id: Optional[int] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_db_session),
+) -> List[TestRunOutput]:
+    """
+    Endpoint to list the test runs, optionally filtered by status, algorithm, model and test dataset.
+
+    If limit is set, at most limit test runs are returned and the cursor of the next page is returned in the
+    X-Next-Cursor header.
+    """
+    stmt = select(TestRunModel).options(
+        selectinload(TestRunModel.model),
+        selectinload(TestRunModel.algorithm),
+        selectinload(TestRunModel.test_dataset),
+        selectinload(TestRunModel.ground_truth_dataset),
+        selectinload(TestRunModel.test_result).options(
+            selectinload(TestResultModel.model),
+            selectinload(TestResultModel.test_dataset),
+            selectinload(TestResultModel.ground_truth_dataset),
+            selectinload(TestResultModel.artifacts),
+        ),
+    )
+    if status is not None:
+        stmt = stmt.where(TestRunModel.status == status)
+    if gid is not None or cid is not None:
+        stmt = stmt.join(TestRunModel.algorithm)
+        if gid is not None:
+            stmt = stmt.where(AlgorithmModel.gid == gid)
+        if cid is not None:
+            stmt = stmt.where(AlgorithmModel.cid == cid)
+    if model_id is not None:
+        stmt = stmt.where(TestRunModel.model_id == model_id)
+    if test_dataset_id is not None:
+        stmt = stmt.where(TestRunModel.test_dataset_id == test_dataset_id)
+    try:
+        test_runs, next_cursor = paginate(session, stmt, TestRunModel.id, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [TestRunOutput.from_model(test_run) for test_run in test_runs]
 
 
@@ -214,7 +315,7 @@ def cancel_test_run(test_run_id: str, session: Session = Depends(get_db_session)
         raise HTTPException(status_code=400, detail="Only pending test runs can be cancelled")
     
     if test_run.job_id:
-        client.xdel(TASK_STREAM_NAME, test_run.job_id)
+        client.xdel(*parse_job_id(test_run.job_id))
 
     test_run.status = TestRunStatus.Cancelled
     test_run.updated_at = datetime.now(timezone.utc)
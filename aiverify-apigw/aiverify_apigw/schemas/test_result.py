@@ -113,5 +113,46 @@ class TestResultOutput(TestResult):
         return obj
 
 
+class TestResultSummary(MyBaseModel):
+    id: int  # test_result_id
+    name: str  # name
+    gid: str = Field(description="Unique global identifier for the plugin")
+    cid: str = Field(description="Unique identifier for the algorithm within the plugin")
+    version: Optional[str] = Field(default=None, description="Algorithm version")
+    startTime: datetime = Field(description="Start date time of test", strict=False)
+    timeTaken: float = Field(description="Time taken to complete running the test in seconds.")
+    mode: Literal["upload", "api"] = Field(description="Mode of model used, upload for model file and api for model api")
+    modelType: Literal["classification", "regression"] = Field(description="AI model type")
+    modelFile: Optional[str] = Field(default=None, description="URI of model file")
+    testDataset: str = Field(description="URI of test dataset")
+    groundTruthDataset: Optional[str] = Field(default=None, description="URI of test dataset")
+    groundTruth: Optional[str] = Field(default=None, description="Ground truth column name")
+    artifacts: Optional[List[str]] = Field(default=None, description="List the test artifacts produced by the algorithm")
+    created_at: Optional[datetime] = Field(default=None, strict=False)
+    updated_at: Optional[datetime] = Field(default=None, strict=False)
+
+    @classmethod
+    def from_model(cls, result: TestResultModel) -> "TestResultSummary":
+        """Summary of the test result, without the algorithm arguments and output so that they need not be loaded"""
+        return cls(
+            id=result.id,
+            name=result.name,
+            gid=result.gid,
+            cid=result.cid,
+            version=result.version,
+            startTime=result.start_time,
+            timeTaken=result.time_taken,
+            mode="api" if result.model.mode == TestModelMode.API else "upload",
+            modelType="regression" if result.model.model_type == ModelType.Regression else "classification",
+            modelFile=result.model.filename,
+            testDataset=result.test_dataset.filename,
+            groundTruthDataset=result.ground_truth_dataset.filename if result.ground_truth_dataset else None,
+            groundTruth=result.ground_truth,
+            artifacts=[artifact.filename for artifact in result.artifacts],
+            created_at=result.created_at,
+            updated_at=result.updated_at,
+        )
+
+
 class TestResultUpdate(MyBaseModel):
     name: str = Field(description="Test Result Name", max_length=256, min_length=1)
@@ -2,7 +2,7 @@ from pydantic import Field
 from typing import Optional, Any, Dict
 
 import json
-from ..lib.constants import TestModelMode, TestRunStatus
+from ..lib.constants import TestModelMode, TestRunStatus, TaskPriority
 from ..models.test_run_model import TestRunModel
 from .test_result import TestResultOutput
 from .base_model import MyBaseModel
@@ -17,6 +17,8 @@ class TestRunInput(MyBaseModel):
     groundTruthDatasetFilename: Optional[str] = None
     groundTruth: Optional[str] = None
     modelFilename: str
+    projectId: Optional[int] = Field(default=None, description="Project of the test run, test runs of each project share the test engine workers fairly")
+    priority: Optional[TaskPriority] = Field(default=None, description="Priority of the test run, if not set the priority is selected from the estimated cost of the test run", strict=False)
 
     model_config = {
         "json_schema_extra": {
@@ -10,6 +10,9 @@ from aiverify_apigw.lib.file_utils import (
     get_file_digest,
     sanitize_filename,
     compute_file_hash,
+    copy_file_with_hash,
+    HashingWriter,
+    COPY_CHUNK_SIZE,
     InvalidFilename,
 )
 
@@ -79,4 +82,32 @@ class TestComputeFileHash:
         file_hash = compute_file_hash(file_path)
         assert isinstance(file_hash, str)
         assert len(file_hash) == 64  # SHA-256 hash is 64 characters long
-        assert file_hash == hashlib.sha256(b"test content").hexdigest()
\ No newline at end of file
+        assert file_hash == hashlib.sha256(b"test content").hexdigest()
+
+
+class TestHashingWriter:
+    def test_hashing_writer(self):
+        fp = io.BytesIO()
+        writer = HashingWriter(fp)
+        writer.write(b"hello ")
+        writer.write(b"world")
+        writer.flush()
+        assert fp.getvalue() == b"hello world"
+        assert writer.size == 11
+        assert writer.hexdigest() == hashlib.sha256(b"hello world").hexdigest()
+
+    def test_hashing_writer_not_seekable(self):
+        # ZipFile must write the zip file in a single pass
+        writer = HashingWriter(io.BytesIO())
+        assert not hasattr(writer, "seek")
+        assert not hasattr(writer, "tell")
+
+
+class TestCopyFileWithHash:
+    def test_copy_file_with_hash(self, tmp_path):
+        content = b"x" * (COPY_CHUNK_SIZE * 2 + 10)
+        target_path = tmp_path / "target.bin"
+        (size, file_hash) = copy_file_with_hash(io.BytesIO(content), target_path)
+        assert size == len(content)
+        assert file_hash == hashlib.sha256(content).hexdigest()
+        assert target_path.read_bytes() == content
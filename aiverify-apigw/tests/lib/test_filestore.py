@@ -0,0 +1,27 @@
+import pytest
+import io
+import hashlib
+from zipfile import ZipFile
+from aiverify_apigw.lib.filestore import zip_folder, FileStoreError
+
+
+class TestZipFolder:
+    def test_zip_folder(self, tmp_path):
+        folder = tmp_path / "my_model"
+        folder.joinpath("variables").mkdir(parents=True)
+        folder.joinpath("saved_model.pb").write_bytes(b"model")
+        folder.joinpath("variables", "variables.index").write_bytes(b"index")
+
+        target = io.BytesIO()
+        file_hash = zip_folder(folder, target)
+
+        # the hash is computed while writing the zip file
+        assert file_hash == hashlib.sha256(target.getvalue()).hexdigest()
+        with ZipFile(io.BytesIO(target.getvalue())) as zipf:
+            assert zipf.testzip() is None
+            assert sorted(zipf.namelist()) == ["saved_model.pb", "variables/", "variables/variables.index"]
+            assert zipf.read("variables/variables.index") == b"index"
+
+    def test_zip_folder_invalid_directory(self, tmp_path):
+        with pytest.raises(FileStoreError):
+            zip_folder(tmp_path / "not_exists", io.BytesIO())
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import inspect, select, text
+from aiverify_apigw.lib.database import create_db_engine
+from aiverify_apigw.lib.migrations import migrate_database, schema_version_table, LATEST_VERSION
+from aiverify_apigw.models import BaseORMModel
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/database.db")
+    yield engine
+    engine.dispose()
+
+
+def get_version(engine):
+    with engine.connect() as connection:
+        return connection.execute(select(schema_version_table.c.version)).scalar()
+
+
+class TestMigrateDatabase:
+    def test_new_database(self, db_engine):
+        assert migrate_database(db_engine) == LATEST_VERSION
+        assert get_version(db_engine) == LATEST_VERSION
+        table_names = inspect(db_engine).get_table_names()
+        assert all(name in table_names for name in BaseORMModel.metadata.tables)
+
+    def test_unversioned_database(self, db_engine):
+        # database created before the schema was versioned, without the new table and indexes
+        BaseORMModel.metadata.create_all(bind=db_engine)
+        with db_engine.begin() as connection:
+            connection.execute(text("DROP INDEX ix_test_result_model_id"))
+            connection.execute(text("DROP TABLE test_run"))
+
+        assert migrate_database(db_engine) == LATEST_VERSION
+        assert get_version(db_engine) == LATEST_VERSION
+        db_inspect = inspect(db_engine)
+        assert "test_run" in db_inspect.get_table_names()
+        assert "ix_test_result_model_id" in [index["name"] for index in db_inspect.get_indexes("test_result")]
+
+    def test_latest_version(self, db_engine):
+        migrate_database(db_engine)
+        assert migrate_database(db_engine) == LATEST_VERSION
+        with db_engine.connect() as connection:
+            assert connection.execute(select(schema_version_table)).all() == [(LATEST_VERSION,)]
+
+    def test_newer_version(self, db_engine):
+        migrate_database(db_engine)
+        with db_engine.begin() as connection:
+            connection.execute(schema_version_table.update().values(version=LATEST_VERSION + 1))
+        with pytest.raises(RuntimeError):
+            migrate_database(db_engine)
@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import MagicMock
+from aiverify_apigw.lib.constants import TaskPriority
+from aiverify_apigw.lib.task_scheduler import (
+    TASK_STREAM_NAME, DEFAULT_DATASET_ROWS,
+    estimate_task_cost, get_task_priority, get_task_stream, make_job_id, parse_job_id
+)
+
+
+class TestEstimateTaskCost:
+    def test_algorithm_weight(self):
+        dataset = MagicMock(num_rows=1000)
+        assert estimate_task_cost(MagicMock(cid="fairness_metrics_toolbox_for_classification"), dataset) == 1000
+        assert estimate_task_cost(MagicMock(cid="aiverify_robustness_toolbox"), dataset) == 20000
+
+    def test_unknown_num_rows(self):
+        assert estimate_task_cost(MagicMock(cid="cid"), MagicMock(num_rows=None)) == DEFAULT_DATASET_ROWS
+
+
+class TestGetTaskPriority:
+    @pytest.mark.parametrize(
+        "cost, expected_priority",
+        [
+            (1000, TaskPriority.High),
+            (100000, TaskPriority.High),
+            (100001, TaskPriority.Normal),
+            (10000000, TaskPriority.Normal),
+            (10000001, TaskPriority.Low),
+        ],
+    )
+    def test_priority_from_cost(self, cost, expected_priority):
+        assert get_task_priority(cost) == expected_priority
+
+    def test_requested_priority(self):
+        assert get_task_priority(1000, TaskPriority.Low) == TaskPriority.Low
+
+
+class TestTaskStream:
+    def test_default_stream(self):
+        assert get_task_stream(TaskPriority.Normal) == TASK_STREAM_NAME
+
+    def test_tenant_stream(self):
+        assert get_task_stream(TaskPriority.High) == f"{TASK_STREAM_NAME}:high:default"
+        assert get_task_stream(TaskPriority.Normal, "project-1") == f"{TASK_STREAM_NAME}:normal:project-1"
+
+    def test_job_id(self):
+        assert make_job_id(TASK_STREAM_NAME, b"1-0") == b"1-0"
+        assert parse_job_id(b"1-0") == (TASK_STREAM_NAME, b"1-0")
+        stream = get_task_stream(TaskPriority.High, "project-1")
+        assert parse_job_id(make_job_id(stream, b"1-0")) == (stream, b"1-0")
@@ -1,7 +1,9 @@
 import pytest
 from pathlib import Path
-from aiverify_apigw.lib.test_engine import TestEngineValidator, TestEngineValidatorException
+import pandas as pd
+from aiverify_apigw.lib.test_engine import TestEngineValidator, TestEngineValidatorException, DATASET_SAMPLE_ROWS
 from aiverify_test_engine.plugins.plugins_manager import IModel, IPipeline, IData
+from aiverify_test_engine.plugins.enums.data_plugin_type import DataPluginType
 from unittest.mock import MagicMock, patch
 
 
@@ -84,17 +86,73 @@ class TestEngineValidatorValidateDatasetTest:
     def test_validate_dataset_success(self, mock_plugins_manager):
         model_path = Path("test_dataset_path")
         data = MagicMock(spec=IData)
-        mock_plugins_manager.PluginManager.get_instance.return_value = (data, MagicMock(), "")
+        data_serializer = MagicMock()
+        mock_plugins_manager.PluginManager.get_instance.return_value = (data, data_serializer, "")
         data.setup.return_value = (True, "")
         data.validate.return_value = (True, "")
         data.read_labels.return_value = {"col1": "int", "col2": "str"}
         data.get_shape.return_value = (10, 2)
-        data.get_data_plugin_type.return_value = MagicMock()
+        data.get_data_plugin_type.return_value = DataPluginType.PANDAS
         result = TestEngineValidator.validate_dataset(model_path)
-        assert result is not None
+        assert result == ("pandas", data_serializer.get_serializer_plugin_type().name.lower(), 10, 2, [
+            {"name": "col1", "datatype": "int", "label": "col1"},
+            {"name": "col2", "datatype": "str", "label": "col2"},
+        ])
         data.setup.assert_called_once()
         data.validate.assert_called_once()
 
+    def test_validate_dataset_batch_metadata(self, mock_plugins_manager):
+        model_path = Path("test_dataset_path")
+        data = MagicMock(spec=IData)
+        data_serializer = MagicMock()
+        mock_plugins_manager.PluginManager.get_instance.return_value = (data, data_serializer, "")
+        data.setup.return_value = (True, "")
+        data.get_data_plugin_type.return_value = DataPluginType.DELIMITER
+        data.is_batch_supported.return_value = True
+        data.iter_batches.return_value = iter([pd.DataFrame({"col1": [1, 2], "col2": ["a", "b"]})])
+        data.get_num_rows.return_value = 100000
+        result = TestEngineValidator.validate_dataset(model_path)
+        assert result == ("pandas", data_serializer.get_serializer_plugin_type().name.lower(), 100000, 2, [
+            {"name": "col1", "datatype": "int64", "label": "col1"},
+            {"name": "col2", "datatype": "object", "label": "col2"},
+        ])
+        # the dataset is not loaded into memory
+        mock_plugins_manager.PluginManager.get_instance.assert_called_once()
+        assert mock_plugins_manager.PluginManager.get_instance.call_args.kwargs["convert_to_pandas"] is False
+        data.iter_batches.assert_called_once_with(DATASET_SAMPLE_ROWS)
+        data.read_labels.assert_not_called()
+
+    def test_validate_dataset_batch_missing_column_labels(self, mock_plugins_manager):
+        model_path = Path("test_dataset_path")
+        data = MagicMock(spec=IData)
+        mock_plugins_manager.PluginManager.get_instance.return_value = (data, MagicMock(), "")
+        data.setup.return_value = (True, "")
+        data.get_data_plugin_type.return_value = DataPluginType.ARROW
+        data.is_batch_supported.return_value = True
+        data.iter_batches.return_value = iter([pd.DataFrame({"col1": [1, 2], "": ["a", "b"]})])
+        with pytest.raises(TestEngineValidatorException):
+            TestEngineValidator.validate_dataset(model_path)
+
+    def test_validate_dataset_not_batch_supported(self, mock_plugins_manager):
+        model_path = Path("test_dataset_path")
+        data = MagicMock(spec=IData)
+        data.get_data_plugin_type.return_value = DataPluginType.IMAGE
+        data.is_batch_supported.return_value = False
+        converted_data = MagicMock(spec=IData)
+        converted_data.setup.return_value = (True, "")
+        converted_data.validate.return_value = (True, "")
+        converted_data.read_labels.return_value = {"col1": "int"}
+        converted_data.get_shape.return_value = (10, 1)
+        converted_data.get_data_plugin_type.return_value = DataPluginType.PANDAS
+        mock_plugins_manager.PluginManager.get_instance.side_effect = [
+            (data, MagicMock(), ""), (converted_data, MagicMock(), "")
+        ]
+        result = TestEngineValidator.validate_dataset(model_path)
+        assert result[0] == "pandas"
+        assert result[2:4] == (10, 1)
+        # the data is converted to pandas when it cannot be read in batches
+        assert "convert_to_pandas" not in mock_plugins_manager.PluginManager.get_instance.call_args.kwargs
+
     def test_validate_dataset_failure_invalid_instance(self, mock_plugins_manager):
         model_path = Path("test_dataset_path")
         data = MagicMock(spec=IData)
@@ -0,0 +1,190 @@
+import pytest
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from concurrent.futures.process import BrokenProcessPool
+from aiverify_apigw.lib import validation_jobs
+from aiverify_apigw.lib.constants import (
+    ModelType, TestDatasetFileType, TestDatasetStatus, TestModelFileType, TestModelMode, TestModelStatus
+)
+from aiverify_apigw.lib.test_engine import TestEngineValidatorException
+from aiverify_apigw.lib.validation_jobs import (
+    validate_dataset_job, validate_model_job, fail_interrupted_validations, _run_validation
+)
+from aiverify_apigw import models
+
+
+@pytest.fixture(autouse=True)
+def mock_session_local(mocker, SessionLocal):
+    return mocker.patch("aiverify_apigw.lib.validation_jobs.SessionLocal", SessionLocal)
+
+
+@pytest.fixture
+def mock_run_validation(mocker):
+    return mocker.patch("aiverify_apigw.lib.validation_jobs._run_validation")
+
+
+@pytest.fixture
+def mock_fs_save_test_dataset(mocker):
+    return mocker.patch("aiverify_apigw.lib.validation_jobs.fs_save_test_dataset", return_value="filehash")
+
+
+@pytest.fixture
+def mock_fs_save_test_model(mocker):
+    return mocker.patch("aiverify_apigw.lib.validation_jobs.fs_save_test_model", return_value="filehash")
+
+
+@pytest.fixture
+def staging_dir(tmp_path):
+    staging_dir = tmp_path.joinpath("staging")
+    staging_dir.mkdir()
+    staging_dir.joinpath("test.csv").write_bytes(b"content")
+    return staging_dir
+
+
+@pytest.fixture
+def pending_dataset(db_session):
+    now = datetime.now(timezone.utc)
+    test_dataset = models.TestDatasetModel(
+        name="test.csv",
+        file_type=TestDatasetFileType.File,
+        filename="test.csv",
+        size=7,
+        status=TestDatasetStatus.Pending,
+        created_at=now,
+        updated_at=now,
+    )
+    db_session.add(test_dataset)
+    db_session.commit()
+    yield test_dataset
+    db_session.delete(test_dataset)
+    db_session.commit()
+
+
+@pytest.fixture
+def pending_model(db_session):
+    now = datetime.now(timezone.utc)
+    test_model = models.TestModelModel(
+        name="test.pkl",
+        mode=TestModelMode.Upload,
+        model_type=ModelType.Classification,
+        file_type=TestModelFileType.File,
+        filename="test.pkl",
+        size=7,
+        status=TestModelStatus.Pending,
+        created_at=now,
+        updated_at=now,
+    )
+    db_session.add(test_model)
+    db_session.commit()
+    yield test_model
+    db_session.delete(test_model)
+    db_session.commit()
+
+
+class TestValidateDatasetJob:
+    def test_valid_dataset(self, db_session, pending_dataset, staging_dir, mock_run_validation, mock_fs_save_test_dataset):
+        data_columns = [{"name": "col1", "datatype": "int64", "label": "col1"}]
+        mock_run_validation.return_value = ("pandas", "delimiter", 10, 1, data_columns)
+        dataset_path = staging_dir.joinpath("test.csv")
+
+        validate_dataset_job(pending_dataset.id, dataset_path, dataset_path, staging_dir)
+
+        mock_fs_save_test_dataset.assert_called_once_with(dataset_path)
+        db_session.refresh(pending_dataset)
+        assert pending_dataset.status == TestDatasetStatus.Valid
+        assert pending_dataset.error_message is None
+        assert pending_dataset.num_rows == 10
+        assert pending_dataset.num_cols == 1
+        assert json.loads(pending_dataset.data_columns) == data_columns
+        assert pending_dataset.zip_hash == "filehash"
+        assert not staging_dir.exists()
+
+    def test_invalid_dataset(self, db_session, pending_dataset, staging_dir, mock_run_validation, mock_fs_save_test_dataset):
+        mock_run_validation.side_effect = TestEngineValidatorException("Invalid dataset format")
+        dataset_path = staging_dir.joinpath("test.csv")
+
+        validate_dataset_job(pending_dataset.id, dataset_path, dataset_path, staging_dir)
+
+        mock_fs_save_test_dataset.assert_not_called()
+        db_session.refresh(pending_dataset)
+        assert pending_dataset.status == TestDatasetStatus.Invalid
+        assert pending_dataset.error_message == "Invalid dataset format"
+        assert pending_dataset.zip_hash is None
+        assert not staging_dir.exists()
+
+    def test_save_error(self, db_session, pending_dataset, staging_dir, mock_run_validation, mock_fs_save_test_dataset):
+        mock_run_validation.return_value = ("pandas", "delimiter", 10, 1, [])
+        mock_fs_save_test_dataset.side_effect = OSError("disk full")
+        dataset_path = staging_dir.joinpath("test.csv")
+
+        validate_dataset_job(pending_dataset.id, dataset_path, dataset_path, staging_dir)
+
+        db_session.refresh(pending_dataset)
+        assert pending_dataset.status == TestDatasetStatus.Invalid
+        assert "disk full" in pending_dataset.error_message
+
+    def test_dataset_deleted(self, staging_dir, mock_run_validation, mock_fs_save_test_dataset):
+        mock_run_validation.return_value = ("pandas", "delimiter", 10, 1, [])
+        dataset_path = staging_dir.joinpath("test.csv")
+
+        validate_dataset_job(123456, dataset_path, dataset_path, staging_dir)
+        assert not staging_dir.exists()
+
+
+class TestValidateModelJob:
+    def test_valid_model(self, db_session, pending_model, staging_dir, mock_run_validation, mock_fs_save_test_model):
+        mock_run_validation.return_value = ("sklearn", "pickle")
+        model_path = staging_dir.joinpath("test.csv")
+
+        validate_model_job(pending_model.id, model_path, model_path, staging_dir, True)
+
+        assert mock_run_validation.call_args.args[1:] == (model_path, True)
+        mock_fs_save_test_model.assert_called_once_with(model_path)
+        db_session.refresh(pending_model)
+        assert pending_model.status == TestModelStatus.Valid
+        assert pending_model.model_format == "sklearn"
+        assert pending_model.serializer == "pickle"
+        assert pending_model.zip_hash == "filehash"
+        assert not staging_dir.exists()
+
+    def test_invalid_model(self, db_session, pending_model, staging_dir, mock_run_validation, mock_fs_save_test_model):
+        mock_run_validation.side_effect = TestEngineValidatorException("x" * 5000)
+        model_path = staging_dir.joinpath("test.csv")
+
+        validate_model_job(pending_model.id, model_path, model_path, staging_dir)
+
+        mock_fs_save_test_model.assert_not_called()
+        db_session.refresh(pending_model)
+        assert pending_model.status == TestModelStatus.Invalid
+        assert len(pending_model.error_message) == validation_jobs.MAX_ERROR_MESSAGE_LENGTH
+        assert not staging_dir.exists()
+
+
+class TestRunValidation:
+    def test_validation_error(self, mocker):
+        pool = MagicMock()
+        pool.submit.return_value.result.side_effect = TestEngineValidatorException("Invalid model format")
+        mocker.patch("aiverify_apigw.lib.validation_jobs._process_pool", pool)
+        with pytest.raises(TestEngineValidatorException):
+            _run_validation(MagicMock())
+        assert validation_jobs._process_pool is pool
+
+    def test_broken_pool_restarted(self, mocker):
+        pool = MagicMock(_broken="A process in the process pool was terminated abruptly")
+        pool.submit.return_value.result.side_effect = BrokenProcessPool()
+        mocker.patch("aiverify_apigw.lib.validation_jobs._process_pool", pool)
+        with pytest.raises(TestEngineValidatorException):
+            _run_validation(MagicMock())
+        pool.shutdown.assert_called_once()
+        assert validation_jobs._process_pool is None
+
+
+class TestFailInterruptedValidations:
+    def test_pending_set_invalid(self, db_session, pending_dataset, pending_model):
+        fail_interrupted_validations()
+        db_session.refresh(pending_dataset)
+        db_session.refresh(pending_model)
+        assert pending_dataset.status == TestDatasetStatus.Invalid
+        assert pending_dataset.error_message is not None
+        assert pending_model.status == TestModelStatus.Invalid
@@ -10,7 +10,7 @@ model_types = ["classification", "regression"]
 
 
 def _create_mock_test_model():
-    filename = faker.file_name(extension="sav")
+    filename = faker.unique.file_name(extension="sav")
     fake_date = faker.date_object()
     test_model = TestModelModel(
         name=faker.name(),
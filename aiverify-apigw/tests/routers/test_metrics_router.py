@@ -0,0 +1,6 @@
+class TestReadDatabaseMetrics:
+    def test_read_database_metrics(self, test_client):
+        response = test_client.get("/metrics/database")
+        assert response.status_code == 200
+        assert "pool" in response.json()
+        assert "checkouts" in response.json()
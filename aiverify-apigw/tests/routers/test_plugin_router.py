@@ -90,10 +90,17 @@ class TestUploadPlugin:
             zip_file.writestr("plugin.meta.json", b"Mock meta")
         return zip_buffer
 
+    @patch("aiverify_apigw.routers.plugin_router.queue_algorithm_builds")
     @patch("aiverify_apigw.routers.plugin_router.backup_plugin")
     @patch("aiverify_apigw.routers.plugin_router.PluginStore")
     def test_upload_plugin_success(
-        self, mock_plugin_store, mock_backup_plugin, mock_plugin_meta, test_client, mock_upload_zipfile
+        self,
+        mock_plugin_store,
+        mock_backup_plugin,
+        mock_queue_algorithm_builds,
+        mock_plugin_meta,
+        test_client,
+        mock_upload_zipfile,
     ):
         meta = mock_plugin_meta
         meta_dict = mock_plugin_meta.model_dump()
@@ -106,6 +113,7 @@ class TestUploadPlugin:
         response = test_client.post("/plugins/upload", files=file)
 
         assert response.status_code == 200
+        mock_queue_algorithm_builds.assert_called_once_with(model.algorithms)
 
     def test_upload_plugin_invalid_format(self, test_client):
         # content_buffer = io.BytesIO()
@@ -1,5 +1,7 @@
 import pytest
 import json
+from unittest.mock import MagicMock
+from botocore.exceptions import ClientError
 
 
 @pytest.fixture
@@ -8,26 +10,98 @@ def mock_check_valid_filename(mocker):
 
 
 @pytest.fixture
-def mock_fs_get_test_model(mocker):
-    return mocker.patch("aiverify_apigw.routers.storage_router.fs_get_test_model")
+def mock_fs_get_test_model_download_path(mocker):
+    return mocker.patch("aiverify_apigw.routers.storage_router.fs_get_test_model_download_path")
 
 
 @pytest.fixture
-def mock_fs_get_test_dataset(mocker):
-    return mocker.patch("aiverify_apigw.routers.storage_router.fs_get_test_dataset")
+def mock_fs_get_test_dataset_download_path(mocker):
+    return mocker.patch("aiverify_apigw.routers.storage_router.fs_get_test_dataset_download_path")
+
+
+@pytest.fixture
+def mock_fs_open_s3_object(mocker):
+    return mocker.patch("aiverify_apigw.routers.storage_router.fs_open_s3_object")
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    file_path = tmp_path / "test_model"
+    file_path.write_bytes(b"test_model_content")
+    return file_path
+
+
+@pytest.fixture
+def hashed_test_model(db_session, mock_test_models):
+    test_model = mock_test_models[0]
+    test_model.zip_hash = "modelhash"
+    db_session.commit()
+    return test_model
 
 
 class TestDownloadTestModel:
-    def test_download_test_model_success(self, mock_check_valid_filename, mock_fs_get_test_model, test_client):
+    def test_download_test_model_success(self, mock_check_valid_filename, mock_fs_get_test_model_download_path, model_file, test_client):
         # Mock the file validation and file retrieval
         mock_check_valid_filename.return_value = True
-        mock_fs_get_test_model.return_value = b"test_model_content"
+        mock_fs_get_test_model_download_path.return_value = model_file
 
         response = test_client.get("/storage/models/test_model")
         assert response.status_code == 200
         assert response.content == b"test_model_content"
         assert response.headers["Content-Disposition"] == 'attachment; filename="test_model"'
         assert response.headers["Content-Type"] == "application/octet-stream"
+        assert response.headers["Accept-Ranges"] == "bytes"
+
+    def test_download_test_model_etag(self, mock_fs_get_test_model_download_path, model_file, hashed_test_model, test_client):
+        mock_fs_get_test_model_download_path.return_value = model_file
+
+        response = test_client.get(f"/storage/models/{hashed_test_model.filename}")
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"modelhash"'
+
+        # the cached copy is still valid
+        response = test_client.get(f"/storage/models/{hashed_test_model.filename}", headers={"If-None-Match": '"modelhash"'})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == '"modelhash"'
+
+        response = test_client.get(f"/storage/models/{hashed_test_model.filename}", headers={"If-None-Match": '"otherhash"'})
+        assert response.status_code == 200
+        assert response.content == b"test_model_content"
+
+    def test_download_test_model_range(self, mock_fs_get_test_model_download_path, model_file, hashed_test_model, test_client):
+        mock_fs_get_test_model_download_path.return_value = model_file
+
+        response = test_client.get(f"/storage/models/{hashed_test_model.filename}", headers={"Range": "bytes=5-"})
+        assert response.status_code == 206
+        assert response.content == b"model_content"
+        assert response.headers["Content-Range"] == "bytes 5-17/18"
+
+        # the file has changed since the client started the download
+        response = test_client.get(f"/storage/models/{hashed_test_model.filename}",
+                                   headers={"Range": "bytes=5-", "If-Range": '"otherhash"'})
+        assert response.status_code == 200
+        assert response.content == b"test_model_content"
+
+    def test_download_test_model_s3(self, mock_fs_get_test_model_download_path, mock_fs_open_s3_object, hashed_test_model, test_client):
+        mock_fs_get_test_model_download_path.return_value = "models/test_model"
+        body = MagicMock()
+        body.iter_chunks.return_value = iter([b"model_", b"content"])
+        mock_fs_open_s3_object.return_value = {"Body": body, "ContentLength": 13, "ContentRange": "bytes 5-17/18"}
+
+        response = test_client.get(f"/storage/models/{hashed_test_model.filename}", headers={"Range": "bytes=5-"})
+        assert response.status_code == 206
+        assert response.content == b"model_content"
+        assert response.headers["Content-Range"] == "bytes 5-17/18"
+        assert response.headers["ETag"] == '"modelhash"'
+        mock_fs_open_s3_object.assert_called_once_with("models/test_model", "bytes=5-")
+
+    def test_download_test_model_s3_invalid_range(self, mock_fs_get_test_model_download_path, mock_fs_open_s3_object, test_client):
+        mock_fs_get_test_model_download_path.return_value = "models/test_model"
+        mock_fs_open_s3_object.side_effect = ClientError({"Error": {"Code": "InvalidRange"}}, "GetObject")
+
+        response = test_client.get("/storage/models/test_model", headers={"Range": "bytes=100-"})
+        assert response.status_code == 416
 
     def test_download_test_model_invalid_filename(self, mock_check_valid_filename, test_client):
         # Mock the file validation to return False
@@ -36,28 +110,30 @@ class TestDownloadTestModel:
         response = test_client.get("/storage/models/invalid_filename")
         assert response.status_code == 400
 
-    def test_download_test_model_not_found(self, mock_check_valid_filename, mock_fs_get_test_model, test_client):
+    def test_download_test_model_not_found(self, mock_check_valid_filename, mock_fs_get_test_model_download_path, test_client):
         # Mock the file validation and raise FileNotFoundError
         mock_check_valid_filename.return_value = True
-        mock_fs_get_test_model.side_effect = FileNotFoundError
+        mock_fs_get_test_model_download_path.side_effect = FileNotFoundError
 
         response = test_client.get("/storage/models/nonexistent_model")
         assert response.status_code == 404
 
-    def test_download_test_model_internal_error(self, mock_check_valid_filename, mock_fs_get_test_model, test_client):
+    def test_download_test_model_internal_error(self, mock_check_valid_filename, mock_fs_get_test_model_download_path, test_client):
         # Mock the file validation and raise an internal error
         mock_check_valid_filename.return_value = True
-        mock_fs_get_test_model.side_effect = Exception("Internal error")
+        mock_fs_get_test_model_download_path.side_effect = Exception("Internal error")
 
         response = test_client.get("/storage/models/test_model")
         assert response.status_code == 500
 
 
 class TestDownloadTestDataset:
-    def test_download_test_dataset_success(self, mock_check_valid_filename, mock_fs_get_test_dataset, test_client):
+    def test_download_test_dataset_success(self, mock_check_valid_filename, mock_fs_get_test_dataset_download_path, tmp_path, test_client):
         # Mock the file validation and file retrieval
         mock_check_valid_filename.return_value = True
-        mock_fs_get_test_dataset.return_value = b"test_dataset_content"
+        file_path = tmp_path / "test_dataset"
+        file_path.write_bytes(b"test_dataset_content")
+        mock_fs_get_test_dataset_download_path.return_value = file_path
 
         response = test_client.get("/storage/datasets/test_dataset")
         assert response.status_code == 200
@@ -65,6 +141,18 @@ class TestDownloadTestDataset:
         assert response.headers["Content-Disposition"] == 'attachment; filename="test_dataset"'
         assert response.headers["Content-Type"] == "application/octet-stream"
 
+    def test_download_test_dataset_etag(self, mock_fs_get_test_dataset_download_path, tmp_path, db_session, mock_test_datasets, test_client):
+        test_dataset = mock_test_datasets[0]
+        test_dataset.zip_hash = "datasethash"
+        db_session.commit()
+        file_path = tmp_path / "test_dataset"
+        file_path.write_bytes(b"test_dataset_content")
+        mock_fs_get_test_dataset_download_path.return_value = file_path
+
+        response = test_client.get(f"/storage/datasets/{test_dataset.filename}", headers={"If-None-Match": 'W/"datasethash"'})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == '"datasethash"'
+
     def test_download_test_dataset_invalid_filename(self, mock_check_valid_filename, test_client):
         # Mock the file validation to return False
         mock_check_valid_filename.return_value = False
@@ -73,20 +161,20 @@ class TestDownloadTestDataset:
         assert response.status_code == 400
         assert response.json()["detail"] == "Invalid filename"
 
-    def test_download_test_dataset_not_found(self, mock_check_valid_filename, mock_fs_get_test_dataset, test_client):
+    def test_download_test_dataset_not_found(self, mock_check_valid_filename, mock_fs_get_test_dataset_download_path, test_client):
         # Mock the file validation and raise FileNotFoundError
         mock_check_valid_filename.return_value = True
-        mock_fs_get_test_dataset.side_effect = FileNotFoundError
+        mock_fs_get_test_dataset_download_path.side_effect = FileNotFoundError
 
         response = test_client.get("/storage/datasets/nonexistent_dataset")
         assert response.status_code == 404
         assert response.json()["detail"] == "Dataset file not found"
 
-    def test_download_test_dataset_internal_error(self, mock_check_valid_filename, mock_fs_get_test_dataset, test_client):
+    def test_download_test_dataset_internal_error(self, mock_check_valid_filename, mock_fs_get_test_dataset_download_path, test_client):
         # Mock the file validation and raise an internal error
         mock_check_valid_filename.return_value = True
-        mock_fs_get_test_dataset.side_effect = Exception("Internal error")
+        mock_fs_get_test_dataset_download_path.side_effect = Exception("Internal error")
 
         response = test_client.get("/storage/datasets/test_dataset")
         assert response.status_code == 500
-        assert response.json()["detail"] == "Internal server error"
\ No newline at end of file
+        assert response.json()["detail"] == "Internal server error"
@@ -1,4 +1,5 @@
 import pytest
+import shutil
 import json
 
 
@@ -32,6 +33,11 @@ def mock_test_engine_validator(mocker):
     return mocker.patch("aiverify_apigw.routers.test_dataset_router.TestEngineValidator")
 
 
+@pytest.fixture
+def mock_submit_dataset_validation(mocker):
+    return mocker.patch("aiverify_apigw.routers.test_dataset_router.submit_dataset_validation")
+
+
 class TestListDatasets:
     def test_list_datasets_success(self, test_client, mock_test_datasets):
         response = test_client.get("/test_datasets/")
@@ -39,19 +45,40 @@ class TestListDatasets:
         assert len(response.json()) == len(mock_test_datasets)
         assert response.json()[0]["name"] == mock_test_datasets[0].name
 
+    def test_list_datasets_paginated(self, test_client, mock_test_datasets):
+        response = test_client.get("/test_datasets/", params={"limit": 1, "status": "valid"})
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [mock_test_datasets[0].id]
+        assert "X-Next-Cursor" not in response.headers
+
+        response = test_client.get("/test_datasets/", params={"cursor": str(mock_test_datasets[0].id)})
+        assert response.status_code == 200
+        assert response.json() == []
+
+        response = test_client.get("/test_datasets/", params={"status": "pending"})
+        assert response.status_code == 200
+        assert response.json() == []
+
 
 class TestUploadDatasetFiles:
-    def test_upload_dataset_files_success(self, mock_check_valid_filename, mock_check_file_size, mock_fs_save_test_dataset, mock_test_engine_validator, test_client):
-        # Mock the file validation, size check, and saving operations
+    def test_upload_dataset_files_success(self, mock_check_valid_filename, mock_check_file_size, mock_submit_dataset_validation, test_client):
+        # Mock the file validation and size check
         mock_check_valid_filename.return_value = True
         mock_check_file_size.return_value = True
-        mock_fs_save_test_dataset.return_value = "filehash"
-        # (data_format, serializer, num_rows, num_cols, dataColumns) = TestEngineValidator.validate_dataset(dataset_path)
-        mock_test_engine_validator.validate_dataset.return_value = ("format", "serializer", 10, 5, [{"name": "test", "datatype": "text", "label": "test"}])
 
         response = test_client.post("/test_datasets/upload", files=[("files", ("test_file.csv", b"content"))])
         assert response.status_code == 200
         assert len(response.json()) == 1
+        dataset = response.json()[0]
+        assert dataset["status"] == "pending"
+        # the dataset is validated in a background job
+        mock_submit_dataset_validation.assert_called_once()
+        (dataset_id, validate_path, save_path, staging_dir) = mock_submit_dataset_validation.call_args.args
+        assert dataset_id == dataset["id"]
+        assert validate_path == save_path
+        assert validate_path.name == dataset["filename"]
+        assert validate_path.read_bytes() == b"content"
+        shutil.rmtree(staging_dir)
 
     def test_upload_dataset_files_invalid_filename(self, mock_check_valid_filename, test_client):
         # Mock the file validation to return False
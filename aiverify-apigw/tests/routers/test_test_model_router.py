@@ -1,4 +1,5 @@
 import pytest
+import shutil
 
 
 @pytest.fixture
@@ -31,6 +32,11 @@ def mock_test_engine_validator(mocker):
     return mocker.patch("aiverify_apigw.routers.test_model_router.TestEngineValidator")
 
 
+@pytest.fixture
+def mock_submit_model_validation(mocker):
+    return mocker.patch("aiverify_apigw.routers.test_model_router.submit_model_validation")
+
+
 class TestListTestModels:
     def test_list_test_models_success(self, test_client, mock_test_models):
         response = test_client.get("/test_models/")
@@ -38,18 +44,40 @@ class TestListTestModels:
         assert len(response.json()) == len(mock_test_models)
         assert response.json()[0]["name"] == mock_test_models[0].name
 
+    def test_list_test_models_paginated(self, test_client, mock_test_models):
+        response = test_client.get("/test_models/", params={"limit": 1, "status": "valid"})
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [mock_test_models[0].id]
+        assert "X-Next-Cursor" not in response.headers
+
+        response = test_client.get("/test_models/", params={"cursor": str(mock_test_models[0].id)})
+        assert response.status_code == 200
+        assert response.json() == []
+
+        response = test_client.get("/test_models/", params={"status": "invalid"})
+        assert response.status_code == 200
+        assert response.json() == []
+
 
 class TestUploadModelFiles:
-    def test_upload_model_files_success(self, mock_check_valid_filename, mock_check_file_size, mock_fs_save_test_model, mock_test_engine_validator, test_client):
-        # Mock the file validation, size check, and saving operations
+    def test_upload_model_files_success(self, mock_check_valid_filename, mock_check_file_size, mock_submit_model_validation, test_client):
+        # Mock the file validation and size check
         mock_check_valid_filename.return_value = True
         mock_check_file_size.return_value = True
-        mock_fs_save_test_model.return_value = "filehash"
-        mock_test_engine_validator.validate_model.return_value = ("format", "serializer")
 
         response = test_client.post("/test_models/upload", files=[("files", ("test_model.pkl", b"content"))], data={"model_types": ["classification"]})
         assert response.status_code == 200
         assert len(response.json()) == 1
+        model = response.json()[0]
+        assert model["status"] == "pending"
+        # the model is validated in a background job
+        mock_submit_model_validation.assert_called_once()
+        (model_id, validate_path, save_path, staging_dir) = mock_submit_model_validation.call_args.args
+        assert model_id == model["id"]
+        assert validate_path.name == model["filename"]
+        assert validate_path.read_bytes() == b"content"
+        assert save_path.parent == staging_dir
+        shutil.rmtree(staging_dir)
 
     def test_upload_model_files_invalid_filename(self, mock_check_valid_filename, test_client):
         # Mock the file validation to return False
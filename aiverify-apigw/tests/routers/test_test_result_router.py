@@ -315,6 +315,74 @@ class TestUploadZipFile:
         result = TestResult(**mock_test_result_data)
         mock_save_test_result.assert_called_once_with(test_result=result, session=ANY, artifact_set=ANY, test_run_id=None)
 
+    def test_upload_zip_file_chunked(self, test_client, mock_plugins, mock_upload_zipfile):
+        """Test uploading a zip file streamed with chunked transfer encoding, with the artifacts streamed to the file store."""
+        plugin = mock_plugins[0]
+        zip_buffer, mock_test_result_data = mock_upload_zipfile
+        mock_test_result_data["gid"] = plugin.gid
+        mock_test_result_data["cid"] = plugin.algorithms[0].cid
+        mock_test_result_data["artifacts"] = ["image.png"]
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED, False) as zip_file:
+            zip_file.writestr("results.json", json.dumps(mock_test_result_data))
+            zip_file.writestr("image.png", b"artifact content")
+
+        def body():
+            yield (
+                f"--{BOUNDARY}\r\n"
+                'Content-Disposition: form-data; name="file"; filename="output.zip"\r\n'
+                "Content-Type: application/octet-stream\r\n\r\n"
+            ).encode("utf-8")
+            data = zip_buffer.getvalue()
+            for i in range(0, len(data), 64):
+                yield data[i : i + 64]
+            yield f"\r\n--{BOUNDARY}--\r\n".encode("utf-8")
+
+        saved_artifacts = {}
+
+        def save_artifact(test_result_id, filename, data):
+            # artifacts are passed as file objects
+            saved_artifacts[filename] = data.read()
+
+        with patch("aiverify_apigw.routers.test_result_router.save_artifact", side_effect=save_artifact):
+            response = test_client.post("/test_results/upload_zip", content=body(), headers=HEADERS)
+        assert response.status_code == 200
+        assert response.json()[1].endswith("/artifacts/image.png")
+        assert saved_artifacts == {"image.png": b"artifact content"}
+
+    def test_upload_zip_file_many_artifacts(self, test_client, mock_plugins, mock_test_result_data):
+        """Test uploading a zip file with 5000 artifacts, each artifact must be read from the zip once."""
+        num_artifacts = 5000
+        plugin = mock_plugins[0]
+        mock_test_result_data["gid"] = plugin.gid
+        mock_test_result_data["cid"] = plugin.algorithms[0].cid
+        mock_test_result_data["artifacts"] = [f"images/image_{i}.png" for i in range(num_artifacts)]
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED, False) as zip_file:
+            zip_file.writestr("results.json", json.dumps(mock_test_result_data))
+            for i in range(num_artifacts):
+                zip_file.writestr(f"images/image_{i}.png", f"artifact {i}".encode("utf-8"))
+
+        saved_artifacts = {}
+
+        def save_artifact(test_result_id, filename, data):
+            saved_artifacts[filename] = data.read()
+
+        zip_open = zipfile.ZipFile.open
+        with (
+            patch("aiverify_apigw.routers.test_result_router.save_artifact", side_effect=save_artifact),
+            patch.object(zipfile.ZipFile, "open", autospec=True, side_effect=zip_open) as mock_zip_open,
+        ):
+            files = {"file": ("test.zip", zip_buffer.getvalue(), "application/zip")}
+            response = test_client.post("/test_results/upload_zip", files=files)
+
+        assert response.status_code == 200
+        assert len(response.json()) == num_artifacts + 1
+        assert len(saved_artifacts) == num_artifacts
+        assert saved_artifacts["images/image_4999.png"] == b"artifact 4999"
+        # results.json and each artifact are opened once
+        assert mock_zip_open.call_count == num_artifacts + 1
+
     def test_upload_zip_file_invalid_format(self, test_client):
         """Test uploading a file that is not a zip."""
 
@@ -459,6 +527,54 @@ class TestReadTestResults:
             assert json_response[i]["cid"] == mock_test_results[i].cid
             assert json_response[i]["version"] == mock_test_results[i].version
 
+    def test_read_test_results_paginated(self, mock_test_results, test_client):
+        """Test following the cursor through the pages of test results."""
+        ids = []
+        response = test_client.get("/test_results/", params={"limit": 2})
+        while True:
+            assert response.status_code == 200
+            assert len(response.json()) <= 2
+            ids.extend([result["id"] for result in response.json()])
+            if "X-Next-Cursor" not in response.headers:
+                break
+            response = test_client.get("/test_results/", params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]})
+        assert ids == sorted([result.id for result in mock_test_results])
+
+    def test_read_test_results_filtered(self, mock_test_results, test_client):
+        """Test filtering the test results by algorithm and model."""
+        test_result = mock_test_results[1]
+        response = test_client.get("/test_results/", params={"gid": test_result.gid, "cid": test_result.cid})
+        assert response.status_code == 200
+        assert [result["id"] for result in response.json()] == [test_result.id]
+
+        response = test_client.get("/test_results/", params={"model_id": test_result.model_id})
+        assert response.status_code == 200
+        assert [result["id"] for result in response.json()] == [test_result.id]
+
+    def test_read_test_results_invalid_cursor(self, test_client):
+        """Test an invalid cursor."""
+        response = test_client.get("/test_results/", params={"limit": 2, "cursor": "invalid"})
+        assert response.status_code == 400
+
+
+# Test class for GET /test_results/summary
+class TestReadTestResultSummaries:
+    def test_read_test_result_summaries_success(self, mock_test_results, test_client):
+        """Test retrieving the test results without the output and algorithm arguments."""
+        response = test_client.get("/test_results/summary", params={"limit": 3})
+
+        assert response.status_code == 200
+        json_response = response.json()
+        assert len(json_response) == 3
+        assert "X-Next-Cursor" in response.headers
+        for summary, test_result in zip(json_response, mock_test_results):
+            assert summary["id"] == test_result.id
+            assert summary["gid"] == test_result.gid
+            assert summary["modelFile"] == test_result.model.filename
+            assert summary["artifacts"] == [artifact.filename for artifact in test_result.artifacts]
+            assert "output" not in summary
+            assert "algorithmArgs" not in summary
+
 
 # Test class for GET /test_results/{test_result_id}
 class TestReadTestResult:
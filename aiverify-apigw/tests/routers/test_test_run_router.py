@@ -1,9 +1,14 @@
 import pytest
-from aiverify_apigw.lib.constants import TestRunStatus
+import json
+from unittest.mock import MagicMock
+from aiverify_apigw.lib.constants import TestDatasetStatus, TestRunStatus
+from aiverify_apigw.lib.task_scheduler import TASK_STREAMS_KEY, DEFAULT_DATASET_ROWS
+from aiverify_apigw.routers.test_run_router import queue_algorithm_builds, TASK_STREAM_NAME
 
 
 @pytest.fixture
 def mock_valkey_client(mocker):
+    mocker.patch("aiverify_apigw.routers.test_run_router._task_streams", set())
     return mocker.patch("aiverify_apigw.routers.test_run_router.client")
 
 
@@ -30,12 +35,72 @@ class TestServerActive:
         assert response.json() is False
 
 
+class TestQueueAlgorithmBuilds:
+    def test_queue_algorithm_builds(self, mock_valkey_client):
+        algo = MagicMock(gid="gid", cid="cid", zip_hash="hash")
+        mock_valkey_client.ping.return_value = True
+        queue_algorithm_builds([algo])
+        fields = mock_valkey_client.xadd.call_args.kwargs["fields"]
+        assert mock_valkey_client.xadd.call_args.args == (TASK_STREAM_NAME,)
+        assert json.loads(fields["build"]) == {"algorithmGID": "gid", "algorithmCID": "cid", "algorithmHash": "hash"}
+
+    def test_queue_algorithm_builds_server_not_active(self, mock_valkey_client):
+        mock_valkey_client.ping.side_effect = Exception("Connection error")
+        queue_algorithm_builds([MagicMock(gid="gid", cid="cid", zip_hash="hash")])
+        mock_valkey_client.xadd.assert_not_called()
+
+
 class TestListTestRuns:
     def test_list_test_runs_success(self, test_client, mock_test_runs):
         response = test_client.get("/test_runs/")
         assert response.status_code == 200
         assert len(response.json()) == len(mock_test_runs)
-        assert response.json()[0]["status"] == mock_test_runs[0].status
+        # test runs are listed in the order of their ids
+        test_runs = {str(test_run.id): test_run for test_run in mock_test_runs}
+        for test_run in response.json():
+            assert test_run["status"] == test_runs[test_run["id"]].status
+
+    def test_list_test_runs_filtered(self, test_client, mock_test_runs):
+        response = test_client.get("/test_runs/", params={"status": "cancelled"})
+        assert response.status_code == 200
+        cancelled = [str(test_run.id) for test_run in mock_test_runs if test_run.status == TestRunStatus.Cancelled]
+        assert [test_run["id"] for test_run in response.json()] == cancelled
+
+        test_run = mock_test_runs[0]
+        response = test_client.get(
+            "/test_runs/", params={"gid": test_run.algorithm.gid, "cid": test_run.algorithm.cid, "model_id": test_run.model_id}
+        )
+        assert response.status_code == 200
+        assert str(test_run.id) in [test_run["id"] for test_run in response.json()]
+
+    def test_list_test_runs_paginated(self, test_client, mock_test_runs):
+        ids = []
+        response = test_client.get("/test_runs/", params={"limit": 1})
+        while "X-Next-Cursor" in response.headers:
+            ids.extend([test_run["id"] for test_run in response.json()])
+            response = test_client.get("/test_runs/", params={"limit": 1, "cursor": response.headers["X-Next-Cursor"]})
+        ids.extend([test_run["id"] for test_run in response.json()])
+        assert sorted(ids) == sorted([str(test_run.id) for test_run in mock_test_runs])
+        assert len(ids) == len(mock_test_runs)
+
+    def test_list_test_runs_invalid_cursor(self, test_client):
+        response = test_client.get("/test_runs/", params={"limit": 1, "cursor": "invalid"})
+        assert response.status_code == 400
+
+
+def get_run_test_input(test_run, **kwargs):
+    input_data = {
+        "mode": "upload",
+        "algorithmGID": test_run.algorithm.gid,
+        "algorithmCID": test_run.algorithm.cid,
+        "algorithmArgs": {"key": "value"},
+        "modelFilename": test_run.model.filename,
+        "testDatasetFilename": test_run.test_dataset.filename,
+        "groundTruthDatasetFilename": test_run.ground_truth_dataset.filename if test_run.ground_truth_dataset else None,
+        "groundTruth": test_run.ground_truth,
+    }
+    input_data.update(kwargs)
+    return input_data
 
 
 class TestRunTest:
@@ -49,20 +114,66 @@ class TestRunTest:
         # Mock JSON schema validation
         mock_validate_json_schema.return_value = True
 
-        input_data = {
-            "mode": "upload",
-            "algorithmGID": test_run.algorithm.gid,
-            "algorithmCID": test_run.algorithm.cid,
-            "algorithmArgs": {"key": "value"},
-            "modelFilename": test_run.model.filename,
-            "testDatasetFilename": test_run.test_dataset.filename,
-            "groundTruthDatasetFilename": test_run.ground_truth_dataset.filename if test_run.ground_truth_dataset else None,
-            "groundTruth": test_run.ground_truth,
-        }
-        response = test_client.post("/test_runs/run_test", json=input_data)
+        response = test_client.post("/test_runs/run_test", json=get_run_test_input(test_run))
         assert response.status_code == 200
         assert response.json()["status"] == "pending"
 
+        # the lane of the task is selected from its estimated cost, the mock dataset has no number of rows
+        task = json.loads(mock_valkey_client.xadd.call_args.kwargs["fields"]["task"])
+        assert task["estimatedCost"] == DEFAULT_DATASET_ROWS
+        assert task["priority"] == "high"
+        stream = f"{TASK_STREAM_NAME}:high:default"
+        assert mock_valkey_client.xadd.call_args.args == (stream,)
+        mock_valkey_client.hset.assert_called_once_with(TASK_STREAMS_KEY, stream, "high")
+
+    def test_run_test_priority_and_project(self, mock_valkey_client, mock_validate_json_schema, test_client,
+                                           mock_test_runs, mock_projects):
+        mock_valkey_client.ping.return_value = True
+        mock_valkey_client.xadd.return_value = b"1-0"
+        mock_validate_json_schema.return_value = True
+
+        project_id = mock_projects[0].id
+        input_data = get_run_test_input(mock_test_runs[0], priority="low", projectId=project_id)
+        response = test_client.post("/test_runs/run_test", json=input_data)
+        assert response.status_code == 200
+
+        stream = f"{TASK_STREAM_NAME}:low:project-{project_id}"
+        assert mock_valkey_client.xadd.call_args.args == (stream,)
+        assert json.loads(mock_valkey_client.xadd.call_args.kwargs["fields"]["task"])["priority"] == "low"
+        assert mock_valkey_client.xgroup_create.call_args.kwargs["name"] == stream
+
+        # the stream of the job is used to cancel the test run
+        response = test_client.post(f"/test_runs/{response.json()['id']}/cancel")
+        assert response.status_code == 200
+        mock_valkey_client.xdel.assert_called_once_with(stream, b"1-0")
+
+    def test_run_test_project_not_found(self, mock_valkey_client, mock_validate_json_schema, test_client,
+                                        mock_test_runs):
+        mock_valkey_client.ping.return_value = True
+        mock_validate_json_schema.return_value = True
+
+        response = test_client.post("/test_runs/run_test", json=get_run_test_input(mock_test_runs[0], projectId=999999))
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Project not found with the provided projectId"
+        mock_valkey_client.xadd.assert_not_called()
+
+    def test_run_test_dataset_pending_validation(self, mock_valkey_client, mock_validate_json_schema, test_client,
+                                                 mock_test_runs, db_session):
+        mock_valkey_client.ping.return_value = True
+        mock_validate_json_schema.return_value = True
+
+        test_dataset = mock_test_runs[0].test_dataset
+        test_dataset.status = TestDatasetStatus.Pending
+        db_session.commit()
+        try:
+            response = test_client.post("/test_runs/run_test", json=get_run_test_input(mock_test_runs[0]))
+            assert response.status_code == 400
+            assert response.json()["detail"] == "Test dataset status is pending"
+            mock_valkey_client.xadd.assert_not_called()
+        finally:
+            test_dataset.status = TestDatasetStatus.Valid
+            db_session.commit()
+
     def test_run_test_algorithm_not_found(self, mock_valkey_client, test_client):
         # Mock Valkey client to simulate active server
         mock_valkey_client.ping.return_value = True
@@ -141,6 +252,7 @@ class TestCancelTestRun:
         response = test_client.post(f"/test_runs/{test_run.id}/cancel")
         assert response.status_code == 200
         assert response.json()["status"] == "cancelled"
+        mock_valkey_client.xdel.assert_called_once_with(TASK_STREAM_NAME, test_run.job_id)
 
     def test_cancel_test_run_not_found(self, test_client):
         response = test_client.post("/test_runs/123e4567-e89b-12d3-a456-426614174000/cancel")
@@ -20,12 +20,6 @@ def init_group():
             groupname=TASK_GROUP_NAME,
             mkstream=True,
         )
-        # client.xautoclaim(
-        #     name=TASK_STREAM_NAME,
-        #     groupname=TASK_GROUP_NAME,
-        #     consumername='worker',
-        #     count=1
-        # )
         logger.info(f"Created STREAM {TASK_STREAM_NAME}")
     except ResponseError:
         pass
@@ -2,5 +2,10 @@ import os
 
 TASK_STREAM_NAME = "aiverify:worker:task_queue"
 TASK_GROUP_NAME = "aiverify_workers"
+# hash of the task stream names and their priority lanes, the streams of each project are registered by the apigw
+TASK_STREAMS_KEY = "aiverify:worker:task_streams"
+TASK_LANES = ["high", "normal", "low"]  # in priority order
+# tasks that cannot be completed, with the reason of the failure
+TASK_DEAD_LETTER_STREAM_NAME = "aiverify:worker:task_dead_letter"
 
 APIGW_URL = os.getenv("APIGW_URL", "http://127.0.0.1:4000").rstrip("/")
@@ -1,7 +1,13 @@
 import os
+from contextlib import contextmanager
 from pathlib import Path
+import fcntl
+import json
+import re
 import shutil
 import hashlib
+import threading
+import time
 import zipfile
 
 from .logging import logger
@@ -39,23 +45,214 @@ base_data_dir: Path = get_base_data_dir()
 # base_model_dir = get_data_subdir("models")
 # base_dataset_dir = get_data_subdir("datasets")
 
+# suffixes of the files kept alongside each cache entry
+CACHE_METADATA_SUFFIXES = (".hash", ".lock", ".use", ".meta")
+CACHE_STATS_FILENAME = ".stats.json"
+HASH_INDEX_DIRNAME = ".by_hash"  # maps content hash to the pathname of the entry storing the content
+
+# cache entries in use by the task running in this process, see FileCache.acquire
+_acquired_entries: dict[str, object] = {}
+_acquired_entries_lock = threading.Lock()
+
+
+def release_cache_entries():
+    """Release all cache entries acquired by this process, making them available for eviction"""
+    with _acquired_entries_lock:
+        while _acquired_entries:
+            _, use_file = _acquired_entries.popitem()
+            use_file.close()  # type: ignore
+
+
+def get_path_size(path: Path) -> int:
+    """Return the total size in bytes of a file, or of all files under a folder"""
+    if not path.is_dir() or path.is_symlink():
+        return path.lstat().st_size
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
 class FileCache:
-    def __init__(self, subdir_name: str) -> None:
+    def __init__(self, subdir_name: str, max_size: int | None = None, eviction_policy: str | None = None) -> None:
         """Constructor for FileCache
 
         Args:
             subdir_name (str): name of data subdir
+            max_size (int | None): maximum size of the cache in bytes, 0 for no limit. Defaults to
+                TEWORKER_CACHE_MAX_SIZE_<SUBDIR_NAME> in MB.
+            eviction_policy (str | None): "lru" to evict the least recently used entries first, or "lfu" to evict the
+                least frequently used entries first. Defaults to TEWORKER_CACHE_EVICTION_POLICY.
         """
         self.subdir_name = subdir_name
         subdir = base_data_dir.joinpath(subdir_name)
         if not subdir.exists():
             subdir.mkdir(parents=True, exist_ok=True)
         self.subdir = subdir
+        if max_size is None:
+            max_size = int(os.getenv(f"TEWORKER_CACHE_MAX_SIZE_{subdir_name.upper()}", "0")) * 1024 * 1024
+        self.max_size = max_size
+        self.eviction_policy = (eviction_policy or os.getenv("TEWORKER_CACHE_EVICTION_POLICY", "lru")).lower()
+        if self.eviction_policy not in ("lru", "lfu"):
+            raise InvalidFileCache(f"Invalid cache eviction policy {self.eviction_policy}")
 
     def get_cache_paths(self, pathname: str):
         hash_filename = f"{pathname}.hash"
         return (self.subdir.joinpath(pathname), self.subdir.joinpath(hash_filename))
 
+    @contextmanager
+    def lock(self, pathname: str):
+        """Hold an exclusive lock on pathname, so that concurrent tasks do not download or store the same path
+
+        Args:
+            pathname (str): filename of file or folder to lock
+        """
+        lock_path = self.subdir.joinpath(f"{pathname}.lock")
+        with open(lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def acquire(self, pathname: str):
+        """Mark pathname as in use by the running task, so that it is not evicted until release_cache_entries is called.
+
+        Args:
+            pathname (str): filename of file or folder to acquire
+        """
+        use_path = self.subdir.joinpath(f"{pathname}.use")
+        with _acquired_entries_lock:
+            if str(use_path) in _acquired_entries:
+                return
+            use_file = open(use_path, 'w')
+            # shared lock, blocks only while the entry is being evicted
+            fcntl.flock(use_file, fcntl.LOCK_SH)
+            _acquired_entries[str(use_path)] = use_file
+
+    def _read_metadata(self, pathname: str) -> dict:
+        meta_path = self.subdir.joinpath(f"{pathname}.meta")
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, path: Path, data: dict):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _touch(self, pathname: str):
+        # record the last access time and access count used for eviction
+        metadata = self._read_metadata(pathname)
+        metadata["last_access"] = time.time()
+        metadata["access_count"] = metadata.get("access_count", 0) + 1
+        self._write_json(self.subdir.joinpath(f"{pathname}.meta"), metadata)
+
+    def _update_stats(self, **increments: int):
+        stats_path = self.subdir.joinpath(CACHE_STATS_FILENAME)
+        with open(self.subdir.joinpath(f"{CACHE_STATS_FILENAME}.lock"), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                with open(stats_path, 'r') as f:
+                    stats = json.load(f)
+            except (OSError, ValueError):
+                stats = {}
+            for key, value in increments.items():
+                stats[key] = stats.get(key, 0) + value
+            self._write_json(stats_path, stats)
+
+    def get_stats(self) -> dict:
+        """Return the cache statistics
+
+        Returns:
+            dict: hits, misses, evictions, evicted_bytes and linked (entries aliased to cached content with the
+                same hash instead of downloaded) since the cache was created, and the current
+                number of entries and size in bytes
+        """
+        try:
+            with open(self.subdir.joinpath(CACHE_STATS_FILENAME), 'r') as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {}
+        entries = self.get_entries()
+        return {
+            "hits": stats.get("hits", 0),
+            "misses": stats.get("misses", 0),
+            "evictions": stats.get("evictions", 0),
+            "evicted_bytes": stats.get("evicted_bytes", 0),
+            "linked": stats.get("linked", 0),
+            "entries": len(entries),
+            "bytes": sum(entry["size"] for entry in entries),
+            "max_bytes": self.max_size,
+        }
+
+    def get_entries(self) -> list[dict]:
+        """Return the cache entries with their size, last access time and access count"""
+        entries = []
+        for path in self.subdir.iterdir():
+            if path.name.startswith(".") or path.name.endswith(CACHE_METADATA_SUFFIXES) or path.name.endswith(".tmp"):
+                continue
+            try:
+                size = get_path_size(path)
+            except OSError:
+                continue  # deleted while listing
+            metadata = self._read_metadata(path.name)
+            entries.append({
+                "pathname": path.name,
+                "size": size,
+                "last_access": metadata.get("last_access", path.lstat().st_mtime),
+                "access_count": metadata.get("access_count", 0),
+            })
+        return entries
+
+    def evict(self) -> int:
+        """Evict entries until the cache size is within max_size. Entries in use are never evicted.
+
+        Returns:
+            int: number of entries evicted
+        """
+        if not self.max_size:
+            return 0
+        entries = self.get_entries()
+        total_size = sum(entry["size"] for entry in entries)
+        if total_size <= self.max_size:
+            return 0
+        if self.eviction_policy == "lfu":
+            entries.sort(key=lambda entry: (entry["access_count"], entry["last_access"]))
+        else:
+            entries.sort(key=lambda entry: entry["last_access"])
+        evicted = 0
+        evicted_bytes = 0
+        for entry in entries:
+            if total_size <= self.max_size:
+                break
+            pathname = entry["pathname"]
+            with open(self.subdir.joinpath(f"{pathname}.use"), 'w') as use_file:
+                try:
+                    fcntl.flock(use_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    logger.debug(f"Cache entry {pathname} in use, not evicted")
+                    continue
+                logger.info(f"Evicting {pathname} ({entry['size']} bytes) from {self.subdir_name} cache")
+                self.delete_cache(pathname)
+                fcntl.flock(use_file, fcntl.LOCK_UN)
+            total_size -= entry["size"]
+            evicted += 1
+            evicted_bytes += entry["size"]
+        if evicted:
+            self._update_stats(evictions=evicted, evicted_bytes=evicted_bytes)
+        if total_size > self.max_size:
+            logger.warning(f"{self.subdir_name} cache size {total_size} exceeds limit {self.max_size}, "
+                           "remaining entries are in use")
+        return evicted
+
     def get_cached(self, pathname: str, hash: str | None) -> Path | None:
         """Return path if exists, otherwise return None
 
@@ -64,8 +261,36 @@ class FileCache:
             hash (str | None): hash of file or folder zip
 
         Returns:
-            Path|None: Path if exists, None if path not exists or does not match hash
+            Path|None: Path if exists, None if path not exists or does not match hash. If pathname is an alias
+                created by link_cached, the path of the linked entry is returned and the entry is acquired.
         """
+        cached_path = self._get_cached_path(pathname, hash)
+        if cached_path is None:
+            self._update_stats(misses=1)
+        else:
+            self._update_stats(hits=1)
+            self._touch(pathname)
+            if cached_path.name != pathname:
+                self._touch(cached_path.name)
+        return cached_path
+
+    def get_hash(self, pathname: str) -> str | None:
+        """Return the hash of the cache entry of pathname, or None if the entry has no hash"""
+        return self._read_hash(pathname)
+
+    def _read_hash(self, pathname: str) -> str | None:
+        try:
+            with open(self.subdir.joinpath(f"{pathname}.hash"), 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _get_hash_index_path(self, file_hash: str) -> Path | None:
+        if not re.fullmatch(r"[A-Za-z0-9_\-]+", file_hash):
+            return None
+        return self.subdir.joinpath(HASH_INDEX_DIRNAME, file_hash)
+
+    def _get_cached_path(self, pathname: str, hash: str | None) -> Path | None:
         cache_path, hash_path = self.get_cache_paths(pathname)
         logger.debug(f"cache_path: {cache_path}")
         if not cache_path.exists():
@@ -75,13 +300,57 @@ class FileCache:
                 return None
             with open(hash_path, 'r') as f:
                 stored_hash = f.read().strip()
-                return None if stored_hash != hash else cache_path
-        else:
-            return cache_path
+                if stored_hash != hash:
+                    return None
+        if cache_path.is_symlink():
+            # alias of an entry with the same content, return the path of that entry if it has not changed.
+            # The entry is acquired first so that it is not evicted while the alias is in use.
+            target_name = os.readlink(cache_path)
+            self.acquire(target_name)
+            target_path = self.subdir.joinpath(target_name)
+            if not target_path.exists() or self._read_hash(target_name) != self._read_hash(pathname):
+                return None
+            return target_path
+        return cache_path
+
+    def link_cached(self, pathname: str, file_hash: str) -> Path | None:
+        """Alias pathname to a cached entry with the same content hash, so that identical content is not
+        downloaded and stored again. The aliased entry is acquired for the running task.
+
+        Args:
+            pathname (str): filename of file or folder to alias
+            file_hash (str): hash of file or folder zip
+
+        Returns:
+            Path|None: Path of the entry with the same content, None if there is no such entry
+        """
+        index_path = self._get_hash_index_path(file_hash)
+        if index_path is None or not index_path.exists():
+            return None
+        target_name = index_path.read_text().strip()
+        if target_name == pathname:
+            return None
+        self.acquire(target_name)
+        target_path = self._get_cached_path(target_name, file_hash)
+        if target_path is None or target_path.name != target_name:
+            return None
+        logger.debug(f"Linking {pathname} to cached {target_name} with the same hash")
+        self.delete_cache(pathname)
+        cache_path, hash_path = self.get_cache_paths(pathname)
+        os.symlink(target_name, cache_path)
+        with open(hash_path, 'w') as f:
+            f.write(file_hash)
+        self._touch(pathname)
+        self._touch(target_name)
+        self._update_stats(linked=1)
+        return target_path
 
     def delete_cache(self, pathname: str):
         cache_path, hash_path = self.get_cache_paths(pathname)
-        if cache_path.exists():  # delete existing path if any
+        if cache_path.is_symlink():  # alias, the linked entry is not deleted
+            logger.debug(f"Removing link {cache_path}")
+            cache_path.unlink()
+        elif cache_path.exists():  # delete existing path if any
             logger.debug(f"Removing {cache_path}")
             if cache_path.is_dir():
                 shutil.rmtree(cache_path)
@@ -90,6 +359,7 @@ class FileCache:
         if hash_path.exists():
             logger.debug(f"Removing {hash_path}")
             hash_path.unlink()
+        self.subdir.joinpath(f"{pathname}.meta").unlink(missing_ok=True)
 
     def store_cache(self, source_path: Path, pathname: str, file_hash: str | None) -> Path:
         """Store the source_path to cache. If source_path is a zip, it will be extracted.
@@ -119,7 +389,7 @@ class FileCache:
         # if is_zip:
         #     filename = filename[:-4]
         self.delete_cache(pathname)
-        cache_path, hash_path = self.get_cache_paths(pathname)
+        cache_path, _ = self.get_cache_paths(pathname)
         if is_zip:
             logger.debug(f"Extracting zip to {cache_path}")
             with zipfile.ZipFile(source_path, 'r') as zip_ref:
@@ -127,11 +397,37 @@ class FileCache:
         else:
             logger.debug(f"Copying file to {cache_path}")
             shutil.copy2(source_path, cache_path)
+        return self.commit_cache(pathname, file_hash)
+
+    def commit_cache(self, pathname: str, file_hash: str) -> Path:
+        """Record the file or folder created at the cache path of pathname as a cache entry with file_hash.
+        Used by store_cache, and to cache folders built in place such as virtual environments.
+
+        Args:
+            pathname (str): filename of file or folder to commit
+            file_hash (str): hash of the content
+
+        Returns:
+            Path: Path to cache_path
+        """
+        cache_path, hash_path = self.get_cache_paths(pathname)
         with open(hash_path, 'w') as f:
             f.write(file_hash)
+        index_path = self._get_hash_index_path(file_hash)
+        if index_path is not None:
+            index_path.parent.mkdir(exist_ok=True)
+            index_path.write_text(pathname)
+        self._touch(pathname)
+        self.evict()
         return cache_path
 
 
 algo_cache = FileCache(subdir_name="algorithms")
 model_cache = FileCache(subdir_name="models")
 dataset_cache = FileCache(subdir_name="datasets")
+venv_cache = FileCache(subdir_name="venvs")
+
+
+def get_cache_stats() -> dict[str, dict]:
+    """Return the statistics of the algorithm, model, dataset and virtual environment caches"""
+    return {cache.subdir_name: cache.get_stats() for cache in (algo_cache, model_cache, dataset_cache, venv_cache)}
@@ -1,10 +1,14 @@
 from ..pipe import Pipe, PipeException
 from ..schemas import PipelineData, PipeStageEnum
-from ...lib.filecache import FileCache, algo_cache, model_cache, dataset_cache
+from ...lib.filecache import FileCache, algo_cache, model_cache, dataset_cache, venv_cache
 from ...lib.logging import logger
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import hashlib
 import os
+import requests
+from requests.adapters import HTTPAdapter
 
 
 class ApigwDownload(Pipe):
@@ -19,10 +23,95 @@ class ApigwDownload(Pipe):
     def setup(self):
         self.apigw_url = os.getenv("APIGW_URL", "http://127.0.0.1:4000")
         # self.algo_cache = FileCache(subdir_name="algorithms")
-
-    def _download_from_apigw(self, cache: FileCache, url: str, target_filename: str, file_hash: str | None):
-        import urllib.request
-        from urllib.error import URLError, HTTPError
+        self.max_concurrent_downloads = max(1, int(os.getenv("TEWORKER_DOWNLOAD_CONCURRENCY", "4")))
+        self.download_retries = int(os.getenv("TEWORKER_DOWNLOAD_RETRIES", "3"))
+        self.download_timeout = int(os.getenv("TEWORKER_DOWNLOAD_TIMEOUT", "300"))
+        self.chunk_size = 1024 * 1024
+        # pooled connections to apigw, shared by the concurrent downloads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrent_downloads)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def teardown(self):
+        self.session.close()
+
+    def _stream_to_file(self, url: str, temp_path: Path, cached_hash: str | None = None) -> tuple[Path | None, str]:
+        """Stream the download to a file under temp_path, hashing the content while downloading.
+
+        If the connection fails, the download is resumed from the last byte received using a HTTP Range request,
+        or restarted if the server does not support ranges.
+
+        Args:
+            cached_hash (str | None): hash of the cached copy of the file. The file is not downloaded if the
+                hash matches the ETag of the file on the server.
+
+        Returns:
+            tuple[Path | None, str]: path of the downloaded file and its sha256 hash, or None and cached_hash if the
+                cached copy is current
+        """
+        file_path: Path | None = None
+        hasher = hashlib.sha256()
+        downloaded = 0
+        attempt = 0
+        etag: str | None = None
+        while True:
+            headers = {}
+            if downloaded > 0:
+                headers["Range"] = f"bytes={downloaded}-"
+                if etag:
+                    # the whole file is sent instead if it has changed since the download started
+                    headers["If-Range"] = etag
+            elif cached_hash:
+                headers["If-None-Match"] = f'"{cached_hash}"'
+            try:
+                with self.session.get(url, headers=headers, stream=True, timeout=self.download_timeout) as response:
+                    if response.status_code == 304:
+                        logger.debug(f"Cached copy of {url} is current")
+                        return None, cached_hash  # type: ignore
+                    if response.status_code == 416 or (downloaded > 0 and response.status_code == 200):
+                        # range not supported, restart the download
+                        logger.debug(f"Server did not resume download from byte {downloaded}, restarting")
+                        hasher = hashlib.sha256()
+                        downloaded = 0
+                        if response.status_code == 416:
+                            raise requests.ConnectionError("Requested range not satisfiable")
+                    response.raise_for_status()
+                    if downloaded == 0:
+                        etag = response.headers.get("ETag")
+
+                    if file_path is None:
+                        content_disposition = response.headers.get('Content-Disposition')
+                        if content_disposition:
+                            # Extract filename from Content-Disposition header
+                            filename = content_disposition.split('filename=')[-1].strip('"\'')
+                        else:
+                            # Fallback: Extract filename from the URL
+                            filename = os.path.basename(url)
+                        # Define the full path to save the file
+                        file_path = temp_path.joinpath(filename)
+
+                    with open(file_path, 'ab' if downloaded > 0 else 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            downloaded += len(chunk)
+
+                logger.debug(f"File downloaded and saved as: {file_path} ({downloaded} bytes)")
+                return file_path, hasher.hexdigest()
+
+            except requests.HTTPError:
+                raise
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                attempt += 1
+                if attempt > self.download_retries:
+                    raise
+                logger.warning(f"Download of {url} interrupted after {downloaded} bytes ({e}), "
+                               f"retry {attempt} of {self.download_retries}")
+
+    def _download_from_apigw(self, cache: FileCache, url: str, target_filename: str, file_hash: str | None,
+                             cached_path: Path | None = None):
+        """Download the file to the cache. If cached_path is set, the cached copy is returned if it is current."""
         import tempfile
 
         # Create a temporary directory
@@ -31,98 +120,122 @@ class ApigwDownload(Pipe):
             temp_path = Path(temp_dir).resolve()
 
             try:
-                # Open the URL and get the response
                 logger.debug(f"Downloading file from {url}")
-                with urllib.request.urlopen(url) as response:
-                    # Extract the filename from the response headers
-                    content_disposition = response.getheader('Content-Disposition')
-                    if content_disposition:
-                        # Extract filename from Content-Disposition header
-                        filename = content_disposition.split('filename=')[-1].strip('"\'')
-                    else:
-                        # Fallback: Extract filename from the URL
-                        filename = os.path.basename(url)
-
-                    # Define the full path to save the file
-                    file_path = temp_path.joinpath(filename)
-
-                    # Save the downloaded content to the file
-                    with open(file_path, 'wb') as f:
-                        f.write(response.read())
-
-                    logger.debug(f"File downloaded and saved as: {file_path}")
-
-            except HTTPError as e:
-                raise PipeException(f"HTTP Error: {e.code} - {e.reason}")
-            except URLError as e:
-                raise PipeException(f"URL Error: {e.reason}")
+                cached_hash = cache.get_hash(target_filename) if cached_path else None
+                file_path, downloaded_hash = self._stream_to_file(url, temp_path, cached_hash)
+            except requests.HTTPError as e:
+                raise PipeException(f"HTTP Error: {e.response.status_code} - {e.response.reason}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                raise PipeException(f"URL Error: {e}")
             except Exception as e:
                 raise PipeException(f"An unexpected error occurred: {e}")
 
-            # Store in cache
-            return cache.store_cache(file_path, target_filename, file_hash)
+            if file_path is None:
+                return cached_path
+            # Store in cache, the hash computed while downloading is used if the task does not provide one
+            return cache.store_cache(file_path, target_filename, file_hash or downloaded_hash)
+
+    def _get_cached(self, cache: FileCache, filename: str, file_hash: str | None) -> Path | None:
+        """Return the cached path of filename, or of a cached entry with the same content hash"""
+        cached_path = cache.get_cached(filename, file_hash)
+        if not cached_path and file_hash:
+            cached_path = cache.link_cached(filename, file_hash)
+        return cached_path
 
     def _download_algo(self, task_data: PipelineData):
-        # check filecache
-        algo_dir = algo_cache.get_cached(task_data.algorithm_id, task_data.task.algorithmHash)
-        # logger.debug(f"algo_dir: {algo_dir}")
-
-        if not algo_dir:  # download from apigw
-            url = f"{self.apigw_url}/plugins/{task_data.task.algorithmGID}/algorithms/{task_data.task.algorithmCID}"
-            algo_dir = self._download_from_apigw(algo_cache, url, task_data.algorithm_id, task_data.task.algorithmHash)
-            task_data.to_build = True  # run build after download
-        else:
-            # already in cache
-            task_data.to_build = False
-            logger.debug(f"Algorithm {task_data.algorithm_id} already in cache")
+        # check filecache, the algorithm is kept from eviction until the task completes
+        algo_cache.acquire(task_data.algorithm_id)
+        with algo_cache.lock(task_data.algorithm_id):
+            algo_dir = algo_cache.get_cached(task_data.algorithm_id, task_data.task.algorithmHash)
+            # logger.debug(f"algo_dir: {algo_dir}")
+
+            if not algo_dir:  # download from apigw
+                url = f"{self.apigw_url}/plugins/{task_data.task.algorithmGID}/algorithms/{task_data.task.algorithmCID}"
+                algo_dir = self._download_from_apigw(algo_cache, url, task_data.algorithm_id, task_data.task.algorithmHash)
+                task_data.to_build = True  # run build after download
+            else:
+                # already in cache
+                task_data.to_build = False
+                logger.debug(f"Algorithm {task_data.algorithm_id} already in cache")
+                venv_path = algo_dir.joinpath(".venv")
+                if venv_path.is_symlink():
+                    # pooled virtual environment, keep it from eviction or rebuild it if it has been evicted
+                    venv_cache.acquire(os.path.basename(os.readlink(venv_path)))
+                    task_data.to_build = not venv_path.exists()
 
         task_data.algorithm_path = algo_dir
 
+    def download_algorithm(self, task_data: PipelineData) -> PipelineData:
+        """Download only the algorithm of the task, used to build the algorithm ahead of the test runs"""
+        self._download_algo(task_data)
+        return task_data
+
     def _download_model(self, filename: str, file_hash: str | None):
         # check filecache
-        model_path = model_cache.get_cached(filename, file_hash)
-        # logger.debug(f"model_path: {model_path}")
-
-        if not model_path:  # download from apigw
-            url = f"{self.apigw_url}/storage/models/{filename}"
-            return self._download_from_apigw(model_cache, url, filename, file_hash)
-        else:
-            # already in cache
-            logger.debug(f"Model {model_path} already in cache")
-            return model_path
+        model_cache.acquire(filename)
+        with model_cache.lock(filename):
+            model_path = self._get_cached(model_cache, filename, file_hash)
+            # logger.debug(f"model_path: {model_path}")
+
+            if not model_path or not file_hash:  # download from apigw
+                # without the hash of the model, the cached copy is revalidated with the apigw
+                url = f"{self.apigw_url}/storage/models/{filename}"
+                return self._download_from_apigw(model_cache, url, filename, file_hash, model_path)
+            else:
+                # already in cache
+                logger.debug(f"Model {model_path} already in cache")
+                return model_path
 
     def _download_dataset(self, filename: str, file_hash: str | None):
         # check filecache
-        dataset_path = dataset_cache.get_cached(filename, file_hash)
-        # logger.debug(f"model_path: {model_path}")
-
-        if not dataset_path:  # download from apigw
-            url = f"{self.apigw_url}/storage/datasets/{filename}"
-            return self._download_from_apigw(dataset_cache, url, filename, file_hash)
-        else:
-            # already in cache
-            logger.debug(f"Dataset {dataset_path} already in cache")
-            return dataset_path
+        dataset_cache.acquire(filename)
+        with dataset_cache.lock(filename):
+            dataset_path = self._get_cached(dataset_cache, filename, file_hash)
+            # logger.debug(f"model_path: {model_path}")
+
+            if not dataset_path or not file_hash:  # download from apigw
+                # without the hash of the dataset, the cached copy is revalidated with the apigw
+                url = f"{self.apigw_url}/storage/datasets/{filename}"
+                return self._download_from_apigw(dataset_cache, url, filename, file_hash, dataset_path)
+            else:
+                # already in cache
+                logger.debug(f"Dataset {dataset_path} already in cache")
+                return dataset_path
 
     def execute(self, task_data: PipelineData) -> PipelineData:
         # Implementation of the download logic
         logger.debug(f"Execute Download task {task_data}")
 
-        self._download_algo(task_data)
-        task_data.model_path = self._download_model(task_data.task.modelFile, task_data.task.modelFileHash)
-        task_data.data_path = self._download_dataset(task_data.task.testDataset, task_data.task.testDatasetHash)
-        if task_data.task.groundTruthDataset:
-            task_data.ground_truth_path = self._download_dataset(
-                task_data.task.groundTruthDataset, task_data.task.groundTruthDatasetHash)
-            
-        # check if any of the algo arguments require dataset download
-        if task_data.task.algorithmArgs:
-            for key in task_data.task.algorithmArgs.keys():
-                value = task_data.task.algorithmArgs[key]
-                if isinstance(value, str) and value.startswith("_dataset_:"):
-                    ds = value[len("_dataset_:"):]
-                    p = self._download_dataset(ds, None)
-                    task_data.task.algorithmArgs[key] = p.absolute().as_posix()
+        # download the algorithm, model and datasets concurrently
+        task = task_data.task
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_downloads) as executor:
+            algo_future = executor.submit(self._download_algo, task_data)
+            model_future = executor.submit(self._download_model, task.modelFile, task.modelFileHash)
+            data_future = executor.submit(self._download_dataset, task.testDataset, task.testDatasetHash)
+            ground_truth_future = None
+            if (task.groundTruthDataset, task.groundTruthDatasetHash) == (task.testDataset, task.testDatasetHash):
+                ground_truth_future = data_future
+            elif task.groundTruthDataset:
+                ground_truth_future = executor.submit(
+                    self._download_dataset, task.groundTruthDataset, task.groundTruthDatasetHash)
+
+            # check if any of the algo arguments require dataset download
+            argument_futures = {}
+            if task.algorithmArgs:
+                for key in task.algorithmArgs.keys():
+                    value = task.algorithmArgs[key]
+                    if isinstance(value, str) and value.startswith("_dataset_:"):
+                        ds = value[len("_dataset_:"):]
+                        argument_futures[key] = executor.submit(self._download_dataset, ds, None)
+
+        # raise the first error, after all downloads have completed
+        algo_future.result()
+        task_data.model_path = model_future.result()
+        task_data.data_path = data_future.result()
+        if ground_truth_future is not None:
+            task_data.ground_truth_path = ground_truth_future.result()
+        for key, future in argument_futures.items():
+            task.algorithmArgs[key] = future.result().absolute().as_posix()
 
         # data.intermediate_data[self.pipe_stage] = {
         #     "hello": "world"
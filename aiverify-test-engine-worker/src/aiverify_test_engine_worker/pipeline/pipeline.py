@@ -86,6 +86,21 @@ class Pipeline:
         logger.info(f"Pipeline run complete")
         return task_data
 
+    def build(self, task_data: PipelineData) -> PipelineData:
+        """Download and build the algorithm of the task ahead of the test runs, e.g. when the plugin is uploaded."""
+        task_data.algorithm_id = f"{task_data.task.algorithmGID}_{task_data.task.algorithmCID}"
+        logger.info(f"Building algorithm {task_data.algorithm_id}")
+        for stage, pipe_instance in self.stages:
+            if stage == PipeStageEnum.DOWNLOAD:
+                download_algorithm = getattr(pipe_instance, "download_algorithm", None)
+                if download_algorithm is None:
+                    raise PipelineException(f"Download pipe {pipe_instance.pipe_name} does not support algorithm download")
+                task_data = download_algorithm(task_data)
+            elif stage == PipeStageEnum.PIPELINE_BUILD and task_data.to_build:
+                task_data = pipe_instance.execute(task_data)
+        logger.info(f"Algorithm {task_data.algorithm_id} build complete")
+        return task_data
+
     def teardown(self):
         """Call `teardown()` for each loaded pipe instance."""
         for _, pipe_instance in self.stages:
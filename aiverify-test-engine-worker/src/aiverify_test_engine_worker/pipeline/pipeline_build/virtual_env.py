@@ -1,10 +1,14 @@
 from ..pipe import Pipe, PipeException
 from ..schemas import PipelineData, PipeStageEnum
-from ...lib.filecache import algo_cache
+from ...lib.filecache import algo_cache, venv_cache
 from ...lib.logging import logger
 
+from pathlib import Path
+import hashlib
+import json
 import os
 import subprocess
+import tomllib
 
 
 class VirtualEnvironmentBuild(Pipe):
@@ -18,6 +22,91 @@ class VirtualEnvironmentBuild(Pipe):
 
     def setup(self):
         self.python_bin = os.getenv("PYTHON", "python3")
+        self.wheelhouse = os.getenv("TEWORKER_WHEELHOUSE")
+        self._python_version: str | None = None
+
+    def _get_python_version(self) -> str:
+        if self._python_version is None:
+            p = subprocess.run([self.python_bin, "-c", "import sys; print(sys.version)"],
+                               check=True, capture_output=True, text=True)
+            self._python_version = p.stdout.strip()
+        return self._python_version
+
+    @staticmethod
+    def get_requirements(algorithm_path: Path) -> list[str] | None:
+        """Return the requirements declared by the algorithm in pyproject.toml and requirements.txt.
+
+        Returns:
+            list[str] | None: the requirements, or None if the algorithm does not declare its requirements in a way
+                that can be installed without the algorithm folder (e.g. dynamic dependencies or local paths)
+        """
+        pyproject_path = algorithm_path.joinpath("pyproject.toml")
+        requirements_path = algorithm_path.joinpath("requirements.txt")
+        if not pyproject_path.exists() and not requirements_path.exists():
+            return None
+        requirements: list[str] = []
+        if pyproject_path.exists():
+            with open(pyproject_path, "rb") as f:
+                project = tomllib.load(f).get("project", {})
+            if "dependencies" in project.get("dynamic", []):
+                return None
+            requirements.extend(project.get("dependencies", []))
+        if requirements_path.exists():
+            for line in requirements_path.read_text().splitlines():
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                if line.startswith(("-", ".", "/")) or "file:" in line:
+                    return None  # options, local paths and other requirement files are not supported
+                requirements.append(line)
+        return sorted(set(requirements))
+
+    def get_venv_key(self, requirements: list[str]) -> str:
+        """Return the key of the pooled virtual environment for the requirements"""
+        key_data = {
+            "python": self._get_python_version(),
+            "requirements": requirements,
+            "wheelhouse": self.wheelhouse is not None,
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _build_pooled_venv(self, venv_key: str, requirements: list[str]) -> Path:
+        venv_path, _ = venv_cache.get_cache_paths(venv_key)
+        # remove any virtual environment left incomplete by a failed build
+        venv_cache.delete_cache(venv_key)
+        logger.info(f"Building virtual environment {venv_key} for requirements {requirements}")
+        try:
+            subprocess.run([self.python_bin, '-m', 'venv', "--system-site-packages", str(venv_path)], check=True)
+            if requirements:
+                pip_cmds = [str(venv_path.joinpath("bin", "pip")), 'install']
+                if self.wheelhouse:
+                    # install from the local wheelhouse only, without network access
+                    pip_cmds.extend(['--no-index', '--find-links', self.wheelhouse])
+                subprocess.run(pip_cmds + requirements, check=True)
+        except Exception:
+            venv_cache.delete_cache(venv_key)
+            raise
+        return venv_cache.commit_cache(venv_key, venv_key)
+
+    def _link_pooled_venv(self, algorithm_path: Path, requirements: list[str]):
+        """Link the algorithm .venv to the pooled virtual environment for its requirements, building it if needed"""
+        venv_key = self.get_venv_key(requirements)
+        # keep the virtual environment from eviction until the task completes
+        venv_cache.acquire(venv_key)
+        with venv_cache.lock(venv_key):
+            pooled_venv_path = venv_cache.get_cached(venv_key, venv_key)
+            if pooled_venv_path is None:
+                pooled_venv_path = self._build_pooled_venv(venv_key, requirements)
+            else:
+                logger.info(f"Reusing virtual environment {venv_key}")
+
+        venv_path = algorithm_path.joinpath('.venv')
+        if venv_path.is_symlink():
+            venv_path.unlink()
+        elif venv_path.exists():
+            import shutil
+            shutil.rmtree(venv_path)
+        venv_path.symlink_to(pooled_venv_path.absolute(), target_is_directory=True)
 
     def execute(self, task_data: PipelineData) -> PipelineData:
         logger.info(f"Building algorithm using venv under {task_data.algorithm_path}")
@@ -25,6 +114,13 @@ class VirtualEnvironmentBuild(Pipe):
             # Get algorithm path from pipeline data
             algorithm_path = task_data.algorithm_path
 
+            # Algorithms that declare their requirements share a virtual environment keyed by the requirements,
+            # so a new version of an algorithm with the same requirements does not need to be built again
+            requirements = self.get_requirements(algorithm_path)
+            if requirements is not None:
+                self._link_pooled_venv(algorithm_path, requirements)
+                return task_data
+
             # Create virtual environment
             venv_path = algorithm_path.joinpath('.venv')
             if not venv_path.exists():
@@ -1,14 +1,39 @@
 from ..pipe import Pipe, PipeException
 from ..schemas import PipelineData, PipeStageEnum
+from ...lib.client import worker_id
+from ...lib.filecache import base_data_dir, model_cache, dataset_cache
 from ...lib.logging import logger
 
+from collections import OrderedDict
+from dataclasses import dataclass
 import os
 import json
+import shutil
+import socket
 import subprocess
 from pathlib import Path
 import uuid
 
 
+# cache folders mounted read-only into the algorithm containers in mount mode
+CONTAINER_CACHE_MOUNTS = {
+    "/app/cache/models": model_cache,
+    "/app/cache/datasets": dataset_cache,
+}
+CONTAINER_OUTPUT_DIR = "/app/output"
+CONTAINER_DATA_DIR = "/app/data"
+# labels of the algorithm containers, to find the containers left running by a worker that has stopped
+OWNER_LABEL = "aiverify.worker.owner"
+WORKER_LABEL = "aiverify.worker.id"
+
+
+@dataclass
+class AlgorithmContainer:
+    name: str
+    tag: str
+    output_dir: Path  # host folder mounted as the container output folder
+
+
 class DockerRun(Pipe):
     @property
     def pipe_stage(self) -> PipeStageEnum:
@@ -25,16 +50,197 @@ class DockerRun(Pipe):
         self.docker_registry = os.getenv("DOCKER_REGISTRY", None)
         if self.docker_registry and len(self.docker_registry) == 0:
             self.docker_registry = None
+        self.run_mode = os.getenv("DOCKER_RUN_MODE", "copy").lower()
+        if self.run_mode not in ("copy", "mount"):
+            raise PipeException(f"Invalid DOCKER_RUN_MODE {self.run_mode}, must be copy or mount")
+        self.max_containers = int(os.getenv("DOCKER_RUN_MAX_CONTAINERS", "4"))
+        self.containers: OrderedDict[str, AlgorithmContainer] = OrderedDict()
+        self.container_output_dir = base_data_dir.joinpath("docker_output")
+        self.owner = os.getenv("DOCKER_RUN_OWNER") or socket.gethostname()
+        # the pipeline is set up by the worker process, and the task processes are forked from it
+        self.worker_pid = os.getpid()
+        self._remove_labelled_containers(f"{OWNER_LABEL}={self.owner}")
+
+    def teardown(self):
+        for key in list(self.containers.keys()):
+            self._stop_container(key)
+        if os.getpid() == self.worker_pid:
+            # worker shutdown: remove the containers of all the task processes
+            self._remove_labelled_containers(f"{WORKER_LABEL}={worker_id}")
+
+    def _get_labels(self) -> list[str]:
+        return ["--label", f"{OWNER_LABEL}={self.owner}", "--label", f"{WORKER_LABEL}={worker_id}"]
+
+    def _remove_labelled_containers(self, label: str):
+        """Remove the algorithm containers with the label, e.g. left running by a previous worker of this owner"""
+        try:
+            p = subprocess.run([self.docker_bin, "ps", "-aq", "--filter", f"label={label}"],
+                               capture_output=True, text=True)
+            container_ids = p.stdout.split() if p.returncode == 0 else []
+            if container_ids:
+                logger.info(f"Removing {len(container_ids)} algorithm containers with label {label}")
+                subprocess.run([self.docker_bin, "rm", "-f", *container_ids], capture_output=True)
+        except Exception as e:
+            logger.warning(f"Unable to remove algorithm containers with label {label}: {e}")
+
+    def _get_tag(self, task_data: PipelineData) -> str:
+        tag = f"{task_data.task.algorithmCID}:{task_data.task.algorithmHash[:128] if task_data.task.algorithmHash else 'latest'}"
+        if self.docker_registry:
+            tag = f"{self.docker_registry}/{tag}"
+        return tag
+
+    def _get_exec_cmds(self, container_name: str, task_data: PipelineData, container_data_path: str,
+                       container_model_path: str, container_ground_truth_path: str | None, json_args: str) -> list[str]:
+        cmds = [
+            self.docker_bin,
+            "exec",
+            container_name,
+            "python", "-m", "scripts.algo_execute",
+            "--test_run_id", task_data.task.id,
+            # "--algo_path", f"/app/data/{task_data.algorithm_path.parent.name}/{task_data.algorithm_path.name}",
+            "--algo_path", f"/app/algo",
+            "--data_path", container_data_path,
+            "--model_path", container_model_path,
+            "--model_type", task_data.task.modelType.lower(),
+            "--algorithm_args", json_args,
+            "--apigw_url", self.apigw_url,
+        ]
+        if container_ground_truth_path is not None:
+            cmds.extend([
+                "--ground_truth_path", container_ground_truth_path,
+                "--ground_truth", task_data.task.groundTruth
+            ])
+        return cmds
+
+    def _stop_container(self, key: str):
+        container = self.containers.pop(key)
+        logger.debug(f"Stopping algorithm container {container.name} for {key}")
+        subprocess.run([self.docker_bin, "stop", container.name])  # don't care about exception
+        shutil.rmtree(container.output_dir, ignore_errors=True)
+
+    def _is_container_running(self, container: AlgorithmContainer) -> bool:
+        cmds = [self.docker_bin, "inspect", "-f", "{{.State.Running}}", container.name]
+        p = subprocess.run(cmds, capture_output=True, text=True)
+        return p.returncode == 0 and p.stdout.strip() == "true"
+
+    def _get_container(self, task_data: PipelineData) -> AlgorithmContainer:
+        """Return the running container of the algorithm, starting it with the cache folders mounted if needed"""
+        key = task_data.algorithm_id
+        tag = self._get_tag(task_data)
+        container = self.containers.get(key)
+        if container is not None:
+            # restart the container if the algorithm image is rebuilt or the container has exited
+            if task_data.to_build or container.tag != tag or not self._is_container_running(container):
+                self._stop_container(key)
+                container = None
+            else:
+                self.containers.move_to_end(key)
+                return container
+
+        container_name = uuid.uuid4().hex
+        output_dir = self.container_output_dir.joinpath(container_name)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        cmds = [self.docker_bin, "run", "--name", container_name, "--rm", "-d", *self._get_labels()]
+        for container_path, cache in CONTAINER_CACHE_MOUNTS.items():
+            cmds.extend(["-v", f"{cache.subdir.absolute().as_posix()}:{container_path}:ro"])
+        cmds.extend(["-v", f"{output_dir.absolute().as_posix()}:{CONTAINER_OUTPUT_DIR}"])
+        cmds.extend(["--entrypoint", "/bin/sh", tag, "-c", "trap : TERM INT; sleep infinity & wait", tag])
+        logger.info(f"Starting algorithm container {container_name} for {key}")
+        logger.debug(f"docker run infinite: {cmds}")
+        try:
+            subprocess.run(cmds, check=True)
+        except Exception:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            raise
+
+        container = AlgorithmContainer(name=container_name, tag=tag, output_dir=output_dir)
+        self.containers[key] = container
+        while len(self.containers) > self.max_containers:
+            self._stop_container(next(iter(self.containers)))
+        return container
+
+    def _get_container_path(self, container_name: str, path: Path, copied_paths: list[str]) -> str:
+        """Return the path of the file in the container, copying it into the container if not in a mounted cache.
+
+        The paths copied into the container are added to copied_paths, to be removed when the task completes.
+        """
+        path = path.absolute()
+        for container_path, cache in CONTAINER_CACHE_MOUNTS.items():
+            if path.is_relative_to(cache.subdir.absolute()):
+                return f"{container_path}/{path.relative_to(cache.subdir.absolute()).as_posix()}"
+        container_data_path = f"{CONTAINER_DATA_DIR}/{path.name}"
+        cmds = [self.docker_bin, "cp", path.as_posix(), f"{container_name}:{container_data_path}"]
+        logger.debug(f"docker cp: {cmds}")
+        subprocess.run(cmds, check=True)
+        copied_paths.append(container_data_path)
+        return container_data_path
+
+    def _remove_container_paths(self, container_name: str, paths: list[str]):
+        """Remove the task files copied into the long-lived container"""
+        if not paths:
+            return
+        cmds = [self.docker_bin, "exec", container_name, "rm", "-rf", *paths]
+        logger.debug(f"docker exec rm: {cmds}")
+        subprocess.run(cmds, capture_output=True)  # don't care about exception
+
+    def _execute_mounted(self, task_data: PipelineData) -> PipelineData:
+        """Run the algorithm in the long-lived container of the algorithm.
+
+        The model and dataset caches are mounted read-only and the output zip is written to a mounted folder,
+        so no artifacts are copied in or out of the container for each task.
+        """
+        try:
+            container = self._get_container(task_data)
+        except subprocess.CalledProcessError as e:
+            raise PipeException(f"Failed to run algorithm: {str(e)}")
+        copied_paths: list[str] = []
+        try:
+            container_data_path = self._get_container_path(container.name, task_data.data_path, copied_paths)
+            container_model_path = self._get_container_path(container.name, task_data.model_path, copied_paths)
+            container_ground_truth_path = None
+            if task_data.ground_truth_path and task_data.task.groundTruth:
+                container_ground_truth_path = self._get_container_path(container.name, task_data.ground_truth_path,
+                                                                       copied_paths)
+
+            json_args_dict = dict(task_data.task.algorithmArgs)
+            for key, value in json_args_dict.items():
+                if isinstance(value, str) and os.path.isabs(value) and os.path.exists(value):
+                    json_args_dict[key] = self._get_container_path(container.name, Path(value), copied_paths)
+
+            output_zip = container.output_dir.joinpath("output.zip")
+            output_zip.unlink(missing_ok=True)
+            cmds = self._get_exec_cmds(container.name, task_data, container_data_path, container_model_path,
+                                       container_ground_truth_path, json.dumps(json_args_dict))
+            cmds.extend(["--output_zip", f"{CONTAINER_OUTPUT_DIR}/{output_zip.name}"])
+            logger.debug(f"cmds: {cmds}")
+            p = subprocess.run(cmds, check=True, capture_output=True)
+            if p.returncode != 0:
+                raise PipeException(f"Error executing algorithm: {p.stderr}")
+
+            if not output_zip.exists():
+                raise PipeException(f"Output zip not generated")
+
+            task_data.output_zip = output_zip
+            return task_data
+
+        except subprocess.CalledProcessError as e:
+            raise PipeException(f"Failed to run algorithm: {str(e)}")
+        except PipeException:
+            raise
+        except Exception as e:
+            raise PipeException(f"Unexpected error during algorithm execute: {str(e)}")
+        finally:
+            self._remove_container_paths(container.name, copied_paths)
 
     def execute(self, task_data: PipelineData) -> PipelineData:
         logger.info(f"Executing algorithm using docker run under {task_data.algorithm_path}")
+        if self.run_mode == "mount":
+            return self._execute_mounted(task_data)
         try:
             # output_folder = task_data.algorithm_path.joinpath("output")
             # if output_folder.exists():
             #     shutil.rmtree(output_folder)
-            tag = f"{task_data.task.algorithmCID}:{task_data.task.algorithmHash[:128] if task_data.task.algorithmHash else 'latest'}"
-            if self.docker_registry:
-                tag = f"{self.docker_registry}/{tag}"
+            tag = self._get_tag(task_data)
             container_name = uuid.uuid4().hex
             logger.debug(f"tag: {tag}, container_name: {container_name}")
 
@@ -45,6 +251,7 @@ class DockerRun(Pipe):
                 "--name", container_name,
                 "--rm",
                 "-d",
+                *self._get_labels(),
                 "--entrypoint",
                 "/bin/sh",
                 tag,
@@ -74,6 +281,7 @@ class DockerRun(Pipe):
             logger.debug(f"docker cp model path: {cmds}")
             subprocess.run(cmds, check=True)
             
+            container_ground_truth_path = None
             if task_data.ground_truth_path and task_data.task.groundTruth:
                 if task_data.ground_truth_path.samefile(task_data.data_path):
                     container_ground_truth_path = container_data_path
@@ -103,25 +311,8 @@ class DockerRun(Pipe):
             
             # docker exec
             # output_folder.chmod(0o777)
-            cmds = [
-                self.docker_bin,
-                "exec",
-                container_name,
-                "python", "-m", "scripts.algo_execute",
-                "--test_run_id", task_data.task.id,
-                # "--algo_path", f"/app/data/{task_data.algorithm_path.parent.name}/{task_data.algorithm_path.name}",
-                "--algo_path", f"/app/algo",
-                "--data_path", container_data_path,
-                "--model_path", container_model_path,
-                "--model_type", task_data.task.modelType.lower(),
-                "--algorithm_args", json_args,
-                "--apigw_url", self.apigw_url,
-            ]
-            if task_data.ground_truth_path and task_data.task.groundTruth:
-                cmds.extend([
-                    "--ground_truth_path", container_ground_truth_path,
-                    "--ground_truth", task_data.task.groundTruth
-                ])
+            cmds = self._get_exec_cmds(container_name, task_data, container_data_path, container_model_path,
+                                       container_ground_truth_path, json_args)
             logger.debug(f"cmds: {cmds}")
             print(" ".join(cmds))
 
@@ -160,9 +351,11 @@ class DockerRun(Pipe):
         except Exception as e:
             raise PipeException(f"Unexpected error during algorithm execute: {str(e)}")
         finally:
+            # remove the container together with the task files copied into it
             cmds = [
                 self.docker_bin,
-                "stop",
+                "rm",
+                "-f",
                 container_name,
             ]
             subprocess.run(cmds)  # don't care about exception
@@ -1,10 +1,13 @@
 from ..pipe import Pipe, PipeException
 from ..schemas import PipelineData, PipeStageEnum
+from ..scripts.progress_reporter import ProgressReporter, forward_progress
+from ...lib.filecache import base_data_dir
 from ...lib.logging import logger
 
 import os
 import json
 import subprocess
+import threading
 from pathlib import Path
 
 
@@ -22,6 +25,32 @@ class VirtualEnvironmentExecute(Pipe):
         self.script_dir = Path(__file__).parent.parent.joinpath("scripts").absolute()
         self.algo_execute = self.script_dir.joinpath("algo_execute.py")
         self.apigw_url = os.getenv("APIGW_URL", "http://127.0.0.1:4000")
+        self.prediction_cache_dir = base_data_dir.joinpath("predictions")
+        self.prediction_cache_max_size = os.getenv("TEWORKER_CACHE_MAX_SIZE_PREDICTIONS", "1024")
+        self.progress_interval = os.getenv("TEWORKER_PROGRESS_INTERVAL", "1")
+        self.progress_channel = os.getenv("TEWORKER_PROGRESS_CHANNEL", "apigw").lower()
+        if self.progress_channel not in ("apigw", "pipe"):
+            raise PipeException(f"Invalid TEWORKER_PROGRESS_CHANNEL {self.progress_channel}, must be apigw or pipe")
+        self.progress_reporter: ProgressReporter | None = None
+        if self.progress_channel == "pipe":
+            # the algorithm writes the progress to a pipe, and the updates are forwarded to apigw by the worker
+            self.progress_reporter = ProgressReporter(self.apigw_url, float(self.progress_interval))
+
+    def teardown(self):
+        if self.progress_reporter is not None:
+            self.progress_reporter.close()
+
+    def _run_with_progress_pipe(self, cmds: list[str], **kwargs) -> subprocess.CompletedProcess:
+        read_fd, write_fd = os.pipe()
+        forwarder = threading.Thread(target=forward_progress, args=(os.fdopen(read_fd, "r"), self.progress_reporter),
+                                     daemon=True)
+        forwarder.start()
+        try:
+            return subprocess.run(cmds + ["--progress_fd", str(write_fd)], pass_fds=(write_fd,), **kwargs)
+        finally:
+            os.close(write_fd)
+            forwarder.join()
+            self.progress_reporter.flush(timeout=10)  # type: ignore
 
     def execute(self, task_data: PipelineData) -> PipelineData:
         logger.info(f"Executing algorithm using venv under {task_data.algorithm_path}")
@@ -42,6 +71,9 @@ class VirtualEnvironmentExecute(Pipe):
                 "--model_type", task_data.task.modelType.lower(),
                 "--algorithm_args", json.dumps(task_data.task.algorithmArgs),
                 "--apigw_url", self.apigw_url,
+                "--prediction_cache_dir", str(self.prediction_cache_dir),
+                "--prediction_cache_max_size", self.prediction_cache_max_size,
+                "--progress_interval", self.progress_interval,
             ]
             if task_data.ground_truth_path:
                 cmds.extend([
@@ -51,11 +83,15 @@ class VirtualEnvironmentExecute(Pipe):
             logger.debug(f"cmds: {cmds}")
 
             # Install the algorithm package in editable mode
-            p = subprocess.run(cmds,
-                               cwd=task_data.algorithm_path, check=True,
-                               capture_output=True,
-                               env={"PYTHONPATH": self.script_dir.parent.as_posix()}
-                               )
+            run_kwargs = dict(
+                cwd=task_data.algorithm_path, check=True,
+                capture_output=True,
+                env={"PYTHONPATH": self.script_dir.parent.as_posix()}
+            )
+            if self.progress_reporter is not None:
+                p = self._run_with_progress_pipe(cmds, **run_kwargs)
+            else:
+                p = subprocess.run(cmds, **run_kwargs)
             if p.returncode != 0:
                 raise PipeException(f"Error executing algorithm: {p.stderr}")
             # logger.debug(p.stdout)  # log the stdout as debug
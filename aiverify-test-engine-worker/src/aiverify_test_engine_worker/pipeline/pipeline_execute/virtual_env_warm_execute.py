@@ -0,0 +1,183 @@
+from ..pipe import Pipe, PipeException
+from ..schemas import PipelineData, PipeStageEnum
+from ...lib.filecache import base_data_dir
+from ...lib.logging import logger
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import os
+import json
+import queue
+import signal
+import subprocess
+import threading
+from pathlib import Path
+
+
+@dataclass
+class WarmExecutor:
+    process: subprocess.Popen
+    algorithm_hash: str | None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # response lines read from the executor stdout, an empty line when the executor exits
+    responses: queue.Queue = field(default_factory=queue.Queue)
+
+    def start_reader(self):
+        """Read the responses in a thread, so that a response can be waited for with a timeout."""
+        def read_responses():
+            for line in iter(self.process.stdout.readline, ""):  # type: ignore
+                self.responses.put(line)
+            self.responses.put("")
+
+        threading.Thread(target=read_responses, daemon=True).start()
+
+    def kill(self):
+        """Kill the executor and the task process it has forked."""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (OSError, TypeError):
+            self.process.kill()
+
+
+class VirtualEnvironmentWarmExecute(Pipe):
+    """Execute algorithms in a long-lived executor process per algorithm venv.
+
+    The executor (scripts.algo_executor) keeps the test engine, algorithm modules and the loaded
+    models and datasets in memory, so back-to-back tests do not pay the start up cost again.
+    """
+    @property
+    def pipe_stage(self) -> PipeStageEnum:
+        return PipeStageEnum.PIPELINE_EXECUTE
+
+    @property
+    def pipe_name(self) -> str:
+        return "virtual_environment_warm_execute"
+
+    def setup(self):
+        self.script_dir = Path(__file__).parent.parent.joinpath("scripts").absolute()
+        self.apigw_url = os.getenv("APIGW_URL", "http://127.0.0.1:4000")
+        self.prediction_cache_dir = base_data_dir.joinpath("predictions")
+        self.prediction_cache_max_size = os.getenv("TEWORKER_CACHE_MAX_SIZE_PREDICTIONS", "1024")
+        self.max_executors = int(os.getenv("WARM_EXECUTOR_MAX", "4"))
+        self.cache_size = os.getenv("ALGO_EXECUTOR_CACHE_SIZE", "4")
+        self.progress_interval = os.getenv("TEWORKER_PROGRESS_INTERVAL", "1")
+        self.timeout = float(os.getenv("WARM_EXECUTOR_TIMEOUT", "3600"))
+        self.executors: OrderedDict[str, WarmExecutor] = OrderedDict()
+        self.executors_lock = threading.Lock()
+
+    def teardown(self):
+        with self.executors_lock:
+            for key in list(self.executors.keys()):
+                self._stop_executor(key)
+
+    def _stop_executor(self, key: str):
+        executor = self.executors.pop(key)
+        logger.debug(f"Stopping algorithm executor for {key}")
+        try:
+            executor.process.stdin.close()  # type: ignore
+            executor.process.wait(timeout=10)
+        except Exception:
+            executor.kill()
+
+    def _remove_executor(self, executor: WarmExecutor, kill: bool = False):
+        """Remove the executor so that the next task starts a new one, if it has not been replaced already."""
+        with self.executors_lock:
+            for key, registered in list(self.executors.items()):
+                if registered is executor:
+                    if kill:
+                        self.executors.pop(key)
+                    else:
+                        self._stop_executor(key)
+        if kill:
+            executor.kill()
+
+    def _get_executor(self, task_data: PipelineData) -> WarmExecutor:
+        python_executable = task_data.algorithm_path.joinpath(".venv", "bin", "python")
+        key = str(python_executable.absolute())
+        with self.executors_lock:
+            executor = self.executors.get(key)
+            if executor is not None:
+                # restart the executor if the algorithm is rebuilt or the executor has exited
+                if (
+                    task_data.to_build
+                    or executor.algorithm_hash != task_data.task.algorithmHash
+                    or executor.process.poll() is not None
+                ):
+                    self._stop_executor(key)
+                    executor = None
+                else:
+                    self.executors.move_to_end(key)
+
+            if executor is None:
+                logger.info(f"Starting algorithm executor under {task_data.algorithm_path}")
+                process = subprocess.Popen(
+                    [key, "-m", "scripts.algo_executor"],
+                    cwd=task_data.algorithm_path,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    text=True,
+                    # own process group, to kill the task process forked by the executor with it
+                    start_new_session=True,
+                    env={
+                        "PYTHONPATH": self.script_dir.parent.as_posix(),
+                        "ALGO_EXECUTOR_CACHE_SIZE": self.cache_size,
+                    },
+                )
+                executor = WarmExecutor(process=process, algorithm_hash=task_data.task.algorithmHash)
+                executor.start_reader()
+                self.executors[key] = executor
+                while len(self.executors) > self.max_executors:
+                    self._stop_executor(next(iter(self.executors)))
+            return executor
+
+    def execute(self, task_data: PipelineData) -> PipelineData:
+        logger.info(f"Executing algorithm using warm executor under {task_data.algorithm_path}")
+        try:
+            argv = [
+                "--test_run_id", task_data.task.id,
+                "--algo_path", str(task_data.algorithm_path.absolute()),
+                "--data_path", str(task_data.data_path.absolute()),
+                "--model_path", str(task_data.model_path.absolute()),
+                "--model_type", task_data.task.modelType.lower(),
+                "--algorithm_args", json.dumps(task_data.task.algorithmArgs),
+                "--apigw_url", self.apigw_url,
+                "--prediction_cache_dir", str(self.prediction_cache_dir),
+                "--prediction_cache_max_size", self.prediction_cache_max_size,
+                "--progress_interval", self.progress_interval,
+            ]
+            if task_data.ground_truth_path:
+                argv.extend([
+                    "--ground_truth_path", str(task_data.ground_truth_path.absolute()),
+                    "--ground_truth", task_data.task.groundTruth
+                ])
+            logger.debug(f"argv: {argv}")
+
+            executor = self._get_executor(task_data)
+            with executor.lock:
+                executor.process.stdin.write(json.dumps({"argv": argv}) + "\n")  # type: ignore
+                executor.process.stdin.flush()  # type: ignore
+                try:
+                    response_line = executor.responses.get(timeout=self.timeout)
+                except queue.Empty:
+                    # the task may be stuck, restart the executor for the next task
+                    self._remove_executor(executor, kill=True)
+                    raise PipeException(f"Algorithm executor timed out after {self.timeout} seconds")
+            if not response_line:
+                raise PipeException(f"Algorithm executor exited with code {executor.process.poll()}")
+
+            response = json.loads(response_line)
+            if response.get("restart"):
+                self._remove_executor(executor)
+            if response.get("status") != "success":
+                raise PipeException(f"Failed to run algorithm: {response.get('errorMessage')}")
+
+            task_data.output_zip = task_data.algorithm_path.joinpath("output.zip")
+            if not task_data.output_zip.exists():
+                raise PipeException(f"Output zip not generated")
+
+            return task_data
+
+        except PipeException:
+            raise
+        except Exception as e:
+            raise PipeException(f"Unexpected error during algorithm execute: {str(e)}")
@@ -11,6 +11,7 @@ from aiverify_test_engine.interfaces.ialgorithm import IAlgorithm
 from aiverify_test_engine.interfaces.imodel import IModel
 from aiverify_test_engine.interfaces.idata import IData
 from aiverify_test_engine.plugins.plugins_manager import PluginManager
+from aiverify_test_engine.plugins.prediction_cache import PredictionCache
 from aiverify_test_engine.plugins.enums.plugin_type import PluginType
 from pathlib import Path
 import argparse
@@ -21,8 +22,10 @@ import json
 import time
 import copy
 from zipfile import ZipFile
-from typing import Dict
+from typing import Any, Dict
 from .algorithm_utils import validate_algorithm
+from .file_utils import upload_file
+from .progress_reporter import ProgressReporter, PipeProgressReporter
 import logging
 from datetime import datetime
 import requests
@@ -101,7 +104,7 @@ def load_plugin_manager():
     return core_modules_path
 
 
-def parse_arguments():
+def parse_arguments(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(
         description="Execute algorithm with specified parameters.")
 
@@ -116,7 +119,7 @@ def parse_arguments():
                         help="Path to the ground truth data file.")
     parser.add_argument(
         "--ground_truth",
-        required="--ground_truth_path" in sys.argv,
+        required="--ground_truth_path" in (sys.argv if argv is None else argv),
         help="The ground truth column name in the data. Required if ground_truth_path is set."
     )
     parser.add_argument(
@@ -139,8 +142,17 @@ def parse_arguments():
         help="If set, results will be uploaded to the specified apigw URL (requires --apigw_url)"
     )
 
+    parser.add_argument("--progress_interval", type=float, default=1.0,
+                        help="Minimum interval in seconds between progress updates sent to apigw")
+    parser.add_argument("--progress_fd", type=int,
+                        help="File descriptor of a pipe to write progress updates to, instead of sending to apigw")
     parser.add_argument("--output_zip", type=Path,
                         help="Path to output zip file, default saved under algo_path")
+    parser.add_argument("--prediction_cache_dir", type=Path,
+                        help="Path to store model predictions for reuse by other algorithm runs, "
+                             "default predictions are only reused within this run")
+    parser.add_argument("--prediction_cache_max_size", type=int, default=0,
+                        help="Maximum size in MB of the predictions stored under prediction_cache_dir, 0 for no limit")
     parser.add_argument(
         "-v", "--verbose",
         action="count",
@@ -148,7 +160,7 @@ def parse_arguments():
         help="Increase verbosity level. Use -v for INFO, -vv for DEBUG."
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Post-parsing validation
     if args.upload_output_to_apigw and not args.apigw_url:
@@ -173,7 +185,7 @@ def parse_arguments():
     if not args.model_path.exists():
         logger.critical(f"Invalid model_path: {args.model_path}")
         exit(-1)
-    if not args.ground_truth_path.exists():
+    if args.ground_truth_path and not args.ground_truth_path.exists():
         logger.critical(f"Invalid ground_truth_path: {args.ground_truth_path}")
         exit(-1)
 
@@ -182,16 +194,38 @@ def parse_arguments():
 
     if args.apigw_url:
         ProcessCallback.apigw_url = args.apigw_url
+    ProcessCallback.progress_interval = args.progress_interval
+    ProcessCallback.progress_fd = args.progress_fd
 
     return args
 
 
 class ProcessCallback:
     apigw_url: str | None = None
+    progress_interval: float = 1.0
+    progress_fd: int | None = None
+    reporter: ProgressReporter | PipeProgressReporter | None = None
 
     def __init__(self, test_run_id) -> None:
         self.test_run_id = test_run_id
 
+    @classmethod
+    def get_reporter(cls) -> ProgressReporter | PipeProgressReporter | None:
+        # created on the first progress update, so that forked task processes start their own reporter thread
+        if cls.reporter is None:
+            if cls.progress_fd is not None:
+                cls.reporter = PipeProgressReporter(cls.progress_fd)
+            elif cls.apigw_url:
+                cls.reporter = ProgressReporter(cls.apigw_url, cls.progress_interval)
+        return cls.reporter
+
+    @classmethod
+    def close_reporter(cls):
+        """Send the pending progress updates and stop the reporter"""
+        if cls.reporter is not None:
+            cls.reporter.close()
+            cls.reporter = None
+
     # @classmethod
     def progress_callback(self, completion_value: int):
         """
@@ -202,59 +236,126 @@ class ProcessCallback:
         """
         logger.info(
             f"[Test Run ID {self.test_run_id}] Progress Update: {completion_value}")
-        if not self.__class__.apigw_url:
+        reporter = self.get_reporter()
+        if reporter is None:
             # logger.error("API Gateway URL is not set.")
             return
 
-        import requests
-        url = f"{self.__class__.apigw_url}/test_runs/{self.test_run_id}"
-        payload = {"progress": completion_value}
+        # the update is sent by the reporter thread, so the algorithm does not wait for apigw
+        reporter.report(self.test_run_id, completion_value)
 
-        try:
-            requests.patch(url, json=payload)
-            # logger.debug(f"Progress reported successfully: {completion_value}")
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to report progress: {e}")
 
+def get_model_args(algorithm_args: dict) -> dict:
+    # inference options in the algorithm args are passed on to the model plugin
+    return {
+        key: algorithm_args[key]
+        for key in ("batch_size", "num_threads")
+        if key in algorithm_args
+    }
 
-def run():
 
-    args = parse_arguments()
-    # print(f"Executing algorithm {args.algo_path}")
-    algo_script, plugin_class, input_schema, output_schema, algo_meta = load_algorithm_class(
-        args.algo_path)
-    algo_src_path = algo_script.parent.absolute()
+def get_prediction_cache(prediction_cache_dir: Path | None, max_size: int = 0) -> str | bool:
+    # predictions of the same model on the same data are reused across algorithms
+    PredictionCache.set_max_disk_size(max_size * 1024 * 1024 if max_size > 0 else None)
+    return prediction_cache_dir.absolute().as_posix() if prediction_cache_dir else True
 
-    # validate input arguments
-    if not validate_json(args.algorithm_args, input_schema):
-        logger.critical(f"Invalid input arguments")
-        exit(-1)
-
-    # load plugin manager
-    core_modules_path = load_plugin_manager()
 
+def load_data(data_path: Path) -> tuple[IData, Any]:
     (data_instance, data_serializer, data_errmsg) = PluginManager.get_instance(
-        PluginType.DATA, **{"filename": args.data_path.absolute().as_posix()}
+        PluginType.DATA, **{"filename": data_path.absolute().as_posix()}
     )
     logger.debug(
         f"validate dataset. data_instance:{data_instance}, data_serializer: {data_serializer}, errmsg: {data_errmsg}")
     if not isinstance(data_instance, IData):
         logger.critical(f"Invalid dataset instance")
         exit(-1)
+    return data_instance, data_serializer
 
-    # try to load the model instance
-    run_as_pipeline = False
+
+def load_model(model_path: Path, model_args: dict, prediction_cache: str | bool) -> tuple[IModel | IPipeline, Any, bool]:
+    # try to load the model instance as pipeline first
     try:
         (model_instance, model_serializer, model_errmsg) = PluginManager.get_instance(
-            PluginType.PIPELINE, **{"pipeline_path": args.model_path.absolute().as_posix()}
+            PluginType.PIPELINE, **{"pipeline_path": model_path.absolute().as_posix(),
+                                    "pipeline_args": model_args,
+                                    "prediction_cache": prediction_cache}
         )
         logger.debug(
             f"validate pipeline. model_instance:{model_instance}, model_serializer: {model_serializer}, errmsg: {model_errmsg}")
         if not isinstance(model_instance, IPipeline):
             logger.critical(f"Invalid pipeline file")
             exit(-1)
+        return model_instance, model_serializer, True
 
-        run_as_pipeline = True
+    except:  # if exception, not pipeline
+        (model_instance, model_serializer, model_errmsg) = PluginManager.get_instance(
+            PluginType.MODEL, **{"filename": model_path.absolute().as_posix(),
+                                 "model_args": model_args,
+                                 "prediction_cache": prediction_cache}
+        )
+        logger.debug(
+            f"validate model. model_instance:{model_instance}, model_serializer: {model_serializer}, errmsg: {model_errmsg}")
+        if not isinstance(model_instance, IModel):
+            logger.critical(f"Invalid model file")
+            exit(-1)
+        return model_instance, model_serializer, False
+
+
+def run():
+
+    args = parse_arguments()
+    # print(f"Executing algorithm {args.algo_path}")
+    algo_script, plugin_class, input_schema, output_schema, algo_meta = load_algorithm_class(
+        args.algo_path)
+
+    # validate input arguments
+    if not validate_json(args.algorithm_args, input_schema):
+        logger.critical(f"Invalid input arguments")
+        exit(-1)
+
+    # load plugin manager
+    core_modules_path = load_plugin_manager()
+
+    data = load_data(args.data_path)
+    model = load_model(args.model_path, get_model_args(args.algorithm_args),
+                       get_prediction_cache(args.prediction_cache_dir, args.prediction_cache_max_size))
+    ground_truth = (None, None)
+    if args.ground_truth_path:
+        # identical datasets are cached at the same path, so load the dataset once
+        same_path = args.ground_truth_path.resolve() == args.data_path.resolve()
+        ground_truth = data if same_path else load_data(args.ground_truth_path)
+
+    execute_algorithm(args, algo_script, plugin_class, output_schema, algo_meta, core_modules_path,
+                      data, model, ground_truth)
+
+
+def execute_algorithm(
+    args: argparse.Namespace,
+    algo_script: Path,
+    plugin_class: type[IAlgorithm],
+    output_schema: dict,
+    algo_meta: dict,
+    core_modules_path: Path,
+    data: tuple[IData, Any],
+    model: tuple[IModel | IPipeline, Any, bool],
+    ground_truth: tuple[IData | None, Any],
+):
+    """Run the algorithm on the loaded data, model and ground truth instances, and write the output zip.
+
+    The instances are modified for the algorithm run (e.g. ground truth removed from the data),
+    so callers that reuse the loaded instances across runs should pass copies.
+    """
+    algo_src_path = algo_script.parent.absolute()
+    data_instance, data_serializer = data
+    model_instance, model_serializer, run_as_pipeline = model
+    ground_truth_data_instance, ground_truth_data_serializer = ground_truth
+    if ground_truth_data_instance is not None and ground_truth_data_instance is data_instance:
+        # the same dataset is used for the ground truth, which must keep the ground truth feature
+        ground_truth_data_instance = copy.deepcopy(data_instance)
+
+    initial_data_instance = None
+    initial_model_instance = None
+    if run_as_pipeline:
         initial_data_instance = copy.deepcopy(data_instance)
         initial_model_instance = copy.deepcopy(model_instance)
 
@@ -279,28 +380,8 @@ def run():
             logger.error(f"Unable to transform pipeline data: {e}")
             # probaby not best way to handle, but for now just ignore when data transformation exception
 
-    except:  # if exception, not pipeline
-        (model_instance, model_serializer, model_errmsg) = PluginManager.get_instance(
-            PluginType.MODEL, **{"filename": args.model_path.absolute().as_posix()}
-        )
-        logger.debug(
-            f"validate model. model_instance:{model_instance}, model_serializer: {model_serializer}, errmsg: {model_errmsg}")
-        if not isinstance(model_instance, IModel):
-            logger.critical(f"Invalid model file")
-            exit(-1)
-        initial_data_instance = None
-        initial_model_instance = None
-
     # load ground truth
-    if args.ground_truth_path:
-        (ground_truth_data_instance, ground_truth_data_serializer, ground_truth_data_errmsg) = PluginManager.get_instance(
-            PluginType.DATA, **{"filename": args.ground_truth_path.absolute().as_posix()}
-        )
-        logging.debug(
-            f"validate ground truth dataset. data_instance:{ground_truth_data_instance}, data_serializer: {ground_truth_data_serializer}, errmsg: {ground_truth_data_errmsg}")
-        if not isinstance(ground_truth_data_instance, IData):
-            logger.critical(f"Invalid dataset instance")
-            exit(-1)
+    if ground_truth_data_instance is not None:
         # Leave only the ground truth feature in self._ground_truth_instance and
         # Remove ground truth feature from the data instance
         # is_ground_truth_instance_success = (
@@ -316,6 +397,9 @@ def run():
         #     )
         #     exit(-1)
 
+    # only the predictions of the dataset are stored on disk for other runs, not those of the perturbed data
+    PredictionCache.set_datasets([data_instance.get_data()])
+
     # set the input arguments
     input_arguments: Dict = copy.deepcopy(args.algorithm_args)
     input_arguments["ground_truth"] = args.ground_truth
@@ -346,7 +430,11 @@ def run():
     )
     # Generate the results using this plugin
     logger.debug("Generating the results with the plugin...")
-    plugin.generate()
+    try:
+        plugin.generate()
+    finally:
+        # the progress updates are sent before the results are uploaded
+        ProcessCallback.close_reporter()
     time_taken = time.time() - start_time
 
     # Get the task results and convert to json friendly and validate against the output schema
@@ -446,20 +534,16 @@ def run():
         upload_url = f"{args.apigw_url}/test_results/upload_zip"
 
         try:
-            with open(output_zip_path, 'rb') as zip_file:
-                # Prepare the files dictionary for the POST request
-                files = {'file': zip_file}
-
-                # Send the POST request to upload the zip file
-                response = requests.post(upload_url, files=files)
-
-                # Check if the upload was successful
-                if response.status_code == 200:
-                    logger.debug(
-                        f"Successfully uploaded zip file to {upload_url}")
-                else:
-                    logger.error(
-                        f"Failed to upload zip file. Status code: {response.status_code}, Response: {response.text}")
+            # Stream the zip file in a multipart POST request
+            response = upload_file(upload_url, output_zip_path)
+
+            # Check if the upload was successful
+            if response.status_code == 200:
+                logger.debug(
+                    f"Successfully uploaded zip file to {upload_url}")
+            else:
+                logger.error(
+                    f"Failed to upload zip file. Status code: {response.status_code}, Response: {response.text}")
 
         except FileNotFoundError:
             logger.error(f"Zip file not found at: {output_zip_path}")
@@ -0,0 +1,188 @@
+"""Long-lived algorithm executor for an algorithm virtual environment.
+
+The executor reads one JSON request per line from stdin, in the form {"argv": [<algo_execute arguments>]},
+and writes one JSON response per line, {"status": "success"} or {"status": "error", "errorMessage": ...}.
+The test engine is imported and the plugins discovered once. Algorithm modules, and the datasets and models
+deserialized by the test engine (keyed by file hash), are kept in memory across tasks. Each task runs in a
+forked child process, so a task sees the cached instances but its changes are discarded when it completes.
+
+Forking a process that has started threads can deadlock the child on a lock held by one of those threads.
+The plugin index is built in a child forked before any plugin is imported, so that the executor imports
+only the plugins it uses. Frameworks that start threads of their own (FORK_UNSAFE_MODULES) are not forked:
+once one is loaded, the task runs in the executor process and the response asks for the executor to be
+restarted ({"status": ..., "restart": true}), as the task may have changed the cached instances.
+"""
+from .algo_execute import (
+    execute_algorithm,
+    get_model_args,
+    get_prediction_cache,
+    load_algorithm_class,
+    load_data,
+    load_model,
+    load_plugin_manager,
+    logger,
+    parse_arguments,
+)
+from .file_utils import get_path_hash
+from aiverify_test_engine.utils.json_utils import validate_json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+import json
+import os
+import sys
+import traceback
+
+
+# frameworks that start thread pools when imported or used, which are not safe to fork
+FORK_UNSAFE_MODULES = ("tensorflow", "torch")
+
+
+def get_fork_unsafe_modules() -> list[str]:
+    """Return the fork unsafe frameworks loaded in this process."""
+    return [name for name in FORK_UNSAFE_MODULES if name in sys.modules]
+
+
+def build_plugin_index():
+    """Discover the plugins in a forked child so that the parent can discover them from the plugin index.
+
+    The first discovery of a plugin folder imports every plugin, including the plugins of frameworks that are not
+    safe to fork. The child writes the index, so that the executor only imports the plugins of the tasks it runs.
+    """
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 0
+        try:
+            load_plugin_manager()
+        except BaseException:
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    _, status = os.waitpid(pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        logger.warning(f"Unable to build the plugin index, exited with status {status}")
+
+
+class AlgoExecutor:
+    def __init__(self, core_modules_path: Path, max_cached_instances: int = 4) -> None:
+        self.core_modules_path = core_modules_path
+        self.max_cached_instances = max_cached_instances
+        self.algorithms: dict[str, tuple] = {}
+        self.instances: OrderedDict[tuple, Any] = OrderedDict()
+        self.path_hashes: dict[tuple, str] = {}
+
+    def _get_path_hash(self, path: Path) -> str:
+        # rehash only when the file has changed since it was last hashed
+        stat = path.stat()
+        key = (str(path.absolute()), stat.st_size, stat.st_mtime_ns)
+        if key not in self.path_hashes:
+            self.path_hashes[key] = get_path_hash(path)
+        return self.path_hashes[key]
+
+    def _get_instance(self, key: tuple, load_fn: Callable[[], Any]) -> Any:
+        if key in self.instances:
+            logger.debug(f"Reusing loaded instance {key}")
+            self.instances.move_to_end(key)
+            return self.instances[key]
+        instance = load_fn()
+        self.instances[key] = instance
+        while len(self.instances) > self.max_cached_instances:
+            self.instances.popitem(last=False)
+        return instance
+
+    def _get_algorithm(self, algo_path: Path) -> tuple:
+        key = str(algo_path.absolute())
+        if key not in self.algorithms:
+            self.algorithms[key] = load_algorithm_class(algo_path)
+        return self.algorithms[key]
+
+    def run_task(self, argv: list[str]) -> dict:
+        """Load or reuse the algorithm, data and model, then run the algorithm in a forked child process."""
+        args = parse_arguments(argv)
+        algo_script, plugin_class, input_schema, output_schema, algo_meta = self._get_algorithm(args.algo_path)
+
+        # validate input arguments
+        if not validate_json(args.algorithm_args, input_schema):
+            return {"status": "error", "errorMessage": "Invalid input arguments"}
+
+        model_args = get_model_args(args.algorithm_args)
+        prediction_cache = get_prediction_cache(args.prediction_cache_dir, args.prediction_cache_max_size)
+        data = self._get_instance(
+            ("data", self._get_path_hash(args.data_path)),
+            lambda: load_data(args.data_path),
+        )
+        model = self._get_instance(
+            ("model", self._get_path_hash(args.model_path), json.dumps(model_args, sort_keys=True), prediction_cache),
+            lambda: load_model(args.model_path, model_args, prediction_cache),
+        )
+        ground_truth = (None, None)
+        if args.ground_truth_path:
+            ground_truth = self._get_instance(
+                ("data", self._get_path_hash(args.ground_truth_path)),
+                lambda: load_data(args.ground_truth_path),
+            )
+
+        fork_unsafe_modules = get_fork_unsafe_modules()
+        if fork_unsafe_modules:
+            # run in this process and restart the executor, the task may have changed the cached instances
+            logger.info(f"Running task without fork, loaded {fork_unsafe_modules} are not fork safe")
+            try:
+                execute_algorithm(args, algo_script, plugin_class, output_schema, algo_meta, self.core_modules_path,
+                                  data, model, ground_truth)
+            except (Exception, SystemExit):
+                return {"status": "error", "errorMessage": traceback.format_exc(), "restart": True}
+            return {"status": "success", "restart": True}
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # child process: run the task and report any error through the pipe
+            os.close(read_fd)
+            exit_code = 0
+            try:
+                execute_algorithm(args, algo_script, plugin_class, output_schema, algo_meta, self.core_modules_path,
+                                  data, model, ground_truth)
+            except BaseException:
+                exit_code = 1
+                os.write(write_fd, traceback.format_exc().encode("utf-8"))
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(exit_code)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as error_pipe:
+            error_message = error_pipe.read().decode("utf-8")
+        _, status = os.waitpid(pid, 0)
+        if os.waitstatus_to_exitcode(status) != 0:
+            return {"status": "error", "errorMessage": error_message or f"Algorithm exited with status {status}"}
+        return {"status": "success"}
+
+
+def main():
+    # keep stdout for responses only, any output from the algorithms is redirected to stderr
+    response_file = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    build_plugin_index()
+    core_modules_path = load_plugin_manager()
+    executor = AlgoExecutor(core_modules_path, int(os.getenv("ALGO_EXECUTOR_CACHE_SIZE", "4")))
+    logger.info(f"Algorithm executor {os.getpid()} ready")
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            response = executor.run_task(request["argv"])
+        except (Exception, SystemExit):
+            # SystemExit is raised for invalid arguments
+            response = {"status": "error", "errorMessage": traceback.format_exc()}
+        response_file.write(json.dumps(response) + "\n")
+        response_file.flush()
+        if response.get("restart"):
+            break
+
+
+if __name__ == "__main__":
+    main()
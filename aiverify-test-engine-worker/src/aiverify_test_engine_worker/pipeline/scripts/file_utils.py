@@ -1,5 +1,9 @@
+import hashlib
+import uuid
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
+
+import requests
 
 
 def find_file_in_directory(dir_path: Path, filename: str, max_levels: int = 1):
@@ -23,3 +27,40 @@ def find_file_in_directory(dir_path: Path, filename: str, max_levels: int = 1):
                 if subdir.joinpath(filename).exists():
                     return subdir.joinpath(filename)
     return None
+
+
+def get_path_hash(path: Path) -> str:
+    """Return the sha256 hash of a file, or of the relative paths and contents of all files in a folder."""
+    hasher = hashlib.sha256()
+    file_paths = [path] if path.is_file() else sorted(item for item in path.rglob("*") if item.is_file())
+    for file_path in file_paths:
+        hasher.update(file_path.relative_to(path).as_posix().encode("utf-8"))
+        with open(file_path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def iter_multipart_file(file_path: Path, boundary: str, field_name: str = "file",
+                        chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Yield a multipart/form-data body with the file as its only part, reading the file in chunks."""
+    yield (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field_name}"; filename="{file_path.name}"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode("utf-8")
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+    yield f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+
+def upload_file(url: str, file_path: Path, session: requests.Session | None = None,
+                timeout: float | None = None) -> requests.Response:
+    """Upload the file as multipart/form-data with chunked transfer encoding, without reading the file into memory."""
+    boundary = uuid.uuid4().hex
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    body = iter_multipart_file(file_path, boundary)
+    if session is not None:
+        return session.post(url, data=body, headers=headers, timeout=timeout)
+    return requests.post(url, data=body, headers=headers, timeout=timeout)
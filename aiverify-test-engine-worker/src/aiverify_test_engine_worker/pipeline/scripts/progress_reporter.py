@@ -0,0 +1,126 @@
+"""Progress reporting from the algorithm process.
+
+The algorithms call the progress callback from their main loop, so reporting must not wait on the API GW.
+ProgressReporter sends the updates from a background thread, keeping only the latest progress of each test run
+and sending at most one update per interval. PipeProgressReporter writes the updates to a pipe read by the
+worker, which forwards them with its own ProgressReporter.
+"""
+from typing import IO
+import json
+import logging
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    def __init__(self, apigw_url: str, interval: float = 1.0, timeout: float = 10.0) -> None:
+        self.apigw_url = apigw_url
+        self.interval = interval
+        self.timeout = timeout
+        self._pending: dict[str, int] = {}
+        self._sending = False
+        self._flush_requested = False
+        self._closed = False
+        self._last_sent = 0.0
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def report(self, test_run_id: str, progress: int):
+        """Queue the progress update of the test run, replacing any update not yet sent"""
+        with self._condition:
+            if self._closed:
+                return
+            self._pending[test_run_id] = progress
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="progress-reporter", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Send the pending updates without waiting for the interval, and wait until they are sent"""
+        with self._condition:
+            if self._pending:
+                self._flush_requested = True
+                self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._pending and not self._sending, timeout)
+
+    def close(self, timeout: float | None = None):
+        """Send the pending updates and stop the background thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _send(self, session: requests.Session, test_run_id: str, progress: int):
+        url = f"{self.apigw_url}/test_runs/{test_run_id}"
+        try:
+            session.patch(url, json={"progress": progress}, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to report progress: {e}")
+
+    def _run(self):
+        session = requests.Session()
+        try:
+            while True:
+                with self._condition:
+                    while not self._pending and not self._closed:
+                        self._condition.wait()
+                    # coalesce the updates received until the interval has passed since the last update sent
+                    while not self._closed and not self._flush_requested:
+                        remaining = self._last_sent + self.interval - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    if not self._pending:
+                        return  # closed
+                    pending, self._pending = self._pending, {}
+                    self._sending = True
+
+                for test_run_id, progress in pending.items():
+                    self._send(session, test_run_id, progress)
+
+                with self._condition:
+                    self._sending = False
+                    self._last_sent = time.monotonic()
+                    if not self._pending:
+                        self._flush_requested = False
+                    self._condition.notify_all()
+        finally:
+            session.close()
+
+
+class PipeProgressReporter:
+    """Write the progress updates as JSON lines to a pipe, to be forwarded by the worker"""
+
+    def __init__(self, fd: int) -> None:
+        self.pipe = open(fd, "w", buffering=1)
+
+    def report(self, test_run_id: str, progress: int):
+        try:
+            self.pipe.write(json.dumps({"testRunId": test_run_id, "progress": progress}) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to report progress: {e}")
+
+    def flush(self, timeout: float | None = None) -> bool:
+        self.pipe.flush()
+        return True
+
+    def close(self, timeout: float | None = None):
+        self.pipe.close()
+
+
+def forward_progress(pipe: IO[str], reporter: ProgressReporter):
+    """Forward the progress updates read from the pipe until it is closed by the algorithm process"""
+    with pipe:
+        for line in pipe:
+            try:
+                update = json.loads(line)
+                reporter.report(update["testRunId"], update["progress"])
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Invalid progress update {line!r}: {e}")
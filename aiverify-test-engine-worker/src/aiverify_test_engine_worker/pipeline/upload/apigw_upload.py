@@ -1,9 +1,9 @@
 from ..pipe import Pipe, PipeException
 from ..schemas import PipelineData, PipeStageEnum
+from ..scripts.file_utils import upload_file
 from ...lib.logging import logger
 
 import os
-import requests
 
 
 class ApigwDownload(Pipe):
@@ -26,20 +26,15 @@ class ApigwDownload(Pipe):
         # Define the upload URL
         upload_url = f"{self.apigw_url}/test_results/upload_zip"
 
-        # Open the zip file in binary mode
-        with open(task_data.output_zip, 'rb') as zip_file:
-            # Prepare the files dictionary for the POST request
-            files = {'file': zip_file}
-
-            # Send the POST request to upload the zip file
-            response = requests.post(upload_url, files=files)
-
-            # Check if the upload was successful
-            if response.status_code == 200:
-                logger.debug(f"Successfully uploaded zip file to {upload_url}")
-            else:
-                logger.error(
-                    f"Failed to upload zip file. Status code: {response.status_code}, Response: {response.text}")
-                raise PipeException(f"Upload failed with status code {response.status_code}")
+        # Stream the zip file, so that large outputs are not read into memory
+        response = upload_file(upload_url, task_data.output_zip)
+
+        # Check if the upload was successful
+        if response.status_code == 200:
+            logger.debug(f"Successfully uploaded zip file to {upload_url}")
+        else:
+            logger.error(
+                f"Failed to upload zip file. Status code: {response.status_code}, Response: {response.text}")
+            raise PipeException(f"Upload failed with status code {response.status_code}")
 
         return task_data
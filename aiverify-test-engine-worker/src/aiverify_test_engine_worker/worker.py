@@ -0,0 +1,495 @@
+from .lib.client import client, worker_id
+from .lib.contants import (
+    TASK_STREAM_NAME, TASK_GROUP_NAME, TASK_STREAMS_KEY, TASK_LANES, TASK_DEAD_LETTER_STREAM_NAME
+)
+from .lib.filecache import get_cache_stats, release_cache_entries
+from .lib.logging import logger
+from .pipeline.pipe import PipeException
+from .pipeline.pipeline import Pipeline
+from .pipeline.schemas import ModeEnum, TestRunTask, PipelineData
+
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from valkey.exceptions import ResponseError
+import multiprocessing
+import multiprocessing.util
+import os
+import json
+import resource
+import signal
+import time
+
+
+# pipeline loaded once in each task process of the pool
+_pipeline: Pipeline | None = None
+# slot of the task process, and the arrays shared with the worker to find the task whose process was killed
+_task_slot = 0
+_running_tasks = None  # run id of the task running in each slot, 0 when idle
+_terminated_slots = None  # set when the task process of the slot is terminated by the pool
+
+
+def load_pipeline():
+    """Load the pipeline in the worker process, forked task processes reuse the loaded pipeline."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = Pipeline()
+    return _pipeline
+
+
+def teardown_pipeline():
+    """Tear down the pipeline loaded in this process, e.g. stop the algorithm containers and executors it started."""
+    global _pipeline
+    if _pipeline is not None:
+        try:
+            _pipeline.teardown()
+        except Exception as e:
+            logger.warning(f"Error tearing down the pipeline: {e}")
+        _pipeline = None
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt()
+
+
+def _on_terminate(signum, frame):
+    # the pool terminates the other task processes when a task process is killed, they are not the cause
+    if _terminated_slots is not None:
+        _terminated_slots[_task_slot] = 1
+    os._exit(128 + signum)
+
+
+@contextmanager
+def _track_task(run_id: int):
+    """Record the task running in the slot of this task process, for the worker if the process is killed"""
+    if _running_tasks is not None:
+        _running_tasks[_task_slot] = run_id
+    try:
+        yield
+    finally:
+        if _running_tasks is not None:
+            _running_tasks[_task_slot] = 0
+
+
+def get_available_cpus() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def init_task_process(slot_counter, concurrency: int, task_cpus: int, task_memory_limit: int,
+                      running_tasks=None, terminated_slots=None):
+    """Initializer for each task process. Apply the per task CPU and memory budgets, then load the pipeline.
+
+    The budgets are inherited by the algorithm processes started by the pipeline.
+    """
+    global _task_slot, _running_tasks, _terminated_slots
+    with slot_counter.get_lock():
+        slot = slot_counter.value % concurrency
+        slot_counter.value += 1
+    _task_slot, _running_tasks, _terminated_slots = slot, running_tasks, terminated_slots
+    if task_cpus > 0 and hasattr(os, "sched_setaffinity"):
+        # pin each task process to its own set of CPUs
+        cpus = get_available_cpus()
+        task_cpu_set = {cpus[(slot * task_cpus + i) % len(cpus)] for i in range(task_cpus)}
+        os.sched_setaffinity(0, task_cpu_set)
+        logger.debug(f"Task process {os.getpid()} pinned to CPUs {sorted(task_cpu_set)}")
+    if task_memory_limit > 0:
+        memory_limit = task_memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        logger.debug(f"Task process {os.getpid()} memory limited to {task_memory_limit}MB")
+    # the worker stops on SIGTERM, the task processes are terminated by the pool
+    signal.signal(signal.SIGTERM, _on_terminate)
+    load_pipeline()
+    # atexit handlers are not run when a pool process exits, the multiprocessing finalizers are run instead
+    multiprocessing.util.Finalize(None, teardown_pipeline, exitpriority=10)
+
+
+def run_task(task_str: str, run_id: int = 0) -> None:
+    """Run the pipeline for a task in the task process."""
+    task = TestRunTask(**json.loads(task_str))
+    logger.debug(f"Process task: {task}")
+    try:
+        with _track_task(run_id):
+            load_pipeline().run(PipelineData(task=task))
+    finally:
+        # the cached algorithm, model and datasets can be evicted once the task completes
+        release_cache_entries()
+
+
+def run_build(build_str: str, run_id: int = 0) -> None:
+    """Download and build an algorithm in the task process, ahead of the test runs of the algorithm."""
+    build = json.loads(build_str)
+    # a build has no model or datasets, so the task data is not validated as a test run
+    task = TestRunTask.model_construct(
+        id=f"build-{build['algorithmGID']}-{build['algorithmCID']}",
+        mode=ModeEnum.UPLOAD,
+        algorithmGID=build["algorithmGID"],
+        algorithmCID=build["algorithmCID"],
+        algorithmHash=build.get("algorithmHash"),
+        algorithmArgs={},
+    )
+    try:
+        with _track_task(run_id):
+            load_pipeline().build(PipelineData.model_construct(task=task))
+    finally:
+        release_cache_entries()
+
+
+@dataclass
+class StreamTask:
+    message_id: bytes
+    task_str: str
+    algorithm_id: str
+    is_build: bool = False  # algorithm build requested when the plugin is uploaded
+    stream: str = TASK_STREAM_NAME
+    deliveries: int = 1  # number of times the task has been started
+    run_id: int = 0  # identifies the current run of the task in the task processes
+
+
+class Worker:
+    """Consume test run tasks from the task streams and run up to `concurrency` tasks at the same time.
+
+    The task streams are grouped in priority lanes. The lanes are read in priority order, and the streams of
+    a lane, one for each project, are read one message at a time in turn so that the projects share the free
+    slots fairly.
+
+    Each task runs in a process pool. A message is acknowledged only when its task completes. Messages left
+    pending by a worker that has stopped are reclaimed with XAUTOCLAIM once idle for `reclaim_idle_time`
+    seconds, so the pending messages of this worker are claimed again periodically as a heartbeat, to keep them
+    from being reclaimed while their tasks are still running.
+
+    A task whose process is killed is retried up to `max_retries` times, whether by this worker or by the worker
+    that reclaims it. Tasks that still fail, tasks that fail with an unexpected error and invalid messages are
+    moved to the dead letter stream with the reason of the failure, and the test run is updated with the error.
+    """
+
+    def __init__(self):
+        self.concurrency = max(1, int(os.getenv("TEWORKER_CONCURRENCY", "1")))
+        self.task_cpus = int(os.getenv("TEWORKER_TASK_CPUS", "0"))
+        self.task_memory_limit = int(os.getenv("TEWORKER_TASK_MEMORY_LIMIT", "0"))
+        self.reclaim_idle_time = int(os.getenv("TEWORKER_RECLAIM_IDLE_TIME", "120"))
+        self.reclaim_interval = min(30, max(1, self.reclaim_idle_time // 4))
+        self.max_retries = max(0, int(os.getenv("TEWORKER_MAX_RETRIES", "2")))
+        # tasks read ahead while waiting for another task of the same algorithm, they do not use a slot
+        self.read_ahead = max(0, int(os.getenv("TEWORKER_READ_AHEAD", str(4 * self.concurrency))))
+        self.dead_letter_max_length = int(os.getenv("TEWORKER_DEAD_LETTER_MAX_LENGTH", "10000"))
+        self.block_time = 1000
+        self.in_flight: dict[Future, StreamTask] = {}
+        self.waiting: list[StreamTask] = []  # tasks waiting for another task of the same algorithm to complete
+        self.last_reclaim = 0.0
+        self.lane_offsets: dict[str, int] = {}  # stream of each lane to read first
+        self.pool: ProcessPoolExecutor | None = None
+        self.last_run_id = 0
+        self.running_tasks = None
+        self.terminated_slots = None
+
+    def _start_pool(self):
+        logger.info(f"Starting task pool with concurrency {self.concurrency}")
+        self.running_tasks = multiprocessing.Array("q", self.concurrency, lock=False)
+        self.terminated_slots = multiprocessing.Array("b", self.concurrency, lock=False)
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.concurrency,
+            initializer=init_task_process,
+            initargs=(multiprocessing.Value("i", 0), self.concurrency, self.task_cpus, self.task_memory_limit,
+                      self.running_tasks, self.terminated_slots),
+        )
+
+    def _pending_tasks(self) -> list[StreamTask]:
+        return list(self.in_flight.values()) + self.waiting
+
+    def _count_waiting(self) -> tuple[int, int]:
+        """Return the number of waiting tasks that can run now, and of the tasks blocked by a task of the same
+        algorithm. Only one of the waiting tasks of an algorithm that is not running can run now."""
+        running = set(task.algorithm_id for task in self.in_flight.values())
+        runnable = set(task.algorithm_id for task in self.waiting if task.algorithm_id not in running)
+        return len(runnable), len(self.waiting) - len(runnable)
+
+    def _free_slots(self) -> int:
+        """Return the number of tasks to read. The blocked tasks do not use a slot, but are limited to read_ahead"""
+        runnable, blocked = self._count_waiting()
+        return min(self.concurrency - len(self.in_flight) - runnable, self.read_ahead - blocked)
+
+    def _ack(self, stream: str, message_id: bytes):
+        logger.debug(f"Send XACK for {message_id} of {stream}")
+        client.xack(stream, TASK_GROUP_NAME, message_id)
+
+    def _report_error(self, task_str: str, reason: str):
+        """Update the test run of the task with the error, using the error pipe of the pipeline"""
+        error_pipe = getattr(load_pipeline(), "error_pipe", None)
+        if error_pipe is None:
+            return
+        try:
+            task = TestRunTask.model_construct(**json.loads(task_str))
+            error_pipe.execute(PipelineData.model_construct(task=task, error_message=reason))
+        except Exception as e:
+            logger.error(f"Unable to report error of task {task_str}: {e}")
+
+    def _dead_letter(self, stream: str, message_id: bytes, message_data: dict, reason: str, deliveries: int = 1):
+        """Move the message to the dead letter stream with the reason of the failure, and acknowledge it"""
+        logger.error(f"Moving message {message_id} of {stream} to the dead letter stream: {reason}")
+        fields = dict(message_data)
+        fields.update({
+            "stream": stream,
+            "messageId": message_id,
+            "reason": reason,
+            "deliveries": deliveries,
+            "workerId": worker_id,
+            "failedAt": int(time.time()),
+        })
+        client.xadd(TASK_DEAD_LETTER_STREAM_NAME, fields, maxlen=self.dead_letter_max_length, approximate=True)
+        self._ack(stream, message_id)
+
+    def _fail_task(self, stream_task: StreamTask, reason: str):
+        """Dead letter the message of the task, and report the error of a test run task"""
+        key = b'build' if stream_task.is_build else b'task'
+        self._dead_letter(stream_task.stream, stream_task.message_id, {key: stream_task.task_str}, reason,
+                          stream_task.deliveries)
+        if not stream_task.is_build:
+            self._report_error(stream_task.task_str, reason)
+
+    def _get_lane_streams(self) -> dict[str, list[str]]:
+        """Return the task streams of each lane"""
+        lane_streams: dict[str, list[str]] = {lane: [] for lane in TASK_LANES}
+        lane_streams["normal"].append(TASK_STREAM_NAME)
+        for stream, lane in (client.hgetall(TASK_STREAMS_KEY) or {}).items():
+            stream, lane = stream.decode("utf-8"), lane.decode("utf-8")
+            if lane in lane_streams and stream != TASK_STREAM_NAME:
+                lane_streams[lane].append(stream)
+        for streams in lane_streams.values():
+            streams.sort()
+        return lane_streams
+
+    def _parse_message(self, stream: str, message_id: bytes, message_data: dict) -> StreamTask | None:
+        try:
+            is_build = b'build' in message_data
+            task_str: str = message_data[b'build' if is_build else b'task'].decode("utf-8")
+            task_dict = json.loads(task_str)
+            algorithm_id = f"{task_dict['algorithmGID']}_{task_dict['algorithmCID']}"
+            return StreamTask(message_id=message_id, task_str=task_str, algorithm_id=algorithm_id,
+                              is_build=is_build, stream=stream)
+        except Exception as e:
+            self._dead_letter(stream, message_id, message_data, f"Invalid task message: {e}")
+            return None
+
+    def _add_messages(self, stream: str, message_list: list, deliveries: dict[bytes, int] | None = None) -> int:
+        """Add the tasks of the messages not already pending, and return the number of messages added"""
+        pending_ids = set((task.stream, task.message_id) for task in self._pending_tasks())
+        count = 0
+        for message_id, message_data in message_list:
+            if (stream, message_id) in pending_ids or message_data is None:
+                continue
+            count += 1
+            stream_task = self._parse_message(stream, message_id, message_data)
+            if stream_task is None:
+                continue
+            stream_task.deliveries = deliveries.get(message_id, 1) if deliveries else 1
+            if stream_task.deliveries > self.max_retries + 1:
+                # the task was left pending each time, e.g. by workers stopped while running it
+                self._fail_task(stream_task, f"Task not completed after {stream_task.deliveries - 1} attempts")
+                continue
+            self.waiting.append(stream_task)
+        return count
+
+    def _submit_waiting(self):
+        # tasks of the same algorithm share the algorithm folder, so they are not run at the same time
+        running = set(task.algorithm_id for task in self.in_flight.values())
+        for stream_task in list(self.waiting):
+            if stream_task.algorithm_id in running:
+                continue
+            if self.pool is None:
+                self._start_pool()
+            run_fn = run_build if stream_task.is_build else run_task
+            self.last_run_id += 1
+            stream_task.run_id = self.last_run_id
+            future = self.pool.submit(run_fn, stream_task.task_str, stream_task.run_id)  # type: ignore
+            self.waiting.remove(stream_task)
+            self.in_flight[future] = stream_task
+            running.add(stream_task.algorithm_id)
+
+    def _get_killed_run_ids(self) -> set[int]:
+        """Return the run ids of the tasks whose process was killed. The other task processes were terminated by
+        the pool once it was broken, and are marked in terminated_slots."""
+        if self.running_tasks is None or self.terminated_slots is None:
+            return set()
+        return set(
+            run_id for run_id, terminated in zip(self.running_tasks, self.terminated_slots)
+            if run_id and not terminated
+        )
+
+    def _retry_broken_pool(self):
+        """Retry the tasks of the broken pool in a new pool.
+
+        Only the task whose process was killed counts a delivery. The other tasks running or queued in the pool are
+        retried without counting a delivery. If the killed task is not found, all the tasks count a delivery.
+        """
+        if self.pool is not None:
+            # wait for the pool to terminate its other task processes, so that they are marked as terminated
+            self.pool.shutdown(wait=True)
+            self.pool = None
+        killed_run_ids = self._get_killed_run_ids()
+        retried = []
+        for future, stream_task in list(self.in_flight.items()):
+            if not future.done() or not isinstance(future.exception(), BrokenProcessPool):
+                continue  # completed before the pool was broken
+            del self.in_flight[future]
+            if killed_run_ids and stream_task.run_id not in killed_run_ids:
+                logger.info(f"Restarting message {stream_task.message_id} stopped by the broken task pool")
+                retried.append(stream_task)
+                continue
+            logger.error(f"Task process terminated while processing message {stream_task.message_id}")
+            if stream_task.deliveries > self.max_retries:
+                self._fail_task(stream_task, f"Task process terminated in {stream_task.deliveries} attempts, "
+                                             f"the task may have exceeded the memory limit")
+            else:
+                # count the retry in the pending entry, for the worker that reclaims it if this worker stops
+                client.xclaim(stream_task.stream, TASK_GROUP_NAME, worker_id, min_idle_time=0,
+                              message_ids=[stream_task.message_id])
+                stream_task.deliveries += 1
+                retried.append(stream_task)
+        self.waiting[:0] = retried
+
+    def _complete_tasks(self, done: set[Future]):
+        for future in done:
+            if future not in self.in_flight:
+                continue  # retried with the broken pool
+            error = future.exception()
+            if isinstance(error, BrokenProcessPool):
+                self._retry_broken_pool()
+                continue
+            stream_task = self.in_flight.pop(future)
+            if isinstance(error, PipeException):
+                # the error has been reported by the pipeline error pipe
+                logger.error(f"Error processing message {stream_task.message_id}: {error}")
+            elif error is not None:
+                self._fail_task(stream_task, f"Unexpected error: {error}")
+                continue
+            self._ack(stream_task.stream, stream_task.message_id)
+
+    def _reclaim(self):
+        now = time.monotonic()
+        if now - self.last_reclaim < self.reclaim_interval:
+            return
+        self.last_reclaim = now
+        min_idle_time = self.reclaim_idle_time * 1000
+
+        self._heartbeat()
+
+        lane_streams = self._get_lane_streams()
+        for stream in [stream for lane in TASK_LANES for stream in lane_streams[lane]]:
+            free_slots = self._free_slots()
+            if free_slots <= 0:
+                return
+            response = client.xautoclaim(stream, TASK_GROUP_NAME, worker_id,
+                                         min_idle_time=min_idle_time, count=free_slots)
+            message_list = response[1] if response else []
+            deleted_ids = response[2] if response and len(response) > 2 else []
+            for message_id in deleted_ids:
+                # message deleted from the stream while pending
+                self._ack(stream, message_id)
+            if message_list:
+                logger.info(f"Reclaimed {len(message_list)} idle pending messages of {stream}")
+                self._add_messages(stream, message_list, self._get_deliveries(stream, message_list))
+
+    def _get_deliveries(self, stream: str, message_list: list) -> dict[bytes, int]:
+        """Return the number of times each reclaimed message has been delivered, including by XAUTOCLAIM"""
+        deliveries = {}
+        for message_id, _ in message_list:
+            pending = client.xpending_range(stream, TASK_GROUP_NAME, min=message_id, max=message_id, count=1)
+            if pending:
+                deliveries[message_id] = pending[0]["times_delivered"]
+        return deliveries
+
+    def _heartbeat(self):
+        """Reset the idle time of the messages still being processed by this worker"""
+        pending_ids: dict[str, list[bytes]] = {}
+        for task in self._pending_tasks():
+            pending_ids.setdefault(task.stream, []).append(task.message_id)
+        for stream, message_ids in pending_ids.items():
+            client.xclaim(stream, TASK_GROUP_NAME, worker_id, min_idle_time=0,
+                          message_ids=message_ids, justid=True)
+
+    def _read_streams(self, streams: list[str], block: int | None = None) -> int:
+        """Read at most one new message from each stream, and return the number of new messages read"""
+        try:
+            messages = client.xreadgroup(
+                groupname=TASK_GROUP_NAME,
+                consumername=worker_id,
+                streams={stream: '>' for stream in streams},
+                count=1,
+                block=block
+            )
+        except ResponseError as e:
+            if "NOGROUP" not in str(e):
+                raise
+            # a registered stream has been removed, create it again with its group
+            for stream in streams:
+                try:
+                    client.xgroup_create(name=stream, groupname=TASK_GROUP_NAME, id="0", mkstream=True)
+                except ResponseError:
+                    pass
+            return 0
+        if messages is None or len(messages) == 0:  # type: ignore
+            return 0
+        count = 0
+        for stream, message_list in messages:  # type: ignore
+            count += self._add_messages(stream.decode("utf-8") if isinstance(stream, bytes) else stream, message_list)
+        return count
+
+    def _read(self):
+        if self._free_slots() <= 0:
+            return
+        lane_streams = self._get_lane_streams()
+        read_count = 0
+        for lane in TASK_LANES:
+            streams = lane_streams[lane]
+            empty_streams = 0
+            # read one message from each stream of the lane in turn, starting after the last stream read, until
+            # there are no free slots or no stream of the lane has new messages
+            while empty_streams < len(streams) and self._free_slots() > 0:
+                start = self.lane_offsets.get(lane, 0) % len(streams)
+                read_streams = (streams[start:] + streams[:start])[:self._free_slots()]
+                self.lane_offsets[lane] = start + len(read_streams)
+                count = self._read_streams(read_streams)
+                empty_streams = 0 if count > 0 else empty_streams + len(read_streams)
+                read_count += count
+        if read_count == 0 and self._free_slots() > 0:
+            # wait for a new message on any stream. Do not block for long while tasks are running, so that
+            # completed tasks are acknowledged promptly
+            self._read_streams([stream for lane in TASK_LANES for stream in lane_streams[lane]],
+                               block=self.block_time if len(self.in_flight) == 0 else 100)
+
+    def step(self):
+        """Run one iteration of the consume loop."""
+        self._reclaim()
+        self._read()
+        self._submit_waiting()
+        if self.in_flight:
+            timeout = 0 if self._free_slots() > 0 else self.block_time / 1000
+            done, _ = wait(self.in_flight.keys(), timeout=timeout, return_when=FIRST_COMPLETED)
+            self._complete_tasks(done)
+
+    def run(self):
+        logger.info(f"Running test engine worker {worker_id} with concurrency {self.concurrency}")
+        load_pipeline()
+        logger.info(f"Cache stats: {get_cache_stats()}")
+        # stop on SIGTERM (e.g. docker stop) as on Ctrl-C, so that the pipeline is torn down
+        signal.signal(signal.SIGTERM, _raise_interrupt)
+        try:
+            while True:
+                try:
+                    self.step()
+                except KeyboardInterrupt:
+                    logger.debug("Received interrupt signal, shutting down...")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in main loop: {e}")
+                    # Continue running after handling error
+                    time.sleep(1)
+        finally:
+            # unacknowledged messages remain pending and will be reclaimed
+            if self.pool is not None:
+                self.pool.shutdown(wait=False, cancel_futures=True)
+            teardown_pipeline()
+            logger.info("Worker shutdown complete")
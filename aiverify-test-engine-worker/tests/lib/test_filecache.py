@@ -8,6 +8,7 @@ from aiverify_test_engine_worker.lib.filecache import (
     get_base_data_dir,
     InvalidFileCache,
     FileCacheError,
+    release_cache_entries,
 )
 
 # Fixture to mock environment variables
@@ -88,6 +89,21 @@ class TestGetCached:
         assert result is None
 
 
+# Test lock method
+class TestLock:
+    def test_lock(self, file_cache):
+        import fcntl
+        with file_cache.lock("test_file"):
+            lock_path = file_cache.subdir / "test_file.lock"
+            assert lock_path.exists()
+            # lock is held, so a non-blocking lock from another open file fails
+            with open(lock_path, 'w') as f:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        with open(lock_path, 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
 # Test delete_cache method
 class TestDeleteCache:
     def test_delete_cache(self, file_cache):
@@ -126,3 +142,126 @@ class TestStoreCache:
         with pytest.raises(FileCacheError):
             file_cache.store_cache(Path("/invalid/path"),
                                    "test_file", file_hash=None)
+
+
+# Fixture to create a FileCache instance with a size limit under tmp_path
+@pytest.fixture
+def bounded_cache(tmp_path):
+    with patch("aiverify_test_engine_worker.lib.filecache.base_data_dir", tmp_path):
+        yield FileCache(subdir_name="bounded", max_size=250)
+
+
+def store_file(cache: FileCache, tmp_path: Path, pathname: str, size: int = 100):
+    source = tmp_path / f"source_{pathname}"
+    source.write_bytes(b"0" * size)
+    return cache.store_cache(source, pathname, None)
+
+
+# Test eviction and stats
+class TestEviction:
+    def test_invalid_eviction_policy(self, tmp_path):
+        with patch("aiverify_test_engine_worker.lib.filecache.base_data_dir", tmp_path):
+            with pytest.raises(InvalidFileCache):
+                FileCache(subdir_name="bounded", eviction_policy="fifo")
+
+    def test_max_size_from_env(self, tmp_path):
+        with patch("aiverify_test_engine_worker.lib.filecache.base_data_dir", tmp_path):
+            with patch.dict(os.environ, {"TEWORKER_CACHE_MAX_SIZE_MODELS": "10"}):
+                assert FileCache(subdir_name="models").max_size == 10 * 1024 * 1024
+            assert FileCache(subdir_name="models").max_size == 0
+
+    def test_lru_eviction(self, bounded_cache, tmp_path):
+        store_file(bounded_cache, tmp_path, "a")
+        store_file(bounded_cache, tmp_path, "b")
+        assert bounded_cache.get_cached("a", None) is not None  # a is now more recently used than b
+        store_file(bounded_cache, tmp_path, "c")
+        assert bounded_cache.get_cached("b", None) is None
+        assert not (bounded_cache.subdir / "b.hash").exists()
+        assert bounded_cache.get_cached("a", None) is not None
+        assert bounded_cache.get_cached("c", None) is not None
+
+    def test_lfu_eviction(self, tmp_path):
+        with patch("aiverify_test_engine_worker.lib.filecache.base_data_dir", tmp_path):
+            cache = FileCache(subdir_name="bounded", max_size=250, eviction_policy="lfu")
+        store_file(cache, tmp_path, "a")
+        store_file(cache, tmp_path, "b")
+        for _ in range(3):
+            cache.get_cached("a", None)
+        cache.get_cached("b", None)
+        store_file(cache, tmp_path, "c")
+        # c has been used the least
+        assert cache.get_cached("c", None) is None
+        assert cache.get_cached("b", None) is not None
+
+    def test_in_use_entry_not_evicted(self, bounded_cache, tmp_path):
+        store_file(bounded_cache, tmp_path, "a")
+        bounded_cache.acquire("a")
+        try:
+            store_file(bounded_cache, tmp_path, "b")
+            store_file(bounded_cache, tmp_path, "c")
+            assert (bounded_cache.subdir / "a").exists()
+            assert not (bounded_cache.subdir / "b").exists()
+        finally:
+            release_cache_entries()
+        store_file(bounded_cache, tmp_path, "d")
+        assert not (bounded_cache.subdir / "a").exists()
+
+    def test_get_stats(self, bounded_cache, tmp_path):
+        store_file(bounded_cache, tmp_path, "a")
+        bounded_cache.get_cached("a", None)
+        bounded_cache.get_cached("missing", None)
+        store_file(bounded_cache, tmp_path, "b")
+        store_file(bounded_cache, tmp_path, "c")
+        assert bounded_cache.get_stats() == {
+            "hits": 1,
+            "misses": 1,
+            "evictions": 1,
+            "evicted_bytes": 100,
+            "linked": 0,
+            "entries": 2,
+            "bytes": 200,
+            "max_bytes": 250,
+        }
+
+
+# Test content addressed aliases
+class TestLinkCached:
+    def test_link_cached(self, file_cache, tmp_path):
+        source = tmp_path / "source.csv"
+        source.write_text("a,b\n1,2\n")
+        stored_path = file_cache.store_cache(source, "test.csv", "hash123")
+        try:
+            assert file_cache.link_cached("missing_hash.csv", "other_hash") is None
+            assert file_cache.link_cached("copy.csv", "hash123") == stored_path
+            assert (file_cache.subdir / "copy.csv").is_symlink()
+            # the alias resolves to the entry with the same content
+            assert file_cache.get_cached("copy.csv", "hash123") == stored_path
+            assert file_cache.get_cached("copy.csv", "other_hash") is None
+        finally:
+            release_cache_entries()
+
+    def test_link_cached_entry_changed(self, file_cache, tmp_path):
+        source = tmp_path / "source.csv"
+        source.write_text("a,b\n1,2\n")
+        file_cache.store_cache(source, "test.csv", "hash123")
+        try:
+            file_cache.link_cached("copy.csv", "hash123")
+            source.write_text("a,b\n3,4\n")
+            file_cache.store_cache(source, "test.csv", "hash456")
+            # alias no longer has the same content as the entry
+            assert file_cache.get_cached("copy.csv", "hash123") is None
+            assert file_cache.link_cached("copy.csv", "hash123") is None
+        finally:
+            release_cache_entries()
+
+    def test_delete_alias(self, file_cache, tmp_path):
+        source = tmp_path / "source.csv"
+        source.write_text("a,b\n1,2\n")
+        stored_path = file_cache.store_cache(source, "test.csv", "hash123")
+        try:
+            file_cache.link_cached("copy.csv", "hash123")
+        finally:
+            release_cache_entries()
+        file_cache.delete_cache("copy.csv")
+        assert not (file_cache.subdir / "copy.csv").exists()
+        assert stored_path.exists()
@@ -1,10 +1,12 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from aiverify_test_engine_worker.pipeline.download.apigw_download import ApigwDownload
 from aiverify_test_engine_worker.pipeline.pipe import PipeException
 from aiverify_test_engine_worker.lib.filecache import FileCache
 from pathlib import Path
+import hashlib
 import os
+import requests
 
 
 # Fixture to create an instance of ApigwDownload
@@ -30,35 +32,132 @@ class TestSetup:
             assert apigw_download.apigw_url == "http://127.0.0.1:4000"
 
 
+def mock_response(content: bytes, status_code: int = 200, headers: dict | None = None, fail_after: int | None = None):
+    """Mock a streamed response, optionally failing after fail_after bytes"""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers if headers is not None else {"Content-Disposition": 'attachment; filename="test_file.zip"'}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=Mock(status_code=status_code, reason="Not Found"))
+
+    def iter_content(chunk_size):
+        for i in range(0, len(content), 4):
+            if fail_after is not None and i >= fail_after:
+                raise requests.exceptions.ChunkedEncodingError("Connection broken")
+            yield content[i:i + 4]
+    response.iter_content.side_effect = iter_content
+    response.__enter__.return_value = response
+    return response
+
+
+# Test for _stream_to_file method
+class TestStreamToFile:
+    def test_stream_to_file(self, apigw_download, tmp_path):
+        with patch.object(apigw_download.session, "get", return_value=mock_response(b"test_content")) as mock_get:
+            file_path, file_hash = apigw_download._stream_to_file("http://mock-url.com/file", tmp_path)
+        assert file_path == tmp_path / "test_file.zip"
+        assert file_path.read_bytes() == b"test_content"
+        assert file_hash == hashlib.sha256(b"test_content").hexdigest()
+        assert mock_get.call_args.kwargs["stream"] is True
+
+    def test_stream_to_file_resume(self, apigw_download, tmp_path):
+        responses = [
+            mock_response(b"test_content", fail_after=8),
+            mock_response(b"tent", status_code=206),
+        ]
+        with patch.object(apigw_download.session, "get", side_effect=responses) as mock_get:
+            file_path, file_hash = apigw_download._stream_to_file("http://mock-url.com/file", tmp_path)
+        assert mock_get.call_args_list[1].kwargs["headers"] == {"Range": "bytes=8-"}
+        assert file_path.read_bytes() == b"test_content"
+        assert file_hash == hashlib.sha256(b"test_content").hexdigest()
+
+    def test_stream_to_file_resume_if_range(self, apigw_download, tmp_path):
+        headers = {"Content-Disposition": 'attachment; filename="test_file.zip"', "ETag": '"etag123"'}
+        responses = [
+            mock_response(b"test_content", headers=headers, fail_after=8),
+            mock_response(b"tent", status_code=206),
+        ]
+        with patch.object(apigw_download.session, "get", side_effect=responses) as mock_get:
+            apigw_download._stream_to_file("http://mock-url.com/file", tmp_path)
+        assert mock_get.call_args_list[1].kwargs["headers"] == {"Range": "bytes=8-", "If-Range": '"etag123"'}
+
+    def test_stream_to_file_not_modified(self, apigw_download, tmp_path):
+        with patch.object(apigw_download.session, "get", return_value=mock_response(b"", status_code=304)) as mock_get:
+            file_path, file_hash = apigw_download._stream_to_file("http://mock-url.com/file", tmp_path, "hash123")
+        assert file_path is None
+        assert file_hash == "hash123"
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"hash123"'}
+
+    def test_stream_to_file_range_not_supported(self, apigw_download, tmp_path):
+        responses = [
+            mock_response(b"test_content", fail_after=8),
+            mock_response(b"test_content", status_code=200),
+        ]
+        with patch.object(apigw_download.session, "get", side_effect=responses):
+            file_path, file_hash = apigw_download._stream_to_file("http://mock-url.com/file", tmp_path)
+        assert file_path.read_bytes() == b"test_content"
+        assert file_hash == hashlib.sha256(b"test_content").hexdigest()
+
+    def test_stream_to_file_retries_exhausted(self, apigw_download, tmp_path):
+        apigw_download.download_retries = 1
+        with patch.object(apigw_download.session, "get", side_effect=requests.ConnectionError("refused")) as mock_get:
+            with pytest.raises(requests.ConnectionError):
+                apigw_download._stream_to_file("http://mock-url.com/file", tmp_path)
+        assert mock_get.call_count == 2
+
+
 # Test for _download_from_apigw method
 class TestDownloadFromApigw:
-    @patch("urllib.request.urlopen")
-    @patch("tempfile.TemporaryDirectory")
-    def test_download_from_apigw_success(self, mock_temp_dir, mock_urlopen, apigw_download):
-        # Mock the temporary directory
-        mock_temp_dir.return_value.__enter__.return_value = "/tmp"
-
-        # Mock the response
-        mock_response = Mock()
-        mock_response.read.return_value = b"test_content"
-        mock_response.getheader.return_value = 'filename="test_file.zip"'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
-
+    def test_download_from_apigw_success(self, apigw_download):
         # Mock the FileCache store_cache method
         cache = Mock(spec=FileCache)
         cache.store_cache.return_value = Path("/tmp/test_file.zip")
-        result = apigw_download._download_from_apigw(
-            cache, "http://mock-url.com", "test_file", "hash123")
+        with patch.object(apigw_download.session, "get", return_value=mock_response(b"test_content")) as mock_get:
+            result = apigw_download._download_from_apigw(
+                cache, "http://mock-url.com", "test_file", "hash123")
 
         assert result == Path("/tmp/test_file.zip")
-        mock_urlopen.assert_called_once_with("http://mock-url.com")
+        assert mock_get.call_args.args == ("http://mock-url.com",)
         cache.store_cache.assert_called_once()
+        assert cache.store_cache.call_args.args[1:] == ("test_file", "hash123")
+
+    def test_download_from_apigw_without_hash(self, apigw_download):
+        # hash computed while downloading is stored
+        cache = Mock(spec=FileCache)
+        with patch.object(apigw_download.session, "get", return_value=mock_response(b"test_content")):
+            apigw_download._download_from_apigw(cache, "http://mock-url.com", "test_file", None)
+        assert cache.store_cache.call_args.args[2] == hashlib.sha256(b"test_content").hexdigest()
+
+    def test_download_from_apigw_cached_not_modified(self, apigw_download):
+        cache = Mock(spec=FileCache)
+        cache.get_hash.return_value = "hash123"
+        with patch.object(apigw_download.session, "get", return_value=mock_response(b"", status_code=304)):
+            result = apigw_download._download_from_apigw(
+                cache, "http://mock-url.com", "test_file", None, Path("/cached/test_file"))
+        assert result == Path("/cached/test_file")
+        cache.store_cache.assert_not_called()
+
+    def test_download_from_apigw_cached_modified(self, apigw_download):
+        cache = Mock(spec=FileCache)
+        cache.get_hash.return_value = "hash123"
+        cache.store_cache.return_value = Path("/tmp/test_file.zip")
+        with patch.object(apigw_download.session, "get", return_value=mock_response(b"new_content")):
+            result = apigw_download._download_from_apigw(
+                cache, "http://mock-url.com", "test_file", None, Path("/cached/test_file"))
+        assert result == Path("/tmp/test_file.zip")
+        assert cache.store_cache.call_args.args[2] == hashlib.sha256(b"new_content").hexdigest()
+
+    def test_download_from_apigw_http_error(self, apigw_download):
+        with patch.object(apigw_download.session, "get", return_value=mock_response(b"", status_code=404)):
+            with pytest.raises(PipeException, match="HTTP Error: 404 - Not Found"):
+                apigw_download._download_from_apigw(
+                    Mock(), "http://mock-url.com", "test_file", "hash123")
 
-    @patch("urllib.request.urlopen", side_effect=Exception("Mock Error"))
-    def test_download_from_apigw_error(self, mock_urlopen, apigw_download):
-        with pytest.raises(PipeException, match="An unexpected error occurred: Mock Error"):
-            apigw_download._download_from_apigw(
-                Mock(), "http://mock-url.com", "test_file", "hash123")
+    def test_download_from_apigw_error(self, apigw_download):
+        with patch.object(apigw_download.session, "get", side_effect=Exception("Mock Error")):
+            with pytest.raises(PipeException, match="An unexpected error occurred: Mock Error"):
+                apigw_download._download_from_apigw(
+                    Mock(), "http://mock-url.com", "test_file", "hash123")
 
 
 # Test for _download_algo method
@@ -83,6 +182,20 @@ class TestDownloadAlgo:
         assert task_data.algorithm_path == Path("/cached/algo")
         assert task_data.to_build is False
 
+    def test_download_algo_pooled_venv_evicted(self, apigw_download, mock_pipeline_data, tmp_path):
+        algo_dir = tmp_path / "algo"
+        algo_dir.mkdir()
+        algo_dir.joinpath(".venv").symlink_to(tmp_path / "venvs" / "venv_key")
+        with patch.object(FileCache, "get_cached", return_value=algo_dir), patch.object(FileCache, "acquire") as mock_acquire:
+            apigw_download._download_algo(mock_pipeline_data)
+            mock_acquire.assert_any_call("venv_key")
+            assert mock_pipeline_data.to_build is True
+
+            # pooled venv exists
+            (tmp_path / "venvs" / "venv_key").mkdir(parents=True)
+            apigw_download._download_algo(mock_pipeline_data)
+            assert mock_pipeline_data.to_build is False
+
 
 # Test for _download_model method
 class TestDownloadModel:
@@ -100,9 +213,29 @@ class TestDownloadModel:
 
         assert result == Path("/cached/model")
 
+    @patch.object(FileCache, "get_cached", return_value=Path("/cached/model"))
+    @patch.object(ApigwDownload, "_download_from_apigw", return_value=Path("/cached/model"))
+    def test_download_model_cached_without_hash(self, mock_download_from_apigw, mock_get_cached, apigw_download):
+        # the cached model is revalidated with the apigw
+        result = apigw_download._download_model("model_file", None)
+
+        assert result == Path("/cached/model")
+        assert mock_download_from_apigw.call_args.args[-1] == Path("/cached/model")
+
 
 # Test for _download_dataset method
 class TestDownloadDataset:
+    @patch.object(FileCache, "get_cached", return_value=None)
+    @patch.object(FileCache, "link_cached", return_value=Path("/cached/same_content_dataset"))
+    @patch.object(ApigwDownload, "_download_from_apigw")
+    def test_download_dataset_same_content(self, mock_download_from_apigw, mock_link_cached, mock_get_cached,
+                                           apigw_download):
+        result = apigw_download._download_dataset("dataset_file", "hash123")
+
+        assert result == Path("/cached/same_content_dataset")
+        mock_link_cached.assert_called_once_with("dataset_file", "hash123")
+        mock_download_from_apigw.assert_not_called()
+
     @patch.object(FileCache, "get_cached", return_value=None)
     @patch.object(ApigwDownload, "_download_from_apigw", return_value=Path("/tmp/dataset"))
     def test_download_dataset_new_download(self, mock_download_from_apigw, mock_get_cached, apigw_download):
@@ -138,3 +271,32 @@ class TestExecute:
                 mock_pipeline_data.task.testDataset, mock_pipeline_data.task.testDatasetHash)
             mock_download_dataset.assert_any_call(
                 mock_pipeline_data.task.groundTruthDataset, mock_pipeline_data.task.groundTruthDatasetHash)
+
+    def test_execute_download_error(self, apigw_download, mock_pipeline_data):
+        with patch.object(apigw_download, "_download_algo"), \
+                patch.object(apigw_download, "_download_model", side_effect=PipeException("HTTP Error: 404 - Not Found")), \
+                patch.object(apigw_download, "_download_dataset", return_value=mock_pipeline_data.data_path) as mock_download_dataset:
+            with pytest.raises(PipeException, match="HTTP Error: 404"):
+                apigw_download.execute(mock_pipeline_data)
+            # the other downloads still complete
+            assert mock_download_dataset.call_count == 2
+
+    def test_execute_dataset_arguments(self, apigw_download, mock_pipeline_data):
+        mock_pipeline_data.task.algorithmArgs = {"background": "_dataset_:background.csv", "size": 10}
+        with patch.object(apigw_download, "_download_algo"), \
+                patch.object(apigw_download, "_download_model", return_value=mock_pipeline_data.model_path), \
+                patch.object(apigw_download, "_download_dataset", return_value=Path("/cached/background.csv")) as mock_download_dataset:
+            apigw_download.execute(mock_pipeline_data)
+        mock_download_dataset.assert_any_call("background.csv", None)
+        assert mock_pipeline_data.task.algorithmArgs == {"background": "/cached/background.csv", "size": 10}
+
+    def test_execute_same_ground_truth_dataset(self, apigw_download, mock_pipeline_data):
+        task = mock_pipeline_data.task
+        task.groundTruthDataset = task.testDataset
+        task.groundTruthDatasetHash = task.testDatasetHash
+        with patch.object(apigw_download, "_download_algo"), \
+                patch.object(apigw_download, "_download_model", return_value=mock_pipeline_data.model_path), \
+                patch.object(apigw_download, "_download_dataset", return_value=Path("/cached/dataset")) as mock_download_dataset:
+            apigw_download.execute(mock_pipeline_data)
+        mock_download_dataset.assert_called_once_with(task.testDataset, task.testDatasetHash)
+        assert mock_pipeline_data.ground_truth_path == mock_pipeline_data.data_path == Path("/cached/dataset")
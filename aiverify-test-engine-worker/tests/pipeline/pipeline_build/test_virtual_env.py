@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import Mock, patch
 from aiverify_test_engine_worker.pipeline.pipeline_build.virtual_env import VirtualEnvironmentBuild
 from aiverify_test_engine_worker.pipeline.pipe import PipeException
-from aiverify_test_engine_worker.lib.filecache import FileCache
+from aiverify_test_engine_worker.lib.filecache import FileCache, release_cache_entries
 from pathlib import Path
 import subprocess
 import os
@@ -77,3 +77,103 @@ class TestExecute:
         # Assertions
         mock_delete_cache.assert_called_once_with(
             mock_pipeline_data.algorithm_id)
+
+
+@pytest.fixture
+def algorithm_path(tmp_path):
+    algorithm_path = tmp_path / "algorithm"
+    algorithm_path.mkdir()
+    algorithm_path.joinpath("pyproject.toml").write_text(
+        '[project]\nname = "algo"\ndependencies = ["pandas==2.2.2", "numpy==1.26.4"]\n')
+    return algorithm_path
+
+
+@pytest.fixture
+def pooled_venv_build(tmp_path):
+    with patch("aiverify_test_engine_worker.lib.filecache.base_data_dir", tmp_path / "data"):
+        venv_cache = FileCache(subdir_name="venvs")
+    with patch("aiverify_test_engine_worker.pipeline.pipeline_build.virtual_env.venv_cache", venv_cache):
+        pipe = VirtualEnvironmentBuild()
+        pipe.setup()
+        pipe._python_version = "3.11.7"
+        yield pipe, venv_cache
+    release_cache_entries()
+
+
+def mock_venv_run(cmds, **kwargs):
+    # create the venv folder for python -m venv
+    if cmds[1:3] == ['-m', 'venv']:
+        Path(cmds[-1]).mkdir(parents=True)
+    return Mock(returncode=0)
+
+
+# Test for the pooled virtual environments
+class TestPooledVirtualEnvironment:
+    def test_get_requirements(self, algorithm_path):
+        algorithm_path.joinpath("requirements.txt").write_text("scipy>=1.0  # comment\n\nnumpy==1.26.4\n")
+        assert VirtualEnvironmentBuild.get_requirements(algorithm_path) == [
+            "numpy==1.26.4", "pandas==2.2.2", "scipy>=1.0"]
+
+    def test_get_requirements_not_supported(self, algorithm_path, tmp_path):
+        assert VirtualEnvironmentBuild.get_requirements(tmp_path) is None
+        algorithm_path.joinpath("requirements.txt").write_text("-e ../local_package\n")
+        assert VirtualEnvironmentBuild.get_requirements(algorithm_path) is None
+        algorithm_path.joinpath("requirements.txt").unlink()
+        algorithm_path.joinpath("pyproject.toml").write_text('[project]\nname = "algo"\ndynamic = ["dependencies"]\n')
+        assert VirtualEnvironmentBuild.get_requirements(algorithm_path) is None
+
+    def test_venv_key(self, pooled_venv_build):
+        pipe, _ = pooled_venv_build
+        key = pipe.get_venv_key(["numpy==1.26.4"])
+        assert key == pipe.get_venv_key(["numpy==1.26.4"])
+        assert key != pipe.get_venv_key(["numpy==2.0.0"])
+        pipe._python_version = "3.12.0"
+        assert key != pipe.get_venv_key(["numpy==1.26.4"])
+
+    @patch("subprocess.run", side_effect=mock_venv_run)
+    def test_execute_shares_venv(self, mock_subprocess_run, pooled_venv_build, algorithm_path, mock_pipeline_data):
+        pipe, venv_cache = pooled_venv_build
+        mock_pipeline_data.algorithm_path = algorithm_path
+        pipe.execute(mock_pipeline_data)
+
+        venv_key = pipe.get_venv_key(["numpy==1.26.4", "pandas==2.2.2"])
+        pooled_venv_path = venv_cache.subdir / venv_key
+        assert algorithm_path.joinpath(".venv").resolve() == pooled_venv_path.resolve()
+        mock_subprocess_run.assert_any_call(
+            [str(pooled_venv_path.joinpath("bin", "pip")), 'install', "numpy==1.26.4", "pandas==2.2.2"], check=True)
+        assert mock_subprocess_run.call_count == 2
+
+        # new version of the algorithm with the same requirements
+        new_algorithm_path = algorithm_path.parent / "new_algorithm"
+        new_algorithm_path.mkdir()
+        new_algorithm_path.joinpath("pyproject.toml").write_text(algorithm_path.joinpath("pyproject.toml").read_text())
+        mock_pipeline_data.algorithm_path = new_algorithm_path
+        pipe.execute(mock_pipeline_data)
+        assert new_algorithm_path.joinpath(".venv").resolve() == pooled_venv_path.resolve()
+        assert mock_subprocess_run.call_count == 2
+
+    @patch("subprocess.run", side_effect=mock_venv_run)
+    def test_execute_wheelhouse(self, mock_subprocess_run, pooled_venv_build, algorithm_path, mock_pipeline_data):
+        pipe, _ = pooled_venv_build
+        pipe.wheelhouse = "/wheelhouse"
+        mock_pipeline_data.algorithm_path = algorithm_path
+        pipe.execute(mock_pipeline_data)
+        pip_cmds = mock_subprocess_run.call_args.args[0]
+        assert pip_cmds[1:5] == ['install', '--no-index', '--find-links', '/wheelhouse']
+
+    @patch.object(FileCache, "delete_cache")
+    def test_execute_pip_error(self, mock_delete_cache, pooled_venv_build, algorithm_path, mock_pipeline_data):
+        pipe, _ = pooled_venv_build
+        mock_pipeline_data.algorithm_path = algorithm_path
+
+        def run(cmds, **kwargs):
+            if 'install' in cmds:
+                raise subprocess.CalledProcessError(1, "pip")
+            return mock_venv_run(cmds)
+
+        with patch("subprocess.run", side_effect=run):
+            with pytest.raises(PipeException, match="Failed to build virtual environment:"):
+                pipe.execute(mock_pipeline_data)
+        venv_key = pipe.get_venv_key(["numpy==1.26.4", "pandas==2.2.2"])
+        mock_delete_cache.assert_any_call(venv_key)
+        mock_delete_cache.assert_any_call(mock_pipeline_data.algorithm_id)
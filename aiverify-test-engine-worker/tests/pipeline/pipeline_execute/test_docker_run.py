@@ -1,16 +1,19 @@
 import pytest
 from unittest.mock import Mock, patch
-from aiverify_test_engine_worker.pipeline.pipeline_execute.docker_run import DockerRun
+from aiverify_test_engine_worker.pipeline.pipeline_execute.docker_run import DockerRun, OWNER_LABEL, WORKER_LABEL
+from aiverify_test_engine_worker.lib.client import worker_id
 from aiverify_test_engine_worker.pipeline.pipe import PipeException
 import os
 import subprocess
+from pathlib import Path
 
 
 # Fixture to create an instance of DockerRun
 @pytest.fixture
 def docker_run():
     pipe = DockerRun()
-    pipe.setup()
+    with patch("subprocess.run", return_value=Mock(returncode=0, stdout="")):
+        pipe.setup()
     return pipe
 
 
@@ -36,6 +39,19 @@ class TestSetup:
         assert docker_run.apigw_url == "http://host.docker.internal:4000"
         assert docker_run.docker_registry is None
 
+    @patch.dict(os.environ, {"DOCKER_RUN_OWNER": "test_owner"})
+    @patch("subprocess.run")
+    def test_setup_removes_orphan_containers(self, mock_run):
+        mock_run.return_value = Mock(returncode=0, stdout="orphan1\norphan2\n")
+        DockerRun().setup()
+        mock_run.assert_any_call(["docker", "ps", "-aq", "--filter", f"label={OWNER_LABEL}=test_owner"],
+                                 capture_output=True, text=True)
+        mock_run.assert_any_call(["docker", "rm", "-f", "orphan1", "orphan2"], capture_output=True)
+
+    @patch("subprocess.run", side_effect=FileNotFoundError("docker"))
+    def test_setup_without_docker(self, mock_run):
+        DockerRun().setup()
+
 
 # Test for execute method
 class TestExecute:
@@ -53,8 +69,9 @@ class TestExecute:
         container_data_path = f"/app/data/{mock_pipeline_data.data_path.name}"
         container_model_path = f"/app/data/{mock_pipeline_data.model_path.name}"
         mock_run.assert_any_call(
-            ["docker", "run", "--name", "test_container_name", "--rm", "-d", "--entrypoint",
-                "/bin/sh", tag, "-c", "trap : TERM INT; sleep infinity & wait", tag],
+            ["docker", "run", "--name", "test_container_name", "--rm", "-d",
+                "--label", f"{OWNER_LABEL}={docker_run.owner}", "--label", f"{WORKER_LABEL}={worker_id}",
+                "--entrypoint", "/bin/sh", tag, "-c", "trap : TERM INT; sleep infinity & wait", tag],
             check=True
         )
         mock_run.assert_any_call(
@@ -67,6 +84,8 @@ class TestExecute:
             ).as_posix(), f"test_container_name:{container_model_path}"],
             check=True
         )
+        # the container is removed with the copied files
+        mock_run.assert_called_with(["docker", "rm", "-f", "test_container_name"])
 
     @patch("subprocess.run", side_effect=[subprocess.CalledProcessError(1, "docker"), None])
     def test_execute_docker_error(self, mock_run, docker_run, mock_pipeline_data):
@@ -77,3 +96,139 @@ class TestExecute:
     def test_execute_unexpected_error(self, mock_run, docker_run, mock_pipeline_data):
         with pytest.raises(PipeException, match="Unexpected error during algorithm execute"):
             docker_run.execute(mock_pipeline_data)
+
+
+@pytest.fixture
+def mounted_docker_run(tmp_path):
+    from aiverify_test_engine_worker.pipeline.pipeline_execute import docker_run as docker_run_module
+
+    with patch.dict(os.environ, {"DOCKER_RUN_MODE": "mount", "DOCKER_RUN_MAX_CONTAINERS": "1"}):
+        pipe = DockerRun()
+        with patch("subprocess.run", return_value=Mock(returncode=0, stdout="")):
+            pipe.setup()
+    pipe.container_output_dir = tmp_path / "docker_output"
+    mounts = {
+        "/app/cache/models": Mock(subdir=tmp_path / "models"),
+        "/app/cache/datasets": Mock(subdir=tmp_path / "datasets"),
+    }
+    with patch.dict(docker_run_module.CONTAINER_CACHE_MOUNTS, mounts, clear=True):
+        yield pipe
+
+
+@pytest.fixture
+def mounted_pipeline_data(mock_pipeline_data, tmp_path):
+    mock_pipeline_data.model_path = tmp_path / "models" / "model.sav"
+    mock_pipeline_data.data_path = tmp_path / "datasets" / "data.csv"
+    mock_pipeline_data.ground_truth_path = tmp_path / "datasets" / "data.csv"
+    return mock_pipeline_data
+
+
+class MockDocker:
+    """Mock subprocess.run for the docker commands, the exec command writes the output zip to the mounted folder"""
+
+    def __init__(self):
+        self.output_dir: Path | None = None
+        self.running = True
+
+    def __call__(self, cmds, **kwargs):
+        if cmds[1] == "run":
+            volumes = [cmds[i + 1] for i, cmd in enumerate(cmds) if cmd == "-v"]
+            output_volume = next(volume for volume in volumes if volume.endswith(":/app/output"))
+            self.output_dir = Path(output_volume.split(":")[0])
+        elif cmds[1] == "inspect":
+            return Mock(returncode=0, stdout="true\n" if self.running else "false\n")
+        elif cmds[1] == "exec" and "scripts.algo_execute" in cmds:
+            self.output_dir.joinpath("output.zip").write_bytes(b"zip")  # type: ignore
+        elif cmds[1] == "ps":
+            return Mock(returncode=0, stdout="")
+        return Mock(returncode=0)
+
+
+class TestMountedExecute:
+    def test_invalid_run_mode(self):
+        with patch.dict(os.environ, {"DOCKER_RUN_MODE": "invalid"}):
+            with pytest.raises(PipeException, match="Invalid DOCKER_RUN_MODE"):
+                DockerRun().setup()
+
+    @patch("subprocess.run")
+    def test_execute_mounted(self, mock_run, mounted_docker_run, mounted_pipeline_data, tmp_path):
+        mock_docker = MockDocker()
+        mock_run.side_effect = mock_docker
+        result = mounted_docker_run.execute(mounted_pipeline_data)
+        assert result.output_zip == mock_docker.output_dir.joinpath("output.zip")
+        assert result.output_zip.read_bytes() == b"zip"
+
+        run_cmds = mock_run.call_args_list[0].args[0]
+        assert run_cmds[:2] == ["docker", "run"]
+        assert f"{WORKER_LABEL}={worker_id}" in run_cmds
+        assert f"{tmp_path / 'models'}:/app/cache/models:ro" in run_cmds
+        assert f"{tmp_path / 'datasets'}:/app/cache/datasets:ro" in run_cmds
+        exec_cmds = mock_run.call_args_list[-1].args[0]
+        assert exec_cmds[exec_cmds.index("--data_path") + 1] == "/app/cache/datasets/data.csv"
+        assert exec_cmds[exec_cmds.index("--model_path") + 1] == "/app/cache/models/model.sav"
+        assert exec_cmds[exec_cmds.index("--ground_truth_path") + 1] == "/app/cache/datasets/data.csv"
+        assert exec_cmds[exec_cmds.index("--output_zip") + 1] == "/app/output/output.zip"
+        # nothing is copied in or out of the container
+        assert not any(call.args[0][1] == "cp" for call in mock_run.call_args_list)
+
+    @patch("subprocess.run")
+    def test_container_reused(self, mock_run, mounted_docker_run, mounted_pipeline_data):
+        mock_run.side_effect = MockDocker()
+        mounted_docker_run.execute(mounted_pipeline_data)
+        mounted_docker_run.execute(mounted_pipeline_data)
+        run_calls = [call for call in mock_run.call_args_list if call.args[0][1] == "run"]
+        assert len(run_calls) == 1
+
+    @patch("subprocess.run")
+    def test_container_restarted(self, mock_run, mounted_docker_run, mounted_pipeline_data):
+        mock_docker = MockDocker()
+        mock_run.side_effect = mock_docker
+        mounted_docker_run.execute(mounted_pipeline_data)
+        container_name = mounted_docker_run.containers[mounted_pipeline_data.algorithm_id].name
+
+        # container has exited
+        mock_docker.running = False
+        mounted_docker_run.execute(mounted_pipeline_data)
+        mock_run.assert_any_call(["docker", "stop", container_name])
+        assert mounted_docker_run.containers[mounted_pipeline_data.algorithm_id].name != container_name
+
+    @patch("subprocess.run")
+    def test_containers_bounded(self, mock_run, mounted_docker_run, mounted_pipeline_data):
+        mock_run.side_effect = MockDocker()
+        mounted_docker_run.execute(mounted_pipeline_data)
+        mounted_pipeline_data.algorithm_id = "another_algorithm_id"
+        mounted_docker_run.execute(mounted_pipeline_data)
+        assert list(mounted_docker_run.containers.keys()) == ["another_algorithm_id"]
+
+        mounted_docker_run.teardown()
+        assert mounted_docker_run.containers == {}
+
+    @patch("subprocess.run")
+    def test_file_outside_cache_copied(self, mock_run, mounted_docker_run, mounted_pipeline_data, tmp_path):
+        mock_run.side_effect = MockDocker()
+        mounted_pipeline_data.model_path = tmp_path / "other" / "model.sav"
+        mounted_docker_run.execute(mounted_pipeline_data)
+        cp_cmds = [call.args[0] for call in mock_run.call_args_list if call.args[0][1] == "cp"]
+        assert len(cp_cmds) == 1
+        assert cp_cmds[0][-1].endswith(":/app/data/model.sav")
+        # the copied file is removed from the long-lived container after the run
+        container_name = mounted_docker_run.containers[mounted_pipeline_data.algorithm_id].name
+        mock_run.assert_called_with(["docker", "exec", container_name, "rm", "-rf", "/app/data/model.sav"],
+                                    capture_output=True)
+
+    @patch("subprocess.run")
+    def test_teardown_in_task_process(self, mock_run, mounted_docker_run, mounted_pipeline_data):
+        mock_run.side_effect = MockDocker()
+        mounted_docker_run.execute(mounted_pipeline_data)
+        container_name = mounted_docker_run.containers[mounted_pipeline_data.algorithm_id].name
+        mounted_docker_run.worker_pid = os.getpid() + 1
+        mounted_docker_run.teardown()
+        mock_run.assert_called_with(["docker", "stop", container_name])
+
+    @patch("subprocess.run")
+    def test_teardown_in_worker_process(self, mock_run, mounted_docker_run):
+        mock_run.return_value = Mock(returncode=0, stdout="container1\n")
+        mounted_docker_run.teardown()
+        mock_run.assert_any_call(["docker", "ps", "-aq", "--filter", f"label={WORKER_LABEL}={worker_id}"],
+                                 capture_output=True, text=True)
+        mock_run.assert_called_with(["docker", "rm", "-f", "container1"], capture_output=True)
@@ -57,6 +57,9 @@ class TestExecute:
                 "--model_type", mock_pipeline_data.task.modelType.lower(),
                 "--algorithm_args", json.dumps(mock_pipeline_data.task.algorithmArgs),
                 "--apigw_url", "http://127.0.0.1:4000",
+                "--prediction_cache_dir", str(virtual_env_execute.prediction_cache_dir),
+                "--prediction_cache_max_size", "1024",
+                "--progress_interval", "1",
                 "--ground_truth_path", str(mock_pipeline_data.ground_truth_path.absolute()),
                 "--ground_truth", mock_pipeline_data.task.groundTruth
             ],
@@ -81,4 +84,31 @@ class TestExecute:
         virtual_env_execute.setup()
         with patch("pathlib.Path.exists", return_value=False):
             with pytest.raises(PipeException, match="Output zip not generated"):
-                virtual_env_execute.execute(mock_pipeline_data)
\ No newline at end of file
+                virtual_env_execute.execute(mock_pipeline_data)
+
+
+class TestProgressPipe:
+    def test_invalid_progress_channel(self):
+        with patch.dict(os.environ, {"TEWORKER_PROGRESS_CHANNEL": "invalid"}):
+            with pytest.raises(PipeException, match="Invalid TEWORKER_PROGRESS_CHANNEL"):
+                VirtualEnvironmentExecute().setup()
+
+    def test_progress_forwarded(self, mock_pipeline_data):
+        import sys
+
+        with patch.dict(os.environ, {"TEWORKER_PROGRESS_CHANNEL": "pipe"}):
+            pipe = VirtualEnvironmentExecute()
+            pipe.setup()
+        pipe.progress_reporter = Mock()
+        # the algorithm process writes the progress updates to the pipe fd passed as the last argument
+        script = (
+            "import json, os, sys\n"
+            "fd = int(sys.argv[-1])\n"
+            "for progress in (10, 50, 100):\n"
+            "    os.write(fd, (json.dumps({'testRunId': 'test_run_id', 'progress': progress}) + '\\n').encode())\n"
+        )
+        p = pipe._run_with_progress_pipe([sys.executable, "-c", script], check=True)
+        assert p.returncode == 0
+        reports = [call.args for call in pipe.progress_reporter.report.call_args_list]
+        assert reports == [("test_run_id", 10), ("test_run_id", 50), ("test_run_id", 100)]
+        pipe.progress_reporter.flush.assert_called_once()
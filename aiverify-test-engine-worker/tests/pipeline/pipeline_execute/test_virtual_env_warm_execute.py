@@ -0,0 +1,137 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from aiverify_test_engine_worker.pipeline.pipeline_execute.virtual_env_warm_execute import VirtualEnvironmentWarmExecute
+from aiverify_test_engine_worker.pipeline.pipe import PipeException
+import os
+import json
+import signal
+import threading
+
+
+def mock_process(response: dict | None = None, count: int = 1):
+    process = MagicMock()
+    process.poll.return_value = None
+    lines = [json.dumps(response) + "\n"] * count if response else []
+    process.stdout.readline.side_effect = lines + [""]
+    return process
+
+
+# Fixture to create an instance of VirtualEnvironmentWarmExecute
+@pytest.fixture
+def warm_execute():
+    pipe = VirtualEnvironmentWarmExecute()
+    pipe.setup()
+    return pipe
+
+
+# Test for setup method
+class TestSetup:
+    @patch.dict(os.environ, {"APIGW_URL": "http://custom-url:4000", "WARM_EXECUTOR_MAX": "2"})
+    def test_setup_with_custom_values(self, warm_execute):
+        warm_execute.setup()
+        assert warm_execute.apigw_url == "http://custom-url:4000"
+        assert warm_execute.max_executors == 2
+
+    def test_setup_with_default_values(self, warm_execute):
+        assert warm_execute.apigw_url == "http://127.0.0.1:4000"
+        assert warm_execute.max_executors == 4
+        assert warm_execute.executors == {}
+
+
+# Test for execute method
+class TestExecute:
+    @patch("pathlib.Path.exists", return_value=True)
+    @patch("subprocess.Popen")
+    def test_execute_reuses_executor(self, mock_popen, mock_exists, warm_execute, mock_pipeline_data):
+        process = mock_process({"status": "success"}, count=2)
+        mock_popen.return_value = process
+
+        result = warm_execute.execute(mock_pipeline_data)
+        assert result.output_zip == mock_pipeline_data.algorithm_path.joinpath("output.zip")
+        warm_execute.execute(mock_pipeline_data)
+
+        # one executor started for both tasks
+        mock_popen.assert_called_once()
+        assert mock_popen.call_args.args[0][1:] == ["-m", "scripts.algo_executor"]
+        assert mock_popen.call_args.kwargs["cwd"] == mock_pipeline_data.algorithm_path
+        assert mock_popen.call_args.kwargs["start_new_session"] is True
+
+        request = json.loads(process.stdin.write.call_args.args[0])
+        argv = request["argv"]
+        assert argv[argv.index("--test_run_id") + 1] == mock_pipeline_data.task.id
+        assert argv[argv.index("--ground_truth") + 1] == mock_pipeline_data.task.groundTruth
+        assert process.stdin.write.call_count == 2
+
+    @patch("pathlib.Path.exists", return_value=True)
+    @patch("subprocess.Popen")
+    def test_execute_restarts_executor(self, mock_popen, mock_exists, warm_execute, mock_pipeline_data):
+        mock_popen.side_effect = [mock_process({"status": "success"}), mock_process({"status": "success"})]
+        warm_execute.execute(mock_pipeline_data)
+
+        # the algorithm has been updated
+        mock_pipeline_data.task.algorithmHash = "new_algorithmHash"
+        warm_execute.execute(mock_pipeline_data)
+        assert mock_popen.call_count == 2
+        assert len(warm_execute.executors) == 1
+
+    @patch("subprocess.Popen")
+    def test_execute_error_response(self, mock_popen, warm_execute, mock_pipeline_data):
+        mock_popen.return_value = mock_process({"status": "error", "errorMessage": "Test error"})
+        with pytest.raises(PipeException, match="Failed to run algorithm: Test error"):
+            warm_execute.execute(mock_pipeline_data)
+
+    @patch("subprocess.Popen")
+    def test_execute_executor_exited(self, mock_popen, warm_execute, mock_pipeline_data):
+        mock_popen.return_value = mock_process(None)
+        with pytest.raises(PipeException, match="Algorithm executor exited"):
+            warm_execute.execute(mock_pipeline_data)
+
+    @patch("os.killpg")
+    @patch("subprocess.Popen")
+    def test_execute_timeout(self, mock_popen, mock_killpg, warm_execute, mock_pipeline_data):
+        process = mock_process(None)
+        # the executor does not respond until it is killed
+        killed = threading.Event()
+        process.stdout.readline.side_effect = lambda: killed.wait() and ""
+        mock_killpg.side_effect = lambda pid, signum: killed.set()
+        process.pid = 1234
+        mock_popen.return_value = process
+        warm_execute.timeout = 0.1
+        with pytest.raises(PipeException, match="Algorithm executor timed out"):
+            warm_execute.execute(mock_pipeline_data)
+
+        # the executor and its task process are killed, and a new executor is started for the next task
+        mock_killpg.assert_called_once_with(1234, signal.SIGKILL)
+        assert warm_execute.executors == {}
+        mock_popen.return_value = mock_process({"status": "success"})
+        with patch("pathlib.Path.exists", return_value=True):
+            warm_execute.execute(mock_pipeline_data)
+        assert mock_popen.call_count == 2
+
+    @patch("pathlib.Path.exists", return_value=True)
+    @patch("subprocess.Popen")
+    def test_execute_restart_response(self, mock_popen, mock_exists, warm_execute, mock_pipeline_data):
+        process = mock_process({"status": "success", "restart": True})
+        mock_popen.return_value = process
+        warm_execute.execute(mock_pipeline_data)
+
+        # the executor ran the task without fork and is stopped
+        process.stdin.close.assert_called_once()
+        assert warm_execute.executors == {}
+
+    @patch("subprocess.Popen")
+    def test_execute_missing_output_zip(self, mock_popen, warm_execute, mock_pipeline_data):
+        mock_popen.return_value = mock_process({"status": "success"})
+        with patch("pathlib.Path.exists", return_value=False):
+            with pytest.raises(PipeException, match="Output zip not generated"):
+                warm_execute.execute(mock_pipeline_data)
+
+    @patch("subprocess.Popen")
+    def test_teardown(self, mock_popen, warm_execute, mock_pipeline_data):
+        process = mock_process({"status": "success"})
+        mock_popen.return_value = process
+        with patch("pathlib.Path.exists", return_value=True):
+            warm_execute.execute(mock_pipeline_data)
+        warm_execute.teardown()
+        process.stdin.close.assert_called_once()
+        assert warm_execute.executors == {}
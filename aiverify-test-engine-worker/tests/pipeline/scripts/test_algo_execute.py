@@ -3,6 +3,8 @@ from unittest.mock import Mock, patch, mock_open, MagicMock
 from aiverify_test_engine_worker.pipeline.scripts import algo_execute
 from pathlib import Path
 from aiverify_test_engine.interfaces.ialgorithm import IAlgorithm
+from aiverify_test_engine.plugins.prediction_cache import PredictionCache
+import pandas as pd
 
 
 # Fixture to create an instance of ProcessCallback
@@ -11,6 +13,25 @@ def process_callback():
     return algo_execute.ProcessCallback("test_run_id")
 
 
+class TestProcessCallback:
+    @patch.object(algo_execute, "ProgressReporter")
+    @patch.object(algo_execute.ProcessCallback, "apigw_url", "http://apigw")
+    def test_progress_callback(self, mock_reporter_class, process_callback):
+        process_callback.progress_callback(10)
+        process_callback.progress_callback(20)
+        mock_reporter_class.assert_called_once_with("http://apigw", 1.0)
+        reporter = mock_reporter_class.return_value
+        assert [call.args for call in reporter.report.call_args_list] == [("test_run_id", 10), ("test_run_id", 20)]
+
+        algo_execute.ProcessCallback.close_reporter()
+        reporter.close.assert_called_once()
+        assert algo_execute.ProcessCallback.reporter is None
+
+    def test_progress_callback_no_apigw(self, process_callback):
+        process_callback.progress_callback(10)
+        assert algo_execute.ProcessCallback.reporter is None
+
+
 # Test for load_algorithm_class function
 class TestLoadAlgorithmClass:
     @patch.object(algo_execute, "validate_algorithm")
@@ -56,3 +77,54 @@ class TestLoadPluginManager:
     def test_load_plugin_manager_failure(self, mock_find_spec):
         with pytest.raises(SystemExit):
             algo_execute.load_plugin_manager()
+
+
+class DummyData:
+    def __init__(self):
+        self.columns = ["feature", "label"]
+
+    def remove_ground_truth(self, ground_truth: str):
+        self.columns.remove(ground_truth)
+
+    def get_data(self):
+        return pd.DataFrame({column: [0, 1] for column in self.columns})
+
+
+# Test for execute_algorithm function
+class TestExecuteAlgorithm:
+    def test_same_ground_truth_instance_copied(self, tmp_path):
+        args = Mock(algorithm_args={}, ground_truth="label", model_type="classification", test_run_id="test_run_id",
+                    algo_path=tmp_path)
+        data_instance = DummyData()
+        plugin_class = Mock(side_effect=RuntimeError("stop after plugin created"))
+        with pytest.raises(RuntimeError):
+            algo_execute.execute_algorithm(args, tmp_path / "algo.py", plugin_class, {}, {}, tmp_path,
+                                           (data_instance, None), (Mock(), None, False), (data_instance, None))
+        data, _, ground_truth = plugin_class.call_args.args[:3]
+        assert data[0].columns == ["feature"]
+        assert ground_truth[0] is not data_instance
+        assert ground_truth[0].columns == ["feature", "label"]
+
+    def test_dataset_registered_for_prediction_cache(self, tmp_path):
+        args = Mock(algorithm_args={}, ground_truth="label", model_type="classification", test_run_id="test_run_id",
+                    algo_path=tmp_path)
+        data_instance = DummyData()
+        plugin_class = Mock(side_effect=RuntimeError("stop after plugin created"))
+        try:
+            with pytest.raises(RuntimeError):
+                algo_execute.execute_algorithm(args, tmp_path / "algo.py", plugin_class, {}, {}, tmp_path,
+                                               (data_instance, None), (Mock(), None, False), (data_instance, None))
+            # the predictions of the data without the ground truth are stored on disk
+            assert len(PredictionCache._datasets) == 1
+            assert list(PredictionCache._datasets[0].columns) == ["feature"]
+        finally:
+            PredictionCache.set_datasets([])
+
+    def test_prediction_cache_max_size(self, tmp_path):
+        try:
+            assert algo_execute.get_prediction_cache(tmp_path, 10) == tmp_path.absolute().as_posix()
+            assert PredictionCache._max_disk_bytes == 10 * 1024 * 1024
+            assert algo_execute.get_prediction_cache(None) is True
+            assert PredictionCache._max_disk_bytes is None
+        finally:
+            PredictionCache.set_max_disk_size(None)
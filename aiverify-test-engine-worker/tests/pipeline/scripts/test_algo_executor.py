@@ -0,0 +1,135 @@
+import pytest
+from unittest.mock import Mock, patch
+from aiverify_test_engine_worker.pipeline.scripts import algo_executor
+from aiverify_test_engine_worker.pipeline.scripts.file_utils import get_path_hash
+from pathlib import Path
+import json
+import os
+import subprocess
+import sys
+
+
+@pytest.fixture
+def task_files(tmp_path):
+    algo_path = tmp_path / "algorithm"
+    algo_path.mkdir()
+    data_path = tmp_path / "data.csv"
+    data_path.write_text("a,b\n1,2\n")
+    model_path = tmp_path / "model.sav"
+    model_path.write_bytes(b"model")
+    return algo_path, data_path, model_path
+
+
+def get_argv(algo_path: Path, data_path: Path, model_path: Path) -> list[str]:
+    return [
+        "--algo_path", str(algo_path),
+        "--data_path", str(data_path),
+        "--model_path", str(model_path),
+        "--model_type", "classification",
+        "--algorithm_args", json.dumps({"batch_size": 32}),
+    ]
+
+
+@pytest.fixture
+def executor():
+    executor = algo_executor.AlgoExecutor(Path("/tmp/aiverify_test_engine"))
+    input_schema = {"type": "object"}
+    executor._get_algorithm = Mock(return_value=(Path("/tmp/algo.py"), Mock(), input_schema, {}, {}))
+    return executor
+
+
+class TestGetPathHash:
+    def test_get_path_hash(self, tmp_path):
+        file_path = tmp_path / "model.sav"
+        file_path.write_bytes(b"model")
+        file_hash = get_path_hash(file_path)
+        folder_hash = get_path_hash(tmp_path)
+        assert file_hash == get_path_hash(file_path)
+
+        file_path.write_bytes(b"changed model")
+        assert get_path_hash(file_path) != file_hash
+        assert get_path_hash(tmp_path) != folder_hash
+
+
+class TestAlgoExecutor:
+    @patch.object(algo_executor, "execute_algorithm")
+    @patch.object(algo_executor, "load_model", return_value=("model", None, False))
+    @patch.object(algo_executor, "load_data", return_value=("data", None))
+    def test_run_task_reuses_instances(self, mock_load_data, mock_load_model, mock_execute, executor, task_files):
+        argv = get_argv(*task_files)
+        assert executor.run_task(argv) == {"status": "success"}
+        assert executor.run_task(argv) == {"status": "success"}
+        mock_load_data.assert_called_once()
+        mock_load_model.assert_called_once_with(task_files[2], {"batch_size": 32}, True)
+
+        # a changed dataset is loaded again
+        task_files[1].write_text("a,b\n3,4\n")
+        executor.run_task(argv)
+        assert mock_load_data.call_count == 2
+        assert mock_load_model.call_count == 1
+
+    @patch.object(algo_executor, "execute_algorithm", side_effect=RuntimeError("algorithm failed"))
+    @patch.object(algo_executor, "load_model", return_value=("model", None, False))
+    @patch.object(algo_executor, "load_data", return_value=("data", None))
+    def test_run_task_error(self, mock_load_data, mock_load_model, mock_execute, executor, task_files):
+        response = executor.run_task(get_argv(*task_files))
+        assert response["status"] == "error"
+        assert "algorithm failed" in response["errorMessage"]
+
+    def test_run_task_invalid_input_arguments(self, executor, task_files):
+        executor._get_algorithm.return_value = (Path("/tmp/algo.py"), Mock(), {"type": "string"}, {}, {})
+        response = executor.run_task(get_argv(*task_files))
+        assert response == {"status": "error", "errorMessage": "Invalid input arguments"}
+
+    def test_cached_instances_are_bounded(self, executor):
+        executor.max_cached_instances = 2
+        for index in range(3):
+            executor._get_instance(("data", str(index)), lambda: index)
+        assert list(executor.instances.keys()) == [("data", "1"), ("data", "2")]
+
+    @patch.dict(sys.modules, {"torch": Mock()})
+    @patch.object(algo_executor, "execute_algorithm")
+    @patch.object(algo_executor, "load_model", return_value=("model", None, False))
+    @patch.object(algo_executor, "load_data", return_value=("data", None))
+    @patch("os.fork")
+    def test_run_task_fork_unsafe_modules(self, mock_fork, mock_load_data, mock_load_model, mock_execute, executor,
+                                          task_files):
+        # the task runs in the executor process, which is restarted after the task
+        assert executor.run_task(get_argv(*task_files)) == {"status": "success", "restart": True}
+        mock_fork.assert_not_called()
+        mock_execute.assert_called_once()
+
+        mock_execute.side_effect = RuntimeError("algorithm failed")
+        response = executor.run_task(get_argv(*task_files))
+        assert response["status"] == "error"
+        assert response["restart"] is True
+        assert "algorithm failed" in response["errorMessage"]
+
+
+class TestBuildPluginIndex:
+    def test_build_plugin_index_in_child(self, tmp_path):
+        # the plugins are discovered in the child only
+        marker = tmp_path / "discovered"
+        with patch.object(algo_executor, "load_plugin_manager", side_effect=lambda: marker.write_text(str(os.getpid()))):
+            algo_executor.build_plugin_index()
+        assert marker.read_text() != str(os.getpid())
+
+    def test_fork_unsafe_modules_preloaded(self):
+        with patch.dict(sys.modules, {"tensorflow": Mock()}):
+            assert "tensorflow" in algo_executor.get_fork_unsafe_modules()
+        with patch.dict(sys.modules):
+            for name in algo_executor.FORK_UNSAFE_MODULES:
+                sys.modules.pop(name, None)
+            assert algo_executor.get_fork_unsafe_modules() == []
+
+    def test_executor_start_up_preloads_fork_safe_modules_only(self, tmp_path):
+        # the plugins discovered from the index are not imported until they are used
+        script = (
+            "from aiverify_test_engine_worker.pipeline.scripts import algo_executor\n"
+            "algo_executor.build_plugin_index()\n"
+            "algo_executor.load_plugin_manager()\n"
+            "print(algo_executor.get_fork_unsafe_modules())\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], env={**os.environ, "AIVERIFY_CACHE_DIR": str(tmp_path)},
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.splitlines()[-1] == "[]"
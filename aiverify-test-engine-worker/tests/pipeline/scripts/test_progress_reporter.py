@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import patch
+from aiverify_test_engine_worker.pipeline.scripts.progress_reporter import (
+    ProgressReporter,
+    PipeProgressReporter,
+    forward_progress,
+)
+import io
+import json
+import os
+import requests
+import threading
+
+
+class MockSession:
+    """Session that records the progress updates, optionally blocking until released"""
+
+    def __init__(self):
+        self.updates: list[tuple[str, dict]] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def patch(self, url, json, timeout):
+        self.release.wait()
+        self.updates.append((url, json))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def mock_session():
+    session = MockSession()
+    with patch.object(requests, "Session", return_value=session):
+        yield session
+
+
+class TestProgressReporter:
+    def test_report_and_close(self, mock_session):
+        reporter = ProgressReporter("http://apigw", interval=0)
+        reporter.report("test_run_id", 10)
+        reporter.close(timeout=5)
+        assert mock_session.updates == [("http://apigw/test_runs/test_run_id", {"progress": 10})]
+
+    def test_updates_coalesced(self, mock_session):
+        reporter = ProgressReporter("http://apigw", interval=60)
+        # block the first update so that the following updates are queued
+        mock_session.release.clear()
+        reporter.report("test_run_id", 1)
+        for progress in range(2, 101):
+            reporter.report("test_run_id", progress)
+        reporter.report("another_test_run_id", 5)
+        mock_session.release.set()
+        # the queued updates are sent without waiting for the interval when flushed
+        assert reporter.flush(timeout=5)
+        progress_sent = [update["progress"] for url, update in mock_session.updates if url.endswith("/test_run_id")]
+        assert progress_sent[-1] == 100
+        assert len(progress_sent) <= 2
+        assert ("http://apigw/test_runs/another_test_run_id", {"progress": 5}) in mock_session.updates
+        reporter.close(timeout=5)
+
+    def test_report_does_not_block(self, mock_session):
+        reporter = ProgressReporter("http://apigw", interval=0)
+        mock_session.release.clear()
+        reporter.report("test_run_id", 1)
+        reporter.report("test_run_id", 2)  # returns while the first update is being sent
+        mock_session.release.set()
+        reporter.close(timeout=5)
+        assert mock_session.updates[-1][1] == {"progress": 2}
+
+    def test_report_after_close_ignored(self, mock_session):
+        reporter = ProgressReporter("http://apigw", interval=0)
+        reporter.close()
+        reporter.report("test_run_id", 10)
+        assert reporter.flush(timeout=1)
+        assert mock_session.updates == []
+
+    def test_request_error(self, mock_session):
+        reporter = ProgressReporter("http://apigw", interval=0)
+        with patch.object(mock_session, "patch", side_effect=requests.ConnectionError("refused")):
+            reporter.report("test_run_id", 10)
+            assert reporter.flush(timeout=5)
+        reporter.close(timeout=5)
+
+
+class TestPipeProgressReporter:
+    def test_forward_progress(self, mock_session):
+        read_fd, write_fd = os.pipe()
+        pipe_reporter = PipeProgressReporter(write_fd)
+        pipe_reporter.report("test_run_id", 10)
+        pipe_reporter.report("test_run_id", 20)
+        pipe_reporter.close()
+
+        reporter = ProgressReporter("http://apigw", interval=0)
+        forward_progress(os.fdopen(read_fd, "r"), reporter)
+        reporter.close(timeout=5)
+        assert mock_session.updates[-1] == ("http://apigw/test_runs/test_run_id", {"progress": 20})
+
+    def test_forward_invalid_update(self, mock_session):
+        reporter = ProgressReporter("http://apigw", interval=0)
+        pipe = io.StringIO("invalid\n" + json.dumps({"testRunId": "test_run_id", "progress": 30}) + "\n")
+        forward_progress(pipe, reporter)
+        reporter.close(timeout=5)
+        assert mock_session.updates == [("http://apigw/test_runs/test_run_id", {"progress": 30})]
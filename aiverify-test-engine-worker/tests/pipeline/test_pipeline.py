@@ -70,6 +70,37 @@ class TestRun:
         pipeline.error_pipe.execute.assert_called_once_with(task_data)
 
 
+# Test build method
+class TestBuild:
+    def test_build(self, pipeline, mock_pipeline_data):
+        download_pipe = Mock()
+        download_pipe.download_algorithm.side_effect = lambda task_data: task_data
+        build_pipe = Mock()
+        execute_pipe = Mock()
+        pipeline.stages = [
+            (PipeStageEnum.DOWNLOAD, download_pipe),
+            (PipeStageEnum.PIPELINE_BUILD, build_pipe),
+            (PipeStageEnum.PIPELINE_EXECUTE, execute_pipe),
+        ]
+        mock_pipeline_data.to_build = True
+        pipeline.build(mock_pipeline_data)
+
+        download_pipe.download_algorithm.assert_called_once_with(mock_pipeline_data)
+        download_pipe.execute.assert_not_called()
+        build_pipe.execute.assert_called_once_with(mock_pipeline_data)
+        execute_pipe.execute.assert_not_called()
+        assert mock_pipeline_data.algorithm_id == "mock_algorithmGID_mock_algorithmCID"
+
+    def test_build_already_built(self, pipeline, mock_pipeline_data):
+        download_pipe = Mock()
+        download_pipe.download_algorithm.side_effect = lambda task_data: task_data
+        build_pipe = Mock()
+        pipeline.stages = [(PipeStageEnum.DOWNLOAD, download_pipe), (PipeStageEnum.PIPELINE_BUILD, build_pipe)]
+        mock_pipeline_data.to_build = False
+        pipeline.build(mock_pipeline_data)
+        build_pipe.execute.assert_not_called()
+
+
 # Test teardown method
 class TestTeardown:
     def test_teardown(self, pipeline):
@@ -1,7 +1,8 @@
 import pytest
-from unittest.mock import Mock, patch, mock_open, ANY
+from unittest.mock import Mock, patch, ANY
 from aiverify_test_engine_worker.pipeline.upload.apigw_upload import ApigwDownload
 from aiverify_test_engine_worker.pipeline.pipe import PipeException
+from aiverify_test_engine_worker.pipeline.scripts.file_utils import iter_multipart_file, upload_file
 import os
 
 
@@ -31,25 +32,44 @@ class TestSetup:
 # Test for execute method
 class TestExecute:
     @patch("requests.post")
-    def test_execute_success(self, mock_post, apigw_upload, mock_pipeline_data):
-        mock_response = Mock(status_code=200)
-        mock_post.return_value = mock_response
-        with patch("builtins.open", mock_open(read_data='mocked file content')):
-            result = apigw_upload.execute(mock_pipeline_data)
-            assert result == mock_pipeline_data
-            mock_post.assert_called_once_with(
-                f"http://127.0.0.1:4000/test_results/upload_zip",
-                files={'file': ANY}
-            )
+    def test_execute_success(self, mock_post, apigw_upload, mock_pipeline_data, tmp_path):
+        mock_pipeline_data.output_zip = tmp_path / "output.zip"
+        mock_pipeline_data.output_zip.write_bytes(b"zip content")
+        mock_post.return_value = Mock(status_code=200)
+        result = apigw_upload.execute(mock_pipeline_data)
+        assert result == mock_pipeline_data
+        mock_post.assert_called_once_with(
+            f"http://127.0.0.1:4000/test_results/upload_zip",
+            data=ANY, headers=ANY, timeout=None
+        )
+        # the body is a generator, so that the zip is streamed with chunked transfer encoding
+        body = b"".join(mock_post.call_args.kwargs["data"])
+        assert b'filename="output.zip"' in body
+        assert b"zip content" in body
 
     @patch("requests.post", return_value=Mock(status_code=400, text="Bad request"))
     def test_execute_upload_failure(self, mock_post, apigw_upload, mock_pipeline_data):
-        with patch("builtins.open", mock_open(read_data='mocked file content')):
-            with pytest.raises(PipeException, match="Upload failed with status code 400"):
-                apigw_upload.execute(mock_pipeline_data)
-
-    @patch("requests.post", return_value=Mock(status_code=200))
-    @patch("builtins.open", side_effect=IOError("File not found"))
-    def test_execute_file_not_found(self, mock_open, mock_post, apigw_upload, mock_pipeline_data):
-        with pytest.raises(OSError, match="File not found"):
+        with pytest.raises(PipeException, match="Upload failed with status code 400"):
             apigw_upload.execute(mock_pipeline_data)
+
+
+class TestUploadFile:
+    def test_multipart_body(self, tmp_path):
+        from email.parser import BytesParser
+
+        file_path = tmp_path / "output.zip"
+        file_path.write_bytes(b"0123456789" * 10)
+        body = b"".join(iter_multipart_file(file_path, "boundary", chunk_size=7))
+        message = BytesParser().parsebytes(b"Content-Type: multipart/form-data; boundary=boundary\r\n\r\n" + body)
+        parts = message.get_payload()
+        assert len(parts) == 1
+        assert parts[0].get_param("name", header="Content-Disposition") == "file"
+        assert parts[0].get_filename() == "output.zip"
+        assert parts[0].get_payload(decode=True) == b"0123456789" * 10
+
+    @patch("requests.post")
+    def test_file_not_found(self, mock_post, tmp_path):
+        # the body generator reads the file while the request is sent
+        mock_post.side_effect = lambda url, data, **kwargs: b"".join(data)
+        with pytest.raises(OSError):
+            upload_file("http://apigw/test_results/upload_zip", tmp_path / "missing.zip")
@@ -0,0 +1,452 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from aiverify_test_engine_worker import worker as worker_module
+from aiverify_test_engine_worker.worker import Worker, init_task_process
+from aiverify_test_engine_worker.lib.contants import (
+    TASK_STREAM_NAME, TASK_GROUP_NAME, TASK_STREAMS_KEY, TASK_DEAD_LETTER_STREAM_NAME
+)
+from aiverify_test_engine_worker.pipeline.pipe import PipeException
+import multiprocessing
+import json
+import os
+
+
+def get_message(message_id: bytes, algorithm_cid: str = "algo1"):
+    task = {"id": message_id.decode(), "algorithmGID": "gid", "algorithmCID": algorithm_cid}
+    return (message_id, {b"task": json.dumps(task).encode("utf-8")})
+
+
+class MockPool:
+    """Process pool that keeps the submitted tasks until they are completed by the test"""
+
+    def __init__(self, *args, **kwargs):
+        self.submitted: list[tuple[Future, str]] = []
+
+    def submit(self, fn, task_str, *args):
+        future = Future()
+        self.submitted.append((future, task_str))
+        return future
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def mock_valkey_client(mocker):
+    mock_client = mocker.patch("aiverify_test_engine_worker.worker.client")
+    mock_client.xreadgroup.return_value = []
+    mock_client.xautoclaim.return_value = [b"0-0", [], []]
+    mock_client.hgetall.return_value = {}
+    mock_client.xpending_range.return_value = []
+    return mock_client
+
+
+@pytest.fixture
+def mock_error_pipe():
+    with patch.object(worker_module, "load_pipeline") as mock_load_pipeline:
+        yield mock_load_pipeline.return_value.error_pipe
+
+
+class MockStreams:
+    """xreadgroup of the task streams, returning the messages queued in each stream in order"""
+
+    def __init__(self, mock_client, lanes: dict[str, str], messages: dict[str, list]):
+        self.messages = messages
+        self.calls: list[tuple[list[str], int | None]] = []
+        mock_client.hgetall.return_value = {stream.encode(): lane.encode() for stream, lane in lanes.items()}
+        mock_client.xreadgroup.side_effect = self.xreadgroup
+
+    def xreadgroup(self, groupname, consumername, streams, count, block):
+        self.calls.append((list(streams.keys()), block))
+        response = []
+        for stream in streams.keys():
+            message_list = self.messages.get(stream, [])[:count]
+            self.messages[stream] = self.messages.get(stream, [])[count:]
+            if message_list:
+                response.append((stream.encode(), message_list))
+        return response
+
+
+@pytest.fixture
+def worker(mock_valkey_client):
+    with patch.dict(os.environ, {"TEWORKER_CONCURRENCY": "2"}):
+        with patch.object(worker_module, "ProcessPoolExecutor", MockPool):
+            yield Worker()
+
+
+class TestSetup:
+    def test_default_values(self):
+        worker = Worker()
+        assert worker.concurrency == 1
+        assert worker.task_cpus == 0
+        assert worker.task_memory_limit == 0
+        assert worker.reclaim_idle_time == 120
+        assert worker.max_retries == 2
+        assert worker.read_ahead == 4
+
+    @patch.dict(os.environ, {
+        "TEWORKER_CONCURRENCY": "8",
+        "TEWORKER_TASK_CPUS": "2",
+        "TEWORKER_TASK_MEMORY_LIMIT": "4096",
+        "TEWORKER_RECLAIM_IDLE_TIME": "60",
+        "TEWORKER_MAX_RETRIES": "0",
+    })
+    def test_custom_values(self):
+        worker = Worker()
+        assert worker.concurrency == 8
+        assert worker.task_cpus == 2
+        assert worker.task_memory_limit == 4096
+        assert worker.reclaim_interval == 15
+        assert worker.max_retries == 0
+
+
+class TestStep:
+    def test_reads_up_to_concurrency(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {
+            TASK_STREAM_NAME: [get_message(b"1-0", "algo1"), get_message(b"2-0", "algo2")]
+        })
+        worker.step()
+        assert mock_valkey_client.xreadgroup.call_args.kwargs["count"] == 1
+        assert mock_valkey_client.xreadgroup.call_args.kwargs["streams"] == {TASK_STREAM_NAME: '>'}
+        assert len(worker.pool.submitted) == 2
+        assert len(worker.in_flight) == 2
+
+        # no free slots, so no more messages are read
+        mock_valkey_client.xreadgroup.reset_mock()
+        worker.step()
+        mock_valkey_client.xreadgroup.assert_not_called()
+        mock_valkey_client.xack.assert_not_called()
+
+    def test_ack_on_completion(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {TASK_STREAM_NAME: [get_message(b"1-0")]})
+        worker.step()
+        mock_valkey_client.xack.assert_not_called()
+
+        worker.pool.submitted[0][0].set_result(None)
+        worker.step()
+        mock_valkey_client.xack.assert_called_once_with(TASK_STREAM_NAME, TASK_GROUP_NAME, b"1-0")
+        assert worker.in_flight == {}
+
+    def test_ack_on_task_error(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {TASK_STREAM_NAME: [get_message(b"1-0")]})
+        worker.step()
+        worker.pool.submitted[0][0].set_exception(PipeException("pipeline error"))
+        worker.step()
+        mock_valkey_client.xack.assert_called_once_with(TASK_STREAM_NAME, TASK_GROUP_NAME, b"1-0")
+        # the error has been reported by the pipeline
+        mock_valkey_client.xadd.assert_not_called()
+
+    def test_invalid_message_acknowledged(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {TASK_STREAM_NAME: [(b"1-0", {b"task": b"invalid"})]})
+        worker.step()
+        mock_valkey_client.xack.assert_called_once_with(TASK_STREAM_NAME, TASK_GROUP_NAME, b"1-0")
+        assert worker.in_flight == {}
+        assert mock_valkey_client.xadd.call_args.args[0] == TASK_DEAD_LETTER_STREAM_NAME
+        assert mock_valkey_client.xadd.call_args.args[1][b"task"] == b"invalid"
+
+    def test_same_algorithm_not_run_concurrently(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {
+            TASK_STREAM_NAME: [get_message(b"1-0", "algo1"), get_message(b"2-0", "algo1")]
+        })
+        worker.step()
+        assert len(worker.pool.submitted) == 1
+        assert [task.message_id for task in worker.waiting] == [b"2-0"]
+
+        worker.pool.submitted[0][0].set_result(None)
+        worker.step()
+        worker.step()
+        assert len(worker.pool.submitted) == 2
+        assert worker.waiting == []
+
+    def test_other_algorithm_dispatched_behind_same_algorithm(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {
+            TASK_STREAM_NAME: [get_message(f"{i}-0".encode(), "algo1") for i in range(1, 5)]
+            + [get_message(b"5-0", "algo2")]
+        })
+        worker.step()
+        # the tasks blocked by the running task of algo1 do not use the free slot
+        assert [task.message_id for task in worker.in_flight.values()] == [b"1-0", b"5-0"]
+        assert [task.message_id for task in worker.waiting] == [b"2-0", b"3-0", b"4-0"]
+
+    def test_blocked_tasks_limited_to_read_ahead(self, worker, mock_valkey_client):
+        worker.read_ahead = 2
+        streams = MockStreams(mock_valkey_client, {}, {
+            TASK_STREAM_NAME: [get_message(f"{i}-0".encode(), "algo1") for i in range(1, 5)]
+            + [get_message(b"5-0", "algo2")]
+        })
+        worker.step()
+        assert [task.message_id for task in worker.in_flight.values()] == [b"1-0"]
+        assert [task.message_id for task in worker.waiting] == [b"2-0", b"3-0"]
+        assert len(streams.messages[TASK_STREAM_NAME]) == 2
+
+
+class TestScheduling:
+    HIGH_A = f"{TASK_STREAM_NAME}:high:project-a"
+    HIGH_B = f"{TASK_STREAM_NAME}:high:project-b"
+    LOW = f"{TASK_STREAM_NAME}:low:default"
+
+    def test_lanes_read_in_priority_order(self, worker, mock_valkey_client):
+        streams = MockStreams(mock_valkey_client, {self.HIGH_A: "high", self.LOW: "low"}, {
+            self.LOW: [get_message(b"1-0", "algo1")],
+            TASK_STREAM_NAME: [get_message(b"2-0", "algo2")],
+            self.HIGH_A: [get_message(b"3-0", "algo3")],
+        })
+        worker.step()
+        assert [task.message_id for task in worker.in_flight.values()] == [b"3-0", b"2-0"]
+        # the high lane is read until it has no new messages, then the normal lane fills the last free slot
+        assert [call[0] for call in streams.calls] == [[self.HIGH_A], [self.HIGH_A], [TASK_STREAM_NAME]]
+        assert streams.messages[self.LOW] != []
+
+        # message acknowledged on its stream
+        worker.pool.submitted[0][0].set_result(None)
+        worker.step()
+        mock_valkey_client.xack.assert_called_once_with(self.HIGH_A, TASK_GROUP_NAME, b"3-0")
+        worker.step()
+        assert [task.message_id for task in worker.in_flight.values()] == [b"2-0", b"1-0"]
+
+    def test_streams_of_lane_read_in_turn(self, worker, mock_valkey_client):
+        streams = MockStreams(mock_valkey_client, {self.HIGH_A: "high", self.HIGH_B: "high"}, {
+            self.HIGH_A: [get_message(f"{i}-0".encode(), f"algo{i}") for i in range(1, 5)],
+            self.HIGH_B: [get_message(b"10-0", "algo10")],
+        })
+        worker.concurrency = 1
+        worker.step()
+        for _ in range(2):
+            worker.pool.submitted[-1][0].set_result(None)
+            worker.step()
+            worker.step()
+        # the tasks of project b are not queued behind all the tasks of project a
+        assert [task_str for _, task_str in worker.pool.submitted] == [
+            json.dumps({"id": message_id, "algorithmGID": "gid", "algorithmCID": algorithm_cid})
+            for message_id, algorithm_cid in [("1-0", "algo1"), ("10-0", "algo10"), ("2-0", "algo2")]
+        ]
+        # the streams of the lane are read in turn, one message at a time
+        assert [call[0] for call in streams.calls] == [[self.HIGH_A], [self.HIGH_B], [self.HIGH_A]]
+        assert [message_id for message_id, _ in streams.messages[self.HIGH_A]] == [b"3-0", b"4-0"]
+
+    def test_block_on_all_streams(self, worker, mock_valkey_client):
+        streams = MockStreams(mock_valkey_client, {self.HIGH_A: "high", self.LOW: "low"}, {})
+        worker.step()
+        assert streams.calls[-1] == ([self.HIGH_A, TASK_STREAM_NAME, self.LOW], worker.block_time)
+        mock_valkey_client.hgetall.assert_called_with(TASK_STREAMS_KEY)
+
+
+class TestRetry:
+    def test_retry_on_broken_pool(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {TASK_STREAM_NAME: [get_message(b"1-0")]})
+        worker.step()
+        worker.pool.submitted[0][0].set_exception(BrokenProcessPool("killed"))
+        worker.step()
+        mock_valkey_client.xack.assert_not_called()
+        assert [(task.message_id, task.deliveries) for task in worker.waiting] == [(b"1-0", 2)]
+        # the retry is counted in the pending entry
+        assert mock_valkey_client.xclaim.call_args.kwargs["message_ids"] == [b"1-0"]
+        assert "justid" not in mock_valkey_client.xclaim.call_args.kwargs
+
+        worker.step()
+        assert len(worker.pool.submitted) == 1  # new pool
+        assert next(iter(worker.in_flight.values())).message_id == b"1-0"
+
+    def test_retry_charged_to_killed_task(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {TASK_STREAM_NAME: [get_message(b"1-0", "algo1"),
+                                                                 get_message(b"2-0", "algo2")]})
+        worker.step()
+        assert len(worker.in_flight) == 2
+        killed_task, stopped_task = worker.in_flight.values()
+        # the process of the first task is killed, the pool terminates the process of the second task
+        worker.running_tasks[0] = killed_task.run_id
+        worker.running_tasks[1] = stopped_task.run_id
+        worker.terminated_slots[1] = 1
+        for future, _ in worker.pool.submitted:
+            future.set_exception(BrokenProcessPool("killed"))
+        worker._complete_tasks({worker.pool.submitted[1][0]})
+
+        assert worker.in_flight == {}
+        assert [(task.message_id, task.deliveries) for task in worker.waiting] == [(b"1-0", 2), (b"2-0", 1)]
+        mock_valkey_client.xclaim.assert_called_once()
+        assert mock_valkey_client.xclaim.call_args.kwargs["message_ids"] == [b"1-0"]
+
+        # both tasks are restarted in a new pool
+        worker.step()
+        assert len(worker.pool.submitted) == 2
+        assert [task.message_id for task in worker.in_flight.values()] == [b"1-0", b"2-0"]
+
+    def test_retry_charged_to_all_tasks_if_killed_task_not_found(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {TASK_STREAM_NAME: [get_message(b"1-0", "algo1"),
+                                                                 get_message(b"2-0", "algo2")]})
+        worker.step()
+        for future, _ in worker.pool.submitted:
+            future.set_exception(BrokenProcessPool("killed"))
+        worker._complete_tasks({future for future, _ in worker.pool.submitted})
+        assert [(task.message_id, task.deliveries) for task in worker.waiting] == [(b"1-0", 2), (b"2-0", 2)]
+
+    def test_dead_letter_after_max_retries(self, worker, mock_valkey_client, mock_error_pipe):
+        worker.max_retries = 0
+        MockStreams(mock_valkey_client, {}, {TASK_STREAM_NAME: [get_message(b"1-0")]})
+        worker.step()
+        worker.pool.submitted[0][0].set_exception(BrokenProcessPool("killed"))
+        worker.step()
+        mock_valkey_client.xack.assert_called_once_with(TASK_STREAM_NAME, TASK_GROUP_NAME, b"1-0")
+        assert worker.waiting == []
+
+        fields = mock_valkey_client.xadd.call_args.args[1]
+        assert mock_valkey_client.xadd.call_args.args[0] == TASK_DEAD_LETTER_STREAM_NAME
+        assert (fields["stream"], fields["messageId"], fields["deliveries"]) == (TASK_STREAM_NAME, b"1-0", 1)
+        assert "terminated" in fields["reason"]
+        # the test run is updated with the error
+        task_data = mock_error_pipe.execute.call_args.args[0]
+        assert (task_data.task.id, task_data.error_message) == ("1-0", fields["reason"])
+
+    def test_dead_letter_on_unexpected_error(self, worker, mock_valkey_client, mock_error_pipe):
+        MockStreams(mock_valkey_client, {}, {TASK_STREAM_NAME: [get_message(b"1-0")]})
+        worker.step()
+        worker.pool.submitted[0][0].set_exception(RuntimeError("unexpected"))
+        worker.step()
+        mock_valkey_client.xack.assert_called_once_with(TASK_STREAM_NAME, TASK_GROUP_NAME, b"1-0")
+        assert mock_valkey_client.xadd.call_args.args[1]["reason"] == "Unexpected error: unexpected"
+        mock_error_pipe.execute.assert_called_once()
+
+    def test_build_error_not_reported(self, worker, mock_valkey_client, mock_error_pipe):
+        build = {"algorithmGID": "gid", "algorithmCID": "algo1"}
+        MockStreams(mock_valkey_client, {}, {
+            TASK_STREAM_NAME: [(b"1-0", {b"build": json.dumps(build).encode("utf-8")})]
+        })
+        worker.step()
+        worker.pool.submitted[0][0].set_exception(RuntimeError("build error"))
+        worker.step()
+        assert mock_valkey_client.xadd.call_args.args[1][b"build"] == json.dumps(build)
+        mock_error_pipe.execute.assert_not_called()
+
+
+class TestBuild:
+    def test_build_message(self, worker, mock_valkey_client):
+        build = {"algorithmGID": "gid", "algorithmCID": "algo1", "algorithmHash": "hash"}
+        MockStreams(mock_valkey_client, {}, {
+            TASK_STREAM_NAME: [(b"1-0", {b"build": json.dumps(build).encode("utf-8")})]
+        })
+        with patch.object(worker.__class__, "_start_pool", lambda self: setattr(self, "pool", MagicMock())):
+            worker.step()
+        assert worker.pool.submit.call_args.args == (worker_module.run_build, json.dumps(build), 1)
+        assert next(iter(worker.in_flight.values())).algorithm_id == "gid_algo1"
+
+    @patch.object(worker_module, "release_cache_entries")
+    @patch.object(worker_module, "load_pipeline")
+    def test_run_build(self, mock_load_pipeline, mock_release_cache_entries):
+        worker_module.run_build(json.dumps({"algorithmGID": "gid", "algorithmCID": "cid", "algorithmHash": "hash"}))
+        task_data = mock_load_pipeline.return_value.build.call_args.args[0]
+        assert (task_data.task.algorithmGID, task_data.task.algorithmCID) == ("gid", "cid")
+        assert task_data.task.algorithmHash == "hash"
+        mock_release_cache_entries.assert_called_once()
+
+
+class TestReclaim:
+    def test_reclaim_idle_messages(self, worker, mock_valkey_client):
+        mock_valkey_client.xautoclaim.return_value = [b"0-0", [get_message(b"1-0")], [b"3-0"]]
+        worker.step()
+        assert mock_valkey_client.xautoclaim.call_args.args[0] == TASK_STREAM_NAME
+        assert mock_valkey_client.xautoclaim.call_args.kwargs["min_idle_time"] == 120000
+        assert mock_valkey_client.xautoclaim.call_args.kwargs["count"] == 2
+        # deleted message is acknowledged
+        mock_valkey_client.xack.assert_called_once_with(TASK_STREAM_NAME, TASK_GROUP_NAME, b"3-0")
+        assert len(worker.pool.submitted) == 1
+
+    def test_reclaimed_message_exceeding_retries(self, worker, mock_valkey_client, mock_error_pipe):
+        mock_valkey_client.xautoclaim.return_value = [b"0-0", [get_message(b"1-0"), get_message(b"2-0", "algo2")], []]
+        mock_valkey_client.xpending_range.side_effect = lambda stream, group, min, max, count: [
+            {"message_id": min, "times_delivered": 4 if min == b"1-0" else 2}
+        ]
+        worker.step()
+        mock_valkey_client.xack.assert_called_once_with(TASK_STREAM_NAME, TASK_GROUP_NAME, b"1-0")
+        assert mock_valkey_client.xadd.call_args.args[1]["reason"] == "Task not completed after 3 attempts"
+        mock_error_pipe.execute.assert_called_once()
+        assert [(task.message_id, task.deliveries) for task in worker.in_flight.values()] == [(b"2-0", 2)]
+
+    def test_refresh_in_flight_messages(self, worker, mock_valkey_client):
+        MockStreams(mock_valkey_client, {}, {TASK_STREAM_NAME: [get_message(b"1-0")]})
+        worker.step()
+        mock_valkey_client.xclaim.assert_not_called()
+
+        # reclaim again, in-flight messages are claimed to reset the idle time
+        mock_valkey_client.xautoclaim.return_value = [b"0-0", [get_message(b"1-0")], []]
+        worker.last_reclaim = 0
+        worker.step()
+        assert mock_valkey_client.xclaim.call_args.kwargs["message_ids"] == [b"1-0"]
+        # message already in flight is not run again
+        assert len(worker.pool.submitted) == 1
+
+
+class TestInitTaskProcess:
+    @patch.object(worker_module, "load_pipeline")
+    @patch.object(worker_module.resource, "setrlimit")
+    @patch.object(worker_module.os, "sched_setaffinity", create=True)
+    @patch.object(worker_module, "get_available_cpus", return_value=[0, 1, 2, 3])
+    def test_task_budgets(self, mock_cpus, mock_setaffinity, mock_setrlimit, mock_load_pipeline):
+        slot_counter = multiprocessing.Value("i", 0)
+        init_task_process(slot_counter, 2, 2, 1024)
+        init_task_process(slot_counter, 2, 2, 1024)
+        assert mock_setaffinity.call_args_list[0].args == (0, {0, 1})
+        assert mock_setaffinity.call_args_list[1].args == (0, {2, 3})
+        mock_setrlimit.assert_called_with(worker_module.resource.RLIMIT_AS, (1024 * 1024 * 1024, 1024 * 1024 * 1024))
+        assert mock_load_pipeline.call_count == 2
+
+    @patch.object(worker_module, "load_pipeline")
+    @patch.object(worker_module.resource, "setrlimit")
+    @patch.object(worker_module.os, "sched_setaffinity", create=True)
+    def test_no_budgets(self, mock_setaffinity, mock_setrlimit, mock_load_pipeline):
+        init_task_process(multiprocessing.Value("i", 0), 1, 0, 0)
+        mock_setaffinity.assert_not_called()
+        mock_setrlimit.assert_not_called()
+        mock_load_pipeline.assert_called_once()
+
+    @patch.object(worker_module, "load_pipeline")
+    @patch.object(worker_module.signal, "signal")
+    @patch.object(worker_module, "_task_slot", 0)
+    @patch.object(worker_module, "_running_tasks", None)
+    @patch.object(worker_module, "_terminated_slots", None)
+    def test_track_task(self, mock_signal, mock_load_pipeline):
+        running_tasks = multiprocessing.Array("q", 2, lock=False)
+        terminated_slots = multiprocessing.Array("b", 2, lock=False)
+        init_task_process(multiprocessing.Value("i", 1), 2, 0, 0, running_tasks, terminated_slots)
+        mock_signal.assert_called_once_with(worker_module.signal.SIGTERM, worker_module._on_terminate)
+
+        with worker_module._track_task(5):
+            assert list(running_tasks) == [0, 5]
+        assert list(running_tasks) == [0, 0]
+        with patch.object(worker_module.os, "_exit") as mock_exit:
+            worker_module._on_terminate(worker_module.signal.SIGTERM, None)
+        assert list(terminated_slots) == [0, 1]
+        mock_exit.assert_called_once_with(128 + worker_module.signal.SIGTERM)
+
+    @patch.object(worker_module, "load_pipeline")
+    @patch.object(worker_module.multiprocessing.util, "Finalize")
+    def test_teardown_registered(self, mock_finalize, mock_load_pipeline):
+        slot_counter = multiprocessing.Value("i", 0)
+        mock_finalize.reset_mock()
+        init_task_process(slot_counter, 1, 0, 0)
+        mock_finalize.assert_called_once_with(None, worker_module.teardown_pipeline, exitpriority=10)
+
+
+class TestTeardown:
+    def test_teardown_pipeline(self):
+        mock_pipeline = MagicMock()
+        with patch.object(worker_module, "_pipeline", mock_pipeline):
+            worker_module.teardown_pipeline()
+            mock_pipeline.teardown.assert_called_once()
+            assert worker_module._pipeline is None
+            # torn down once
+            worker_module.teardown_pipeline()
+            mock_pipeline.teardown.assert_called_once()
+
+    @patch.object(worker_module, "teardown_pipeline")
+    @patch.object(worker_module, "get_cache_stats", return_value={})
+    @patch.object(worker_module, "load_pipeline")
+    @patch.object(worker_module.signal, "signal")
+    def test_run_teardown_on_shutdown(self, mock_signal, mock_load_pipeline, mock_cache_stats, mock_teardown,
+                                      mock_valkey_client, worker):
+        worker.pool = MockPool()
+        with patch.object(worker, "step", side_effect=KeyboardInterrupt()):
+            worker.run()
+        mock_signal.assert_called_once_with(worker_module.signal.SIGTERM, worker_module._raise_interrupt)
+        mock_teardown.assert_called_once()
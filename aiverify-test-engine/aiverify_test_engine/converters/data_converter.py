@@ -56,6 +56,10 @@ class DataConverter:
             return DataConverter._convert_delimiter_dict_to_dataframe(
                 data_dict, pandas_instance
             )
+        elif plugin_type is DataPluginType.ARROW:
+            return DataConverter._convert_arrow_dict_to_dataframe(
+                data_dict, pandas_instance
+            )
         else:
             return None
 
@@ -68,7 +72,8 @@ class DataConverter:
 
         Args:
             data_dict (Dict): The data returned from DelimiterData. It should contain the data path of the CSV file
-            and the delimiter type
+            and the delimiter type. It may also contain the parser "engine", the column "dtype" and the "columns"
+            to be parsed
             pandas_instance (Any): The pandas instance created, so we can call pandas methods
             without importing pandas in aiverify-test-engine
 
@@ -87,7 +92,48 @@ class DataConverter:
             return None
 
         else:
-            df = pandas_instance.read_csv_as_df(data_path, delimiter_type)
+            # Pass on the optional parser settings only if they are provided
+            read_options = {
+                key: data_dict[key]
+                for key in ("engine", "dtype", "columns")
+                if data_dict.get(key) is not None
+            }
+            df = pandas_instance.read_csv_as_df(
+                data_path, delimiter_type, **read_options
+            )
+            return df
+
+    @staticmethod
+    def _convert_arrow_dict_to_dataframe(
+        data_dict: Dict, pandas_instance: IData
+    ) -> Any:
+        """
+        A helper method to convert a dictionary generated from ArrowData to pandas DataFrame
+
+        Args:
+            data_dict (Dict): The data returned from ArrowData. It should contain the data path of the columnar file
+            and the file format. It may also contain the "columns" to be read
+            pandas_instance (Any): The pandas instance created, so we can call pandas methods
+            without importing pandas in aiverify-test-engine
+
+        Returns:
+            pandas.DataFrame (Any): the DataFrame of converted data_dict
+        """
+        data_path = data_dict.get("data_path")
+        file_format = data_dict.get("file_format")
+
+        if (
+            data_path is None
+            or is_empty_string(data_path)
+            or file_format is None
+            or is_empty_string(file_format)
+        ):
+            return None
+
+        else:
+            df = pandas_instance.read_arrow_as_df(
+                data_path, file_format, data_dict.get("columns")
+            )
             return df
 
     @staticmethod
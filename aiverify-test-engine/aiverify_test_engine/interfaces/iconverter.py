@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Any, List
+from typing import Any, List, Union
 
 
 class IConverter:
@@ -16,3 +16,10 @@ class IConverter:
     @abstractmethod
     def read_image_as_df(self, image_paths: List, column_name: str) -> Any:
         pass
+
+    @staticmethod
+    @abstractmethod
+    def read_arrow_as_df(
+        self, data_path: str, file_format: str, columns: Union[List, None] = None
+    ) -> Any:
+        pass
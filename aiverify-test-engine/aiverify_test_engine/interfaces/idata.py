@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
 from aiverify_test_engine.interfaces.iplugin import IPlugin
 from aiverify_test_engine.plugins.enums.data_plugin_type import DataPluginType
@@ -58,3 +58,46 @@ class IData(IPlugin):
     @abstractmethod
     def convert_to_dict(self) -> Dict:
         pass
+
+    # Optional batch access for data that does not fit in memory.
+    # Data plugins that can read their data in batches should override these methods.
+    def is_batch_supported(self) -> bool:
+        """
+        A method to check whether the data can be read in batches with iter_batches
+
+        Returns:
+            bool: True if the data plugin supports reading the data in batches
+        """
+        return False
+
+    def get_num_rows(self) -> int:
+        """
+        A method to return the number of rows in the data
+
+        Returns:
+            int: the number of rows in the data
+        """
+        shape = self.get_shape()
+        return shape[0] if shape else 0
+
+    def iter_batches(
+        self, batch_size: int, columns: Union[List, None] = None
+    ) -> Iterator[Any]:
+        """
+        A method to read the data in batches of at most batch_size rows, so that the whole data
+        does not need to be in memory. Each batch is a pandas DataFrame
+
+        Args:
+            batch_size (int): The maximum number of rows in each batch
+            columns (Union[List, None], optional): The columns to be read, column names that are not
+            in the data are ignored. Defaults to None (all columns)
+
+        Raises:
+            NotImplementedError: The data plugin does not support reading the data in batches
+
+        Returns:
+            Iterator[Any]: An iterator of pandas DataFrame batches
+        """
+        raise NotImplementedError(
+            f"{type(self).__module__} does not support reading data in batches"
+        )
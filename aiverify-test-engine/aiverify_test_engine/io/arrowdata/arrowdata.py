@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from aiverify_test_engine.interfaces.idata import IData
+from aiverify_test_engine.plugins.enums.arrow_format_type import ArrowFormatType
+from aiverify_test_engine.plugins.enums.data_plugin_type import DataPluginType
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.metadata.arrow_metadata import ArrowMetadata
+from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
+from aiverify_test_engine.utils.arrow_utils import iter_arrow_batches, read_arrow_table
+from aiverify_test_engine.utils.validate_checks import is_empty_string
+
+
+# NOTE: Do not change the class name, else the plugin cannot be read by the system
+class Plugin(IData):
+    """
+    The Plugin(arrowdata) class specifies methods on
+    handling columnar data formats (Parquet, Feather, Arrow IPC).
+    """
+
+    # Some information on plugin
+    _data: ArrowMetadata = None
+    _name: str = "arrowdata"
+    _description: str = "arrowdata supports columnar data (Parquet, Feather, Arrow IPC)"
+    _version: str = "0.9.0"
+    _metadata: PluginMetadata = PluginMetadata(_name, _description, _version)
+    _plugin_type: PluginType = PluginType.DATA
+    _data_plugin_type: DataPluginType = DataPluginType.ARROW
+
+    @staticmethod
+    def get_metadata() -> PluginMetadata:
+        """
+        A method to return the metadata for this plugin
+
+        Returns:
+            PluginMetadata: Metadata of this plugin
+        """
+        return Plugin._metadata
+
+    @staticmethod
+    def get_plugin_type() -> PluginType:
+        """
+        A method to return the type for this plugin
+
+        Returns:
+             PluginType: Type of this plugin
+        """
+        return Plugin._plugin_type
+
+    @staticmethod
+    def get_data_plugin_type() -> DataPluginType:
+        """
+        A method to return data plugin type
+
+        Returns:
+            DataPluginType: data plugin type
+        """
+        return Plugin._data_plugin_type
+
+    def __init__(self, **kwargs) -> None:
+        data = kwargs.get("data", None)
+        if isinstance(data, ArrowMetadata) and data:
+            self._data = data
+
+    def setup(self) -> Tuple[bool, str]:
+        """
+        A method to perform setup
+
+        Returns:
+            Tuple[bool, str]: Returns bool to indicate success, str will indicate
+            the error message if failed.
+        """
+        is_success = True
+        error_messages = ""
+        return is_success, error_messages
+
+    def get_data(self) -> Any:
+        """
+        A method to return data. The selected columns are read from the memory-mapped file
+
+        Returns:
+            Any: data in a pyarrow Table
+        """
+        if isinstance(self._data, ArrowMetadata) and self._data:
+            return read_arrow_table(
+                self._data.get_data_path(),
+                self._data.get_file_format(),
+                self._data.get_columns(),
+            )
+        else:
+            return None
+
+    def get_file_format(self) -> Union[ArrowFormatType, None]:
+        """
+        A method to return the columnar file format
+
+        Returns:
+            Union[ArrowFormatType, None]: the file format of the data
+        """
+        if isinstance(self._data, ArrowMetadata) and self._data:
+            return self._data.get_file_format()
+        else:
+            return None
+
+    def set_data(self, data: ArrowMetadata) -> None:
+        """
+        A method to set the data.
+
+        Args:
+            data (ArrowMetadata): The data to replace the current data
+        """
+        if isinstance(data, ArrowMetadata) and data:
+            self._data = data
+
+    def is_supported(self) -> bool:
+        """
+        A method to check whether the data is being identified correctly
+        and is supported
+
+        Returns:
+            bool: True if is an instance of data and is supported
+        """
+        return isinstance(self._data, ArrowMetadata)
+
+    def keep_ground_truth(self, ground_truth: str) -> bool:
+        """
+        A method to keep only the ground truth in the data.
+        Only the ground truth column will be read from the file
+
+        Args:
+            ground_truth (str): The ground truth feature name
+
+        Returns:
+            bool: True if the ground truth is found and kept, False if not found
+        """
+        if (
+            isinstance(self._data, ArrowMetadata)
+            and not is_empty_string(ground_truth)
+            and ground_truth in self._data.get_labels()
+        ):
+            self._data = self._data.select_columns([ground_truth])
+            return True
+
+        return False
+
+    def read_labels(self) -> Dict:
+        """
+        A method to return the data labels
+
+        Returns:
+            Dict: Returns a dictionary of key-value pairs for col name - col datatype
+        """
+        if isinstance(self._data, ArrowMetadata):
+            return self._data.get_labels()
+        return dict()
+
+    def remove_ground_truth(self, ground_truth: str) -> None:
+        """
+        A method to remove ground truth from the data.
+        The ground truth column will not be read from the file
+
+        Args:
+            ground_truth (str): The ground truth feature name
+        """
+        if isinstance(self._data, ArrowMetadata) and not is_empty_string(ground_truth):
+            labels = self._data.get_labels()
+            if ground_truth in labels:
+                self._data = self._data.select_columns(
+                    [column for column in labels if column != ground_truth]
+                )
+
+    def validate(self) -> Tuple[bool, str]:
+        """
+        A method to perform validation on the data
+
+        Returns:
+            Tuple[bool, str]: True if the data is valid, False with error messages
+            if data is not valid
+        """
+        if isinstance(self._data, ArrowMetadata) and self._data.get_labels():
+            if any(is_empty_string(column) for column in self._data.get_labels()):
+                return False, "The data has missing column labels."
+            else:
+                return True, ""
+        else:
+            return False, "The inputs do not meet the validation rules."
+
+    def get_shape(self) -> Tuple[int, int]:
+        """
+        A method to return the number of rows and columns in the data.
+        The shape is read from the file schema without reading the data
+
+        Returns:
+            Tuple[int, int]: Returns the number of rows and columns in the data
+        """
+        if isinstance(self._data, ArrowMetadata):
+            return self._data.get_num_rows(), len(self._data.get_labels())
+
+    def is_batch_supported(self) -> bool:
+        """
+        A method to check whether the data can be read in batches with iter_batches
+
+        Returns:
+            bool: True if the data plugin supports reading the data in batches
+        """
+        return True
+
+    def get_num_rows(self) -> int:
+        """
+        A method to return the number of rows in the data, read from the file schema
+
+        Returns:
+            int: the number of rows in the data
+        """
+        if isinstance(self._data, ArrowMetadata):
+            return self._data.get_num_rows()
+        return 0
+
+    def iter_batches(
+        self, batch_size: int, columns: Union[List, None] = None
+    ) -> Iterator[Any]:
+        """
+        A method to read the data in batches of at most batch_size rows.
+        Only the batch being converted is read into memory
+
+        Args:
+            batch_size (int): The maximum number of rows in each batch
+            columns (Union[List, None], optional): The columns to be read, column names that are not
+            in the data are ignored. Defaults to None (the selected columns)
+
+        Raises:
+            ValueError: The batch size is not a positive integer
+
+        Returns:
+            Iterator[Any]: An iterator of pandas DataFrame batches
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError(f"The batch size must be a positive integer: {batch_size}")
+
+        if isinstance(self._data, ArrowMetadata) and self._data:
+            data = self._data
+            if columns is not None:
+                labels = data.get_labels()
+                data = data.select_columns(
+                    [column for column in columns if column in labels]
+                )
+            for record_batch in iter_arrow_batches(
+                data.get_data_path(),
+                data.get_file_format(),
+                batch_size,
+                data.get_columns(),
+            ):
+                yield record_batch.to_pandas()
+
+    def convert_to_dict(self) -> Dict:
+        """
+        A method to add the data path, file format and selected columns of the columnar file into a dictionary.
+
+        Returns:
+            Dict: dictionary with the data path, file format and selected columns
+        """
+        if isinstance(self._data, ArrowMetadata) and self._data:
+            return {
+                "data_path": self._data.get_data_path(),
+                "file_format": self._data.get_file_format().name,
+                "columns": self._data.get_columns(),
+            }
+        else:
+            return dict()
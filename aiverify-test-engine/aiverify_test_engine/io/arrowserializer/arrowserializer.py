@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import Any, Tuple
+
+import numpy
+import pyarrow
+from aiverify_test_engine.interfaces.iserializer import ISerializer
+from aiverify_test_engine.plugins.enums.arrow_format_type import ArrowFormatType
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
+    SerializerPluginType,
+)
+from aiverify_test_engine.plugins.metadata.arrow_metadata import ArrowMetadata
+from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
+from pyarrow import feather, ipc, parquet
+
+
+# NOTE: Do not change the class name, else the plugin cannot be read by the system
+class Plugin(ISerializer):
+    """
+    The Plugin(arrowserializer) class specifies methods on serialization.
+    """
+
+    # Some information on plugin
+    _name: str = "arrowserializer"
+    _description: str = (
+        "arrowserializer supports reading columnar data (Parquet, Feather, Arrow IPC)"
+    )
+    _version: str = "0.9.0"
+    _metadata: PluginMetadata = PluginMetadata(_name, _description, _version)
+    _plugin_type: PluginType = PluginType.SERIALIZER
+    _serializer_plugin_type: SerializerPluginType = SerializerPluginType.ARROW
+
+    @staticmethod
+    def get_metadata() -> PluginMetadata:
+        """
+        A method to return the metadata for this plugin
+
+        Returns:
+            PluginMetadata: Metadata of this plugin
+        """
+        return Plugin._metadata
+
+    @staticmethod
+    def get_plugin_type() -> PluginType:
+        """
+        A method to return the type for this plugin
+
+        Returns:
+             PluginType: Type of this plugin
+        """
+        return Plugin._plugin_type
+
+    @staticmethod
+    def deserialize_data(data_path: str) -> Any:
+        """
+        A method to read the data path and attempt to deserialize it.
+        Only the schema and row count are read, the column data is read when it is converted
+
+        Args:
+            data_path (str): data path that is serialized
+
+        Returns:
+            Any: deserialized data
+        """
+        # list of supported file signatures. list can be expanded in the future.
+        supported_signature_list = [
+            (ArrowFormatType.PARQUET, b"PAR1"),
+            (ArrowFormatType.FEATHER, b"ARROW1"),
+            (ArrowFormatType.FEATHER, b"FEA1"),
+            (ArrowFormatType.ARROW_STREAM, b"\xff\xff\xff\xff"),
+        ]
+
+        try:
+            with open(data_path, "rb") as data_file:
+                header = data_file.read(8)
+
+            # Check the file is of what format
+            detected_format = None
+            for file_format, signature in supported_signature_list:
+                if header.startswith(signature):
+                    detected_format = file_format
+                    break
+
+            # If file format is not supported
+            if not detected_format:
+                raise ValueError("The columnar file format is not supported.")
+
+            schema, num_rows = Plugin._read_schema(data_path, detected_format)
+            labels = {
+                field.name: Plugin._get_dtype_name(field.type) for field in schema
+            }
+            return ArrowMetadata(detected_format, labels, num_rows, data_path)
+        except Exception:
+            raise
+
+    @staticmethod
+    def get_serializer_plugin_type() -> SerializerPluginType:
+        """
+        A method to return SerializerPluginType
+
+        Returns:
+            SerializerPluginType: Serializer Plugin Type
+        """
+        return Plugin._serializer_plugin_type
+
+    @staticmethod
+    def _read_schema(
+        data_path: str, file_format: ArrowFormatType
+    ) -> Tuple[pyarrow.Schema, int]:
+        """
+        A helper method to read the schema and the number of rows of the columnar file
+
+        Args:
+            data_path (str): The columnar file path
+            file_format (ArrowFormatType): The detected file format
+
+        Returns:
+            Tuple[pyarrow.Schema, int]: The schema and the number of rows
+        """
+        if file_format is ArrowFormatType.PARQUET:
+            # The schema and row count are stored in the footer
+            parquet_file = parquet.ParquetFile(data_path, memory_map=True)
+            return parquet_file.schema_arrow, parquet_file.metadata.num_rows
+
+        elif file_format is ArrowFormatType.FEATHER:
+            with pyarrow.memory_map(data_path, "r") as source:
+                try:
+                    # Only the footer and the record batch headers are read
+                    reader = ipc.open_file(source)
+                except pyarrow.ArrowInvalid:
+                    # Feather V1 files are not Arrow IPC files
+                    table = feather.read_table(data_path, memory_map=True)
+                    return table.schema, table.num_rows
+                num_rows = sum(
+                    reader.get_batch(index).num_rows
+                    for index in range(reader.num_record_batches)
+                )
+                return reader.schema, num_rows
+
+        else:
+            with pyarrow.memory_map(data_path, "r") as source:
+                reader = ipc.open_stream(source)
+                # The memory-mapped batches are counted without copying the column data
+                num_rows = sum(batch.num_rows for batch in reader)
+                return reader.schema, num_rows
+
+    @staticmethod
+    def _get_dtype_name(arrow_type: pyarrow.DataType) -> str:
+        """
+        A helper method to return the pandas dtype name of an arrow type,
+        so that the labels match those read from a DataFrame
+
+        Args:
+            arrow_type (pyarrow.DataType): The arrow type
+
+        Returns:
+            str: The pandas dtype name
+        """
+        if pyarrow.types.is_dictionary(arrow_type):
+            return "category"
+
+        try:
+            return numpy.dtype(arrow_type.to_pandas_dtype()).name
+        except Exception:
+            return "object"
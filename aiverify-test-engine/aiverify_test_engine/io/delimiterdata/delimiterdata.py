@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple, Union
+import csv
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
 from aiverify_test_engine.interfaces.idata import IData
 from aiverify_test_engine.plugins.enums.data_plugin_type import DataPluginType
@@ -8,6 +9,7 @@ from aiverify_test_engine.plugins.enums.delimiter_type import DelimiterType
 from aiverify_test_engine.plugins.enums.plugin_type import PluginType
 from aiverify_test_engine.plugins.metadata.delimiter_metadata import DelimiterMetadata
 from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
+from pandas import read_csv
 
 
 # NOTE: Do not change the class name, else the plugin cannot be read by the system
@@ -166,6 +168,69 @@ class Plugin(IData):
         """
         pass
 
+    def is_batch_supported(self) -> bool:
+        """
+        A method to check whether the data can be read in batches with iter_batches
+
+        Returns:
+            bool: True if the data plugin supports reading the data in batches
+        """
+        return isinstance(self._data, DelimiterMetadata) and bool(
+            self._data.get_data_path()
+        )
+
+    def get_num_rows(self) -> int:
+        """
+        A method to return the number of rows in the data, excluding the header row.
+        The file is read row by row without keeping the rows in memory
+
+        Returns:
+            int: the number of rows in the data
+        """
+        if not self.is_batch_supported():
+            return 0
+
+        with open(self._data.get_data_path(), "r", newline="") as text_file:
+            num_rows = sum(
+                1
+                for _ in csv.reader(
+                    text_file, delimiter=self._data.get_delimiter_char()
+                )
+            )
+        return max(num_rows - 1, 0)
+
+    def iter_batches(
+        self, batch_size: int, columns: Union[List, None] = None
+    ) -> Iterator[Any]:
+        """
+        A method to read the data in batches of at most batch_size rows.
+        The file is parsed one batch at a time
+
+        Args:
+            batch_size (int): The maximum number of rows in each batch
+            columns (Union[List, None], optional): The columns to be read, column names that are not
+            in the data are ignored. Defaults to None (all columns)
+
+        Raises:
+            ValueError: The batch size is not a positive integer
+
+        Returns:
+            Iterator[Any]: An iterator of pandas DataFrame batches
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError(f"The batch size must be a positive integer: {batch_size}")
+
+        if self.is_batch_supported():
+            with read_csv(
+                self._data.get_data_path(),
+                sep=self._data.get_delimiter_char(),
+                chunksize=batch_size,
+                usecols=(
+                    (lambda column: column in columns) if columns is not None else None
+                ),
+            ) as reader:
+                yield from reader
+
     def convert_to_dict(self) -> Dict:
         """
         A method to add the data path of the CSV file and delimiter type into a dictionary.
@@ -28,6 +28,7 @@ class Plugin(ISerializer):
     _metadata: PluginMetadata = PluginMetadata(_name, _description, _version)
     _plugin_type: PluginType = PluginType.SERIALIZER
     _serializer_plugin_type: SerializerPluginType = SerializerPluginType.DELIMITER
+    _sample_size: int = 4096
 
     @staticmethod
     def get_metadata() -> PluginMetadata:
@@ -70,43 +71,39 @@ class Plugin(ISerializer):
             (DelimiterType.COLON, ":"),
         ]
 
-        # check if file can be parsed properly and if the delimiter is supported. if not, raise an error
+        # check if the file can be parsed properly and if the delimiter is supported. if not, raise an error
+        # only a sample at the start of the file is read here. the rows are parsed once by the data converter
         try:
             with open(data_path, "r") as text_file:
-                list_data = list(csv.reader(text_file))
-                # check if SV file only has a single column by checking for presence of supported SVs
-                if all(
-                    supported_separated_value[1] not in list_data[0][0]
-                    for supported_separated_value in supported_separated_values_list
-                ):
-                    delimiter_tuple = (DelimiterType.COMMA, ",")
-                    delimiter_instance = DelimiterMetadata(
-                        list_data, delimiter_tuple, data_path
-                    )
-                    return delimiter_instance
-                else:
-                    text_file.seek(0)
-                    dialect = csv.Sniffer().sniff(text_file.read(4096))
-                    detected_delimiter_tuple = None
-                    for count, item in enumerate(supported_separated_values_list):
-                        if (
-                            dialect.delimiter
-                            == supported_separated_values_list[count][1]
-                        ):
-                            detected_delimiter_tuple = item
-                            break
-
-                    # if delimiter is not found in our list of supported delimiters
-                    if not detected_delimiter_tuple:
-                        raise ValueError("The delimiter is not supported.")
-
-                    text_file.seek(0)
-                    reader = csv.reader(text_file, delimiter=dialect.delimiter)
-                    list_data_with_delimiter = list(reader)
-                    delimiter_instance = DelimiterMetadata(
-                        list_data_with_delimiter, detected_delimiter_tuple, data_path
-                    )
-                    return delimiter_instance
+                sample = text_file.read(Plugin._sample_size)
+            if not sample:
+                raise ValueError("The file is empty.")
+
+            # check if SV file only has a single column by checking for presence of supported SVs
+            first_cell = next(csv.reader(sample.splitlines()[:1]), [""])[0]
+            if all(
+                supported_separated_value[1] not in first_cell
+                for supported_separated_value in supported_separated_values_list
+            ):
+                delimiter_tuple = (DelimiterType.COMMA, ",")
+                return DelimiterMetadata(
+                    None, delimiter_tuple, data_path, read_on_demand=True
+                )
+            else:
+                dialect = csv.Sniffer().sniff(sample)
+                detected_delimiter_tuple = None
+                for count, item in enumerate(supported_separated_values_list):
+                    if dialect.delimiter == supported_separated_values_list[count][1]:
+                        detected_delimiter_tuple = item
+                        break
+
+                # if delimiter is not found in our list of supported delimiters
+                if not detected_delimiter_tuple:
+                    raise ValueError("The delimiter is not supported.")
+
+                return DelimiterMetadata(
+                    None, detected_delimiter_tuple, data_path, read_on_demand=True
+                )
         except Exception:
             raise
 
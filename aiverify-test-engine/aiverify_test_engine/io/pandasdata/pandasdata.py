@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
 from aiverify_test_engine.interfaces.iconverter import IConverter
 from aiverify_test_engine.interfaces.idata import IData
+from aiverify_test_engine.plugins.enums.arrow_format_type import ArrowFormatType
 from aiverify_test_engine.plugins.enums.data_plugin_type import DataPluginType
 from aiverify_test_engine.plugins.enums.plugin_type import PluginType
 from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
+from aiverify_test_engine.utils.arrow_utils import read_arrow_table
 from aiverify_test_engine.utils.validate_checks import is_empty_string
 from pandas import DataFrame, read_csv
 
@@ -184,6 +186,54 @@ class Plugin(IData, IConverter):
         if isinstance(self._data, DataFrame) and not self._data.empty:
             return self._data.shape[0], self._data.shape[1]
 
+    def is_batch_supported(self) -> bool:
+        """
+        A method to check whether the data can be read in batches with iter_batches
+
+        Returns:
+            bool: True if the data plugin supports reading the data in batches
+        """
+        return True
+
+    def get_num_rows(self) -> int:
+        """
+        A method to return the number of rows in the data
+
+        Returns:
+            int: the number of rows in the data
+        """
+        if isinstance(self._data, DataFrame):
+            return len(self._data)
+        return 0
+
+    def iter_batches(
+        self, batch_size: int, columns: Union[List, None] = None
+    ) -> Iterator[Any]:
+        """
+        A method to read the data in batches of at most batch_size rows.
+        The batches are views of the DataFrame and do not copy the data
+
+        Args:
+            batch_size (int): The maximum number of rows in each batch
+            columns (Union[List, None], optional): The columns to be read, column names that are not
+            in the data are ignored. Defaults to None (all columns)
+
+        Raises:
+            ValueError: The batch size is not a positive integer
+
+        Returns:
+            Iterator[Any]: An iterator of pandas DataFrame batches
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError(f"The batch size must be a positive integer: {batch_size}")
+
+        if isinstance(self._data, DataFrame):
+            df = self._data
+            if columns is not None:
+                df = df[[column for column in df.columns if column in columns]]
+            for start in range(0, len(df), batch_size):
+                yield df.iloc[start : start + batch_size]
+
     def convert_to_dict(self) -> Dict:
         """
         A method to convert the data returned from the data plugin to Dict
@@ -193,24 +243,76 @@ class Plugin(IData, IConverter):
         """
         pass
 
-    def read_csv_as_df(self, data_path: str, delimiter_char: str) -> Any:
+    def read_csv_as_df(
+        self,
+        data_path: str,
+        delimiter_char: str,
+        engine: str = None,
+        dtype: Any = None,
+        columns: Union[List, None] = None,
+    ) -> Any:
         """
         A method to read in CSV, with the detected limiter, and converts the data into Pandas DataFrame
+        The file is parsed in a single pass directly into the DataFrame
 
         Args:
             data_path (str): The path of the CSV file
             delimiter_char (str): The delimiter detected prior to calling this method by DelimiterMetadata
+            engine (str, optional): The pandas parser engine (e.g. "c", "pyarrow"). Defaults to None (c engine)
+            dtype (Any, optional): The column data types, to skip type inference. Defaults to None
+            columns (Union[List, None], optional): The columns to be parsed, column names that are not
+            in the file are ignored. Defaults to None (all columns)
         Returns:
             Any: The CSV data in a Pandas DataFrame
         """
         if not is_empty_string(data_path) and not is_empty_string(delimiter_char):
             try:
-                df = read_csv(data_path, sep=delimiter_char)
+                usecols = None
+                if columns is not None:
+                    # The pyarrow engine does not accept a callable, so the columns are selected from the header
+                    header = read_csv(data_path, sep=delimiter_char, nrows=0)
+                    usecols = [column for column in header.columns if column in columns]
+                df = read_csv(
+                    data_path,
+                    sep=delimiter_char,
+                    engine=engine,
+                    dtype=dtype,
+                    usecols=usecols,
+                )
                 return df
             except Exception:
                 return None
         return None
 
+    def read_arrow_as_df(
+        self, data_path: str, file_format: str, columns: Union[List, None] = None
+    ) -> Any:
+        """
+        A method to read in a columnar file (Parquet, Feather, Arrow IPC) and converts the data into Pandas DataFrame.
+        The file is memory-mapped and only the selected columns are read
+
+        Args:
+            data_path (str): The path of the columnar file
+            file_format (str): The file format name detected prior to calling this method by ArrowMetadata
+            columns (Union[List, None], optional): The columns to be read. Defaults to None (all columns)
+
+        Returns:
+            Any: The columnar data in a Pandas DataFrame
+        """
+        if (
+            not is_empty_string(data_path)
+            and not is_empty_string(file_format)
+            and file_format in ArrowFormatType.__members__
+        ):
+            try:
+                table = read_arrow_table(
+                    data_path, ArrowFormatType[file_format], columns
+                )
+                return table.to_pandas()
+            except Exception:
+                return None
+        return None
+
     def read_image_as_df(self, image_paths: List, column_name: str) -> Any:
         """
         A method to read in image file information, converts the data into Pandas DataFrame.
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Tuple
+import os
+from typing import Any, Callable, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import torch
 import torch.nn.functional as F
-from torch.utils.data import DataLoader, TensorDataset
 
 from aiverify_test_engine.interfaces.imodel import IModel
 from aiverify_test_engine.plugins.enums.model_plugin_type import ModelPluginType
@@ -30,8 +30,15 @@ class Plugin(IModel):
     _metadata: PluginMetadata = PluginMetadata(_name, _description, _version)
     _plugin_type: PluginType = PluginType.MODEL
     _model_plugin_type: ModelPluginType = ModelPluginType.PYTORCH
-    _batch_size: int = 1
-    _num_workers: int = 0
+    _batch_size: Union[int, None] = None
+    _num_threads: Union[int, None] = None
+
+    # Automatic batch size: use a fraction of the available memory, allowing for the
+    # intermediate activations of a forward pass to be much larger than the input row
+    _default_batch_size: int = 1024
+    _max_batch_size: int = 8192
+    _memory_fraction: float = 0.25
+    _activation_factor: int = 64
 
     @staticmethod
     def get_metadata() -> PluginMetadata:
@@ -70,6 +77,10 @@ class Plugin(IModel):
             # Set the model to evaluation mode
             self._model.eval()
 
+        self.set_inference_options(
+            kwargs.get("batch_size", None), kwargs.get("num_threads", None)
+        )
+
     def cleanup(self) -> None:
         """
         A method to clean-up objects
@@ -88,6 +99,30 @@ class Plugin(IModel):
         error_messages = ""
         return is_success, error_messages
 
+    def set_inference_options(
+        self,
+        batch_size: Union[int, None] = None,
+        num_threads: Union[int, None] = None,
+    ) -> None:
+        """
+        A method to set the inference options used by predict and predict_proba
+
+        Args:
+            batch_size (Union[int, None], optional): The number of rows in each forward pass.
+            Defaults to None (chosen from the available memory)
+            num_threads (Union[int, None], optional): The number of threads used by torch for CPU inference.
+            Defaults to None (torch default)
+        """
+        if isinstance(batch_size, int) and batch_size > 0:
+            self._batch_size = batch_size
+        else:
+            self._batch_size = None
+
+        if isinstance(num_threads, int) and num_threads > 0:
+            self._num_threads = num_threads
+        else:
+            self._num_threads = None
+
     def get_model(self) -> Any:
         """
         A method to return the model
@@ -141,24 +176,9 @@ class Plugin(IModel):
             np.ndarray: Predicted results.
         """
         try:
-            predictions = []
-
-            # Create DataLoader from input data
-            dataloader = self._create_dataloader(data)
-            with torch.no_grad():
-                for batch in dataloader:
-                    # TensorDataset returns a tuple, get the first element
-                    batch_input = batch[0]
-                    batch_pred = self._model(batch_input)
-                    # Apply argmax to get class labels
-                    batch_classes = torch.argmax(
-                        batch_pred, dim=1
-                    )  # dim=1 assumes class logits are along dimension 1
-                    predictions.append(batch_classes)
-                    # predictions.append(batch_pred)
-
-            # Concatenate all predictions and return as NumPy array
-            return torch.cat(predictions, dim=0).numpy()
+            # Apply argmax to get class labels
+            # dim=1 assumes class logits are along dimension 1
+            return self._run_inference(data, lambda logits: torch.argmax(logits, dim=1))
 
         except Exception as e:
             print(f"Error during prediction: {e}")
@@ -175,20 +195,7 @@ class Plugin(IModel):
             Any: Predicted result probabilities.
         """
         try:
-            # Create a DataLoader using the provided data
-            dataloader = self._create_dataloader(data)
-
-            probabilities = []  # Store predicted probabilities
-            with torch.no_grad():
-                for batch in dataloader:
-                    # Extract input data from the DataLoader batch
-                    batch_input = batch[0]  # TensorDataset returns a tuple
-                    logits = self._model(batch_input)
-                    probas = F.softmax(logits, dim=1)
-                    probabilities.append(probas)
-
-            # Concatenate all probabilities into a single NumPy array
-            return torch.cat(probabilities, dim=0).numpy()
+            return self._run_inference(data, lambda logits: F.softmax(logits, dim=1))
 
         except Exception as e:
             raise ValueError(f"Error during prediction probability computation: {e}")
@@ -242,34 +249,87 @@ class Plugin(IModel):
         except Exception as e:
             raise ValueError(f"Failed to convert input to tensor: {str(e)}")
 
-    def _create_dataloader(self, data: Any) -> DataLoader:
+    def _run_inference(
+        self, data: Any, transform: Callable[[torch.Tensor], torch.Tensor]
+    ) -> np.ndarray:
         """
-        Create a DataLoader using TensorDataset.
+        A helper method to run the model over the data in batches and write the transformed outputs
+        into a preallocated buffer
 
         Args:
-            data: Input data in supported format
+            data (Any): Data to be predicted by the model
+            transform (Callable[[torch.Tensor], torch.Tensor]): The transformation applied to the
+            model output of each batch (e.g. argmax, softmax)
 
         Returns:
-            DataLoader: PyTorch DataLoader
+            np.ndarray: The transformed outputs of all the rows
         """
-        try:
-            # Convert to tensor
-            tensor_data = self._convert_to_tensor(data)
-
-            # Create TensorDataset
-            dataset = TensorDataset(tensor_data)
-
-            # Create DataLoader
-            return DataLoader(
-                dataset,
-                batch_size=self._batch_size,
-                shuffle=False,
-                num_workers=self._num_workers,
-                pin_memory=False,
-                drop_last=False,
+        tensor_data = self._convert_to_tensor(data)
+        num_rows = tensor_data.shape[0]
+        batch_size = self._batch_size or self._get_auto_batch_size(tensor_data)
+
+        if self._num_threads:
+            torch.set_num_threads(self._num_threads)
+
+        outputs = None
+        with torch.inference_mode():
+            for start in range(0, num_rows, batch_size):
+                end = min(start + batch_size, num_rows)
+                batch_output = transform(self._model(tensor_data[start:end]))
+                if outputs is None:
+                    # Allocate the output once, using the shape of the first batch output
+                    outputs = torch.empty(
+                        (num_rows, *batch_output.shape[1:]), dtype=batch_output.dtype
+                    )
+                outputs[start:end] = batch_output
+
+        if outputs is None:
+            return np.empty((0,))
+        return outputs.numpy()
+
+    def _get_auto_batch_size(self, tensor_data: torch.Tensor) -> int:
+        """
+        A helper method to choose the batch size from the available memory and the size of each row
+
+        Args:
+            tensor_data (torch.Tensor): The input data tensor
+
+        Returns:
+            int: The batch size
+        """
+        num_rows = max(tensor_data.shape[0], 1)
+        row_bytes = max(tensor_data[:1].numel() * tensor_data.element_size(), 1)
+        available_memory = self._get_available_memory()
+        if available_memory is None:
+            batch_size = Plugin._default_batch_size
+        else:
+            batch_size = int(
+                available_memory
+                * Plugin._memory_fraction
+                / (row_bytes * Plugin._activation_factor)
             )
-        except Exception as e:
-            raise ValueError(f"Failed to create DataLoader: {str(e)}")
+        return max(1, min(batch_size, Plugin._max_batch_size, num_rows))
+
+    @staticmethod
+    def _get_available_memory() -> Union[int, None]:
+        """
+        A helper method to return the available system memory in bytes
+
+        Returns:
+            Union[int, None]: The available memory in bytes, None if it cannot be determined
+        """
+        try:
+            with open("/proc/meminfo", "r") as meminfo:
+                for line in meminfo:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) * 1024
+        except Exception:
+            pass
+
+        try:
+            return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (AttributeError, ValueError, OSError):
+            return None
 
     def _identify_model_algorithm(self, model: Any) -> Tuple[bool, str]:
         """
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Tuple
+from typing import Any, Tuple, Union
 
 import torch
 
@@ -26,6 +26,8 @@ class Plugin(IPipeline):
     _metadata: PluginMetadata = PluginMetadata(_name, _description, _version)
     _plugin_type: PluginType = PluginType.PIPELINE
     _pipeline_plugin_type: PipelinePluginType = PipelinePluginType.PYTORCH
+    _batch_size: Union[int, None] = None
+    _num_threads: Union[int, None] = None
 
     @staticmethod
     def get_metadata() -> PluginMetadata:
@@ -62,6 +64,10 @@ class Plugin(IPipeline):
         if pipeline:
             self._pipeline = pipeline
 
+        self.set_inference_options(
+            kwargs.get("batch_size", None), kwargs.get("num_threads", None)
+        )
+
     def cleanup(self) -> None:
         """
         A method to clean-up objects
@@ -80,6 +86,32 @@ class Plugin(IPipeline):
         error_messages = ""
         return is_success, error_messages
 
+    def set_inference_options(
+        self,
+        batch_size: Union[int, None] = None,
+        num_threads: Union[int, None] = None,
+    ) -> None:
+        """
+        A method to set the inference options used by predict and predict_proba.
+        The batch size is passed on to pipelines that have a batch_size attribute,
+        as the pipeline is responsible for splitting the data into batches
+
+        Args:
+            batch_size (Union[int, None], optional): The number of rows in each forward pass.
+            Defaults to None (pipeline default)
+            num_threads (Union[int, None], optional): The number of threads used by torch for CPU inference.
+            Defaults to None (torch default)
+        """
+        if isinstance(batch_size, int) and batch_size > 0:
+            self._batch_size = batch_size
+        else:
+            self._batch_size = None
+
+        if isinstance(num_threads, int) and num_threads > 0:
+            self._num_threads = num_threads
+        else:
+            self._num_threads = None
+
     def get_pipeline(self) -> Any:
         """
         A method to return the pipeline
@@ -149,7 +181,9 @@ class Plugin(IPipeline):
         #
         # The user should implement the necessary data preprocessing steps in the predict method.
         try:
-            return self._pipeline.predict(data)
+            self._apply_inference_options()
+            with torch.inference_mode():
+                return self._pipeline.predict(data)
         except Exception:
             raise
 
@@ -164,7 +198,9 @@ class Plugin(IPipeline):
             Any: predicted result
         """
         try:
-            return self._pipeline.predict_proba(data)
+            self._apply_inference_options()
+            with torch.inference_mode():
+                return self._pipeline.predict_proba(data)
         except Exception:
             raise
 
@@ -184,6 +220,16 @@ class Plugin(IPipeline):
         except Exception:
             raise
 
+    def _apply_inference_options(self) -> None:
+        """
+        A helper method to apply the inference options to torch and the pipeline
+        """
+        if self._num_threads:
+            torch.set_num_threads(self._num_threads)
+
+        if self._batch_size and hasattr(self._pipeline, "batch_size"):
+            self._pipeline.batch_size = self._batch_size
+
     def _identify_pipeline_algorithm(self, pipeline: Any) -> Tuple[bool, str]:
         """
         A helper method to identify the pipeline algorithm whether it is being supported
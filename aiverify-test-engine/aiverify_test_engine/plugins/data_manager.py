@@ -7,6 +7,7 @@ from aiverify_test_engine.converters.data_converter import DataConverter
 from aiverify_test_engine.interfaces.idata import IData
 from aiverify_test_engine.interfaces.iserializer import ISerializer
 from aiverify_test_engine.plugins.enums.data_plugin_type import DataPluginType
+from aiverify_test_engine.plugins.serializer_sniffer import SerializerSniffer
 from aiverify_test_engine.utils.log_utils import log_message
 from aiverify_test_engine.utils.url_utils import download_from_url, is_url
 
@@ -34,7 +35,12 @@ class DataManager:
 
     @staticmethod
     def read_data(
-        data_path: str, data_plugins: Dict, serializer_plugins: Dict
+        data_path: str,
+        data_plugins: Dict,
+        serializer_plugins: Dict,
+        columns: Union[List, None] = None,
+        convert_to_pandas: bool = True,
+        read_options: Union[Dict, None] = None,
     ) -> Tuple[bool, Union[IData, None], Union[ISerializer, None], str]:
         """
         A method to read the data file/folder path or URL and return a list of tuple consisting of
@@ -45,6 +51,13 @@ class DataManager:
             data_path (str): The data file/folder path or URL
             data_plugins (Dict): A dictionary of supported data plugins
             serializer_plugins (Dict): A dictionary of supported serializer plugins
+            columns (Union[List, None], optional): The columns to be read from data files that are converted
+            to pandas (e.g. Parquet, CSV). Defaults to None (all columns)
+            convert_to_pandas (bool, optional): Whether to convert the data to pandas. Set to False to keep the
+            file-backed data instance (e.g. Parquet, CSV) and read it in batches with IData.iter_batches.
+            Defaults to True
+            read_options (Union[Dict, None], optional): The parser options of delimited files that are converted
+            to pandas, the parser "engine" (e.g. "pyarrow") and the column "dtype". Defaults to None
 
         Returns:
             Tuple[bool, Union[IData, None], Union[ISerializer, None], str]:
@@ -180,8 +193,10 @@ class DataManager:
         )
 
         # Convert to Pandas if necessary
+        # Data that is read in batches stays in its file-backed data instance
         if (
-            return_data_instance
+            convert_to_pandas
+            and return_data_instance
             and return_data_instance.get_data_plugin_type() is not DataPluginType.PANDAS
         ):
             log_message(
@@ -193,7 +208,9 @@ class DataManager:
                 is_success,
                 return_data_instance,
                 error_message,
-            ) = DataManager._convert_to_pandas(return_data_instance, data_plugins)
+            ) = DataManager._convert_to_pandas(
+                return_data_instance, data_plugins, columns, read_options
+            )
 
         # Log if there is return_data_instance found
         if return_data_instance:
@@ -256,7 +273,10 @@ class DataManager:
 
     @staticmethod
     def _convert_to_pandas(
-        data_instance: IData, data_plugins: Dict
+        data_instance: IData,
+        data_plugins: Dict,
+        columns: Union[List, None] = None,
+        read_options: Union[Dict, None] = None,
     ) -> Tuple[bool, Union[IData, None], str]:
         """
         A helper method to create a dataframe file by converting some other non-pandas datatype to pandas.
@@ -264,6 +284,8 @@ class DataManager:
         Args:
             data_instance (IData): An instance of IData
             data_plugins (Dict): A dictionary of supported data plugins
+            columns (Union[List, None], optional): The columns to be read. Defaults to None (all columns)
+            read_options (Union[Dict, None], optional): The parser "engine" and column "dtype". Defaults to None
 
         Returns:
             Tuple[bool, Union[IData, None], str]:
@@ -277,6 +299,12 @@ class DataManager:
         if pandas_data_plugin:
             pandas_data_instance = pandas_data_plugin.Plugin()
             data_dict = data_instance.convert_to_dict()
+            if columns is not None:
+                data_dict["columns"] = columns
+            if read_options:
+                for key in ("engine", "dtype"):
+                    if read_options.get(key) is not None:
+                        data_dict[key] = read_options[key]
             df_data = DataConverter.convert_dict_to_dataframe(
                 data_dict, data_instance.get_data_plugin_type(), pandas_data_instance
             )
@@ -353,18 +381,18 @@ class DataManager:
         data = None
         serializer = None
 
-        # Scan through all the supported serializer
+        # Scan through the supported serializers, most likely serializer for this file first
         # Check that this data is one of the supported data formats and can be deserialized
-        for (
-            _,
-            serializer_plugin,
-        ) in serializer_plugins.items():
+        for serializer_plugin in SerializerSniffer.sort_serializers(
+            data_file, serializer_plugins
+        ):
             try:
                 temp_serializer = serializer_plugin.Plugin
                 data = temp_serializer.deserialize_data(data_file)
                 if data is not None:
                     is_success = True
                     serializer = temp_serializer
+                    SerializerSniffer.remember_serializer(data_file, serializer_plugin)
                     break
             except Exception:
                 continue
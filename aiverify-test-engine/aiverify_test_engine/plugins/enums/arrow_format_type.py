@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class ArrowFormatType(Enum):
+    """
+    The ArrowFormatType enum class specifies the different columnar file formats the tool supports
+    """
+
+    PARQUET = 1
+    FEATHER = 2
+    ARROW_STREAM = 3
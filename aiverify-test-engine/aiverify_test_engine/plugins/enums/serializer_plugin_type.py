@@ -12,3 +12,4 @@ class SerializerPluginType(Enum):
     DELIMITER = 4
     IMAGE = 5
     PYTORCH = 6
+    ARROW = 7
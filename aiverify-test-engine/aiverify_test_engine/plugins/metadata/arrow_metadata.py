@@ -0,0 +1,109 @@
+from typing import Dict, List, Union
+
+from aiverify_test_engine.plugins.enums.arrow_format_type import ArrowFormatType
+from aiverify_test_engine.utils.validate_checks import is_empty_string
+
+
+class ArrowMetadata:
+    """
+    The ArrowMetadata class comprises information on a columnar (Parquet/Feather/Arrow IPC) file.
+    Only the schema and row count are kept, the column data stays in the file until it is read.
+    """
+
+    _file_path: str = ""
+    _file_format: ArrowFormatType = None
+    _labels: Dict = None
+    _num_rows: int = 0
+    _columns: Union[List, None] = None
+
+    def __init__(
+        self,
+        file_format: ArrowFormatType,
+        labels: Dict,
+        num_rows: int,
+        file_path: str = "",
+        columns: Union[List, None] = None,
+    ):
+        if file_format is not None and isinstance(file_format, ArrowFormatType):
+            self._file_format = file_format
+
+        if labels is not None and isinstance(labels, dict):
+            self._labels = labels
+        else:
+            self._labels = dict()
+
+        if isinstance(num_rows, int) and num_rows >= 0:
+            self._num_rows = num_rows
+
+        if not is_empty_string(file_path) and isinstance(file_path, str):
+            self._file_path = file_path
+
+        if columns is not None and isinstance(columns, list):
+            self._columns = [column for column in self._labels if column in columns]
+        else:
+            self._columns = None
+
+    def get_data_path(self) -> str:
+        """
+        A method to return the file path of the columnar file
+
+        Returns:
+            str: the columnar file path
+        """
+        return self._file_path
+
+    def get_file_format(self) -> ArrowFormatType:
+        """
+        A method to return the columnar file format
+
+        Returns:
+            ArrowFormatType: the file format of the columnar file
+        """
+        return self._file_format
+
+    def get_labels(self) -> Dict:
+        """
+        A method to return the labels of the selected columns
+
+        Returns:
+            Dict: Returns a dictionary of key-value pairs for col name - col datatype
+        """
+        return {
+            column: self._labels[column]
+            for column in self._labels
+            if self._columns is None or column in self._columns
+        }
+
+    def get_num_rows(self) -> int:
+        """
+        A method to return the number of rows in the file
+
+        Returns:
+            int: the number of rows
+        """
+        return self._num_rows
+
+    def get_columns(self) -> Union[List, None]:
+        """
+        A method to return the selected columns to be read
+
+        Returns:
+            Union[List, None]: the selected column names, None if all the columns are read
+        """
+        return self._columns
+
+    def select_columns(self, columns: Union[List, None]) -> "ArrowMetadata":
+        """
+        A method to return a copy of the metadata that reads only the selected columns from the file.
+        Column names that are not in the file are ignored. The metadata itself is not changed, as it
+        may be shared by copies of the data instance (e.g. the ground truth instance)
+
+        Args:
+            columns (Union[List, None]): the column names to be read, None to read all the columns
+
+        Returns:
+            ArrowMetadata: the metadata with the selected columns
+        """
+        return ArrowMetadata(
+            self._file_format, self._labels, self._num_rows, self._file_path, columns
+        )
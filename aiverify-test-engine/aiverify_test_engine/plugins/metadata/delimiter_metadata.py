@@ -1,3 +1,4 @@
+import csv
 from typing import Any, Tuple, Union
 
 from aiverify_test_engine.plugins.enums.delimiter_type import DelimiterType
@@ -12,14 +13,17 @@ class DelimiterMetadata:
     _data: Union[Any, None] = None
     _delimiter_type: Tuple[DelimiterType, str] = (None, None)
     _csv_file_path: str = ""
+    _read_on_demand: bool = False
 
     def __init__(
         self,
         data: Any,
         delimiter_type: Tuple[DelimiterType, str],
         csv_file_path: str = "",
+        read_on_demand: bool = False,
     ):
         self._data = data
+        self._read_on_demand = read_on_demand is True
 
         if (
             delimiter_type is not None
@@ -38,9 +42,17 @@ class DelimiterMetadata:
         """
         A method to return data value
 
+        If the metadata is created to read on demand, the rows are only read from the CSV file
+        the first time this method is called.
+
         Returns:
              Any: the delimited data that is read from the file
         """
+        if self._data is None and self._read_on_demand and self._csv_file_path:
+            with open(self._csv_file_path, "r") as text_file:
+                self._data = list(
+                    csv.reader(text_file, delimiter=self.get_delimiter_char())
+                )
         return self._data
 
     def get_delimiter_char(self) -> str:
@@ -1,8 +1,11 @@
 import logging
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, List, Tuple, Union
 
 from aiverify_test_engine.interfaces.imodel import IModel
 from aiverify_test_engine.interfaces.iserializer import ISerializer
+from aiverify_test_engine.plugins.enums.model_plugin_type import ModelPluginType
+from aiverify_test_engine.plugins.plugin_index import get_plugin_types
+from aiverify_test_engine.plugins.serializer_sniffer import SerializerSniffer
 from aiverify_test_engine.utils.log_utils import log_message
 from aiverify_test_engine.utils.url_utils import download_from_url, is_url
 
@@ -15,6 +18,14 @@ class ModelManager:
     """
 
     _logger: logging.Logger = None
+    # The packages that define the model classes supported by each model plugin type
+    _model_packages: Dict = {
+        ModelPluginType.SKLEARN: ("sklearn",),
+        ModelPluginType.TENSORFLOW: ("tensorflow", "keras", "tf_keras"),
+        ModelPluginType.XGBOOST: ("xgboost",),
+        ModelPluginType.LIGHTGBM: ("lightgbm",),
+        ModelPluginType.PYTORCH: ("torch",),
+    }
 
     @staticmethod
     def set_logger(logger: logging.Logger) -> None:
@@ -114,7 +125,10 @@ class ModelManager:
 
     @staticmethod
     def read_model_file(
-        model_file: str, model_plugins: Dict, serializer_plugins: Dict
+        model_file: str,
+        model_plugins: Dict,
+        serializer_plugins: Dict,
+        model_args: Union[Dict, None] = None,
     ) -> Tuple[bool, Union[IModel, None], Union[ISerializer, None], str]:
         """
         A method to read the model file path or URL and return the model instance and serializer instance
@@ -124,6 +138,8 @@ class ModelManager:
             model_file (str): The model file path or URL
             model_plugins (Dict): A dictionary of supported model plugins
             serializer_plugins (Dict): A dictionary of supported serializer plugins
+            model_args (Union[Dict, None], optional): Additional arguments for the model plugin
+            (e.g. batch_size, num_threads). Defaults to None
 
         Returns:
             Tuple[bool, Union[IModel, None], Union[ISerializer, None], str]:
@@ -214,7 +230,7 @@ class ModelManager:
             f"Attempting to identify model format: {type(model)}",
         )
         is_success, return_model_instance = ModelManager._try_to_identify_model_format(
-            model_plugins, **{"model": model}
+            model_plugins, **{**(model_args or dict()), "model": model}
         )
         if is_success:
             error_message = ""
@@ -260,18 +276,18 @@ class ModelManager:
         model = None
         serializer = None
 
-        # Scan through all the supported serializer
+        # Scan through the supported serializers, most likely serializer for this file first
         # Check that this model is one of the supported model formats and can be deserialized
-        for (
-            _,
-            serializer_plugin,
-        ) in serializer_plugins.items():
+        for serializer_plugin in SerializerSniffer.sort_serializers(
+            model_file, serializer_plugins
+        ):
             try:
                 temp_serializer = serializer_plugin.Plugin
                 model = temp_serializer.deserialize_data(model_file)
                 if model is not None:
                     is_success = True
                     serializer = temp_serializer
+                    SerializerSniffer.remember_serializer(model_file, serializer_plugin)
                     break
             except Exception:
                 continue
@@ -297,10 +313,12 @@ class ModelManager:
         is_success = False
         model_instance = None
 
-        # Scan through all the supported model formats
+        # Scan through all the supported model formats, plugins of the model's package first
         # Check that this model is one of the supported model formats
         try:
-            for _, model_plugin in model_plugins.items():
+            for model_plugin in ModelManager._sort_model_plugins(
+                kwargs.get("model"), model_plugins
+            ):
                 model_instance = model_plugin.Plugin(**kwargs)
                 if model_instance.is_supported():
                     is_success = True
@@ -311,3 +329,36 @@ class ModelManager:
             model_instance = None
 
         return is_success, model_instance
+
+    @staticmethod
+    def _sort_model_plugins(model: Any, model_plugins: Dict) -> List:
+        """
+        A helper method to order the model plugins so that the plugins of the packages the model class
+        is defined in (e.g. sklearn for a LogisticRegression) are checked first.
+        The plugin type is read from the discovery index, so that the other model plugins
+        (and their frameworks) are only imported if none of these plugins supports the model
+
+        Args:
+            model (Any): The deserialized model
+            model_plugins (Dict): The dictionary of detected model plugins
+
+        Returns:
+            List: The model plugins, candidates first and the others in priority order
+        """
+        model_packages = {
+            cls.__module__.split(".")[0] for cls in type(model).__mro__
+        }
+        candidates = list()
+        others = list()
+        for model_plugin in model_plugins.values():
+            try:
+                _, model_plugin_type = get_plugin_types(model_plugin)
+                packages = ModelManager._model_packages.get(model_plugin_type, ())
+            except Exception:
+                packages = ()
+            if model_packages.intersection(packages):
+                candidates.append(model_plugin)
+            else:
+                others.append(model_plugin)
+
+        return candidates + others
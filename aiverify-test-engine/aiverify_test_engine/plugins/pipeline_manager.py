@@ -10,6 +10,7 @@ from aiverify_test_engine.utils.import_modules import (
     get_non_python_files,
     import_python_modules,
 )
+from aiverify_test_engine.plugins.serializer_sniffer import SerializerSniffer
 from aiverify_test_engine.utils.log_utils import log_message
 from aiverify_test_engine.utils.url_utils import download_from_url, is_url
 from aiverify_test_engine.utils.zipfile_utils import extract_zipfile
@@ -37,7 +38,10 @@ class PipelineManager:
 
     @staticmethod
     def read_pipeline_path(
-        pipeline_path: str, pipeline_plugins: Dict, serializer_plugins: Dict
+        pipeline_path: str,
+        pipeline_plugins: Dict,
+        serializer_plugins: Dict,
+        pipeline_args: Union[Dict, None] = None,
     ) -> Tuple[bool, Union[IPipeline, None], Union[ISerializer, None], str]:
         """
         A method to read the pipeline path and return the pipeline instance and serializer instance
@@ -47,6 +51,8 @@ class PipelineManager:
             pipeline_path (str): The pipeline path (can be a file, folder path, ZIP archive or URL)
             pipeline_plugins (Dict): A dictionary of supported pipeline plugins
             serializer_plugins (Dict): A dictionary of supported serializer plugins
+            pipeline_args (Union[Dict, None], optional): Additional arguments for the pipeline plugin
+            (e.g. batch_size, num_threads). Defaults to None
 
         Returns:
             Tuple[bool, Union[IPipeline, None], Union[ISerializer, None], str]:
@@ -216,7 +222,7 @@ class PipelineManager:
             is_success,
             return_pipeline_instance,
         ) = PipelineManager._try_to_identify_pipeline_format(
-            pipeline_plugins, **{"pipeline": pipeline}
+            pipeline_plugins, **{**(pipeline_args or dict()), "pipeline": pipeline}
         )
         if is_success:
             error_message = ""
@@ -265,18 +271,20 @@ class PipelineManager:
         pipeline = None
         serializer = None
 
-        # Scan through all the supported serializer
+        # Scan through the supported serializers, most likely serializer for this file first
         # Check that this pipeline is one of the supported pipeline formats and can be deserialized
-        for (
-            _,
-            serializer_plugin,
-        ) in serializer_plugins.items():
+        for serializer_plugin in SerializerSniffer.sort_serializers(
+            pipeline_file, serializer_plugins
+        ):
             try:
                 temp_serializer = serializer_plugin.Plugin
                 pipeline = temp_serializer.deserialize_data(pipeline_file)
                 if pipeline is not None:
                     is_success = True
                     serializer = temp_serializer
+                    SerializerSniffer.remember_serializer(
+                        pipeline_file, serializer_plugin
+                    )
                     break
             except Exception:
                 continue
@@ -0,0 +1,330 @@
+import hashlib
+import json
+import os
+import sys
+from enum import Enum
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Tuple, Union
+
+from aiverify_test_engine.plugins.enums.data_plugin_type import DataPluginType
+from aiverify_test_engine.plugins.enums.model_plugin_type import ModelPluginType
+from aiverify_test_engine.plugins.enums.pipeline_plugin_type import PipelinePluginType
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
+    SerializerPluginType,
+)
+from aiverify_test_engine.utils.cache_utils import get_cache_dir
+from aiverify_test_engine.utils.import_modules import (
+    create_module_spec,
+    import_module_from_spec,
+)
+
+# The subtype enum and the Plugin getter that returns it, for each plugin type
+_plugin_subtypes: Dict = {
+    PluginType.DATA: (DataPluginType, "get_data_plugin_type"),
+    PluginType.MODEL: (ModelPluginType, "get_model_plugin_type"),
+    PluginType.PIPELINE: (PipelinePluginType, "get_pipeline_plugin_type"),
+    PluginType.SERIALIZER: (SerializerPluginType, "get_serializer_plugin_type"),
+}
+
+
+def get_plugin_types(
+    module: Union[ModuleType, "LazyPluginModule"],
+) -> Tuple[PluginType, Union[Enum, None]]:
+    """
+    A function to return the plugin type and plugin subtype (e.g. DataPluginType) of a plugin module.
+    Lazy plugin modules answer from the discovery index without importing the module.
+
+    Args:
+        module (Union[ModuleType, LazyPluginModule]): The plugin module
+
+    Returns:
+        Tuple[PluginType, Union[Enum, None]]: The plugin type and the plugin subtype.
+        Algorithm plugins do not have a subtype and will return None
+    """
+    if isinstance(module, LazyPluginModule):
+        return module.get_plugin_type(), module.get_plugin_subtype()
+
+    plugin_type = module.Plugin.get_plugin_type()
+    subtype_getter = _plugin_subtypes.get(plugin_type, (None, None))[1]
+    if subtype_getter:
+        return plugin_type, getattr(module.Plugin, subtype_getter)()
+    else:
+        return plugin_type, None
+
+
+class LazyPluginModule:
+    """
+    The LazyPluginModule class stands in for a discovered plugin module that has not been imported yet.
+    The module is only imported when one of its attributes (e.g. Plugin) is accessed
+    """
+
+    def __init__(
+        self,
+        module_name: str,
+        module_path: str,
+        plugin_type: PluginType,
+        plugin_subtype: Union[Enum, None],
+    ):
+        self._module_name = module_name
+        self._module_path = module_path
+        self._plugin_type = plugin_type
+        self._plugin_subtype = plugin_subtype
+        self._module = None
+
+    def __getattr__(self, name: str):
+        # Only called for attributes not found on the proxy itself
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        # Same representation as the imported module so that printable plugins do not change
+        return f"<module '{self._module_name}' from '{os.path.abspath(self._module_path)}'>"
+
+    def get_plugin_type(self) -> PluginType:
+        """
+        A method to return the plugin type recorded in the discovery index
+
+        Returns:
+            PluginType: Type of this plugin
+        """
+        return self._plugin_type
+
+    def get_plugin_subtype(self) -> Union[Enum, None]:
+        """
+        A method to return the plugin subtype recorded in the discovery index
+
+        Returns:
+            Union[Enum, None]: Subtype of this plugin (e.g. DataPluginType), None for algorithm plugins
+        """
+        return self._plugin_subtype
+
+    def is_loaded(self) -> bool:
+        """
+        A method to check whether the underlying module has been imported
+
+        Returns:
+            bool: True if the module has been imported
+        """
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        """
+        A method to import the underlying module if it has not been imported
+
+        Raises:
+            ImportError: The module cannot be imported from the module path
+
+        Returns:
+            ModuleType: The imported plugin module
+        """
+        if self._module is None:
+            # Add the plugin folder in case it uses relative path
+            plugin_folder_path = str(Path(self._module_path).parent)
+            sys.path.append(plugin_folder_path)
+            try:
+                module_spec = create_module_spec(self._module_name, self._module_path)
+                if not module_spec:
+                    raise ImportError(
+                        f"Unable to create module spec for plugin: {self._module_path}"
+                    )
+                self._module = import_module_from_spec(module_spec)
+            finally:
+                sys.path.remove(plugin_folder_path)
+
+        return self._module
+
+
+class PluginIndex:
+    """
+    The PluginIndex class persists the result of a plugin discovery scan (module name, plugin type,
+    plugin subtype and file fingerprint per python file) so that later discoveries of the same folder
+    do not need to import every python file to find out whether it is a plugin
+    """
+
+    _index_version: int = 1
+
+    def __init__(self, discover_folder: str, cache_dir: Union[str, None] = None):
+        self._discover_folder = str(Path(discover_folder).absolute())
+        folder_hash = hashlib.md5(self._discover_folder.encode("utf-8")).hexdigest()
+        self._index_path = (
+            Path(cache_dir or get_cache_dir()) / f"plugin_index.{folder_hash}.json"
+        )
+        self._entries: Dict = dict()
+        self._is_modified = False
+
+    def get_index_path(self) -> Path:
+        """
+        A method to return the path of the index file
+
+        Returns:
+            Path: The index file path
+        """
+        return self._index_path
+
+    def load(self) -> None:
+        """
+        A method to read the index file. A missing, corrupted or outdated index is treated as empty
+        """
+        self._entries = dict()
+        self._is_modified = False
+        try:
+            with open(self._index_path, "r") as index_file:
+                index_dict = json.load(index_file)
+            if (
+                isinstance(index_dict, dict)
+                and index_dict.get("version") == PluginIndex._index_version
+                and index_dict.get("discover_folder") == self._discover_folder
+                and isinstance(index_dict.get("entries"), dict)
+            ):
+                self._entries = index_dict["entries"]
+        except Exception:
+            pass  # Unable to read the index; Rebuild from a full scan
+
+    def save(self) -> None:
+        """
+        A method to write the index file if there are changes since it was loaded.
+        The file is replaced atomically so that concurrent readers never see a partial index
+        """
+        if not self._is_modified:
+            return
+
+        index_dict = {
+            "version": PluginIndex._index_version,
+            "discover_folder": self._discover_folder,
+            "entries": self._entries,
+        }
+        temp_path = self._index_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w") as index_file:
+                json.dump(index_dict, index_file)
+            os.replace(temp_path, self._index_path)
+            self._is_modified = False
+        except Exception:
+            # Unable to persist the index (e.g. read-only filesystem); Discovery still works without it
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def lookup(self, plugin_path: str) -> Tuple[bool, Union[Dict, None]]:
+        """
+        A method to look up the index entry of a python file
+
+        Args:
+            plugin_path (str): The python file path
+
+        Returns:
+            Tuple[bool, Union[Dict, None]]: Returns a bool that indicates if the file has an up-to-date entry,
+            and the entry (None if the file is not a plugin)
+        """
+        entry = self._entries.get(plugin_path)
+        if entry is None or entry.get("fingerprint") != self._get_fingerprint(
+            plugin_path
+        ):
+            return False, None
+
+        if entry.get("plugin_type") is None:
+            return True, None
+
+        # Reject entries that do not match the installed enums
+        if self._get_types_from_entry(entry) is None:
+            return False, None
+
+        return True, entry
+
+    def get_lazy_module(self, plugin_path: str, entry: Dict) -> LazyPluginModule:
+        """
+        A method to create a lazy plugin module from an index entry
+
+        Args:
+            plugin_path (str): The python file path
+            entry (Dict): The index entry returned by lookup
+
+        Returns:
+            LazyPluginModule: The lazy plugin module
+        """
+        plugin_type, plugin_subtype = self._get_types_from_entry(entry)
+        return LazyPluginModule(
+            entry["module_name"], plugin_path, plugin_type, plugin_subtype
+        )
+
+    def update(
+        self, plugin_path: str, module_name: str, module: Union[ModuleType, None]
+    ) -> None:
+        """
+        A method to add or replace the index entry of a python file
+
+        Args:
+            plugin_path (str): The python file path
+            module_name (str): The module name
+            module (Union[ModuleType, None]): The imported plugin module, None if the file is not a plugin
+        """
+        plugin_type = None
+        plugin_subtype = None
+        if module is not None:
+            module_plugin_type, module_plugin_subtype = get_plugin_types(module)
+            plugin_type = module_plugin_type.name
+            if module_plugin_subtype is not None:
+                plugin_subtype = module_plugin_subtype.name
+
+        self._entries[plugin_path] = {
+            "module_name": module_name,
+            "fingerprint": self._get_fingerprint(plugin_path),
+            "plugin_type": plugin_type,
+            "plugin_subtype": plugin_subtype,
+        }
+        self._is_modified = True
+
+    def prune(self, plugin_paths: List) -> None:
+        """
+        A method to remove entries of python files that no longer exist in the discover folder
+
+        Args:
+            plugin_paths (List): The python file paths found in the discover folder
+        """
+        stale_paths = set(self._entries.keys()) - set(plugin_paths)
+        for stale_path in stale_paths:
+            self._entries.pop(stale_path)
+            self._is_modified = True
+
+    @staticmethod
+    def _get_fingerprint(plugin_path: str) -> Union[List, None]:
+        """
+        A helper method to return the file fingerprint (modification time and size)
+
+        Args:
+            plugin_path (str): The python file path
+
+        Returns:
+            Union[List, None]: The file fingerprint, None if the file cannot be read
+        """
+        try:
+            file_stat = os.stat(plugin_path)
+            return [file_stat.st_mtime_ns, file_stat.st_size]
+        except OSError:
+            return None
+
+    @staticmethod
+    def _get_types_from_entry(
+        entry: Dict,
+    ) -> Union[Tuple[PluginType, Union[Enum, None]], None]:
+        """
+        A helper method to convert the stored plugin type names to enums
+
+        Args:
+            entry (Dict): The index entry
+
+        Returns:
+            Union[Tuple[PluginType, Union[Enum, None]], None]: The plugin type and subtype,
+            None if the stored names are not valid
+        """
+        try:
+            plugin_type = PluginType[entry["plugin_type"]]
+            subtype_enum = _plugin_subtypes.get(plugin_type, (None, None))[0]
+            if subtype_enum is None:
+                return plugin_type, None
+            return plugin_type, subtype_enum[entry["plugin_subtype"]]
+        except (KeyError, TypeError):
+            return None
@@ -4,6 +4,7 @@ import sys
 from logging import Logger
 from multiprocessing import Lock
 from pathlib import Path
+from types import ModuleType
 from typing import Dict, List, Tuple, Union
 
 from aiverify_test_engine.interfaces.ialgorithm import IAlgorithm
@@ -24,6 +25,14 @@ from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
 )
 from aiverify_test_engine.plugins.model_manager import ModelManager
 from aiverify_test_engine.plugins.pipeline_manager import PipelineManager
+from aiverify_test_engine.plugins.plugin_index import PluginIndex, get_plugin_types
+from aiverify_test_engine.plugins.prediction_cache import (
+    CachedModel,
+    CachedPipeline,
+    PredictionCache,
+)
+from aiverify_test_engine.plugins.serializer_sniffer import SerializerSniffer
+from aiverify_test_engine.utils.cache_utils import get_cache_dir
 from aiverify_test_engine.utils.import_modules import (
     create_module_spec,
     import_module_from_spec,
@@ -41,6 +50,7 @@ class PluginManager:
     _data_priority_list: List = [
         DataPluginType.PANDAS,
         DataPluginType.IMAGE,
+        DataPluginType.ARROW,
         DataPluginType.DELIMITER,
     ]
     _model_priority_list: List = [
@@ -57,6 +67,7 @@ class PluginManager:
         SerializerPluginType.TENSORFLOW,
         SerializerPluginType.IMAGE,
         SerializerPluginType.PYTORCH,
+        SerializerPluginType.ARROW,
         SerializerPluginType.DELIMITER,
     ]
     _pipeline_priority_list: List = [
@@ -67,6 +78,7 @@ class PluginManager:
     _plugins: Dict = {plugin_type.name: dict() for plugin_type in PluginType}
     lock: Lock = Lock()
     plugin_name: str = "Plugin"
+    index_cache_dir: str = get_cache_dir()
 
     @staticmethod
     def set_logger(logger: Logger) -> None:
@@ -83,20 +95,31 @@ class PluginManager:
             ModelManager.set_logger(logger)
             AlgorithmManager.set_logger(logger)
             PipelineManager.set_logger(logger)
+            SerializerSniffer.set_logger(logger)
+            PredictionCache.set_logger(logger)
 
     @staticmethod
     def discover(
-        discover_folder: str = str(Path().absolute() / "plugins"), tag_name: str = None
+        discover_folder: str = str(Path().absolute() / "plugins"),
+        tag_name: str = None,
+        use_index: bool = True,
     ) -> None:
         """
-        A method to discover possible plugins in the Discover folder indicated during setup phase
+        A method to discover possible plugins in the Discover folder indicated during setup phase.
+        Python files that were scanned before and have not changed since are looked up in the
+        discovery index, and their plugin modules are only imported when they are first used.
 
         Args:
             discover_folder (str, optional): A path to discover new plugins.
             Defaults to str(Path().absolute() / "plugins").
             tag_name (str, optional): A string to tag this name with the module found. Defaults to None
+            use_index (bool, optional): Whether to read and update the discovery index. Defaults to True
         """
-        if discover_folder is None or is_empty_string(discover_folder):
+        if (
+            discover_folder is None
+            or not isinstance(discover_folder, str)
+            or is_empty_string(discover_folder)
+        ):
             return
 
         # Find python files in the given folder.
@@ -104,43 +127,46 @@ class PluginManager:
             file for file in glob.glob(f"{discover_folder}/**/*.py", recursive=True)
         ]
 
+        plugin_index = None
+        if use_index:
+            plugin_index = PluginIndex(discover_folder, PluginManager.index_cache_dir)
+            plugin_index.load()
+
         # Search through the discovered paths and create modules
         plugin_modules = dict()
         for plugin_path in discover_paths:
-            # Add the plugin folder in case it uses relative path
-            plugin_folder_path = str(Path(plugin_path).parent)
-            sys.path.append(plugin_folder_path)
-
-            try:
-                # Remove files that have underscores (__filename__.py)
-                module_name = re.sub("\\.py$", "", Path(plugin_path).name)
-                if module_name.__contains__("__"):
-                    continue
-
-                # Import module with the module specification
-                # Store modules in the dict
-                module_spec = create_module_spec(module_name, plugin_path)
-                if not module_spec:
-                    continue  # module spec is None
-
-                module = import_module_from_spec(module_spec)
-                if (
-                    PluginManager.plugin_name in dir(module)
-                    and module.Plugin.get_plugin_type() in PluginType
-                ):
-                    if tag_name:
-                        plugin_modules.update({tag_name: module})
-                    else:
-                        plugin_modules.update({module_name: module})
-                else:
-                    pass  # Unexpected module or Invalid plugin type
+            # Remove files that have underscores (__filename__.py)
+            module_name = re.sub("\\.py$", "", Path(plugin_path).name)
+            if module_name.__contains__("__"):
+                continue
+
+            # Reuse the index entry if the file has not changed since it was indexed,
+            # otherwise import the file and record the result in the index
+            is_indexed = False
+            if plugin_index:
+                is_indexed, entry = plugin_index.lookup(plugin_path)
+
+            if is_indexed:
+                module = (
+                    plugin_index.get_lazy_module(plugin_path, entry) if entry else None
+                )
+            else:
+                is_success, module = PluginManager._import_plugin_module(
+                    module_name, plugin_path
+                )
+                if is_success and plugin_index:
+                    plugin_index.update(plugin_path, module_name, module)
 
-            except Exception:
-                pass  # Encountered an error while processing this py file; Continue next file
+            # Store modules in the dict
+            if module:
+                if tag_name:
+                    plugin_modules.update({tag_name: module})
+                else:
+                    plugin_modules.update({module_name: module})
 
-            finally:
-                # Remove the plugin folder from sys search path
-                sys.path.remove(plugin_folder_path)
+        if plugin_index:
+            plugin_index.prune(discover_paths)
+            plugin_index.save()
 
         # Update list of plugin modules
         PluginManager._update_plugin_modules(plugin_modules)
@@ -247,7 +273,13 @@ class PluginManager:
             If it fails to deserialize/identify, it will contain None objects and returns the error message
         """
         # Pass the information to DataManager to process and return the detected data instance
+        # Columns is optional and only reads the selected columns for formats that support it
+        # Set convert_to_pandas to False to read data that does not fit in memory in batches
+        # Read options are optional parser settings of delimited files, e.g. {"engine": "pyarrow"}
         filename = arguments.get("filename", "")
+        columns = arguments.get("columns", None)
+        convert_to_pandas = arguments.get("convert_to_pandas", True)
+        read_options = arguments.get("read_options", None)
         (
             is_success,
             data_instance,
@@ -257,6 +289,9 @@ class PluginManager:
             filename,
             PluginManager._get_plugins_by_type(PluginType.DATA),
             PluginManager._get_plugins_by_type(PluginType.SERIALIZER),
+            columns,
+            convert_to_pandas,
+            read_options,
         )
 
         if is_success:
@@ -312,7 +347,11 @@ class PluginManager:
                 )
 
         else:
+            # Model args is optional and is passed on to the model plugin (e.g. batch_size, num_threads)
+            # Prediction cache is optional, set to True to cache predictions in memory or
+            # to a folder path to also store the predictions on disk
             filename = arguments.get("filename", "")
+            model_args = arguments.get("model_args", None)
             (
                 is_success,
                 model_instance,
@@ -322,9 +361,15 @@ class PluginManager:
                 filename,
                 PluginManager._get_plugins_by_type(PluginType.MODEL),
                 PluginManager._get_plugins_by_type(PluginType.SERIALIZER),
+                model_args,
             )
 
             if is_success:
+                prediction_cache = arguments.get("prediction_cache", None)
+                if prediction_cache:
+                    model_instance = PluginManager._get_cached_instance(
+                        CachedModel, model_instance, filename, prediction_cache
+                    )
                 return model_instance, serializer_instance, error_message
             else:
                 raise RuntimeError(
@@ -352,7 +397,11 @@ class PluginManager:
             If it fails to deserialize/identify, it will contain None objects and returns the error message
         """
         # Pass the information to PipelineManager to process and return the detected pipeline instance
+        # Pipeline args is optional and is passed on to the pipeline plugin (e.g. batch_size, num_threads)
+        # Prediction cache is optional, set to True to cache predictions in memory or
+        # to a folder path to also store the predictions on disk
         pipeline_path = arguments.get("pipeline_path", "")
+        pipeline_args = arguments.get("pipeline_args", None)
         (
             is_success,
             pipeline_instance,
@@ -362,15 +411,51 @@ class PluginManager:
             pipeline_path,
             PluginManager._get_plugins_by_type(PluginType.PIPELINE),
             PluginManager._get_plugins_by_type(PluginType.SERIALIZER),
+            pipeline_args,
         )
 
         if is_success:
+            prediction_cache = arguments.get("prediction_cache", None)
+            if prediction_cache:
+                pipeline_instance = PluginManager._get_cached_instance(
+                    CachedPipeline, pipeline_instance, pipeline_path, prediction_cache
+                )
             return pipeline_instance, serializer_instance, error_message
         else:
             raise RuntimeError(
                 f"There was an error loading pipeline(file): {pipeline_path} ({error_message})"
             )
 
+    @staticmethod
+    def _get_cached_instance(
+        cached_class: type,
+        instance: Union[IModel, IPipeline],
+        model_path: str,
+        prediction_cache: Union[bool, str],
+    ) -> Union[CachedModel, CachedPipeline]:
+        """
+        A helper method to wrap the model or pipeline instance to cache its predictions.
+        The model hash is computed from the model file content, so a changed model file is not served
+        the predictions of the previous model
+
+        Args:
+            cached_class (type): The wrapper class (CachedModel, CachedPipeline)
+            instance (Union[IModel, IPipeline]): The model or pipeline instance
+            model_path (str): The model file or pipeline folder path
+            prediction_cache (Union[bool, str]): True to cache in memory, or the folder path to
+            also store the predictions on disk
+
+        Returns:
+            Union[CachedModel, CachedPipeline]: The wrapped model or pipeline instance
+        """
+        cache_dir = prediction_cache if isinstance(prediction_cache, str) else None
+        model_hash = PredictionCache.get_file_hash(model_path)
+        if model_hash:
+            model_hash = f"{instance.get_metadata().name}-{model_hash}"
+        return cached_class(
+            instance=instance, model_hash=model_hash, cache_dir=cache_dir
+        )
+
     @staticmethod
     def _get_algorithm_serializer_instance(
         arguments: Dict,
@@ -399,6 +484,48 @@ class PluginManager:
         else:
             raise RuntimeError(f"There was an error loading algorithm: {error_message}")
 
+    @staticmethod
+    def _import_plugin_module(
+        module_name: str, plugin_path: str
+    ) -> Tuple[bool, Union[ModuleType, None]]:
+        """
+        A helper method to import a python file and check whether it is a plugin module
+
+        Args:
+            module_name (str): The module name
+            plugin_path (str): The python file path
+
+        Returns:
+            Tuple[bool, Union[ModuleType, None]]:
+            Returns a tuple consisting of a bool that indicates if the file was imported successfully,
+            and the module if it is a valid plugin module (None if it is not a plugin)
+        """
+        # Add the plugin folder in case it uses relative path
+        plugin_folder_path = str(Path(plugin_path).parent)
+        sys.path.append(plugin_folder_path)
+
+        try:
+            # Import module with the module specification
+            module_spec = create_module_spec(module_name, plugin_path)
+            if not module_spec:
+                return False, None  # module spec is None
+
+            module = import_module_from_spec(module_spec)
+            if (
+                PluginManager.plugin_name in dir(module)
+                and module.Plugin.get_plugin_type() in PluginType
+            ):
+                return True, module
+            else:
+                return True, None  # Unexpected module or Invalid plugin type
+
+        except Exception:
+            return False, None  # Encountered an error while processing this py file
+
+        finally:
+            # Remove the plugin folder from sys search path
+            sys.path.remove(plugin_folder_path)
+
     @staticmethod
     def _delete_plugins_by_type(plugin_type: PluginType, plugin_name: str) -> None:
         """
@@ -446,27 +573,19 @@ class PluginManager:
         Returns:
             int : The order of this plugin with reference to the priority listing
         """
-        plugin_type = plugin_tuple[1].Plugin.get_plugin_type()
+        plugin_type, plugin_subtype = get_plugin_types(plugin_tuple[1])
 
         if plugin_type is PluginType.DATA:
-            return PluginManager._data_priority_list.index(
-                plugin_tuple[1].Plugin.get_data_plugin_type()
-            )
+            return PluginManager._data_priority_list.index(plugin_subtype)
 
         elif plugin_type is PluginType.MODEL:
-            return PluginManager._model_priority_list.index(
-                plugin_tuple[1].Plugin.get_model_plugin_type()
-            )
+            return PluginManager._model_priority_list.index(plugin_subtype)
 
         elif plugin_type is PluginType.PIPELINE:
-            return PluginManager._pipeline_priority_list.index(
-                plugin_tuple[1].Plugin.get_pipeline_plugin_type()
-            )
+            return PluginManager._pipeline_priority_list.index(plugin_subtype)
 
         elif plugin_type is PluginType.SERIALIZER:
-            return PluginManager._serializer_priority_list.index(
-                plugin_tuple[1].Plugin.get_serializer_plugin_type()
-            )
+            return PluginManager._serializer_priority_list.index(plugin_subtype)
 
         else:
             return list(
@@ -501,7 +620,7 @@ class PluginManager:
         """
         for module_name, module in modules.items():
             # Get the module plugin type
-            plugin_type = module.Plugin.get_plugin_type()
+            plugin_type, _ = get_plugin_types(module)
 
             # Check if this module exists in the pluginmanager plugins list.
             # Add plugin if the module does not exist.
@@ -0,0 +1,540 @@
+import hashlib
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from collections.abc import ItemsView, KeysView, ValuesView
+from pathlib import Path
+from typing import Any, Callable, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from aiverify_test_engine.interfaces.imodel import IModel
+from aiverify_test_engine.interfaces.ipipeline import IPipeline
+from aiverify_test_engine.plugins.enums.model_plugin_type import ModelPluginType
+from aiverify_test_engine.plugins.enums.pipeline_plugin_type import PipelinePluginType
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
+from aiverify_test_engine.utils.log_utils import log_message
+
+
+class PredictionCache:
+    """
+    The PredictionCache class stores the results of predict and predict_proba keyed by the model hash,
+    the prediction method and the fingerprint of the input data. Results are kept in memory for the
+    process and, when a cache directory is provided, on disk so that other processes running
+    the same model on the same data reuse them.
+    Only the predictions of the registered datasets are written to disk, as the predictions of perturbed data
+    are seldom reused by other processes. The least recently used predictions are removed from disk
+    when the cache directory exceeds the maximum disk size.
+    """
+
+    _logger: logging.Logger = None
+    _memory_cache: OrderedDict = OrderedDict()
+    _max_memory_entries: int = 64
+    _max_disk_bytes: Union[int, None] = None
+    _datasets: List[Any] = []
+    _read_chunk_size: int = 1024 * 1024
+
+    @staticmethod
+    def set_logger(logger: logging.Logger) -> None:
+        """
+        A method to set up the logger instance for logging
+
+        Args:
+            logger (Logger): The logger instance
+        """
+        if isinstance(logger, logging.Logger):
+            PredictionCache._logger = logger
+
+    @staticmethod
+    def clear() -> None:
+        """
+        A method to remove the predictions kept in memory
+        """
+        PredictionCache._memory_cache.clear()
+
+    @staticmethod
+    def set_datasets(datasets: List[Any]) -> None:
+        """
+        A method to register the datasets of the run. The predictions of these datasets (or of a subset of their
+        columns, e.g. without the ground truth) are written to the cache directory
+
+        Args:
+            datasets (List[Any]): The datasets, as DataFrames or numpy arrays
+        """
+        PredictionCache._datasets = [
+            dataset
+            for dataset in datasets
+            if isinstance(dataset, (pd.DataFrame, np.ndarray))
+        ]
+
+    @staticmethod
+    def set_max_disk_size(max_bytes: Union[int, None]) -> None:
+        """
+        A method to set the maximum size of the predictions in the cache directory
+
+        Args:
+            max_bytes (Union[int, None]): The maximum size in bytes, None for no limit
+        """
+        PredictionCache._max_disk_bytes = max_bytes
+
+    @staticmethod
+    def get_file_hash(file_path: str) -> Union[str, None]:
+        """
+        A method to compute the hash of the model file content.
+        For a folder (e.g. a pipeline folder), the relative paths and contents of all its files are hashed
+
+        Args:
+            file_path (str): The model file or folder path
+
+        Returns:
+            Union[str, None]: The content hash, None if the path cannot be read
+        """
+        try:
+            path = Path(file_path)
+            if path.is_file():
+                file_paths = [path]
+            elif path.is_dir():
+                file_paths = sorted(item for item in path.rglob("*") if item.is_file())
+            else:
+                return None
+
+            content_hash = hashlib.blake2b(digest_size=16)
+            for item in file_paths:
+                content_hash.update(item.relative_to(path).as_posix().encode("utf-8"))
+                with open(item, "rb") as file:
+                    for chunk in iter(
+                        lambda: file.read(PredictionCache._read_chunk_size), b""
+                    ):
+                        content_hash.update(chunk)
+            return content_hash.hexdigest()
+        except Exception:
+            return None
+
+    @staticmethod
+    def get_object_hash(obj: Any) -> Union[str, None]:
+        """
+        A method to compute the hash of an in-memory object (e.g. a transformed pipeline) from its pickled bytes
+
+        Args:
+            obj (Any): The object to be hashed
+
+        Returns:
+            Union[str, None]: The object hash, None if the object cannot be pickled
+        """
+        try:
+            return hashlib.blake2b(
+                pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16
+            ).hexdigest()
+        except Exception:
+            return None
+
+    @staticmethod
+    def get_data_fingerprint(data: Any, *args) -> Union[str, None]:
+        """
+        A method to compute the fingerprint of the prediction inputs.
+        The shape, dtypes and column names are part of the fingerprint, together with a hash of all the values
+        as algorithms such as robustness perturb only a few values of the data between predictions
+
+        Args:
+            data (Any): The data to be predicted
+            args: The additional arguments to the prediction method
+
+        Returns:
+            Union[str, None]: The data fingerprint, None if the data cannot be fingerprinted
+        """
+        try:
+            fingerprint = hashlib.blake2b(digest_size=16)
+            for item in (data, *args):
+                fingerprint.update(type(item).__name__.encode("utf-8"))
+                if isinstance(item, pd.DataFrame):
+                    fingerprint.update(repr(item.shape).encode("utf-8"))
+                    fingerprint.update(repr(list(item.columns)).encode("utf-8"))
+                    fingerprint.update(repr(list(item.dtypes)).encode("utf-8"))
+                    fingerprint.update(
+                        pd.util.hash_pandas_object(item, index=True).values.tobytes()
+                    )
+                elif isinstance(item, pd.Series):
+                    fingerprint.update(repr((item.shape, item.name)).encode("utf-8"))
+                    fingerprint.update(repr(item.dtype).encode("utf-8"))
+                    fingerprint.update(
+                        pd.util.hash_pandas_object(item, index=True).values.tobytes()
+                    )
+                elif isinstance(item, np.ndarray) and item.dtype != object:
+                    fingerprint.update(
+                        repr((item.shape, item.dtype.str)).encode("utf-8")
+                    )
+                    fingerprint.update(np.ascontiguousarray(item).data)
+                else:
+                    if isinstance(item, (KeysView, ValuesView, ItemsView)):
+                        # Algorithms pass the data labels as dict items, which cannot be pickled
+                        item = list(item)
+                    fingerprint.update(
+                        pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+                    )
+            return fingerprint.hexdigest()
+        except Exception:
+            return None
+
+    @staticmethod
+    def predict(
+        model_hash: Union[str, None],
+        method_name: str,
+        predict_function: Callable,
+        data: Any,
+        *args,
+        cache_dir: Union[str, None] = None,
+    ) -> Any:
+        """
+        A method to return the cached prediction of the data, or to run the prediction and cache its result.
+        The prediction is run without caching if the model hash or data fingerprint is not available
+
+        Args:
+            model_hash (Union[str, None]): The hash of the model
+            method_name (str): The prediction method name (e.g. predict, predict_proba)
+            predict_function (Callable): The prediction method of the model plugin
+            data (Any): The data to be predicted
+            args: The additional arguments to the prediction method
+            cache_dir (Union[str, None], optional): The folder to store the predictions on disk.
+            Defaults to None (predictions are only kept in memory)
+
+        Returns:
+            Any: The prediction of the data
+        """
+        data_fingerprint = None
+        if model_hash:
+            data_fingerprint = PredictionCache.get_data_fingerprint(data, *args)
+        if data_fingerprint is None:
+            return predict_function(data, *args)
+
+        cache_key = f"{model_hash}-{method_name}-{data_fingerprint}"
+        is_found, prediction = PredictionCache._get_prediction(cache_key, cache_dir)
+        if is_found:
+            log_message(
+                PredictionCache._logger,
+                logging.DEBUG,
+                f"Reusing cached {method_name} result: {cache_key}",
+            )
+            return prediction
+
+        prediction = predict_function(data, *args)
+        if cache_dir and not PredictionCache._is_dataset(data):
+            cache_dir = None  # Perturbed data is only cached in memory
+        PredictionCache._set_prediction(cache_key, prediction, cache_dir)
+        return prediction
+
+    @staticmethod
+    def _is_dataset(data: Any) -> bool:
+        """
+        A helper method to check if the data is one of the registered datasets, or a subset of its columns
+
+        Args:
+            data (Any): The data to be predicted
+
+        Returns:
+            bool: True if the data is a registered dataset
+        """
+        for dataset in PredictionCache._datasets:
+            if data is dataset:
+                return True
+            try:
+                if isinstance(data, pd.DataFrame) and isinstance(dataset, pd.DataFrame):
+                    if (
+                        data.shape[0] == dataset.shape[0]
+                        and data.columns.isin(dataset.columns).all()
+                        and data.index.equals(dataset.index)
+                        and data.equals(dataset[data.columns])
+                    ):
+                        return True
+                elif isinstance(data, np.ndarray) and isinstance(dataset, np.ndarray):
+                    if np.array_equal(data, dataset):
+                        return True
+            except Exception:
+                pass  # Not comparable with this dataset
+        return False
+
+    @staticmethod
+    def _get_prediction(
+        cache_key: str, cache_dir: Union[str, None]
+    ) -> Tuple[bool, Any]:
+        """
+        A helper method to read the prediction from memory, or from the cache directory
+
+        Args:
+            cache_key (str): The prediction cache key
+            cache_dir (Union[str, None]): The folder of predictions stored on disk
+
+        Returns:
+            Tuple[bool, Any]: True with a copy of the prediction if found, False with None if not found
+        """
+        if cache_key in PredictionCache._memory_cache:
+            PredictionCache._memory_cache.move_to_end(cache_key)
+            return True, pickle.loads(PredictionCache._memory_cache[cache_key])
+
+        if cache_dir:
+            cache_path = Path(cache_dir) / f"{cache_key}.pkl"
+            try:
+                prediction_bytes = cache_path.read_bytes()
+                prediction = pickle.loads(prediction_bytes)
+            except Exception:
+                return False, None  # Not predicted before or unreadable
+            try:
+                # Mark as recently used, so that it is removed from disk last
+                os.utime(cache_path)
+            except OSError:
+                pass
+            PredictionCache._remember(cache_key, prediction_bytes)
+            return True, prediction
+
+        return False, None
+
+    @staticmethod
+    def _set_prediction(
+        cache_key: str, prediction: Any, cache_dir: Union[str, None]
+    ) -> None:
+        """
+        A helper method to keep the pickled prediction in memory, and write it to the cache directory
+
+        Args:
+            cache_key (str): The prediction cache key
+            prediction (Any): The prediction of the data
+            cache_dir (Union[str, None]): The folder of predictions stored on disk
+        """
+        try:
+            # Kept pickled, so that callers cannot modify the cached prediction
+            prediction_bytes = pickle.dumps(prediction, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return  # The prediction cannot be pickled and is not cached
+        PredictionCache._remember(cache_key, prediction_bytes)
+
+        if cache_dir:
+            cache_path = Path(cache_dir) / f"{cache_key}.pkl"
+            temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path.write_bytes(prediction_bytes)
+                os.replace(temp_path, cache_path)
+            except Exception as error:
+                # Unable to persist the prediction; It is still kept in memory
+                log_message(
+                    PredictionCache._logger,
+                    logging.WARNING,
+                    f"Unable to write the prediction to the cache directory: {error}",
+                )
+                if temp_path.exists():
+                    temp_path.unlink()
+                return
+            PredictionCache._evict_from_disk(cache_dir)
+
+    @staticmethod
+    def _evict_from_disk(cache_dir: str) -> None:
+        """
+        A helper method to remove the least recently used predictions from the cache directory
+        until it is within the maximum disk size
+
+        Args:
+            cache_dir (str): The folder of predictions stored on disk
+        """
+        if PredictionCache._max_disk_bytes is None:
+            return
+
+        entries = []
+        total_size = 0
+        try:
+            with os.scandir(cache_dir) as items:
+                for item in items:
+                    if item.name.endswith(".pkl") and item.is_file():
+                        stat = item.stat()
+                        entries.append((stat.st_mtime, stat.st_size, item.path))
+                        total_size += stat.st_size
+        except OSError:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= PredictionCache._max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Removed by another process
+            total_size -= size
+
+    @staticmethod
+    def _remember(cache_key: str, prediction_bytes: bytes) -> None:
+        """
+        A helper method to keep the pickled prediction in memory, removing the least recently used predictions
+
+        Args:
+            cache_key (str): The prediction cache key
+            prediction_bytes (bytes): The pickled prediction of the data
+        """
+        PredictionCache._memory_cache[cache_key] = prediction_bytes
+        PredictionCache._memory_cache.move_to_end(cache_key)
+        while len(PredictionCache._memory_cache) > PredictionCache._max_memory_entries:
+            PredictionCache._memory_cache.popitem(last=False)
+
+
+class CachedModel(IModel):
+    """
+    The CachedModel class wraps a model plugin instance and caches the results of predict and predict_proba
+    with the PredictionCache. All the other methods are passed on to the model plugin instance.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self._instance = kwargs.get("instance", None)
+        self._model_hash = kwargs.get("model_hash", None)
+        self._cache_dir = kwargs.get("cache_dir", None)
+
+    def __getattr__(self, name: str) -> Any:
+        # Pass plugin specific methods (e.g. set_inference_options) on to the model plugin
+        if name == "_instance":
+            raise AttributeError(name)
+        return getattr(self._instance, name)
+
+    def get_metadata(self) -> PluginMetadata:
+        return self._instance.get_metadata()
+
+    def get_plugin_type(self) -> PluginType:
+        return self._instance.get_plugin_type()
+
+    def get_model_plugin_type(self) -> ModelPluginType:
+        return self._instance.get_model_plugin_type()
+
+    def get_instance(self) -> IModel:
+        """
+        A method to return the wrapped model plugin instance
+
+        Returns:
+            IModel: the model plugin instance
+        """
+        return self._instance
+
+    def cleanup(self) -> None:
+        self._instance.cleanup()
+
+    def setup(self) -> Tuple[bool, str]:
+        return self._instance.setup()
+
+    def get_model(self) -> Any:
+        return self._instance.get_model()
+
+    def get_model_algorithm(self) -> str:
+        return self._instance.get_model_algorithm()
+
+    def is_supported(self) -> bool:
+        return self._instance.is_supported()
+
+    def predict(self, data: Any, *args) -> Any:
+        return PredictionCache.predict(
+            self._model_hash,
+            "predict",
+            self._instance.predict,
+            data,
+            *args,
+            cache_dir=self._cache_dir,
+        )
+
+    def predict_proba(self, data: Any, *args) -> Any:
+        return PredictionCache.predict(
+            self._model_hash,
+            "predict_proba",
+            self._instance.predict_proba,
+            data,
+            *args,
+            cache_dir=self._cache_dir,
+        )
+
+    def score(self, data: Any, y_true: Any) -> Any:
+        return self._instance.score(data, y_true)
+
+
+class CachedPipeline(IPipeline):
+    """
+    The CachedPipeline class wraps a pipeline plugin instance and caches the results of predict and predict_proba
+    with the PredictionCache. All the other methods are passed on to the pipeline plugin instance.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self._instance = kwargs.get("instance", None)
+        self._model_hash = kwargs.get("model_hash", None)
+        self._cache_dir = kwargs.get("cache_dir", None)
+
+    def __getattr__(self, name: str) -> Any:
+        # Pass plugin specific methods (e.g. set_inference_options) on to the pipeline plugin
+        if name == "_instance":
+            raise AttributeError(name)
+        return getattr(self._instance, name)
+
+    def get_metadata(self) -> PluginMetadata:
+        return self._instance.get_metadata()
+
+    def get_plugin_type(self) -> PluginType:
+        return self._instance.get_plugin_type()
+
+    def get_pipeline_plugin_type(self) -> PipelinePluginType:
+        return self._instance.get_pipeline_plugin_type()
+
+    def get_instance(self) -> IPipeline:
+        """
+        A method to return the wrapped pipeline plugin instance
+
+        Returns:
+            IPipeline: the pipeline plugin instance
+        """
+        return self._instance
+
+    def cleanup(self) -> None:
+        self._instance.cleanup()
+
+    def setup(self) -> Tuple[bool, str]:
+        return self._instance.setup()
+
+    def get_pipeline(self) -> Any:
+        return self._instance.get_pipeline()
+
+    def get_pipeline_algorithm(self) -> str:
+        return self._instance.get_pipeline_algorithm()
+
+    def set_pipeline(self, pipeline: Any) -> None:
+        """
+        A method to replace the pipeline. The model hash is computed from the new pipeline,
+        and caching is disabled if the new pipeline cannot be hashed
+
+        Args:
+            pipeline (Any): The new pipeline
+        """
+        self._instance.set_pipeline(pipeline)
+        pipeline_hash = PredictionCache.get_object_hash(pipeline)
+        if pipeline_hash:
+            self._model_hash = f"{self.get_metadata().name}-{pipeline_hash}"
+        else:
+            self._model_hash = None
+
+    def is_supported(self) -> bool:
+        return self._instance.is_supported()
+
+    def predict(self, data: Any, *args) -> Any:
+        return PredictionCache.predict(
+            self._model_hash,
+            "predict",
+            self._instance.predict,
+            data,
+            *args,
+            cache_dir=self._cache_dir,
+        )
+
+    def predict_proba(self, data: Any, *args) -> Any:
+        return PredictionCache.predict(
+            self._model_hash,
+            "predict_proba",
+            self._instance.predict_proba,
+            data,
+            *args,
+            cache_dir=self._cache_dir,
+        )
+
+    def score(self, data: Any, y_true: Any) -> Any:
+        return self._instance.score(data, y_true)
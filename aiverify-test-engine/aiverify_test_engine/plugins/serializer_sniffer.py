@@ -0,0 +1,384 @@
+import hashlib
+import json
+import logging
+import os
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
+    SerializerPluginType,
+)
+from aiverify_test_engine.plugins.plugin_index import LazyPluginModule
+from aiverify_test_engine.utils.cache_utils import get_cache_dir
+from aiverify_test_engine.utils.log_utils import log_message
+
+
+class SerializerSniffer:
+    """
+    The SerializerSniffer class ranks serializer plugins for a file by looking at its leading bytes
+    and extension, so that the managers attempt a full deserialization with the most likely serializer first.
+    The serializer that succeeded for a file content is remembered so that repeated loads skip detection.
+    """
+
+    _logger: logging.Logger = None
+    _header_size: int = 4096
+    _sample_size: int = 65536
+    _cache_dir: str = get_cache_dir()
+    _hints_filename: str = "serializer_hints.json"
+    _hints: Union[Dict, None] = None
+
+    # Leading bytes of known file formats
+    _pickle_protocols: Tuple = (2, 3, 4, 5)
+    _compressed_signatures: Tuple = (
+        b"\x1f\x8b",  # gzip
+        b"BZh",  # bz2
+        b"\xfd7zXZ\x00",  # xz
+        b"\x04\x22\x4d\x18",  # lz4
+        b"\x78\x01",  # zlib
+        b"\x78\x5e",
+        b"\x78\x9c",
+        b"\x78\xda",
+    )
+    _image_signatures: Tuple = (b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff")
+    _hdf5_signature: bytes = b"\x89HDF\r\n\x1a\n"
+    _zip_signature: bytes = b"PK\x03\x04"
+    _arrow_signatures: Tuple = (b"PAR1", b"ARROW1", b"FEA1")
+
+    _extension_hints: Dict = {
+        ".csv": [SerializerPluginType.DELIMITER],
+        ".tsv": [SerializerPluginType.DELIMITER],
+        ".txt": [SerializerPluginType.DELIMITER],
+        ".png": [SerializerPluginType.IMAGE],
+        ".jpg": [SerializerPluginType.IMAGE],
+        ".jpeg": [SerializerPluginType.IMAGE],
+        ".keras": [SerializerPluginType.TENSORFLOW],
+        ".h5": [SerializerPluginType.TENSORFLOW],
+        ".pt": [SerializerPluginType.PYTORCH],
+        ".pth": [SerializerPluginType.PYTORCH],
+        ".pkl": [SerializerPluginType.PICKLE, SerializerPluginType.JOBLIB],
+        ".pickle": [SerializerPluginType.PICKLE, SerializerPluginType.JOBLIB],
+        ".sav": [SerializerPluginType.PICKLE, SerializerPluginType.JOBLIB],
+        ".joblib": [SerializerPluginType.JOBLIB],
+        ".parquet": [SerializerPluginType.ARROW],
+        ".feather": [SerializerPluginType.ARROW],
+        ".arrow": [SerializerPluginType.ARROW],
+        ".arrows": [SerializerPluginType.ARROW],
+    }
+
+    @staticmethod
+    def set_logger(logger: logging.Logger) -> None:
+        """
+        A method to set up the logger instance for logging
+
+        Args:
+            logger (Logger): The logger instance
+        """
+        if isinstance(logger, logging.Logger):
+            SerializerSniffer._logger = logger
+
+    @staticmethod
+    def sort_serializers(file_path: str, serializer_plugins: Dict) -> List:
+        """
+        A method to order the serializer plugins by how likely they can deserialize the file.
+        The serializer remembered for this file content is placed first, followed by serializers that match
+        the file signature or extension. The remaining serializers keep their priority order and are placed
+        last so that they are only attempted when the likely serializers fail.
+
+        Args:
+            file_path (str): The file path to be deserialized
+            serializer_plugins (Dict): A dictionary of supported serializer plugins
+
+        Returns:
+            List: A list of serializer plugins, most likely serializer first
+        """
+        serializer_list = list(serializer_plugins.values())
+        header = SerializerSniffer._read_header(file_path)
+        if header is None:
+            return serializer_list
+
+        # Score each serializer type: remembered serializer > file signature > file extension
+        scores = dict()
+        for serializer_type in SerializerSniffer._detect_by_extension(file_path):
+            scores[serializer_type] = 1
+        for serializer_type, weight in SerializerSniffer._detect_by_signature(
+            file_path, header
+        ).items():
+            scores[serializer_type] = scores.get(serializer_type, 0) + weight
+        remembered_type = SerializerSniffer._get_remembered_serializer(file_path)
+        if remembered_type:
+            scores[remembered_type] = 10
+
+        ranked_list = sorted(
+            enumerate(serializer_list),
+            key=lambda item: (
+                -scores.get(SerializerSniffer._get_serializer_type(item[1]), 0),
+                item[0],
+            ),
+        )
+        log_message(
+            SerializerSniffer._logger,
+            logging.DEBUG,
+            f"Serializer ranking for {file_path}: "
+            f"{[(serializer_type.name, score) for serializer_type, score in scores.items()]}",
+        )
+        return [serializer_plugin for _, serializer_plugin in ranked_list]
+
+    @staticmethod
+    def remember_serializer(file_path: str, serializer_plugin: Any) -> None:
+        """
+        A method to remember the serializer that deserialized the file content successfully
+
+        Args:
+            file_path (str): The file path that was deserialized
+            serializer_plugin (Any): The serializer plugin module that deserialized the file
+        """
+        serializer_type = SerializerSniffer._get_serializer_type(serializer_plugin)
+        if not isinstance(serializer_type, SerializerPluginType):
+            return
+
+        content_key = SerializerSniffer._get_content_key(file_path)
+        if content_key is None:
+            return
+
+        hints = SerializerSniffer._load_hints()
+        if hints.get(content_key) == serializer_type.name:
+            return
+        hints[content_key] = serializer_type.name
+        SerializerSniffer._save_hints(hints)
+
+    @staticmethod
+    def _get_serializer_type(
+        serializer_plugin: Any,
+    ) -> Union[SerializerPluginType, None]:
+        """
+        A helper method to return the serializer plugin type without importing lazy plugin modules
+
+        Args:
+            serializer_plugin (Any): The serializer plugin module
+
+        Returns:
+            Union[SerializerPluginType, None]: The serializer plugin type, None if it cannot be determined
+        """
+        if isinstance(serializer_plugin, LazyPluginModule):
+            return serializer_plugin.get_plugin_subtype()
+
+        try:
+            return serializer_plugin.Plugin.get_serializer_plugin_type()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _read_header(file_path: str) -> Union[bytes, None]:
+        """
+        A helper method to read the leading bytes of the file
+
+        Args:
+            file_path (str): The file path
+
+        Returns:
+            Union[bytes, None]: The leading bytes, None if the path is not a readable file
+        """
+        try:
+            with open(file_path, "rb") as file:
+                return file.read(SerializerSniffer._header_size)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _detect_by_extension(file_path: str) -> List:
+        """
+        A helper method to return the serializer types that are associated with the file extension
+
+        Args:
+            file_path (str): The file path
+
+        Returns:
+            List: A list of serializer plugin types
+        """
+        return SerializerSniffer._extension_hints.get(
+            Path(file_path).suffix.lower(), []
+        )
+
+    @staticmethod
+    def _detect_by_signature(file_path: str, header: bytes) -> Dict:
+        """
+        A helper method to return the serializer types that match the file signature, with the
+        weight of the evidence. Binary signatures are strong evidence, while plain text is weak evidence
+        as old pickle protocols are also text.
+
+        Args:
+            file_path (str): The file path
+            header (bytes): The leading bytes of the file
+
+        Returns:
+            Dict: The weight of each matching serializer plugin type
+        """
+        if header.startswith(SerializerSniffer._image_signatures):
+            return {SerializerPluginType.IMAGE: 2}
+
+        if header.startswith(SerializerSniffer._arrow_signatures):
+            return {SerializerPluginType.ARROW: 2}
+
+        if header.startswith(SerializerSniffer._hdf5_signature):
+            return {SerializerPluginType.TENSORFLOW: 2}
+
+        if header.startswith(SerializerSniffer._zip_signature):
+            # torch.save and keras .keras files are both zip archives
+            try:
+                with zipfile.ZipFile(file_path) as zip_file:
+                    names = zip_file.namelist()
+                if any(name.endswith("data.pkl") for name in names):
+                    return {SerializerPluginType.PYTORCH: 2}
+                if "config.json" in names:
+                    return {SerializerPluginType.TENSORFLOW: 2}
+            except Exception:
+                pass
+            return {SerializerPluginType.PYTORCH: 2, SerializerPluginType.TENSORFLOW: 2}
+
+        if (
+            len(header) > 1
+            and header[0] == 0x80
+            and header[1] in SerializerSniffer._pickle_protocols
+        ):
+            # joblib and legacy torch files are also pickles
+            return {
+                SerializerPluginType.PICKLE: 2,
+                SerializerPluginType.JOBLIB: 2,
+                SerializerPluginType.PYTORCH: 2,
+            }
+
+        if header.startswith(SerializerSniffer._compressed_signatures):
+            return {SerializerPluginType.JOBLIB: 2}
+
+        if SerializerSniffer._is_text(header):
+            return {SerializerPluginType.DELIMITER: 1}
+
+        return dict()
+
+    @staticmethod
+    def _is_text(header: bytes) -> bool:
+        """
+        A helper method to check whether the leading bytes look like text
+
+        Args:
+            header (bytes): The leading bytes of the file
+
+        Returns:
+            bool: True if the leading bytes are utf-8 text
+        """
+        if not header or b"\x00" in header:
+            return False
+
+        # Allow a multi-byte character to be cut off at the end of the header
+        for trim in range(4):
+            try:
+                header[: len(header) - trim].decode("utf-8")
+                return True
+            except UnicodeDecodeError:
+                continue
+        return False
+
+    @staticmethod
+    def _get_content_key(file_path: str) -> Union[str, None]:
+        """
+        A helper method to compute a content key from the file size and sampled bytes at the start and end
+        of the file, without reading the whole file
+
+        Args:
+            file_path (str): The file path
+
+        Returns:
+            Union[str, None]: The content key, None if the path is not a readable file
+        """
+        try:
+            file_size = os.path.getsize(file_path)
+            content_hash = hashlib.md5(str(file_size).encode("utf-8"))
+            with open(file_path, "rb") as file:
+                content_hash.update(file.read(SerializerSniffer._sample_size))
+                if file_size > SerializerSniffer._sample_size:
+                    file.seek(
+                        max(
+                            file_size - SerializerSniffer._sample_size,
+                            SerializerSniffer._sample_size,
+                        )
+                    )
+                    content_hash.update(file.read())
+            return content_hash.hexdigest()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _get_remembered_serializer(
+        file_path: str,
+    ) -> Union[SerializerPluginType, None]:
+        """
+        A helper method to return the serializer that deserialized this file content before
+
+        Args:
+            file_path (str): The file path
+
+        Returns:
+            Union[SerializerPluginType, None]: The remembered serializer plugin type, None if not found
+        """
+        content_key = SerializerSniffer._get_content_key(file_path)
+        if content_key is None:
+            return None
+
+        serializer_name = SerializerSniffer._load_hints().get(content_key)
+        if serializer_name in SerializerPluginType.__members__:
+            return SerializerPluginType[serializer_name]
+        return None
+
+    @staticmethod
+    def _load_hints() -> Dict:
+        """
+        A helper method to load the remembered serializers from the cache directory
+
+        Returns:
+            Dict: The remembered serializer names keyed by content key
+        """
+        if SerializerSniffer._hints is None:
+            SerializerSniffer._hints = dict()
+            try:
+                hints_path = (
+                    Path(SerializerSniffer._cache_dir)
+                    / SerializerSniffer._hints_filename
+                )
+                with open(hints_path, "r") as hints_file:
+                    hints = json.load(hints_file)
+                if isinstance(hints, dict):
+                    SerializerSniffer._hints = hints
+            except Exception:
+                pass  # No remembered serializers
+
+        return SerializerSniffer._hints
+
+    @staticmethod
+    def _save_hints(hints: Dict) -> None:
+        """
+        A helper method to write the remembered serializers to the cache directory
+
+        Args:
+            hints (Dict): The remembered serializer names keyed by content key
+        """
+        hints_path = (
+            Path(SerializerSniffer._cache_dir) / SerializerSniffer._hints_filename
+        )
+        temp_path = hints_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            # Keep the hints written by other processes since this process loaded them
+            stored_hints = dict()
+            if hints_path.exists():
+                with open(hints_path, "r") as hints_file:
+                    stored_hints = json.load(hints_file)
+            stored_hints.update(hints)
+
+            hints_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w") as hints_file:
+                json.dump(stored_hints, hints_file)
+            os.replace(temp_path, hints_path)
+        except Exception:
+            # Unable to persist the hints; They are still kept in memory
+            if temp_path.exists():
+                temp_path.unlink()
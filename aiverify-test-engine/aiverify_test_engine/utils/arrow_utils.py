@@ -0,0 +1,113 @@
+from typing import Any, Iterator, List, Union
+
+from aiverify_test_engine.plugins.enums.arrow_format_type import ArrowFormatType
+
+
+def read_arrow_table(
+    data_path: str, file_format: ArrowFormatType, columns: Union[List, None] = None
+) -> Any:
+    """
+    Read a columnar file into a pyarrow Table. The file is memory-mapped and only the selected
+    columns are read, so large files do not need to be copied into memory before conversion.
+    Selected column names that are not in the file are ignored.
+
+    Args:
+        data_path (str): The path of the columnar file.
+        file_format (ArrowFormatType): The file format of the columnar file.
+        columns (Union[List, None], optional): The column names to be read. Defaults to None (all columns).
+
+    Raises:
+        ValueError: The file format is not supported.
+
+    Returns:
+        Any: The pyarrow Table.
+    """
+    # pyarrow is an optional dependency, only import it when a columnar file is read
+    import pyarrow
+
+    if file_format is ArrowFormatType.PARQUET:
+        from pyarrow import parquet
+
+        parquet_file = parquet.ParquetFile(data_path, memory_map=True)
+        if columns is not None:
+            columns = _get_existing_columns(parquet_file.schema_arrow.names, columns)
+        return parquet_file.read(columns=columns)
+
+    elif file_format is ArrowFormatType.FEATHER:
+        from pyarrow import feather, ipc
+
+        if columns is not None:
+            try:
+                with pyarrow.memory_map(data_path, "r") as source:
+                    file_columns = ipc.open_file(source).schema.names
+            except pyarrow.ArrowInvalid:
+                # Feather V1 files are not Arrow IPC files
+                file_columns = feather.read_table(data_path, memory_map=True).column_names
+            columns = _get_existing_columns(file_columns, columns)
+        return feather.read_table(data_path, columns=columns, memory_map=True)
+
+    elif file_format is ArrowFormatType.ARROW_STREAM:
+        from pyarrow import ipc
+
+        # Streams have no footer to select the columns from, so the columns are selected after reading
+        with pyarrow.memory_map(data_path, "r") as source:
+            table = ipc.open_stream(source).read_all()
+
+    else:
+        raise ValueError(f"The columnar file format is not supported: {file_format}")
+
+    if columns is not None:
+        table = table.select(_get_existing_columns(table.column_names, columns))
+    return table
+
+
+def iter_arrow_batches(
+    data_path: str,
+    file_format: ArrowFormatType,
+    batch_size: int,
+    columns: Union[List, None] = None,
+) -> Iterator[Any]:
+    """
+    Read a columnar file in pyarrow RecordBatches of at most batch_size rows. Parquet files are
+    decoded one batch at a time and Feather/Arrow IPC files are memory-mapped, so only the batch
+    being processed needs to be resident in memory.
+    Selected column names that are not in the file are ignored.
+
+    Args:
+        data_path (str): The path of the columnar file.
+        file_format (ArrowFormatType): The file format of the columnar file.
+        batch_size (int): The maximum number of rows in each batch.
+        columns (Union[List, None], optional): The column names to be read. Defaults to None (all columns).
+
+    Raises:
+        ValueError: The file format is not supported.
+
+    Returns:
+        Iterator[Any]: An iterator of pyarrow RecordBatches.
+    """
+    if file_format is ArrowFormatType.PARQUET:
+        from pyarrow import parquet
+
+        parquet_file = parquet.ParquetFile(data_path, memory_map=True)
+        if columns is not None:
+            columns = _get_existing_columns(parquet_file.schema_arrow.names, columns)
+        yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+
+    else:
+        # The memory-mapped table does not copy the column data until a batch is converted
+        table = read_arrow_table(data_path, file_format, columns)
+        yield from table.to_batches(max_chunksize=batch_size)
+
+
+def _get_existing_columns(file_columns: List, columns: List) -> List:
+    """
+    Return the selected column names that exist in the file, in the file column order.
+
+    Args:
+        file_columns (List): The column names in the file.
+        columns (List): The selected column names.
+
+    Returns:
+        List: The selected column names that exist in the file.
+    """
+    return [column for column in file_columns if column in columns]
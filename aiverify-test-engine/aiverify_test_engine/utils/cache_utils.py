@@ -0,0 +1,18 @@
+import os
+from pathlib import Path
+
+
+def get_cache_dir() -> str:
+    """
+    Get the absolute path of the aiverify cache directory.
+    The directory is set by the AIVERIFY_CACHE_DIR environment variable,
+    otherwise it is the aiverify folder in the user cache directory ($XDG_CACHE_HOME or ~/.cache).
+
+    Returns:
+        str: The absolute path of the cache directory.
+    """
+    cache_dir = os.environ.get("AIVERIFY_CACHE_DIR")
+    if not cache_dir:
+        user_cache_dir = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        cache_dir = Path(user_cache_dir) / "aiverify"
+    return str(Path(cache_dir).expanduser().absolute())
@@ -0,0 +1,88 @@
+import ast
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_predictions(predictions: Any) -> np.ndarray:
+    """
+    A function to convert the model predictions (list, ndarray, tensor, DataFrame, object arrays of arrays)
+    to a typed numpy array. Numeric strings (e.g. from API models) are converted to numbers and
+    predictions that are already typed numpy arrays are returned without copying
+
+    Args:
+        predictions (Any): the predictions returned by the model
+
+    Returns:
+        np.ndarray: the predictions in a numpy array
+    """
+    if isinstance(predictions, (pd.DataFrame, pd.Series)):
+        predictions = predictions.to_numpy()
+    elif not isinstance(predictions, np.ndarray) and hasattr(predictions, "numpy"):
+        # torch and tensorflow tensors
+        if hasattr(predictions, "detach"):
+            predictions = predictions.detach().cpu()
+        predictions = predictions.numpy()
+
+    try:
+        predictions_array = np.asarray(predictions)
+    except ValueError:
+        # Rows of different lengths
+        predictions_array = np.empty(len(predictions), dtype=object)
+        predictions_array[:] = list(predictions)
+
+    if predictions_array.dtype.kind not in "OUS" or predictions_array.size == 0:
+        return predictions_array
+
+    first_value = predictions_array.flat[0]
+    if predictions_array.dtype.kind == "O" and (
+        isinstance(first_value, (list, tuple, np.ndarray))
+        or hasattr(first_value, "numpy")
+    ):
+        # Object array of rows, e.g. a column of probability arrays
+        try:
+            rows = np.stack(
+                [normalize_predictions(row) for row in predictions_array.ravel()]
+            )
+            return rows.reshape(predictions_array.shape + rows.shape[1:])
+        except ValueError:
+            return predictions_array
+
+    if predictions_array.dtype.kind == "S":
+        predictions_array = np.char.decode(predictions_array, "utf-8")
+
+    return _convert_to_numeric(predictions_array)
+
+
+def _convert_to_numeric(predictions_array: np.ndarray) -> np.ndarray:
+    """
+    A helper function to convert an array of strings or python objects to numbers.
+    Strings of lists (e.g. "[0.1, 0.9]") are converted to rows of numbers.
+    Predictions that are not numeric (e.g. class names) are returned unchanged
+
+    Args:
+        predictions_array (np.ndarray): the predictions in a numpy array of strings or objects
+
+    Returns:
+        np.ndarray: the predictions in a numeric numpy array if they are numeric
+    """
+    values = pd.Series(predictions_array.ravel())
+    try:
+        return pd.to_numeric(values).to_numpy().reshape(predictions_array.shape)
+    except (ValueError, TypeError):
+        pass
+
+    if values.map(lambda value: isinstance(value, str)).all():
+        stripped_values = values.str.strip()
+        if (
+            stripped_values.str.startswith("[") & stripped_values.str.endswith("]")
+        ).all():
+            try:
+                rows = np.asarray(stripped_values.map(ast.literal_eval).tolist())
+                if rows.dtype.kind in "biuf":
+                    return rows.reshape(predictions_array.shape + rows.shape[1:])
+            except (ValueError, SyntaxError):
+                pass
+
+    return predictions_array
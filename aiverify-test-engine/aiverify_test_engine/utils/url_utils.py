@@ -1,9 +1,12 @@
 import hashlib
 from pathlib import Path
+from typing import Union
 from urllib.parse import urlparse
 
 import requests
 
+from aiverify_test_engine.utils.cache_utils import get_cache_dir
+
 
 def is_url(data_path: str) -> bool:
     """
@@ -37,19 +40,20 @@ def get_absolute_path(data_path: str) -> str:
     return Path(data_path).resolve().as_uri()
 
 
-def download_from_url(url: str, cache_dir: str = ".cache/aiverify/") -> str:
+def download_from_url(url: str, cache_dir: Union[str, None] = None) -> str:
     """
     Download a file from the given URL and save it to a cache directory,
     using the original filename and appending a content hash for caching purposes.
 
     Args:
         url (str): The URL of the file to download.
-        cache_dir (str): Directory to cache the downloaded files. Defaults to ".cache/aiverify/".
+        cache_dir (Union[str, None]): Directory to cache the downloaded files.
+            Defaults to None (the aiverify cache directory, see get_cache_dir).
 
     Returns:
         str: The path to the downloaded file.
     """
-    cache_dir_path = Path(cache_dir)
+    cache_dir_path = Path(cache_dir or get_cache_dir())
     cache_dir_path.mkdir(parents=True, exist_ok=True)
 
     # Extract the original file name and extension from the URL
@@ -0,0 +1,163 @@
+import copy
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from aiverify_test_engine.plugins.enums.arrow_format_type import ArrowFormatType
+from aiverify_test_engine.plugins.enums.data_plugin_type import DataPluginType
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
+    SerializerPluginType,
+)
+from aiverify_test_engine.plugins.plugins_manager import PluginManager
+from aiverify_test_engine.utils.arrow_utils import read_arrow_table
+from pyarrow import feather
+
+discover_path = Path(__file__).parent.parent.parent / "aiverify_test_engine/io"
+sv_comma_path = Path(__file__).parent / "user_defined_files/sv_comma.txt"
+expected_data_labels = {
+    "Name": "object",
+    "Age": "int64",
+    "Gender": "object",
+}
+
+
+@pytest.fixture
+def parquet_path(tmp_path):
+    file_path = tmp_path / "data.parquet"
+    pd.read_csv(sv_comma_path).to_parquet(file_path)
+    return str(file_path)
+
+
+@pytest.fixture
+def arrow_data_instance(parquet_path):
+    PluginManager.discover(str(discover_path))
+    assert PluginManager.is_plugin_exists(PluginType.DATA, "arrowdata")
+    serializer_plugin = PluginManager._plugins[PluginType.SERIALIZER.name][
+        "arrowserializer"
+    ]
+    data_plugin = PluginManager._plugins[PluginType.DATA.name]["arrowdata"]
+    return data_plugin.Plugin(
+        data=serializer_plugin.Plugin.deserialize_data(parquet_path)
+    )
+
+
+def test_arrow_data_plugin(arrow_data_instance):
+    """
+    Tests the arrow data plugin on a parquet file
+    """
+    metadata = arrow_data_instance.get_metadata()
+    assert metadata.name == "arrowdata"
+    assert (
+        metadata.description
+        == "arrowdata supports columnar data (Parquet, Feather, Arrow IPC)"
+    )
+    assert metadata.version == "0.9.0"
+    assert arrow_data_instance.get_plugin_type() is PluginType.DATA
+    assert arrow_data_instance.get_data_plugin_type() is DataPluginType.ARROW
+    assert arrow_data_instance.get_file_format() is ArrowFormatType.PARQUET
+    assert arrow_data_instance.is_supported() is True
+    assert arrow_data_instance.setup() == (True, "")
+    assert arrow_data_instance.validate() == (True, "")
+    assert arrow_data_instance.read_labels() == expected_data_labels
+    assert arrow_data_instance.get_shape() == (3, 3)
+    assert arrow_data_instance.get_data().column_names == ["Name", "Age", "Gender"]
+
+
+def test_keep_and_remove_ground_truth(arrow_data_instance):
+    """
+    Tests that the ground truth is selected and removed on copies of the data instance
+    """
+    ground_truth_instance = copy.copy(arrow_data_instance)
+    assert ground_truth_instance.keep_ground_truth("Missing") is False
+    assert ground_truth_instance.keep_ground_truth("Gender") is True
+    assert ground_truth_instance.read_labels() == {"Gender": "object"}
+    assert ground_truth_instance.get_data().column_names == ["Gender"]
+    assert ground_truth_instance.convert_to_dict()["columns"] == ["Gender"]
+
+    arrow_data_instance.remove_ground_truth("Gender")
+    assert arrow_data_instance.get_data().column_names == ["Name", "Age"]
+    assert ground_truth_instance.get_data().column_names == ["Gender"]
+
+
+@pytest.mark.parametrize(
+    "columns, expected_columns",
+    [
+        (None, ["Name", "Age", "Gender"]),
+        (["Gender", "Age"], ["Age", "Gender"]),
+        (["Age", "Missing"], ["Age"]),
+    ],
+)
+def test_get_instance_with_columns(parquet_path, columns, expected_columns):
+    """
+    Tests that columnar data is converted to pandas with only the selected columns
+    """
+    PluginManager.discover(str(discover_path))
+    data_instance, serializer_instance, error_message = PluginManager.get_instance(
+        PluginType.DATA, **{"filename": parquet_path, "columns": columns}
+    )
+    assert error_message == ""
+    assert data_instance.get_data_plugin_type() is DataPluginType.PANDAS
+    assert serializer_instance.get_serializer_plugin_type() is (
+        SerializerPluginType.ARROW
+    )
+    assert list(data_instance.get_data().columns) == expected_columns
+    assert data_instance.get_data()["Age"].tolist() == [30, 29, 50]
+
+
+def test_get_instance_csv_with_columns():
+    """
+    Tests that delimited data is parsed with only the selected columns
+    """
+    PluginManager.discover(str(discover_path))
+    data_instance, _, _ = PluginManager.get_instance(
+        PluginType.DATA, **{"filename": str(sv_comma_path), "columns": ["Age"]}
+    )
+    assert list(data_instance.get_data().columns) == ["Age"]
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "feather"])
+def test_iter_batches(tmp_path, file_format):
+    """
+    Tests that columnar data is read in batches without converting it to pandas
+    """
+    df = pd.DataFrame({"feature": range(10), "label": [0, 1] * 5})
+    file_path = str(tmp_path / f"data.{file_format}")
+    getattr(df, f"to_{file_format}")(file_path)
+
+    PluginManager.discover(str(discover_path))
+    data_instance, _, _ = PluginManager.get_instance(
+        PluginType.DATA, **{"filename": file_path, "convert_to_pandas": False}
+    )
+    assert data_instance.get_data_plugin_type() is DataPluginType.ARROW
+    assert data_instance.is_batch_supported() is True
+    assert data_instance.get_num_rows() == 10
+
+    batches = list(data_instance.iter_batches(4))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert pd.concat(batches, ignore_index=True).equals(df)
+
+    batches = list(data_instance.iter_batches(4, ["label", "missing"]))
+    assert all(list(batch.columns) == ["label"] for batch in batches)
+
+    # Batches only contain the selected columns of the data instance
+    assert data_instance.keep_ground_truth("label") is True
+    batches = list(data_instance.iter_batches(10, ["feature", "label"]))
+    assert list(batches[0].columns) == ["label"]
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_read_feather_columns(tmp_path, version):
+    """
+    Tests that only the selected columns of a feather file are read, ignoring the missing columns
+    """
+    file_path = tmp_path / "data.feather"
+    feather.write_feather(pd.read_csv(sv_comma_path), str(file_path), version=version)
+
+    with patch.object(feather, "read_table", wraps=feather.read_table) as mock_read_table:
+        table = read_arrow_table(
+            str(file_path), ArrowFormatType.FEATHER, ["Gender", "Age", "Missing"]
+        )
+    assert table.column_names == ["Age", "Gender"]
+    assert mock_read_table.call_args.kwargs["columns"] == ["Age", "Gender"]
@@ -0,0 +1,136 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow
+import pytest
+from aiverify_test_engine.plugins.enums.arrow_format_type import ArrowFormatType
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
+    SerializerPluginType,
+)
+from aiverify_test_engine.plugins.metadata.arrow_metadata import ArrowMetadata
+from aiverify_test_engine.plugins.plugins_manager import PluginManager
+from pyarrow import feather, ipc
+
+discover_path = Path(__file__).parent.parent.parent / "aiverify_test_engine/io"
+sv_comma_path = Path(__file__).parent / "user_defined_files/sv_comma.txt"
+
+
+def write_columnar_file(file_path: Path, file_format: str) -> None:
+    df = pd.read_csv(sv_comma_path)
+    if file_format == "parquet":
+        df.to_parquet(file_path)
+    elif file_format == "feather":
+        df.to_feather(file_path)
+    else:
+        table = pyarrow.Table.from_pandas(df)
+        with ipc.new_stream(str(file_path), table.schema) as writer:
+            writer.write_table(table)
+
+
+@pytest.fixture
+def serializer_plugin():
+    PluginManager.discover(str(discover_path))
+    assert PluginManager.is_plugin_exists(PluginType.SERIALIZER, "arrowserializer")
+    return PluginManager._plugins[PluginType.SERIALIZER.name]["arrowserializer"]
+
+
+def test_metadata(serializer_plugin):
+    """
+    Tests the arrow serializer metadata and plugin types
+    """
+    metadata = serializer_plugin.Plugin.get_metadata()
+    assert metadata.name == "arrowserializer"
+    assert (
+        metadata.description
+        == "arrowserializer supports reading columnar data (Parquet, Feather, Arrow IPC)"
+    )
+    assert metadata.version == "0.9.0"
+    assert serializer_plugin.Plugin.get_plugin_type() is PluginType.SERIALIZER
+    assert (
+        serializer_plugin.Plugin.get_serializer_plugin_type()
+        is SerializerPluginType.ARROW
+    )
+
+
+@pytest.mark.parametrize(
+    "filename, file_format, expected_format",
+    [
+        ("data.parquet", "parquet", ArrowFormatType.PARQUET),
+        ("data.feather", "feather", ArrowFormatType.FEATHER),
+        ("data.arrows", "stream", ArrowFormatType.ARROW_STREAM),
+        # The format is detected from the file signature, not the extension
+        ("data", "parquet", ArrowFormatType.PARQUET),
+    ],
+)
+def test_deserialize_data(
+    serializer_plugin, tmp_path, filename, file_format, expected_format
+):
+    """
+    Tests that the schema and row count are read from the columnar file
+    """
+    file_path = tmp_path / filename
+    write_columnar_file(file_path, file_format)
+
+    metadata = serializer_plugin.Plugin.deserialize_data(str(file_path))
+    assert isinstance(metadata, ArrowMetadata)
+    assert metadata.get_file_format() is expected_format
+    assert metadata.get_data_path() == str(file_path)
+    assert metadata.get_num_rows() == 3
+    assert metadata.get_labels() == {
+        "Name": "object",
+        "Age": "int64",
+        "Gender": "object",
+    }
+
+
+def test_deserialize_legacy_feather(serializer_plugin, tmp_path):
+    """
+    Tests that version 1 feather files are supported
+    """
+    file_path = tmp_path / "data.feather"
+    feather.write_feather(pd.read_csv(sv_comma_path), str(file_path), version=1)
+
+    metadata = serializer_plugin.Plugin.deserialize_data(str(file_path))
+    assert metadata.get_file_format() is ArrowFormatType.FEATHER
+    assert metadata.get_num_rows() == 3
+
+
+@pytest.mark.parametrize("file_format", ["feather", "stream"])
+def test_deserialize_schema_only(serializer_plugin, tmp_path, file_format):
+    """
+    Tests that the schema and row count of Feather and Arrow IPC files are read
+    without reading the tables, and that the rows of all record batches are counted
+    """
+    file_path = tmp_path / "data"
+    table = pyarrow.Table.from_pandas(pd.read_csv(sv_comma_path))
+    writer_class = ipc.new_file if file_format == "feather" else ipc.new_stream
+    with writer_class(str(file_path), table.schema) as writer:
+        writer.write_table(table)
+        writer.write_table(table)
+
+    with patch.object(feather, "read_table") as mock_read_table, patch.object(
+        pyarrow.ipc.RecordBatchStreamReader, "read_all"
+    ) as mock_read_all:
+        metadata = serializer_plugin.Plugin.deserialize_data(str(file_path))
+    mock_read_table.assert_not_called()
+    mock_read_all.assert_not_called()
+    assert metadata.get_num_rows() == 6
+    assert list(metadata.get_labels()) == ["Name", "Age", "Gender"]
+
+
+@pytest.mark.parametrize(
+    "data_path",
+    [
+        str(sv_comma_path),
+        str(Path(__file__).parent / "user_defined_files/1.jpg"),
+        str(Path(__file__).parent / "user_defined_files/missing.parquet"),
+    ],
+)
+def test_deserialize_unsupported_data(serializer_plugin, data_path):
+    """
+    Tests that files that are not columnar are rejected
+    """
+    with pytest.raises(Exception):
+        serializer_plugin.Plugin.deserialize_data(data_path)
@@ -188,3 +188,58 @@ def test_end_to_end_data_plugin_test(data_path, request):
 
     plugin_test = PluginTest()
     plugin_test.test_plugin(plugin_test_data)
+
+
+def test_iter_batches():
+    """
+    Tests that delimited data is parsed in batches without converting it to pandas
+    """
+    discover_path = Path(__file__).parent.parent.parent / "aiverify_test_engine/io"
+    data_path = str(Path(__file__).parent / "user_defined_files/sv_comma.txt")
+    PluginManager.discover(str(discover_path))
+    data_instance, _, _ = PluginManager.get_instance(
+        PluginType.DATA, **{"filename": data_path, "convert_to_pandas": False}
+    )
+    assert data_instance.get_data_plugin_type() is DataPluginType.DELIMITER
+    assert data_instance.is_batch_supported() is True
+    assert data_instance.get_num_rows() == 3
+
+    batches = list(data_instance.iter_batches(2, ["Name", "Age"]))
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert list(batches[0].columns) == ["Name", "Age"]
+    assert batches[1]["Age"].tolist() == [50]
+
+
+@pytest.mark.parametrize("engine", [None, "c", "python", "pyarrow"])
+def test_get_instance_with_read_options(engine):
+    """
+    Tests that the parser engine and column dtypes are used to parse delimited data
+    """
+    discover_path = Path(__file__).parent.parent.parent / "aiverify_test_engine/io"
+    data_path = str(Path(__file__).parent / "user_defined_files/sv_comma.txt")
+    PluginManager.discover(str(discover_path))
+    data_instance, _, _ = PluginManager.get_instance(
+        PluginType.DATA,
+        **{
+            "filename": data_path,
+            "columns": ["Age", "Gender"],
+            "read_options": {"engine": engine, "dtype": {"Age": "float64"}},
+        },
+    )
+    data = data_instance.get_data()
+    assert list(data.columns) == ["Age", "Gender"]
+    assert str(data["Age"].dtype) == "float64"
+
+
+def test_get_instance_with_invalid_engine():
+    """
+    Tests that delimited data is not read with an unknown parser engine
+    """
+    discover_path = Path(__file__).parent.parent.parent / "aiverify_test_engine/io"
+    data_path = str(Path(__file__).parent / "user_defined_files/sv_comma.txt")
+    PluginManager.discover(str(discover_path))
+    with pytest.raises(RuntimeError, match="There was an error loading dataset"):
+        PluginManager.get_instance(
+            PluginType.DATA,
+            **{"filename": data_path, "read_options": {"engine": "invalid"}},
+        )
@@ -202,3 +202,33 @@ class PluginTest:
 def test_end_to_end_data_plugin(plugin_test_data):
     data_plugin_test = PluginTest()
     data_plugin_test.test_plugin(plugin_test_data)
+
+
+@pytest.mark.parametrize(
+    "batch_size, columns, expected_batch_rows, expected_columns",
+    [
+        (1000, None, [1000, 1000, 500], 9),
+        (2000, ["age", "default", "missing"], [2000, 500], 2),
+        (10000, [], [2500], 0),
+    ],
+)
+def test_iter_batches(
+    plugin_test_data, batch_size, columns, expected_batch_rows, expected_columns
+):
+    """
+    Tests that the data is read in batches of at most batch size rows
+    """
+    file_path, discover_path, _, _, _ = plugin_test_data
+    PluginManager.discover(str(discover_path))
+    data_instance, _, _ = PluginManager.get_instance(
+        PluginType.DATA, **{"filename": file_path}
+    )
+    assert data_instance.is_batch_supported() is True
+    assert data_instance.get_num_rows() == 2500
+
+    batches = list(data_instance.iter_batches(batch_size, columns))
+    assert [len(batch) for batch in batches] == expected_batch_rows
+    assert all(len(batch.columns) == expected_columns for batch in batches)
+
+    with pytest.raises(ValueError):
+        next(data_instance.iter_batches(0))
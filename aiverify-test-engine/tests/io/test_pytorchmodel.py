@@ -2,7 +2,10 @@ from pathlib import Path
 from typing import Tuple
 from torchvision import datasets, transforms, models
 
+import numpy as np
+import pandas as pd
 import pytest
+import torch
 from aiverify_test_engine.plugins.enums.model_plugin_type import ModelPluginType
 from aiverify_test_engine.plugins.enums.plugin_type import PluginType
 from aiverify_test_engine.plugins.plugins_manager import PluginManager
@@ -134,3 +137,50 @@ class PluginTest:
 def test_end_to_end_model_plugin(plugin_test_data):
     model_plugin_test = PluginTest()
     model_plugin_test.test_model_plugin(plugin_test_data)
+
+
+@pytest.mark.parametrize(
+    "model_args",
+    [
+        None,
+        {"batch_size": 1},
+        {"batch_size": 7, "num_threads": 1},
+        {"batch_size": 1000},
+    ],
+)
+def test_predict_batch_size(plugin_test_data, model_args):
+    """
+    Tests that predictions do not depend on the batch size
+    """
+    file_path, discover_path, _, _ = plugin_test_data
+    PluginManager.discover(str(discover_path))
+    model_instance, _, _ = PluginManager.get_instance(
+        PluginType.MODEL, **{"filename": file_path, "model_args": model_args}
+    )
+    model = model_instance.get_model()
+
+    data = np.random.default_rng(0).random((50, 5), dtype=np.float32)
+    with torch.no_grad():
+        expected_proba = model(torch.from_numpy(data)).numpy()
+
+    predictions = model_instance.predict(pd.DataFrame(data))
+    probabilities = model_instance.predict_proba(data)
+    assert predictions.shape == (50,)
+    assert np.array_equal(predictions, expected_proba.argmax(axis=1))
+    assert probabilities.shape == (50, 3)
+    assert np.allclose(
+        probabilities, torch.softmax(torch.from_numpy(expected_proba), dim=1)
+    )
+
+
+def test_auto_batch_size(plugin_test_data):
+    """
+    Tests that the automatic batch size is bounded by the number of rows and the maximum batch size
+    """
+    file_path, discover_path, _, _ = plugin_test_data
+    PluginManager.discover(str(discover_path))
+    model_instance, _, _ = PluginManager.get_instance(
+        PluginType.MODEL, **{"filename": file_path}
+    )
+    assert model_instance._get_auto_batch_size(torch.zeros((10, 5))) == 10
+    assert 1 <= model_instance._get_auto_batch_size(torch.zeros((100000, 5))) <= 8192
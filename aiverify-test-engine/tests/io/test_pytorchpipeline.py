@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Tuple
 
 import pytest
+import torch
 from aiverify_test_engine.plugins.enums.pipeline_plugin_type import PipelinePluginType
 from aiverify_test_engine.plugins.enums.plugin_type import PluginType
 from aiverify_test_engine.plugins.plugins_manager import PluginManager
@@ -141,3 +142,30 @@ def test_end_to_end_pipeline_plugin(file_path, request):
 
     plugin_test = PluginTest()
     plugin_test.test_pipeline_plugin(pipeline_test_data)
+
+
+class BatchPipeline(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.batch_size = 32
+
+    def predict(self, data):
+        # Record the inference settings seen by the pipeline
+        return self.batch_size, torch.is_inference_mode_enabled()
+
+
+def test_pipeline_inference_options():
+    """
+    Tests that the batch size is passed on to the pipeline and inference mode is enabled
+    """
+    discover_path = Path(__file__).parent.parent.parent / "aiverify_test_engine/io"
+    PluginManager.discover(str(discover_path))
+    pipeline_plugin = PluginManager._plugins[PluginType.PIPELINE.name][
+        "pytorchpipeline"
+    ]
+
+    pipeline_instance = pipeline_plugin.Plugin(pipeline=BatchPipeline())
+    assert pipeline_instance.predict(None) == (32, True)
+
+    pipeline_instance.set_inference_options(batch_size=256)
+    assert pipeline_instance.predict(None) == (256, True)
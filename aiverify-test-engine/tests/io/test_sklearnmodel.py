@@ -1,3 +1,7 @@
+import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 from typing import Tuple
 
@@ -148,3 +152,42 @@ def test_end_to_end_plugin_model(file_path, request):
 
     plugin_test = PluginTest()
     plugin_test.test_plugin_model(plugin_test_data)
+
+
+def test_detect_plugin_model_does_not_import_other_models(tmp_path, request):
+    """
+    Tests that detecting a sklearn model with an up-to-date discovery index
+    does not import the frameworks of the other model plugins
+    """
+    test_dir = Path(request.module.__file__).parent
+    discover_path = test_dir.parent.parent / "aiverify_test_engine/io"
+    model_path = test_dir / "user_defined_files/pickle_scikit_lr.sav"
+    env = {**os.environ, "AIVERIFY_CACHE_DIR": str(tmp_path / "cache")}
+
+    # The first discovery imports all the plugins to write the index,
+    # so the detection is run in a new process that discovers the plugins from the index
+    script = f"""
+import json
+import sys
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.plugins_manager import PluginManager
+PluginManager.discover({str(discover_path)!r})
+if sys.argv[1] == "detect":
+    model_instance, _, _ = PluginManager.get_instance(PluginType.MODEL, filename={str(model_path)!r})
+    print(json.dumps([
+        model_instance.get_model_plugin_type().name,
+        [module for module in ("lightgbm", "xgboost", "torch", "tensorflow") if module in sys.modules],
+    ]))
+"""
+    for step in ["index", "detect"]:
+        result = subprocess.run(
+            [sys.executable, "-c", script, step],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    model_plugin_type, imported_modules = json.loads(result.stdout.splitlines()[-1])
+    assert model_plugin_type == ModelPluginType.SKLEARN.name
+    assert imported_modules == []
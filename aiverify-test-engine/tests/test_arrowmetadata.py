@@ -0,0 +1,71 @@
+import pytest
+from aiverify_test_engine.plugins.enums.arrow_format_type import ArrowFormatType
+from aiverify_test_engine.plugins.metadata.arrow_metadata import ArrowMetadata
+
+
+class TestCollectionArrowMetadata:
+    labels = {"age": "int64", "gender": "object", "default": "int64"}
+
+    @pytest.mark.parametrize(
+        "file_format, labels, num_rows, file_path, expected_format, expected_labels, expected_rows, expected_path",
+        [
+            (
+                ArrowFormatType.PARQUET,
+                labels,
+                10,
+                "tests/data/data.parquet",
+                ArrowFormatType.PARQUET,
+                labels,
+                10,
+                "tests/data/data.parquet",
+            ),
+            (None, None, None, None, None, {}, 0, ""),
+            ("PARQUET", "labels", -1, "", None, {}, 0, ""),
+        ],
+    )
+    def test_arrow_metadata(
+        self,
+        file_format,
+        labels,
+        num_rows,
+        file_path,
+        expected_format,
+        expected_labels,
+        expected_rows,
+        expected_path,
+    ):
+        """
+        Tests the values stored in the arrow metadata
+        """
+        metadata = ArrowMetadata(file_format, labels, num_rows, file_path)
+        assert metadata.get_file_format() is expected_format
+        assert metadata.get_labels() == expected_labels
+        assert metadata.get_num_rows() == expected_rows
+        assert metadata.get_data_path() == expected_path
+        assert metadata.get_columns() is None
+
+    @pytest.mark.parametrize(
+        "columns, expected_columns, expected_labels",
+        [
+            (None, None, labels),
+            (["default"], ["default"], {"default": "int64"}),
+            (
+                ["default", "age", "missing"],
+                ["age", "default"],
+                {"age": "int64", "default": "int64"},
+            ),
+            ([], [], {}),
+        ],
+    )
+    def test_select_columns(self, columns, expected_columns, expected_labels):
+        """
+        Tests that selecting columns returns a new metadata in the file column order
+        """
+        metadata = ArrowMetadata(
+            ArrowFormatType.FEATHER, self.labels, 10, "data.feather"
+        )
+        selected_metadata = metadata.select_columns(columns)
+        assert selected_metadata.get_columns() == expected_columns
+        assert selected_metadata.get_labels() == expected_labels
+        assert selected_metadata.get_num_rows() == 10
+        assert metadata.get_columns() is None
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import pytest
+from aiverify_test_engine.utils.cache_utils import get_cache_dir
+
+
+class TestCollectionCacheUtils:
+    def test_get_cache_dir_from_env(self, monkeypatch, tmp_path):
+        """
+        Tests that the cache directory is set by AIVERIFY_CACHE_DIR
+        """
+        monkeypatch.setenv("AIVERIFY_CACHE_DIR", str(tmp_path / "cache"))
+        assert get_cache_dir() == str(tmp_path / "cache")
+
+    @pytest.mark.parametrize("xdg_cache_home", [None, "xdg"])
+    def test_get_cache_dir_default(self, monkeypatch, tmp_path, xdg_cache_home):
+        """
+        Tests that the default cache directory is an absolute path that does not depend on the working directory
+        """
+        monkeypatch.delenv("AIVERIFY_CACHE_DIR", raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        if xdg_cache_home:
+            monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / xdg_cache_home))
+            expected_cache_dir = tmp_path / xdg_cache_home / "aiverify"
+        else:
+            monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+            expected_cache_dir = tmp_path / "home" / ".cache" / "aiverify"
+
+        monkeypatch.chdir(tmp_path)
+        assert get_cache_dir() == str(expected_cache_dir)
+        assert Path(get_cache_dir()).is_absolute()
@@ -890,3 +890,26 @@ class TestCollectionDelimiterMetadata:
         """
         new_object = DelimiterMetadata(None, (DelimiterType.TAB, "\t"))
         assert new_object.get_data_path() == ""
+
+    @pytest.mark.parametrize(
+        "read_on_demand, expected_data",
+        [
+            (True, [["a", "b"], ["1", "2"]]),
+            (False, None),
+        ],
+    )
+    def test_get_data_read_on_demand(self, tmp_path, read_on_demand, expected_data):
+        """
+        Test getting data that is only read from the CSV file when requested
+        """
+        csv_filepath = tmp_path / "test_colon.csv"
+        csv_filepath.write_text("a:b\n1:2\n")
+
+        new_object = DelimiterMetadata(
+            None,
+            (DelimiterType.COLON, ":"),
+            str(csv_filepath),
+            read_on_demand=read_on_demand,
+        )
+        assert new_object._data is None
+        assert new_object.get_data() == expected_data
@@ -0,0 +1,151 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
+    SerializerPluginType,
+)
+from aiverify_test_engine.plugins.plugin_index import LazyPluginModule, PluginIndex
+from aiverify_test_engine.plugins.plugins_manager import PluginManager
+from aiverify_test_engine.utils.cache_utils import get_cache_dir
+
+
+class TestCollectionPluginIndex:
+    @pytest.fixture(autouse=True)
+    def init(self, tmp_path):
+        # Reset
+        PluginManager._plugins = {
+            plugin_type.name: dict() for plugin_type in PluginType
+        }
+        self.cache_dir = str(tmp_path / "cache")
+        self.plugin_folder = tmp_path / "plugins"
+        shutil.copytree("tests/importmodules", self.plugin_folder)
+        PluginManager.index_cache_dir = self.cache_dir
+
+        # Perform tests
+        yield
+
+        # Reset
+        PluginManager.index_cache_dir = get_cache_dir()
+        PluginManager._plugins = {
+            plugin_type.name: dict() for plugin_type in PluginType
+        }
+
+    def test_discover_writes_index(self):
+        """
+        Tests that the first discovery writes the index with plugin and non-plugin entries
+        """
+        PluginManager.discover(str(self.plugin_folder))
+        assert PluginManager.is_plugin_exists(
+            PluginType.SERIALIZER, "example_serializer"
+        )
+
+        plugin_index = PluginIndex(str(self.plugin_folder), self.cache_dir)
+        assert plugin_index.get_index_path().exists()
+        plugin_index.load()
+
+        plugin_path = str(self.plugin_folder / "example_serializer.py")
+        is_indexed, entry = plugin_index.lookup(plugin_path)
+        assert is_indexed is True
+        assert entry["plugin_type"] == "SERIALIZER"
+        assert entry["plugin_subtype"] == "DELIMITER"
+
+        non_plugin_path = str(
+            self.plugin_folder / "example_serializer_wrong_classname.py"
+        )
+        assert plugin_index.lookup(non_plugin_path) == (True, None)
+
+    def test_discover_reuses_index_lazily(self):
+        """
+        Tests that a later discovery does not import the plugin until it is used
+        """
+        PluginManager.discover(str(self.plugin_folder))
+        PluginManager._plugins = {
+            plugin_type.name: dict() for plugin_type in PluginType
+        }
+
+        PluginManager.discover(str(self.plugin_folder))
+        plugin = PluginManager._get_plugins_by_type(PluginType.SERIALIZER)[
+            "example_serializer"
+        ]
+        assert isinstance(plugin, LazyPluginModule)
+        assert plugin.is_loaded() is False
+        assert plugin.get_plugin_subtype() is SerializerPluginType.DELIMITER
+
+        assert plugin.Plugin.get_plugin_type() is PluginType.SERIALIZER
+        assert plugin.is_loaded() is True
+
+    def test_discover_rescans_modified_file(self):
+        """
+        Tests that a modified file is imported again instead of reusing its index entry
+        """
+        PluginManager.discover(str(self.plugin_folder))
+        PluginManager._plugins = {
+            plugin_type.name: dict() for plugin_type in PluginType
+        }
+
+        plugin_path = self.plugin_folder / "example_serializer.py"
+        plugin_path.write_text(plugin_path.read_text() + "\n# modified\n")
+
+        PluginManager.discover(str(self.plugin_folder))
+        plugin = PluginManager._get_plugins_by_type(PluginType.SERIALIZER)[
+            "example_serializer"
+        ]
+        assert not isinstance(plugin, LazyPluginModule)
+
+    def test_discover_without_index(self):
+        """
+        Tests that discovery does not write the index when it is disabled
+        """
+        PluginManager.discover(str(self.plugin_folder), use_index=False)
+        assert PluginManager.is_plugin_exists(
+            PluginType.SERIALIZER, "example_serializer"
+        )
+        assert not Path(self.cache_dir).exists()
+
+    def test_prune_removes_deleted_files(self):
+        """
+        Tests that entries of deleted files are removed from the index
+        """
+        PluginManager.discover(str(self.plugin_folder))
+        plugin_path = self.plugin_folder / "example_serializer.py"
+        plugin_path.unlink()
+        PluginManager.discover(str(self.plugin_folder))
+
+        plugin_index = PluginIndex(str(self.plugin_folder), self.cache_dir)
+        plugin_index.load()
+        assert plugin_index.lookup(str(plugin_path)) == (False, None)
+
+    @pytest.mark.parametrize(
+        "index_content",
+        [
+            "",
+            "not json",
+            "[]",
+            '{"version": 0, "entries": {}}',
+        ],
+    )
+    def test_load_invalid_index(self, index_content):
+        """
+        Tests that an invalid index is treated as empty
+        """
+        plugin_index = PluginIndex(str(self.plugin_folder), self.cache_dir)
+        plugin_index.get_index_path().parent.mkdir(parents=True, exist_ok=True)
+        plugin_index.get_index_path().write_text(index_content)
+        plugin_index.load()
+
+        plugin_path = str(self.plugin_folder / "example_serializer.py")
+        assert plugin_index.lookup(plugin_path) == (False, None)
+
+    def test_lookup_invalid_plugin_subtype(self):
+        """
+        Tests that an entry with an unknown plugin subtype is not reused
+        """
+        plugin_path = str(self.plugin_folder / "example_serializer.py")
+        PluginManager.discover(str(self.plugin_folder))
+
+        plugin_index = PluginIndex(str(self.plugin_folder), self.cache_dir)
+        plugin_index.load()
+        plugin_index._entries[plugin_path]["plugin_subtype"] = "UNKNOWN"
+        assert plugin_index.lookup(plugin_path) == (False, None)
@@ -0,0 +1,320 @@
+import copy
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from aiverify_test_engine.interfaces.imodel import IModel
+from aiverify_test_engine.interfaces.ipipeline import IPipeline
+from aiverify_test_engine.plugins.enums.model_plugin_type import ModelPluginType
+from aiverify_test_engine.plugins.enums.pipeline_plugin_type import PipelinePluginType
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.prediction_cache import (
+    CachedModel,
+    CachedPipeline,
+    PredictionCache,
+)
+from aiverify_test_engine.plugins.plugins_manager import PluginManager
+
+discover_path = Path(__file__).parent.parent / "aiverify_test_engine/io"
+model_path = Path(__file__).parent / "io/user_defined_files/pickle_scikit_lr.sav"
+pipeline_path = Path(__file__).parent / "io/user_defined_files/sklearn_pipeline_files"
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, data, *args):
+        self.calls += 1
+        return np.asarray(data).sum(axis=1)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    PredictionCache.clear()
+    yield
+    PredictionCache.clear()
+    PredictionCache.set_datasets([])
+    PredictionCache.set_max_disk_size(None)
+
+
+class TestCollectionPredictionCache:
+    @pytest.mark.parametrize(
+        "data, changed_data",
+        [
+            (np.arange(12).reshape(4, 3), np.arange(12).reshape(3, 4)),
+            (np.arange(12).reshape(4, 3), np.arange(12).reshape(4, 3).astype(float)),
+            (
+                pd.DataFrame({"a": [1, 2], "b": [3, 4]}),
+                pd.DataFrame({"a": [1, 2], "c": [3, 4]}),
+            ),
+            (
+                pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}),
+                pd.DataFrame({"a": [1, 2], "b": ["x", "z"]}),
+            ),
+            ([[1, 2], [3, 4]], [[1, 2], [3, 5]]),
+        ],
+    )
+    def test_get_data_fingerprint(self, data, changed_data):
+        """
+        Tests that the fingerprint is repeatable and changes when the data changes
+        """
+        fingerprint = PredictionCache.get_data_fingerprint(data)
+        assert fingerprint is not None
+        assert fingerprint == PredictionCache.get_data_fingerprint(copy.deepcopy(data))
+        assert fingerprint != PredictionCache.get_data_fingerprint(changed_data)
+
+    def test_get_data_fingerprint_single_value_changed(self):
+        """
+        Tests that perturbing a single value of a large array changes the fingerprint
+        """
+        data = np.zeros((100000, 10))
+        perturbed_data = data.copy()
+        perturbed_data[54321, 7] = 1e-9
+        assert PredictionCache.get_data_fingerprint(
+            data
+        ) != PredictionCache.get_data_fingerprint(perturbed_data)
+
+    def test_get_data_fingerprint_with_labels(self):
+        """
+        Tests that the data labels passed as dict items are part of the fingerprint
+        """
+        data = np.arange(4).reshape(2, 2)
+        fingerprint = PredictionCache.get_data_fingerprint(
+            data, {"a": "int64", "b": "int64"}.items()
+        )
+        assert fingerprint is not None
+        assert fingerprint == PredictionCache.get_data_fingerprint(
+            data, {"a": "int64", "b": "int64"}.items()
+        )
+        assert fingerprint != PredictionCache.get_data_fingerprint(
+            data, {"a": "int64", "c": "int64"}.items()
+        )
+
+    def test_get_data_fingerprint_unsupported(self):
+        """
+        Tests that data that cannot be fingerprinted returns None
+        """
+        assert PredictionCache.get_data_fingerprint(lambda x: x) is None
+
+    def test_predict_in_memory(self):
+        """
+        Tests that the same data is only predicted once and a copy of the result is returned
+        """
+        model = CountingModel()
+        data = np.arange(6).reshape(2, 3)
+        first = PredictionCache.predict("model", "predict", model.predict, data)
+        first[0] = -1
+        second = PredictionCache.predict("model", "predict", model.predict, data)
+        assert model.calls == 1
+        assert second.tolist() == [3, 12]
+
+        # Different model hash, method or data is predicted again
+        PredictionCache.predict("other", "predict", model.predict, data)
+        PredictionCache.predict("model", "predict_proba", model.predict, data)
+        PredictionCache.predict("model", "predict", model.predict, data + 1)
+        assert model.calls == 4
+
+    def test_predict_without_model_hash(self):
+        """
+        Tests that the predictions are not cached without a model hash
+        """
+        model = CountingModel()
+        data = np.arange(6).reshape(2, 3)
+        PredictionCache.predict(None, "predict", model.predict, data)
+        PredictionCache.predict(None, "predict", model.predict, data)
+        assert model.calls == 2
+
+    def test_predict_on_disk(self, tmp_path):
+        """
+        Tests that the predictions stored on disk are reused by another process
+        """
+        model = CountingModel()
+        data = np.arange(6).reshape(2, 3)
+        PredictionCache.set_datasets([data.copy()])
+        PredictionCache.predict(
+            "model", "predict", model.predict, data, cache_dir=str(tmp_path)
+        )
+        assert len(list(tmp_path.glob("*.pkl"))) == 1
+        assert len(list(tmp_path.glob("*.tmp"))) == 0
+
+        # Simulate another process by removing the predictions in memory
+        PredictionCache.clear()
+        result = PredictionCache.predict(
+            "model", "predict", model.predict, data, cache_dir=str(tmp_path)
+        )
+        assert model.calls == 1
+        assert result.tolist() == [3, 12]
+
+    def test_predict_perturbed_data_not_on_disk(self, tmp_path):
+        """
+        Tests that only the predictions of the registered datasets, or a subset of their columns, are stored on disk
+        """
+        model = CountingModel()
+        dataset = pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6], "label": [0, 1, 0]})
+        PredictionCache.set_datasets([dataset])
+
+        perturbed = dataset.drop(columns="label")
+        perturbed.loc[1, "a"] = 7
+        PredictionCache.predict(
+            "model", "predict", model.predict, perturbed, cache_dir=str(tmp_path)
+        )
+        assert len(list(tmp_path.glob("*.pkl"))) == 0
+
+        PredictionCache.predict(
+            "model",
+            "predict",
+            model.predict,
+            dataset.drop(columns="label"),
+            cache_dir=str(tmp_path),
+        )
+        assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+        # The perturbed data prediction is still reused in memory
+        PredictionCache.predict(
+            "model", "predict", model.predict, perturbed, cache_dir=str(tmp_path)
+        )
+        assert model.calls == 2
+
+    def test_disk_size_is_bounded(self, tmp_path):
+        """
+        Tests that the least recently used predictions are removed from disk when the maximum size is exceeded
+        """
+        model = CountingModel()
+        datasets = [np.full((100, 1), value, dtype=float) for value in range(3)]
+        PredictionCache.set_datasets(datasets)
+        PredictionCache.predict(
+            "model", "predict", model.predict, datasets[0], cache_dir=str(tmp_path)
+        )
+        entry_size = next(tmp_path.glob("*.pkl")).stat().st_size
+        PredictionCache.set_max_disk_size(2 * entry_size)
+
+        PredictionCache.predict(
+            "model", "predict", model.predict, datasets[1], cache_dir=str(tmp_path)
+        )
+        # Age the stored predictions, then read the first from disk to mark it as recently used
+        for path in tmp_path.glob("*.pkl"):
+            os.utime(path, (1, 1))
+        PredictionCache.clear()
+        PredictionCache.predict(
+            "model", "predict", model.predict, datasets[0], cache_dir=str(tmp_path)
+        )
+        PredictionCache.predict(
+            "model", "predict", model.predict, datasets[2], cache_dir=str(tmp_path)
+        )
+        assert len(list(tmp_path.glob("*.pkl"))) == 2
+        assert model.calls == 3
+
+        # The second prediction was removed, and the first is reused
+        PredictionCache.clear()
+        PredictionCache.predict(
+            "model", "predict", model.predict, datasets[0], cache_dir=str(tmp_path)
+        )
+        assert model.calls == 3
+        PredictionCache.predict(
+            "model", "predict", model.predict, datasets[1], cache_dir=str(tmp_path)
+        )
+        assert model.calls == 4
+
+    def test_memory_entries_are_bounded(self):
+        """
+        Tests that the least recently used predictions are removed from memory
+        """
+        model = CountingModel()
+        with patch.object(PredictionCache, "_max_memory_entries", 2):
+            for value in range(3):
+                PredictionCache.predict(
+                    "model", "predict", model.predict, np.full((1, 1), value)
+                )
+            assert len(PredictionCache._memory_cache) == 2
+            PredictionCache.predict(
+                "model", "predict", model.predict, np.full((1, 1), 0)
+            )
+        assert model.calls == 4
+
+    def test_get_file_hash(self, tmp_path):
+        """
+        Tests that the hash of a file or folder changes with its content
+        """
+        file_path = tmp_path / "model.sav"
+        file_path.write_bytes(b"model")
+        file_hash = PredictionCache.get_file_hash(str(file_path))
+        folder_hash = PredictionCache.get_file_hash(str(tmp_path))
+        assert file_hash is not None and folder_hash is not None
+
+        file_path.write_bytes(b"changed model")
+        assert PredictionCache.get_file_hash(str(file_path)) != file_hash
+        assert PredictionCache.get_file_hash(str(tmp_path)) != folder_hash
+        assert PredictionCache.get_file_hash(str(tmp_path / "missing")) is None
+
+
+class TestCollectionCachedInstances:
+    def test_cached_model(self, tmp_path):
+        """
+        Tests that the model plugin predictions are cached and other methods are passed on
+        """
+        PluginManager.discover(str(discover_path))
+        model_instance, _, _ = PluginManager.get_instance(
+            PluginType.MODEL,
+            **{"filename": str(model_path), "prediction_cache": str(tmp_path)},
+        )
+        assert isinstance(model_instance, CachedModel)
+        assert isinstance(model_instance, IModel)
+        assert model_instance.get_plugin_type() is PluginType.MODEL
+        assert model_instance.get_model_plugin_type() is ModelPluginType.SKLEARN
+        assert model_instance.get_metadata().name == "sklearnmodel"
+        assert (
+            model_instance.get_model_algorithm()
+            == "sklearn.linear_model._logistic.LogisticRegression"
+        )
+
+        data = np.random.RandomState(0).rand(
+            5, model_instance.get_model().n_features_in_
+        )
+        PredictionCache.set_datasets([data])
+        wrapped_instance = model_instance.get_instance()
+        with patch.object(
+            wrapped_instance, "predict", wraps=wrapped_instance.predict
+        ) as mock_predict:
+            expected = model_instance.predict(data)
+            assert np.array_equal(model_instance.predict(data), expected)
+            assert np.array_equal(copy.deepcopy(model_instance).predict(data), expected)
+            assert mock_predict.call_count == 1
+        assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    def test_model_without_prediction_cache(self):
+        """
+        Tests that the model plugin instance is not wrapped by default
+        """
+        PluginManager.discover(str(discover_path))
+        model_instance, _, _ = PluginManager.get_instance(
+            PluginType.MODEL, **{"filename": str(model_path)}
+        )
+        assert not isinstance(model_instance, CachedModel)
+
+    def test_cached_pipeline_set_pipeline(self):
+        """
+        Tests that replacing the pipeline does not reuse the predictions of the previous pipeline
+        """
+        PluginManager.discover(str(discover_path))
+        pipeline_instance, _, _ = PluginManager.get_instance(
+            PluginType.PIPELINE,
+            **{"pipeline_path": str(pipeline_path), "prediction_cache": True},
+        )
+        assert isinstance(pipeline_instance, CachedPipeline)
+        assert isinstance(pipeline_instance, IPipeline)
+        assert (
+            pipeline_instance.get_pipeline_plugin_type() is PipelinePluginType.SKLEARN
+        )
+        model_hash = pipeline_instance._model_hash
+        assert model_hash.startswith("sklearnpipeline-")
+
+        pipeline_instance.set_pipeline(pipeline_instance.get_pipeline()[-1])
+        assert pipeline_instance._model_hash.startswith("sklearnpipeline-")
+        assert pipeline_instance._model_hash != model_hash
+
+        pipeline_instance.set_pipeline(lambda x: x)
+        assert pipeline_instance._model_hash is None
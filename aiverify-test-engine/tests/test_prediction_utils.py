@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from aiverify_test_engine.utils.prediction_utils import normalize_predictions
+
+
+class TestCollectionPredictionUtils:
+    @pytest.mark.parametrize(
+        "predictions, expected_predictions, expected_kind",
+        [
+            ([1, 0, 1], [1, 0, 1], "i"),
+            ([np.int64(1), np.int64(0)], [1, 0], "i"),
+            ([0.25, 0.75], [0.25, 0.75], "f"),
+            (["1", "0"], [1, 0], "i"),
+            (["0.5", "1"], [0.5, 1.0], "f"),
+            (np.array([b"1", b"2"]), [1, 2], "i"),
+            (np.array(["1", "0"], dtype=object), [1, 0], "i"),
+            (["[0.1, 0.9]", "[0.2, 0.8]"], [[0.1, 0.9], [0.2, 0.8]], "f"),
+            ([[0.1, 0.9], [0.2, 0.8]], [[0.1, 0.9], [0.2, 0.8]], "f"),
+            (
+                pd.Series([np.array([0.1, 0.9]), np.array([0.3, 0.7])]),
+                [[0.1, 0.9], [0.3, 0.7]],
+                "f",
+            ),
+            (pd.DataFrame({"a": [1, 2]}), [[1], [2]], "i"),
+            (pd.Series([True, False]), [True, False], "b"),
+            (["yes", "no"], ["yes", "no"], "U"),
+        ],
+    )
+    def test_normalize_predictions(
+        self, predictions, expected_predictions, expected_kind
+    ):
+        """
+        Tests that the predictions are converted to a typed numpy array
+        """
+        result = normalize_predictions(predictions)
+        assert isinstance(result, np.ndarray)
+        assert result.dtype.kind == expected_kind
+        assert result.tolist() == expected_predictions
+
+    def test_normalize_predictions_no_copy(self):
+        """
+        Tests that typed numpy predictions are returned without copying
+        """
+        predictions = np.arange(5)
+        assert normalize_predictions(predictions) is predictions
+
+    def test_normalize_predictions_tensor(self):
+        """
+        Tests that tensors are converted to numpy arrays
+        """
+        torch = pytest.importorskip("torch")
+        result = normalize_predictions(torch.tensor([[1.0, 2.0]], requires_grad=True))
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [[1.0, 2.0]]
+
+    def test_normalize_predictions_empty(self):
+        """
+        Tests that empty predictions are converted to an empty numpy array
+        """
+        assert normalize_predictions([]).shape == (0,)
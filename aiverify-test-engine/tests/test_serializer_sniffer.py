@@ -0,0 +1,120 @@
+import gzip
+import pickle
+
+import pytest
+from aiverify_test_engine.plugins.enums.plugin_type import PluginType
+from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
+    SerializerPluginType,
+)
+from aiverify_test_engine.plugins.plugin_index import LazyPluginModule
+from aiverify_test_engine.plugins.serializer_sniffer import SerializerSniffer
+from aiverify_test_engine.utils.cache_utils import get_cache_dir
+
+
+def lazy_serializer(serializer_type: SerializerPluginType) -> LazyPluginModule:
+    return LazyPluginModule(
+        serializer_type.name.lower(),
+        f"{serializer_type.name.lower()}.py",
+        PluginType.SERIALIZER,
+        serializer_type,
+    )
+
+
+class TestCollectionSerializerSniffer:
+    pytest.serializer_plugins = {
+        serializer_type.name: lazy_serializer(serializer_type)
+        for serializer_type in [
+            SerializerPluginType.PICKLE,
+            SerializerPluginType.JOBLIB,
+            SerializerPluginType.TENSORFLOW,
+            SerializerPluginType.IMAGE,
+            SerializerPluginType.PYTORCH,
+            SerializerPluginType.ARROW,
+            SerializerPluginType.DELIMITER,
+        ]
+    }
+
+    @pytest.fixture(autouse=True)
+    def init(self, tmp_path):
+        # Reset
+        SerializerSniffer._cache_dir = str(tmp_path / "cache")
+        SerializerSniffer._hints = None
+
+        # Perform tests
+        yield
+
+        # Reset
+        SerializerSniffer._cache_dir = get_cache_dir()
+        SerializerSniffer._hints = None
+
+    @staticmethod
+    def get_order(file_path):
+        return [
+            serializer_plugin.get_plugin_subtype()
+            for serializer_plugin in SerializerSniffer.sort_serializers(
+                str(file_path), pytest.serializer_plugins
+            )
+        ]
+
+    @pytest.mark.parametrize(
+        "filename, content, expected_first",
+        [
+            ("data.csv", b"a,b,c\n1,2,3\n", SerializerPluginType.DELIMITER),
+            ("data", b"a;b;c\n1;2;3\n", SerializerPluginType.DELIMITER),
+            ("model.sav", pickle.dumps({"a": 1}), SerializerPluginType.PICKLE),
+            ("model.bin", gzip.compress(b"content"), SerializerPluginType.JOBLIB),
+            ("image.png", b"\x89PNG\r\n\x1a\n0000", SerializerPluginType.IMAGE),
+            ("model.h5", b"\x89HDF\r\n\x1a\n0000", SerializerPluginType.TENSORFLOW),
+            ("model.pt", b"PK\x03\x04corrupted", SerializerPluginType.PYTORCH),
+            ("data", b"PAR1\x15\x04", SerializerPluginType.ARROW),
+            ("data.feather", b"ARROW1\x00\x00", SerializerPluginType.ARROW),
+        ],
+    )
+    def test_sort_serializers(self, tmp_path, filename, content, expected_first):
+        """
+        Tests that the most likely serializer is placed first and no serializer is dropped
+        """
+        file_path = tmp_path / filename
+        file_path.write_bytes(content)
+
+        order = self.get_order(file_path)
+        assert order[0] is expected_first
+        assert sorted(order, key=lambda item: item.value) == sorted(
+            SerializerPluginType, key=lambda item: item.value
+        )
+
+    def test_sort_serializers_text_pickle(self, tmp_path):
+        """
+        Tests that a text pickle with a pickle extension is not handed to the delimiter serializer first
+        """
+        file_path = tmp_path / "model.sav"
+        file_path.write_bytes(pickle.dumps([1, 2], protocol=0))
+
+        order = self.get_order(file_path)
+        assert order[:2] == [SerializerPluginType.PICKLE, SerializerPluginType.JOBLIB]
+
+    @pytest.mark.parametrize("file_path", ["tests/data", "tests/data/missing.csv"])
+    def test_sort_serializers_unreadable_path(self, file_path):
+        """
+        Tests that the priority order is kept when the path cannot be read
+        """
+        assert SerializerSniffer.sort_serializers(
+            file_path, pytest.serializer_plugins
+        ) == list(pytest.serializer_plugins.values())
+
+    def test_remember_serializer(self, tmp_path):
+        """
+        Tests that the remembered serializer is placed first for the same content, even under another name
+        """
+        file_path = tmp_path / "data.csv"
+        file_path.write_bytes(b"a,b,c\n1,2,3\n")
+        SerializerSniffer.remember_serializer(
+            str(file_path), pytest.serializer_plugins["JOBLIB"]
+        )
+
+        copy_path = tmp_path / "copy.csv"
+        copy_path.write_bytes(file_path.read_bytes())
+
+        # Reload the hints from the cache directory
+        SerializerSniffer._hints = None
+        assert self.get_order(copy_path)[0] is SerializerPluginType.JOBLIB
@@ -15,6 +15,7 @@ from aiverify_test_engine.plugins.enums.model_type import ModelType
 from aiverify_test_engine.plugins.enums.plugin_type import PluginType
 from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
 from aiverify_test_engine.utils.json_utils import load_schema_file, validate_json
+from aiverify_test_engine.utils.prediction_utils import normalize_predictions
 from aiverify_test_engine.utils.simple_progress import SimpleProgress
 
 
@@ -360,8 +361,8 @@ class Plugin(IAlgorithm):
         prediction_lower_bound = self._model_instance.predict(z_lower, dict_items_labels)
         prediction_higher_bound = self._model_instance.predict(z_higher, dict_items_labels)
 
-        prediction_lower_bound = np.array([eval(str(i)) for i in prediction_lower_bound])
-        prediction_higher_bound = np.array([eval(str(i)) for i in prediction_higher_bound])
+        prediction_lower_bound = normalize_predictions(prediction_lower_bound)
+        prediction_higher_bound = normalize_predictions(prediction_higher_bound)
 
         # collect the unique bin values, so we can do a mean prediction later within the intervals
         results[feature_name] = [bins[b + 1] for b in feat_bins.cat.codes]
@@ -466,9 +467,9 @@ class Plugin(IAlgorithm):
         z_lower_prediction = self._model_instance.predict(z_lower[data_remove_first_group], dict_items_labels)
         z = self._model_instance.predict(data, dict_items_labels)
 
-        z_upper_prediction = np.array([eval(str(i)) for i in z_upper_prediction])
-        z_lower_prediction = np.array([eval(str(i)) for i in z_lower_prediction])
-        z = np.array([eval(str(i)) for i in z])
+        z_upper_prediction = normalize_predictions(z_upper_prediction)
+        z_lower_prediction = normalize_predictions(z_lower_prediction)
+        z = normalize_predictions(z)
         # calculate the mean prediction difference
         upper_diff = z_upper_prediction - z[data_remove_last_group]
         lower_diff = z[data_remove_first_group] - z_lower_prediction
@@ -17,6 +17,7 @@ from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
 )
 from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
 from aiverify_test_engine.utils.json_utils import load_schema_file, validate_json
+from aiverify_test_engine.utils.prediction_utils import normalize_predictions
 from aiverify_test_engine.utils.simple_progress import SimpleProgress
 from sklearn.metrics import confusion_matrix
 
@@ -442,7 +443,7 @@ class Plugin(IAlgorithm):
         # list of tuple of labels to be passed into predict()
         dict_items_labels = self._data_instance.read_labels().items()
         predicted_data = self._model.predict(self._data, dict_items_labels)
-        return [eval(str(i)) for i in predicted_data]
+        return normalize_predictions(predicted_data)
 
     def _compute_between_group(
         self,
@@ -13,6 +13,7 @@ from aiverify_test_engine.plugins.enums.model_type import ModelType
 from aiverify_test_engine.plugins.enums.plugin_type import PluginType
 from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
 from aiverify_test_engine.utils.json_utils import load_schema_file, validate_json
+from aiverify_test_engine.utils.prediction_utils import normalize_predictions
 from aiverify_test_engine.utils.simple_progress import SimpleProgress
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
@@ -318,7 +319,7 @@ class Plugin(IAlgorithm):
 
         # list of tuple of labels to be passed into predict()
         dict_items_labels = self._data_instance.read_labels().items()
-        predictions = self._model_instance.predict(data, dict_items_labels)
+        predictions = normalize_predictions(self._model_instance.predict(data, dict_items_labels))
 
         # have put back the ground truth column because we need this for comparison in run-test
         data[self._ground_truth] = testing[[self._ground_truth]]
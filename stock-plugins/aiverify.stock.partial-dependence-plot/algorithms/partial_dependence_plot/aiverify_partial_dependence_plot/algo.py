@@ -17,6 +17,7 @@ from aiverify_test_engine.utils.json_utils import (
     remove_numpy_formats,
     validate_json,
 )
+from aiverify_test_engine.utils.prediction_utils import normalize_predictions
 from aiverify_test_engine.utils.simple_progress import SimpleProgress
 from scipy.stats.mstats import mquantiles
 
@@ -406,7 +407,7 @@ class Plugin(IAlgorithm):
 
         for i, y in enumerate(grid_values):
             data_copy[:, idx] = y
-            baselines.append(self._model_instance.predict(data_copy, data_labels))
+            baselines.append(normalize_predictions(self._model_instance.predict(data_copy, data_labels)))
 
         baselines = np.swapaxes(np.array(baselines), 0, 1)
         mean_value = np.mean(baselines, axis=0)
@@ -21,6 +21,7 @@ from aiverify_test_engine.plugins.enums.serializer_plugin_type import (
 )
 from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
 from aiverify_test_engine.utils.json_utils import load_schema_file, validate_json
+from aiverify_test_engine.utils.prediction_utils import normalize_predictions
 from aiverify_test_engine.utils.simple_progress import SimpleProgress
 from PIL import Image
 from sklearn.metrics import accuracy_score, mean_absolute_error
@@ -394,7 +395,7 @@ class Plugin(IAlgorithm):
             else:
                 data_to_predict = self._transform_to_df(data_in_numpy, raw_shapes, subfolder_name="pred_init")
 
-            predictions = self._model.predict(data_to_predict, self._data_labels_items)
+            predictions = normalize_predictions(self._model.predict(data_to_predict, self._data_labels_items))
             # Update the progress total value (initial adversarial + final adversarial samples)
             self._progress_inst.add_total(2 * len(data_in_numpy))
 
@@ -552,9 +553,11 @@ class Plugin(IAlgorithm):
                         image_shapes,
                         subfolder_name="adv_pred",
                     )
-                    adversarial_prediction = self._model.predict(
-                        transformed_pertubed_input_df,
-                        self._data_labels_items,
+                    adversarial_prediction = normalize_predictions(
+                        self._model.predict(
+                            transformed_pertubed_input_df,
+                            self._data_labels_items,
+                        )
                     )
 
                 else:
@@ -563,9 +566,11 @@ class Plugin(IAlgorithm):
                         image_shapes,
                         subfolder_name="adv_pred",
                     )
-                    adversarial_prediction = self._model.predict(
-                        processed_pertubed_input_df,
-                        self._data_labels_items,
+                    adversarial_prediction = normalize_predictions(
+                        self._model.predict(
+                            processed_pertubed_input_df,
+                            self._data_labels_items,
+                        )
                     )
 
             # Update the progress
@@ -648,8 +653,8 @@ class Plugin(IAlgorithm):
                                     )
 
                             # Check predictions for adversarial
-                            potential_adversarials_prediction = self._model.predict(
-                                adversarial_list_to_predict, self._data_labels_items
+                            potential_adversarials_prediction = normalize_predictions(
+                                self._model.predict(adversarial_list_to_predict, self._data_labels_items)
                             )
                             satisfied = potential_adversarials_prediction != ground_truth_in_numpy
                             delta_ratio = np.mean(satisfied)
@@ -684,16 +689,20 @@ class Plugin(IAlgorithm):
                                         potential_adversarials,
                                         columns=self._data_labels,
                                     )
-                                    potential_adversarials_prediction = self._model.predict(df, self._data_labels_items)
+                                    potential_adversarials_prediction = normalize_predictions(
+                                        self._model.predict(df, self._data_labels_items)
+                                    )
                             else:
                                 potential_adv_pred_transformed = self._transform_to_df(
                                     np.array(potential_adversarials),
                                     image_shapes,
                                     subfolder_name="potential_adv_pred" + str(iteration) + str(count_test),
                                 )
-                                potential_adversarials_prediction = self._model.predict(
-                                    potential_adv_pred_transformed,
-                                    self._data_labels_items,
+                                potential_adversarials_prediction = normalize_predictions(
+                                    self._model.predict(
+                                        potential_adv_pred_transformed,
+                                        self._data_labels_items,
+                                    )
                                 )
                             satisfied = potential_adversarials_prediction != ground_truth_in_numpy
                             epsilon_ratio = np.mean(satisfied)
@@ -760,7 +769,9 @@ class Plugin(IAlgorithm):
                 final_adversarial_samples, image_shapes, subfolder_name="adv_prediction"
             )
 
-        adversarial_prediction = self._model.predict(final_adversarial_samples_to_predict, self._data_labels_items)
+        adversarial_prediction = normalize_predictions(
+            self._model.predict(final_adversarial_samples_to_predict, self._data_labels_items)
+        )
 
         # get the sample predictions to use for the sample section later
         sample_adv_predictions = adversarial_prediction[:samples_to_show]
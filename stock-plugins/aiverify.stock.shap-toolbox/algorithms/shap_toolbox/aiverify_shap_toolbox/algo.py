@@ -19,6 +19,7 @@ from aiverify_test_engine.plugins.enums.plugin_type import PluginType
 from aiverify_test_engine.plugins.metadata.plugin_metadata import PluginMetadata
 from aiverify_test_engine.plugins.plugins_manager import PluginManager
 from aiverify_test_engine.utils.json_utils import load_schema_file, validate_json
+from aiverify_test_engine.utils.prediction_utils import normalize_predictions
 from aiverify_test_engine.utils.simple_progress import SimpleProgress
 from aiverify_test_engine.utils.url_utils import is_url
 
@@ -486,9 +487,9 @@ class Plugin(IAlgorithm):
             Any: predicted value
         """
         dict_item_labels = self._data_instance.read_labels().items()
-        predicted_results = self._model_instance.predict(data, dict_item_labels)
-        if isinstance(predicted_results, list):
-            predicted_results = np.array(list(predicted_results), dtype="float32")
+        predicted_results = normalize_predictions(self._model_instance.predict(data, dict_item_labels))
+        if predicted_results.dtype.kind in "biu":
+            predicted_results = predicted_results.astype("float32")
         return predicted_results
 
     def _get_explainer(self) -> Union[shap.TreeExplainer, shap.KernelExplainer]: